@@ -1,6 +1,29 @@
+import os
+import sys
+import logging
+import threading
+
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 class ChoreographyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.choreography'
+
+    def ready(self):
+        # Optionally load the text embedding model at startup so the first
+        # natural-language request doesn't pay for it
+        is_testing = 'test' in sys.argv or os.environ.get('DJANGO_TESTING', '').lower() == 'true'
+        preload = os.environ.get('TEXT_EMBEDDING_PRELOAD', 'False').lower() in ('true', '1', 'yes')
+
+        if preload and not is_testing:
+            from services.text_embedding_service import get_text_embedding_service
+
+            threading.Thread(
+                target=get_text_embedding_service().preload,
+                name='text-embedding-preload',
+                daemon=True
+            ).start()
+            logger.info("Preloading text embedding model in background")
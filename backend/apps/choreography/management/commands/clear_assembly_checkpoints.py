@@ -0,0 +1,64 @@
+"""
+Inspect or garbage-collect resumable video assembly checkpoints.
+
+Usage:
+    python manage.py clear_assembly_checkpoints                      # remove stale checkpoints
+    python manage.py clear_assembly_checkpoints --max-age-hours 6    # with another age limit
+    python manage.py clear_assembly_checkpoints --all                # remove every checkpoint
+    python manage.py clear_assembly_checkpoints --stats              # list checkpoints only
+
+Stale checkpoints are also collected whenever an assembly starts; run this
+from cron on workers that rarely assemble. Requires VIDEO_ASSEMBLY_CHECKPOINT_DIR.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.assembly_checkpoint import get_checkpoint_store
+
+
+class Command(BaseCommand):
+    help = 'Remove stale video assembly checkpoints, or list them with --stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Only list checkpoints with their age and size'
+        )
+        parser.add_argument(
+            '--max-age-hours',
+            type=float,
+            default=None,
+            help='Remove checkpoints older than this (default: VIDEO_ASSEMBLY_CHECKPOINT_MAX_AGE_HOURS)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Remove every checkpoint, including recent ones'
+        )
+
+    def handle(self, *args, **options):
+        store = get_checkpoint_store()
+        if store is None:
+            raise CommandError('VIDEO_ASSEMBLY_CHECKPOINT_DIR is not set')
+
+        if options['stats']:
+            checkpoints = store.list_checkpoints()
+            for checkpoint in sorted(checkpoints, key=lambda c: c['age']):
+                self.stdout.write(
+                    f"{checkpoint['task_id']}: {checkpoint['age'] / 3600:.1f} h old, "
+                    f"{checkpoint['bytes'] / 1024 ** 2:.1f} MB"
+                )
+            total = sum(checkpoint['bytes'] for checkpoint in checkpoints)
+            self.stdout.write(f"{store.root_dir}: {len(checkpoints)} checkpoints, {total / 1024 ** 2:.1f} MB")
+            return
+
+        if options['all']:
+            max_age = 0
+        elif options['max_age_hours'] is not None:
+            max_age = options['max_age_hours'] * 3600
+        else:
+            max_age = None
+
+        removed = store.collect_garbage(max_age=max_age)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} assembly checkpoints"))
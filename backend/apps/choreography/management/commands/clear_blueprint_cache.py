@@ -0,0 +1,54 @@
+"""
+Clear cached blueprints.
+
+Usage:
+    python manage.py clear_blueprint_cache                 # remove everything
+    python manage.py clear_blueprint_cache --song PATH     # one song's blueprints
+    python manage.py clear_blueprint_cache --stale         # entries for old move indexes
+
+Run after re-generating move embeddings or changing the music analyzer in a
+way the version constants do not capture.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.blueprint_cache import BlueprintCache, file_content_hash
+
+
+class Command(BaseCommand):
+    help = 'Remove cached blueprints (all, for one song, or for old move index versions)'
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            '--song',
+            help='Only remove blueprints generated from this audio file'
+        )
+        group.add_argument(
+            '--stale',
+            action='store_true',
+            help='Only remove blueprints built from a different move index than the current one'
+        )
+
+    def handle(self, *args, **options):
+        cache = BlueprintCache(persistent=True)
+
+        if options['stale']:
+            from services.vector_search_service import get_vector_search_service
+
+            version = get_vector_search_service().get_index_version()
+            deleted = cache.invalidate_stale(version)
+            self.stdout.write(self.style.SUCCESS(
+                f'Removed {deleted} stale cached blueprints (current move index: {version})'
+            ))
+            return
+
+        song_hash = None
+        if options['song']:
+            try:
+                song_hash = file_content_hash(options['song'])
+            except OSError as e:
+                raise CommandError(f"Cannot read song file: {e}")
+
+        deleted = cache.invalidate(song_hash=song_hash)
+        self.stdout.write(self.style.SUCCESS(f'Removed {deleted} cached blueprints'))
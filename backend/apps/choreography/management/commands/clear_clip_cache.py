@@ -0,0 +1,43 @@
+"""
+Inspect or clear the normalized clip cache.
+
+Usage:
+    python manage.py clear_clip_cache            # remove every cached clip
+    python manage.py clear_clip_cache --stats    # show entries and size only
+
+Run after changing normalization in a way FFmpegCommandBuilder.BUILDER_VERSION
+does not capture. Requires NORMALIZED_CLIP_CACHE_DIR.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.clip_cache import get_clip_cache
+
+
+class Command(BaseCommand):
+    help = 'Remove cached normalized clips, or show cache usage with --stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Only report the number of cached clips and their size'
+        )
+
+    def handle(self, *args, **options):
+        cache = get_clip_cache()
+        if cache is None:
+            raise CommandError('NORMALIZED_CLIP_CACHE_DIR is not set')
+
+        usage = cache.disk_usage()
+        if options['stats']:
+            self.stdout.write(
+                f"{cache.cache_dir}: {usage['entries']} clips, "
+                f"{usage['bytes'] / 1024 ** 2:.1f} MB of {cache.max_bytes / 1024 ** 2:.0f} MB"
+            )
+            return
+
+        deleted = cache.clear()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {deleted} cached clips ({usage['bytes'] / 1024 ** 2:.1f} MB)"
+        ))
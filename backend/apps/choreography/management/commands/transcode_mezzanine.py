@@ -0,0 +1,152 @@
+"""
+Pre-transcode the move library into the uniform mezzanine format.
+
+Usage:
+    python manage.py transcode_mezzanine                  # clips without a current mezzanine
+    python manage.py transcode_mezzanine --force          # re-transcode everything
+    python manage.py transcode_mezzanine --workers 4 --threads 2
+
+Each distinct MoveEmbedding.video_path is downloaded from storage, transcoded
+with FFmpegCommandBuilder.build_mezzanine_command (same codec profile, fps,
+resolution, pixel format, timebase and closed GOP for every clip), uploaded
+under FFmpegCommandBuilder.MEZZANINE_PREFIX and recorded in
+MoveEmbedding.mezzanine_path. Blueprints then reference the mezzanine clips
+and VideoAssemblyService concatenates them with stream copy.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.choreography.models import MoveEmbedding
+from services.ffmpeg_builder import FFmpegCommandBuilder
+from services.storage.factory import get_storage_backend
+
+
+# Seconds allowed for one clip transcode
+TRANSCODE_TIMEOUT = 600
+
+
+class Command(BaseCommand):
+    help = 'Transcode library clips to the mezzanine format for copy-only assembly'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Parallel ffmpeg processes (default: half the CPU count)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=0,
+            help='Encoder threads per ffmpeg process (default: CPU count / workers)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-transcode clips that already have a current mezzanine'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the clips that would be transcoded'
+        )
+
+    def handle(self, *args, **options):
+        builder = FFmpegCommandBuilder()
+
+        pending = {}
+        for video_path, mezzanine_path in MoveEmbedding.objects.values_list('video_path', 'mezzanine_path'):
+            target = builder.mezzanine_path(video_path)
+            if options['force'] or mezzanine_path != target:
+                pending[video_path] = target
+
+        if not pending:
+            self.stdout.write(self.style.SUCCESS('All clips already have a current mezzanine'))
+            return
+
+        if options['dry_run']:
+            for video_path, target in sorted(pending.items()):
+                self.stdout.write(f"{video_path} -> {target}")
+            self.stdout.write(f"{len(pending)} clips would be transcoded")
+            return
+
+        if shutil.which('ffmpeg') is None:
+            raise CommandError('ffmpeg not found on PATH')
+
+        cpu_count = os.cpu_count() or 1
+        workers = options['workers'] or max(1, cpu_count // 2)
+        threads = options['threads'] or max(1, cpu_count // workers)
+        storage = get_storage_backend()
+        work_dir = tempfile.mkdtemp(prefix='mezzanine_')
+
+        self.stdout.write(
+            f"Transcoding {len(pending)} clips with {workers} workers x {threads} threads "
+            f"to {builder.MEZZANINE_PREFIX}/"
+        )
+
+        def transcode(index, video_path, target):
+            start = time.perf_counter()
+            source = os.path.join(work_dir, f'source_{index:04d}{Path(video_path).suffix}')
+            output = os.path.join(work_dir, f'mezzanine_{index:04d}.mp4')
+            try:
+                storage.download_file(video_path, source)
+                subprocess.run(
+                    builder.build_mezzanine_command(source, output, threads=threads),
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=TRANSCODE_TIMEOUT
+                )
+                storage.upload_file(local_path=output, remote_path=target)
+            finally:
+                for path in (source, output):
+                    if os.path.exists(path):
+                        os.remove(path)
+            return time.perf_counter() - start
+
+        failures = []
+        completed = 0
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(transcode, i, video_path, target): (video_path, target)
+                    for i, (video_path, target) in enumerate(sorted(pending.items()))
+                }
+                for future in as_completed(futures):
+                    video_path, target = futures[future]
+                    try:
+                        elapsed = future.result()
+                    except subprocess.CalledProcessError as e:
+                        detail = e.stderr[-300:] if e.stderr else 'No error output'
+                        failures.append(video_path)
+                        self.stderr.write(f"FAILED {video_path}: {detail}")
+                        continue
+                    except Exception as e:
+                        failures.append(video_path)
+                        self.stderr.write(f"FAILED {video_path}: {e}")
+                        continue
+
+                    # Database writes stay on the main thread
+                    MoveEmbedding.objects.filter(video_path=video_path).update(mezzanine_path=target)
+                    completed += 1
+                    self.stdout.write(f"[{completed}/{len(pending)}] {video_path} ({elapsed:.1f}s)")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        self.stdout.write(
+            f"Transcoded {completed} clips in {time.perf_counter() - started:.1f}s. "
+            f"The vector search index picks up mezzanine paths on its next reload."
+        )
+        if failures:
+            raise CommandError(f"{len(failures)} clips failed to transcode")
+        self.stdout.write(self.style.SUCCESS('Mezzanine library is up to date'))
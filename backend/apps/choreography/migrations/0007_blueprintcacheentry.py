@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('choreography', '0006_remove_job_execution_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlueprintCacheEntry',
+            fields=[
+                ('cache_key', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('song_hash', models.CharField(db_index=True, max_length=64)),
+                ('move_index_version', models.CharField(db_index=True, max_length=64)),
+                ('blueprint_json', models.JSONField(help_text='Blueprint without per-task fields (task_id, output path, timestamp)')),
+                ('hit_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Blueprint Cache Entry',
+                'verbose_name_plural': 'Blueprint Cache Entries',
+                'db_table': 'blueprint_cache',
+                'ordering': ['-last_used_at'],
+            },
+        ),
+    ]
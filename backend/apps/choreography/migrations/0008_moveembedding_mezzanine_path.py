@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('choreography', '0007_blueprintcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moveembedding',
+            name='mezzanine_path',
+            field=models.CharField(blank=True, default='', help_text='Path to the pre-transcoded mezzanine clip (see transcode_mezzanine command)', max_length=500),
+        ),
+    ]
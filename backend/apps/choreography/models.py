@@ -19,6 +19,12 @@ class MoveEmbedding(models.Model):
         max_length=500,
         help_text="Path to video file (local or GCS)"
     )
+    mezzanine_path = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        help_text="Path to the pre-transcoded mezzanine clip (see transcode_mezzanine command)"
+    )
     
     # Embeddings stored as JSON arrays
     pose_embedding = models.JSONField(
@@ -227,3 +233,43 @@ class Blueprint(models.Model):
     
     def __str__(self):
         return f"Blueprint for Task {self.task_id}"
+    
+    def get_blueprint(self):
+        """Return the blueprint in the standard dict-per-move schema.
+        
+        blueprint_json may be stored in the compact columnar form
+        (see services/blueprint_codec.py); this expands it.
+        """
+        from services.blueprint_codec import expand_blueprint
+        return expand_blueprint(self.blueprint_json)
+
+
+class BlueprintCacheEntry(models.Model):
+    """Persistent tier of the blueprint cache.
+    
+    Stores task-independent blueprints keyed by a hash of the song content,
+    generation parameters, move index version and generator version, so
+    repeated requests for the same song and parameters skip analysis,
+    search and sequencing. See services/blueprint_cache.py.
+    """
+    
+    cache_key = models.CharField(max_length=64, primary_key=True)
+    song_hash = models.CharField(max_length=64, db_index=True)
+    move_index_version = models.CharField(max_length=64, db_index=True)
+    blueprint_json = models.JSONField(
+        help_text="Blueprint without per-task fields (task_id, output path, timestamp)"
+    )
+    hit_count = models.IntegerField(default=0)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    class Meta:
+        db_table = 'blueprint_cache'
+        ordering = ['-last_used_at']
+        verbose_name = 'Blueprint Cache Entry'
+        verbose_name_plural = 'Blueprint Cache Entries'
+    
+    def __str__(self):
+        return f"Cached blueprint {self.cache_key[:12]}"
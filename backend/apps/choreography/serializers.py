@@ -178,6 +178,11 @@ class AIGenerationSerializer(serializers.Serializer):
         required=False,
         help_text="Optional pre-parsed parameters (if not provided, will parse from query)"
     )
+    preview = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Render a fast low-resolution draft (360p, 15 fps) instead of the full video"
+    )
     
     def validate_query(self, value):
         """Validate query is not empty"""
@@ -213,6 +218,11 @@ class GenerateChoreographySerializer(serializers.Serializer):
         allow_blank=True,
         help_text="Style of the choreography"
     )
+    preview = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Render a fast low-resolution draft (360p, 15 fps) instead of the full video"
+    )
     
     def validate_song_id(self, value):
         """Validate that the song exists in the database."""
@@ -221,6 +231,56 @@ class GenerateChoreographySerializer(serializers.Serializer):
         return value
 
 
+class BatchBlueprintItemSerializer(serializers.Serializer):
+    """
+    One (song, parameters) entry of a batch blueprint request.
+    
+    Song existence is checked by the view so that a missing song only fails
+    its own item.
+    """
+    song_id = serializers.IntegerField(required=True)
+    difficulty = serializers.ChoiceField(
+        choices=['beginner', 'intermediate', 'advanced'],
+        default='intermediate',
+        help_text="Difficulty level of the choreography"
+    )
+    energy_level = serializers.ChoiceField(
+        choices=['low', 'medium', 'high'],
+        default='medium',
+        required=False,
+        allow_blank=True,
+        help_text="Energy level of the choreography"
+    )
+    style = serializers.ChoiceField(
+        choices=['traditional', 'modern', 'romantic', 'sensual'],
+        default='modern',
+        required=False,
+        allow_blank=True,
+        help_text="Style of the choreography"
+    )
+
+
+class BatchBlueprintSerializer(serializers.Serializer):
+    """
+    Serializer for batch blueprint generation.
+    
+    Generates blueprints (without assembling videos) for many songs and
+    parameter combinations in one request.
+    """
+    MAX_ITEMS = 50
+    
+    items = serializers.ListField(
+        child=BatchBlueprintItemSerializer(),
+        min_length=1,
+        max_length=MAX_ITEMS,
+        help_text=f"Songs and parameters to generate blueprints for (max {MAX_ITEMS})"
+    )
+    include_blueprints = serializers.BooleanField(
+        default=False,
+        help_text="Return the blueprints (compact form) in the response"
+    )
+
+
 class DescribeChoreographySerializer(serializers.Serializer):
     """
     Serializer for Path 2 natural language choreography description.
@@ -234,6 +294,11 @@ class DescribeChoreographySerializer(serializers.Serializer):
         max_length=2000,
         help_text="Natural language description of desired choreography"
     )
+    preview = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Render a fast low-resolution draft (360p, 15 fps) instead of the full video"
+    )
     
     def validate_user_request(self, value):
         """
@@ -2,11 +2,12 @@
 Additional tests to increase coverage of views.py
 """
 import uuid
+from unittest.mock import patch
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
-from apps.choreography.models import Song, ChoreographyTask
+from apps.choreography.models import Song, ChoreographyTask, Blueprint
 
 User = get_user_model()
 
@@ -97,4 +98,494 @@ class SongViewsCoverageTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class BatchBlueprintViewTests(TestCase):
+    """Tests for the batch blueprint generation endpoint"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='batchuser',
+            email='batch@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.song = Song.objects.create(
+            title='Batch Song',
+            artist='Test Artist',
+            genre='bachata',
+            bpm=120,
+            duration=180.0,
+            audio_path='songs/batch.mp3'
+        )
+    
+    @staticmethod
+    def fake_batch(configs, **kwargs):
+        """Complete every item except advanced ones."""
+        results = []
+        for config in configs:
+            if config.difficulty == 'advanced':
+                results.append({'task_id': config.task_id, 'status': 'failed', 'cached': False, 'error': 'analysis failed'})
+                continue
+            blueprint = {
+                'task_id': config.task_id,
+                'audio_path': config.song_path,
+                'moves': [
+                    {'clip_id': f'move_{i + 1}', 'video_path': 'clips/basic.mp4', 'start_time': i * 8.0, 'duration': 8.0}
+                    for i in range(3)
+                ],
+                'output_config': {'output_path': f'output/choreography_{config.task_id}.mp4'},
+            }
+            results.append({'task_id': config.task_id, 'status': 'completed', 'cached': False, 'blueprint': blueprint})
+        return results
+    
+    @patch('services.vector_search_service.get_vector_search_service')
+    @patch('services.blueprint_generator.BlueprintGenerator.generate_blueprints_batch')
+    def test_batch_reports_per_item_status(self, mock_batch, mock_vector_search):
+        """Test that each item gets its own status and stored blueprint"""
+        mock_batch.side_effect = self.fake_batch
+        
+        response = self.client.post('/api/choreography/generate/batch/', {
+            'items': [
+                {'song_id': self.song.id, 'difficulty': 'beginner', 'style': 'romantic'},
+                {'song_id': self.song.id, 'difficulty': 'advanced'},
+                {'song_id': 99999, 'difficulty': 'beginner'},
+            ],
+            'include_blueprints': True
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = response.data['items']
+        self.assertEqual([item['status'] for item in items], ['completed', 'failed', 'failed'])
+        self.assertEqual(items[1]['error'], 'analysis failed')
+        self.assertIn('99999', items[2]['error'])
+        self.assertEqual(response.data['summary']['completed'], 1)
+        self.assertEqual(response.data['summary']['distinct_songs'], 1)
+        
+        # Only the two existing-song items reach the generator, in one call
+        self.assertEqual(mock_batch.call_count, 1)
+        self.assertEqual(len(mock_batch.call_args[0][0]), 2)
+        
+        task = ChoreographyTask.objects.get(task_id=items[0]['task_id'])
+        self.assertEqual(task.stage, 'blueprint_generated')
+        self.assertEqual(task.result['move_count'], 3)
+        stored = Blueprint.objects.get(task=task)
+        self.assertEqual(len(stored.get_blueprint()['moves']), 3)
+        self.assertEqual(items[0]['blueprint'], stored.blueprint_json)
+        self.assertEqual(ChoreographyTask.objects.filter(user=self.user).count(), 1)
+    
+    def test_batch_rejects_empty_items(self):
+        """Test that an empty batch is rejected"""
+        response = self.client.post('/api/choreography/generate/batch/', {'items': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PipelinedGenerationViewTests(TestCase):
+    """Tests for synchronous generation with VIDEO_ASSEMBLY_STREAMING enabled"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='streamuser',
+            email='stream@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.song = Song.objects.create(
+            title='Stream Song',
+            artist='Test Artist',
+            genre='bachata',
+            bpm=120,
+            duration=180.0,
+            audio_path='songs/stream.mp3'
+        )
+    
+    @patch.dict('os.environ', {'VIDEO_ASSEMBLY_STREAMING': 'true'})
+    @patch('music_analyzer.MusicAnalyzer')
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.vector_search_service.get_vector_search_service')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    @patch('services.blueprint_generator.BlueprintGenerator')
+    def test_streams_blueprint_into_assembly(self, mock_generator, mock_assembly, *mocks):
+        """Test that the stream is assembled and its blueprint stored afterwards"""
+        blueprint = {
+            'task_id': 'stream-task',
+            'audio_path': 'songs/stream.mp3',
+            'moves': [{'clip_id': 'move_1', 'video_path': 'clips/basic.mp4', 'start_time': 0.0, 'duration': 8.0}],
+            'output_config': {'output_path': 'output/stream.mp4'},
+        }
+        stream = mock_generator.return_value.stream_blueprint.return_value
+        stream.blueprint = blueprint
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.assemble_video_stream.return_value = 'https://storage.example.com/output/stream.mp4'
+        assembly.output_path.return_value = 'output/stream.mp4'
+        assembly.last_timings = {}
+        
+        response = self.client.post('/api/choreography/generate/', {
+            'song_id': self.song.id,
+            'difficulty': 'beginner'
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['video_url'], 'https://storage.example.com/output/stream.mp4')
+        mock_generator.return_value.generate_blueprint.assert_not_called()
+        assembly.assemble_video.assert_not_called()
+        self.assertIs(assembly.assemble_video_stream.call_args[0][0], stream)
+        task = ChoreographyTask.objects.get(task_id=response.data['task_id'])
+        self.assertEqual(task.result['move_count'], 1)
+        self.assertEqual(Blueprint.objects.get(task=task).get_blueprint()['moves'], blueprint['moves'])
+    
+    @patch.dict('os.environ', {'VIDEO_ASSEMBLY_STREAMING': 'true'})
+    @patch('music_analyzer.MusicAnalyzer')
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.vector_search_service.get_vector_search_service')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    @patch('services.blueprint_generator.BlueprintGenerator')
+    def test_playlist_url_recorded_before_completion(self, mock_generator, mock_assembly, *mocks):
+        """Test that an HLS playlist URL and storage path are in the task result while assembly runs"""
+        playlist_url = 'https://storage.example.com/output/stream/index.m3u8'
+        stream = mock_generator.return_value.stream_blueprint.return_value
+        stream.output_path = 'output/stream.mp4'
+        stream.blueprint = {
+            'task_id': 'stream-task',
+            'audio_path': 'songs/stream.mp3',
+            'moves': [{'clip_id': 'move_1', 'video_path': 'clips/basic.mp4', 'start_time': 0.0, 'duration': 8.0}],
+            'output_config': {'output_path': 'output/stream.mp4'},
+        }
+        mock_assembly.OUTPUT_HLS = 'hls'
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.output_format = 'hls'
+        assembly.output_path.return_value = 'output/stream.mp4'
+        assembly.last_timings = {}
+        seen = {}
+        
+        def assemble(stream, progress_callback, playlist_callback):
+            playlist_callback(playlist_url)
+            task = ChoreographyTask.objects.get(user=self.user)
+            seen['status'], seen['result'] = task.status, task.result
+            return playlist_url
+        
+        assembly.assemble_video_stream.side_effect = assemble
+        
+        response = self.client.post('/api/choreography/generate/', {
+            'song_id': self.song.id,
+            'difficulty': 'beginner'
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(seen['status'], 'started')
+        self.assertEqual(seen['result'], {'playlist_url': playlist_url, 'playlist_path': 'output/stream/index.m3u8'})
+        task = ChoreographyTask.objects.get(task_id=response.data['task_id'])
+        self.assertEqual(task.result['playlist_url'], playlist_url)
+        self.assertEqual(task.result['playlist_path'], 'output/stream/index.m3u8')
+        self.assertEqual(task.result['video_url'], playlist_url)
+    
+    @patch.dict('os.environ', {'VIDEO_ASSEMBLY_STREAMING': 'true'})
+    @patch('music_analyzer.MusicAnalyzer')
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.vector_search_service.get_vector_search_service')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    @patch('services.blueprint_generator.BlueprintGenerator')
+    def test_blueprint_stored_when_assembly_fails(self, mock_generator, mock_assembly, *mocks):
+        """Test that a fully streamed blueprint is stored even if assembly then fails"""
+        from services.video_assembly_service import VideoAssemblyError
+        
+        blueprint = {
+            'task_id': 'stream-task',
+            'audio_path': 'songs/stream.mp3',
+            'moves': [{'clip_id': 'move_1', 'video_path': 'clips/basic.mp4', 'start_time': 0.0, 'duration': 8.0}],
+            'output_config': {'output_path': 'output/stream.mp4'},
+        }
+        stream = mock_generator.return_value.stream_blueprint.return_value
+        stream.blueprint = None
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        
+        def assemble(stream, progress_callback, playlist_callback):
+            stream.blueprint = blueprint
+            raise VideoAssemblyError('Failed to upload video')
+        
+        assembly.assemble_video_stream.side_effect = assemble
+        
+        response = self.client.post('/api/choreography/generate/', {
+            'song_id': self.song.id,
+            'difficulty': 'beginner'
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        task = ChoreographyTask.objects.get(user=self.user)
+        self.assertEqual(task.status, 'failed')
+        self.assertEqual(Blueprint.objects.get(task=task).get_blueprint()['moves'], blueprint['moves'])
+
 
+class PreviewGenerationViewTests(TestCase):
+    """Tests for draft preview generation and the upgrade to a full render"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='previewuser',
+            email='preview@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.song = Song.objects.create(
+            title='Preview Song',
+            artist='Test Artist',
+            genre='bachata',
+            bpm=120,
+            duration=240.0,
+            audio_path='songs/preview.mp3'
+        )
+        self.blueprint = {
+            'task_id': 'preview-task',
+            'audio_path': 'songs/preview.mp3',
+            'moves': [{'clip_id': 'move_1', 'video_path': 'clips/basic.mp4', 'start_time': 0.0, 'duration': 8.0}],
+            'output_config': {'output_path': 'output/preview.mp4'},
+        }
+    
+    @patch('music_analyzer.MusicAnalyzer')
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.vector_search_service.get_vector_search_service')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    @patch('services.blueprint_generator.BlueprintGenerator')
+    def test_preview_option_selects_profile(self, mock_generator, mock_assembly, *mocks):
+        """Test that preview=true assembles with the preview profile and marks the result"""
+        mock_generator.return_value.generate_blueprint.return_value = self.blueprint
+        mock_assembly.PROFILE_PREVIEW = 'preview'
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.assemble_video.return_value = 'https://storage.example.com/output/preview_preview.mp4'
+        assembly.output_path.return_value = 'output/preview_preview.mp4'
+        
+        response = self.client.post('/api/choreography/generate/', {
+            'song_id': self.song.id,
+            'difficulty': 'beginner',
+            'preview': True
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['preview'])
+        self.assertEqual(mock_assembly.call_args.kwargs['profile'], 'preview')
+        task = ChoreographyTask.objects.get(task_id=response.data['task_id'])
+        self.assertEqual(task.result['output_path'], 'output/preview_preview.mp4')
+        self.assertTrue(task.result['preview'])
+    
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    def test_full_render_reuses_stored_blueprint(self, mock_assembly, mock_storage):
+        """Test that upgrading a preview assembles the task's stored blueprint in full"""
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='completed',
+            result={'video_url': 'https://storage.example.com/output/preview_preview.mp4', 'preview': True}
+        )
+        Blueprint.objects.create(task=task, blueprint_json=self.blueprint)
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.assemble_video.return_value = 'https://storage.example.com/output/preview.mp4'
+        assembly.output_path.return_value = 'output/preview.mp4'
+        
+        response = self.client.post(f'/api/choreography/tasks/{task.task_id}/render/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('profile', mock_assembly.call_args.kwargs)
+        self.assertEqual(assembly.assemble_video.call_args.kwargs['blueprint']['moves'], self.blueprint['moves'])
+        task.refresh_from_db()
+        self.assertEqual(task.result['video_url'], 'https://storage.example.com/output/preview.mp4')
+        self.assertEqual(task.result['preview_url'], 'https://storage.example.com/output/preview_preview.mp4')
+        self.assertFalse(task.result['preview'])
+    
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    def test_failed_full_render_keeps_preview(self, mock_assembly, mock_storage):
+        """Test that a failed upgrade leaves the preview in place"""
+        from services.video_assembly_service import VideoAssemblyError
+        preview_result = {'video_url': 'https://storage.example.com/output/preview_preview.mp4', 'preview': True}
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='completed',
+            result=preview_result
+        )
+        Blueprint.objects.create(task=task, blueprint_json=self.blueprint)
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.assemble_video.side_effect = VideoAssemblyError('FFmpeg concatenation failed')
+        
+        response = self.client.post(f'/api/choreography/tasks/{task.task_id}/render/')
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.result), ('completed', preview_result))
+        self.assertIn('concatenation failed', task.error)
+    
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    def test_full_render_hls_playlist(self, mock_assembly, mock_storage):
+        """Test that an HLS full render exposes its playlist while rendering and afterwards"""
+        playlist_url = 'https://storage.example.com/output/preview/index.m3u8'
+        preview_result = {'video_url': 'https://storage.example.com/output/preview_preview.mp4', 'preview': True}
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='completed',
+            result=preview_result
+        )
+        Blueprint.objects.create(task=task, blueprint_json=self.blueprint)
+        mock_assembly.OUTPUT_HLS = 'hls'
+        assembly = mock_assembly.return_value
+        assembly.check_ffmpeg_available.return_value = True
+        assembly.output_format = 'hls'
+        assembly.output_path.return_value = 'output/preview.mp4'
+        seen = {}
+        
+        def assemble(blueprint, progress_callback, playlist_callback):
+            playlist_callback(playlist_url)
+            current = ChoreographyTask.objects.get(task_id=task.task_id)
+            seen['status'], seen['result'] = current.status, current.result
+            return playlist_url
+        
+        assembly.assemble_video.side_effect = assemble
+        
+        response = self.client.post(f'/api/choreography/tasks/{task.task_id}/render/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(seen['status'], 'started')
+        self.assertEqual(
+            seen['result'],
+            {**preview_result, 'playlist_url': playlist_url, 'playlist_path': 'output/preview/index.m3u8'}
+        )
+        task.refresh_from_db()
+        self.assertEqual(task.result['playlist_url'], playlist_url)
+        self.assertEqual(task.result['playlist_path'], 'output/preview/index.m3u8')
+        self.assertFalse(task.result['preview'])
+    
+    @patch('services.storage.factory.get_storage_backend')
+    @patch('services.video_assembly_service.VideoAssemblyService')
+    def test_unexpected_render_error_keeps_preview(self, mock_assembly, mock_storage):
+        """Test that an error outside assembly does not leave the task started"""
+        preview_result = {'video_url': 'https://storage.example.com/output/preview_preview.mp4', 'preview': True}
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='completed',
+            result=preview_result
+        )
+        Blueprint.objects.create(task=task, blueprint_json=self.blueprint)
+        mock_storage.side_effect = ValueError('AWS_STORAGE_BUCKET_NAME is required')
+        
+        response = self.client.post(f'/api/choreography/tasks/{task.task_id}/render/')
+        
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        mock_assembly.assert_not_called()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.result), ('completed', preview_result))
+        self.assertIn('AWS_STORAGE_BUCKET_NAME', task.error)
+    
+    def test_only_previews_can_be_upgraded(self):
+        """Test that a full video task is not rendered again"""
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='completed',
+            result={'video_url': 'https://storage.example.com/output/video.mp4'}
+        )
+        
+        response = self.client.post(f'/api/choreography/tasks/{task.task_id}/render/')
+        
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+    
+    @patch('threading.Thread')
+    @patch('services.get_agent_service')
+    @patch('services.song_selector.SongSelector')
+    @patch('services.parameter_extractor.ParameterExtractor')
+    def test_describe_passes_preview_to_agent(self, mock_extractor, mock_selector, mock_agent, mock_thread):
+        """Test that preview=true on the Path 2 endpoint reaches the agent workflow"""
+        mock_extractor.return_value.extract_parameters.return_value = {}
+        mock_selector.return_value.select_song_for_choreography.return_value = self.song
+        
+        response = self.client.post('/api/choreography/describe/', {
+            'user_request': 'A romantic beginner bachata routine',
+            'preview': True
+        }, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_thread.call_args.kwargs['target']()
+        workflow_kwargs = mock_agent.return_value.create_workflow.call_args.kwargs
+        self.assertEqual(workflow_kwargs['song_path'], 'songs/preview.mp3')
+        self.assertTrue(workflow_kwargs['preview'])
+
+
+class ServeVideoTests(TestCase):
+    """Tests for serve_video"""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='viewer',
+            email='viewer@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+    
+    @patch('services.storage.factory.get_storage_backend')
+    def test_serves_signed_playlist_while_assembling(self, mock_storage):
+        """Test that an HLS task serves its playlist with freshly signed segment URLs"""
+        storage = mock_storage.return_value
+        
+        def download(remote_path, local_path):
+            with open(local_path, 'w') as f:
+                f.write('#EXTM3U\n#EXT-X-MAP:URI="init.mp4"\n#EXTINF:4.0,\nsegment_00000.m4s\n')
+            return local_path
+        
+        storage.download_file.side_effect = download
+        storage.get_url.side_effect = lambda path, expiration: f'https://s3.example.com/{path}?X-Amz-Signature=abc'
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='started',
+            result={
+                'playlist_url': 'https://s3.example.com/output/task/index.m3u8?X-Amz-Signature=old',
+                'playlist_path': 'output/task/index.m3u8'
+            }
+        )
+        
+        response = self.client.get(f'/api/choreography/videos/{task.task_id}/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.apple.mpegurl')
+        self.assertEqual(storage.download_file.call_args[0][0], 'output/task/index.m3u8')
+        playlist = response.content.decode()
+        self.assertIn('URI="https://s3.example.com/output/task/init.mp4?X-Amz-Signature=abc"', playlist)
+        self.assertIn('\nhttps://s3.example.com/output/task/segment_00000.m4s?X-Amz-Signature=abc\n', playlist)
+    
+    def test_redirects_to_playlist_without_storage_path(self):
+        """Test that an HLS task recorded without a playlist path redirects to its playlist"""
+        playlist_url = 'https://storage.example.com/output/task/index.m3u8'
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='started',
+            result={'playlist_url': playlist_url}
+        )
+        
+        response = self.client.get(f'/api/choreography/videos/{task.task_id}/')
+        
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(response['Location'], playlist_url)
+    
+    def test_failed_task_is_not_served(self):
+        """Test that a failed HLS task is not redirected to its partial playlist"""
+        task = ChoreographyTask.objects.create(
+            task_id=str(uuid.uuid4()),
+            user=self.user,
+            status='failed',
+            result={'playlist_url': 'https://storage.example.com/output/task/index.m3u8'}
+        )
+        
+        response = self.client.get(f'/api/choreography/videos/{task.task_id}/')
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -6,8 +6,10 @@ from .views import (
     song_detail,
     describe_choreography,
     generate_choreography,
+    generate_blueprints_batch,
     get_task_status,
     list_tasks,
+    render_full_video,
     serve_video
 )
 from .mock_views import (
@@ -25,12 +27,16 @@ urlpatterns = [
     # New synchronous video generation endpoint
     path('generate/', generate_choreography, name='generate-choreography'),
     
+    # Batch blueprint generation (no video assembly)
+    path('generate/batch/', generate_blueprints_batch, name='generate-blueprints-batch'),
+    
     # Path 2: Agent-based natural language choreography generation
     path('describe/', describe_choreography, name='describe-choreography'),
     
     # Task status endpoints
     path('tasks/', list_tasks, name='list-tasks'),
     path('tasks/<uuid:task_id>/', get_task_status, name='task-status'),
+    path('tasks/<uuid:task_id>/render/', render_full_video, name='render-full-video'),
     
     # Video serving endpoint
     path('videos/<uuid:task_id>/', serve_video, name='serve-video'),
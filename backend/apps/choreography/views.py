@@ -17,10 +17,12 @@ from .serializers import (
     SongDetailSerializer,
     SongGenerationSerializer,
     DescribeChoreographySerializer,
-    GenerateChoreographySerializer
+    GenerateChoreographySerializer,
+    BatchBlueprintSerializer
 )
 from django.conf import settings
 import logging
+import os
 import uuid
 import time
 
@@ -31,6 +33,11 @@ logger = logging.getLogger(__name__)
 VIDEO_GENERATION_TIMEOUT = 600
 
 
+def _assembly_streaming_enabled() -> bool:
+    """Whether synchronous generation pipelines blueprint generation and assembly."""
+    return os.getenv('VIDEO_ASSEMBLY_STREAMING', 'False').lower() in ('true', '1', 'yes')
+
+
 @extend_schema(
     summary="List available songs",
     description="""
@@ -321,6 +328,9 @@ def song_detail(request, song_id):
     - difficulty: beginner, intermediate, or advanced (default: intermediate)
     - energy_level: low, medium, or high (default: medium)
     - style: traditional, modern, romantic, or sensual (default: modern)
+    - preview: render a fast low-resolution draft (360p, 15 fps, hard cuts)
+      to check the move sequence (default: false); render the full video
+      from the same blueprint later with POST /tasks/{task_id}/render/
     
     **Response:**
     - Returns video_url directly when complete (200 OK)
@@ -430,6 +440,7 @@ def generate_choreography(request):
     """
     from services.blueprint_generator import BlueprintGenerator
     from services.video_assembly_service import VideoAssemblyService, VideoAssemblyError
+    from services.hls_publisher import playlist_storage_path
     from services.storage.factory import get_storage_backend
     from services.vector_search_service import get_vector_search_service
     from music_analyzer import MusicAnalyzer
@@ -453,6 +464,7 @@ def generate_choreography(request):
     difficulty = serializer.validated_data['difficulty']
     energy_level = serializer.validated_data.get('energy_level') or 'medium'
     style = serializer.validated_data.get('style') or 'modern'
+    preview = serializer.validated_data.get('preview', False)
     
     # Create task record
     task_id = str(uuid.uuid4())
@@ -474,7 +486,8 @@ def generate_choreography(request):
             'user_id': request.user.id,
             'difficulty': difficulty,
             'energy_level': energy_level,
-            'style': style
+            'style': style,
+            'preview': preview
         }
     )
     
@@ -489,6 +502,13 @@ def generate_choreography(request):
         task.save()
         logger.debug(f"Task {task_id} progress: {stage} ({progress}%) - {message}")
     
+    # HLS output: expose the playlist as soon as playback can start
+    def playlist_callback(playlist_url: str):
+        """Record the playlist URL and storage path in the task result."""
+        task.result = {'playlist_url': playlist_url, 'playlist_path': playlist_storage_path(output_path)}
+        task.save()
+        logger.info(f"Task {task_id} playlist available: {playlist_url}")
+    
     try:
         # Step 1: Generate blueprint (10% progress)
         progress_callback('generating_blueprint', 10, 'Analyzing music and generating blueprint...')
@@ -502,39 +522,79 @@ def generate_choreography(request):
             music_analyzer=music_analyzer
         )
         
-        blueprint = blueprint_gen.generate_blueprint(
-            task_id=task_id,
-            song_path=song.audio_path,
-            difficulty=difficulty,
-            energy_level=energy_level,
-            style=style,
-            user_id=request.user.id
+        storage_backend = get_storage_backend()
+        video_assembly = VideoAssemblyService(
+            storage_service=storage_backend,
+            profile=VideoAssemblyService.PROFILE_PREVIEW if preview else VideoAssemblyService.PROFILE_FULL
         )
         
-        # Store blueprint in database
         from .models import Blueprint
-        Blueprint.objects.create(
-            task=task,
-            blueprint_json=blueprint
-        )
-        
-        logger.info(f"Blueprint generated for task {task_id}: {len(blueprint.get('moves', []))} moves")
-        
-        # Step 2: Assemble video using VideoAssemblyService
-        progress_callback('video_assembly', 15, 'Starting video assembly...')
-        
-        storage_backend = get_storage_backend()
-        video_assembly = VideoAssemblyService(storage_service=storage_backend)
-        
-        # Check FFmpeg availability
-        if not video_assembly.check_ffmpeg_available():
-            raise VideoAssemblyError("FFmpeg is not available in the system PATH")
-        
-        # Assemble video with progress updates
-        video_url = video_assembly.assemble_video(
-            blueprint=blueprint,
-            progress_callback=progress_callback
-        )
+        from services.blueprint_codec import encode_for_storage
+        
+        if _assembly_streaming_enabled():
+            # Pipelined: clips are fetched and normalized section by section
+            # while the blueprint is still being generated
+            if not video_assembly.check_ffmpeg_available():
+                raise VideoAssemblyError("FFmpeg is not available in the system PATH")
+            
+            stream = blueprint_gen.stream_blueprint(
+                task_id=task_id,
+                song_path=song.audio_path,
+                difficulty=difficulty,
+                energy_level=energy_level,
+                style=style,
+                user_id=request.user.id
+            )
+            output_path = stream.output_path
+            try:
+                video_url = video_assembly.assemble_video_stream(
+                    stream, progress_callback=progress_callback, playlist_callback=playlist_callback
+                )
+            finally:
+                # Keep the blueprint even if assembly fails after the stream
+                # is exhausted (the stream holds it from then on)
+                blueprint = stream.blueprint
+                if blueprint is not None:
+                    Blueprint.objects.create(
+                        task=task,
+                        blueprint_json=encode_for_storage(blueprint)
+                    )
+            logger.info(
+                f"Pipelined assembly for task {task_id}: {len(blueprint.get('moves', []))} moves, "
+                f"timings={video_assembly.last_timings}"
+            )
+        else:
+            blueprint = blueprint_gen.generate_blueprint(
+                task_id=task_id,
+                song_path=song.audio_path,
+                difficulty=difficulty,
+                energy_level=energy_level,
+                style=style,
+                user_id=request.user.id
+            )
+            
+            # Store blueprint in database
+            Blueprint.objects.create(
+                task=task,
+                blueprint_json=encode_for_storage(blueprint)
+            )
+            output_path = blueprint.get('output_config', {}).get('output_path')
+            
+            logger.info(f"Blueprint generated for task {task_id}: {len(blueprint.get('moves', []))} moves")
+            
+            # Step 2: Assemble video using VideoAssemblyService
+            progress_callback('video_assembly', 15, 'Starting video assembly...')
+            
+            # Check FFmpeg availability
+            if not video_assembly.check_ffmpeg_available():
+                raise VideoAssemblyError("FFmpeg is not available in the system PATH")
+            
+            # Assemble video with progress updates
+            video_url = video_assembly.assemble_video(
+                blueprint=blueprint,
+                progress_callback=progress_callback,
+                playlist_callback=playlist_callback
+            )
         
         # Calculate duration
         elapsed_time = time.time() - start_time
@@ -543,13 +603,20 @@ def generate_choreography(request):
         task.status = 'completed'
         task.progress = 100
         task.stage = 'completed'
-        task.message = 'Choreography video generated successfully'
+        task.message = (
+            'Choreography preview generated successfully' if preview
+            else 'Choreography video generated successfully'
+        )
         task.result = {
             'video_url': video_url,
-            'output_path': blueprint.get('output_config', {}).get('output_path'),
+            'output_path': video_assembly.output_path(blueprint),
             'duration_seconds': elapsed_time,
-            'move_count': len(blueprint.get('moves', []))
+            'move_count': len(blueprint.get('moves', [])),
+            'preview': preview
         }
+        if video_assembly.output_format == VideoAssemblyService.OUTPUT_HLS:
+            task.result['playlist_url'] = video_url
+            task.result['playlist_path'] = playlist_storage_path(output_path)
         task.save()
         
         logger.info(
@@ -565,7 +632,8 @@ def generate_choreography(request):
             'task_id': task_id,
             'status': 'completed',
             'video_url': video_url,
-            'duration_seconds': round(elapsed_time, 2)
+            'duration_seconds': round(elapsed_time, 2),
+            'preview': preview
         }, status=status.HTTP_200_OK)
         
     except VideoAssemblyError as e:
@@ -681,6 +749,205 @@ def generate_choreography(request):
 
 
 
+@extend_schema(
+    summary="Generate blueprints for many songs",
+    description="""
+    Generate choreography blueprints for many songs and parameter combinations
+    in one request, e.g. for an instructor's class plan. Videos are not
+    assembled; each blueprint is stored on its own task.
+    
+    Each distinct song is analyzed once, all move searches run in one batched
+    vector search, and sequencing runs in parallel, so a batch is much cheaper
+    than one request per blueprint. Cached blueprints are reused.
+    
+    **Per-item status:**
+    Every item reports `completed` or `failed` independently; a missing song
+    or failed analysis only fails the items that use it.
+    
+    **Example Request:**
+    ```json
+    {
+        "items": [
+            {"song_id": 1, "difficulty": "beginner", "energy_level": "medium", "style": "romantic"},
+            {"song_id": 1, "difficulty": "advanced", "energy_level": "high", "style": "modern"},
+            {"song_id": 2, "difficulty": "beginner"}
+        ],
+        "include_blueprints": false
+    }
+    ```
+    """,
+    request=BatchBlueprintSerializer,
+    responses={
+        200: OpenApiResponse(
+            description="Batch processed (see per-item status)",
+            examples=[
+                OpenApiExample(
+                    'Success',
+                    value={
+                        'items': [
+                            {
+                                'index': 0,
+                                'song_id': 1,
+                                'difficulty': 'beginner',
+                                'energy_level': 'medium',
+                                'style': 'romantic',
+                                'status': 'completed',
+                                'task_id': '550e8400-e29b-41d4-a716-446655440000',
+                                'move_count': 24,
+                                'cached': False
+                            },
+                            {
+                                'index': 1,
+                                'song_id': 999,
+                                'difficulty': 'beginner',
+                                'energy_level': 'medium',
+                                'style': 'modern',
+                                'status': 'failed',
+                                'error': 'Song with ID 999 does not exist'
+                            }
+                        ],
+                        'summary': {
+                            'total': 2,
+                            'completed': 1,
+                            'failed': 1,
+                            'distinct_songs': 1,
+                            'duration_seconds': 3.4
+                        }
+                    }
+                )
+            ]
+        ),
+        400: OpenApiResponse(description="Invalid input parameters"),
+        401: OpenApiResponse(description="Authentication required")
+    },
+    tags=['Choreography']
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_blueprints_batch(request):
+    """
+    Generate blueprints for a batch of (song, difficulty, energy, style) items.
+    
+    Successful items get a completed task with a stored Blueprint (stage
+    'blueprint_generated'); failed items are reported without a task.
+    """
+    from django.db import transaction
+    from services.blueprint_codec import encode_for_storage
+    from services.blueprint_generator import BlueprintConfig, BlueprintGenerator
+    from services.vector_search_service import get_vector_search_service
+    from music_analyzer import MusicAnalyzer
+    from .models import Blueprint
+    
+    serializer = BatchBlueprintSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    items = serializer.validated_data['items']
+    include_blueprints = serializer.validated_data['include_blueprints']
+    songs = Song.objects.in_bulk({item['song_id'] for item in items})
+    
+    start_time = time.time()
+    
+    responses = []
+    configs = []
+    config_items = []
+    for index, item in enumerate(items):
+        entry = {
+            'index': index,
+            'song_id': item['song_id'],
+            'difficulty': item['difficulty'],
+            'energy_level': item.get('energy_level') or 'medium',
+            'style': item.get('style') or 'modern',
+        }
+        responses.append(entry)
+        
+        song = songs.get(item['song_id'])
+        if song is None:
+            entry.update(status='failed', error=f"Song with ID {item['song_id']} does not exist")
+            continue
+        
+        configs.append(BlueprintConfig(
+            task_id=str(uuid.uuid4()),
+            song_path=song.audio_path,
+            difficulty=entry['difficulty'],
+            energy_level=entry['energy_level'],
+            style=entry['style'],
+            user_id=request.user.id
+        ))
+        config_items.append(entry)
+    
+    logger.info(
+        f"Starting batch blueprint generation: {len(items)} items, {len(songs)} songs",
+        extra={'user_id': request.user.id, 'item_count': len(items)}
+    )
+    
+    results = []
+    if configs:
+        blueprint_gen = BlueprintGenerator(
+            vector_search_service=get_vector_search_service(),
+            music_analyzer=MusicAnalyzer()
+        )
+        results = blueprint_gen.generate_blueprints_batch(configs)
+    
+    # Store tasks and blueprints for successful items in one transaction
+    tasks = []
+    blueprints = []
+    for entry, result in zip(config_items, results):
+        if result['status'] != 'completed':
+            entry.update(status='failed', error=result['error'])
+            continue
+        
+        blueprint = result['blueprint']
+        stored = encode_for_storage(blueprint)
+        task = ChoreographyTask(
+            task_id=result['task_id'],
+            user=request.user,
+            status='completed',
+            progress=100,
+            stage='blueprint_generated',
+            message='Blueprint generated (video not assembled)',
+            song=songs[entry['song_id']],
+            result={
+                'blueprint_only': True,
+                'move_count': len(blueprint.get('moves', []))
+            }
+        )
+        tasks.append(task)
+        blueprints.append(Blueprint(task=task, blueprint_json=stored))
+        
+        entry.update(
+            status='completed',
+            task_id=result['task_id'],
+            move_count=len(blueprint.get('moves', [])),
+            cached=result['cached']
+        )
+        if include_blueprints:
+            entry['blueprint'] = stored
+    
+    with transaction.atomic():
+        ChoreographyTask.objects.bulk_create(tasks)
+        Blueprint.objects.bulk_create(blueprints)
+    
+    elapsed_time = time.time() - start_time
+    completed = sum(1 for entry in responses if entry['status'] == 'completed')
+    
+    logger.info(
+        f"Batch blueprint generation finished in {elapsed_time:.1f}s: "
+        f"{completed} completed, {len(responses) - completed} failed"
+    )
+    
+    return Response({
+        'items': responses,
+        'summary': {
+            'total': len(responses),
+            'completed': completed,
+            'failed': len(responses) - completed,
+            'distinct_songs': len({config.song_path for config in configs}),
+            'duration_seconds': round(elapsed_time, 2)
+        }
+    }, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     summary="Parse natural language query",
     description="""
@@ -914,6 +1181,7 @@ def generate_with_ai(request):
     
     query = serializer.validated_data['query']
     parameters = serializer.validated_data.get('parameters')
+    preview = serializer.validated_data.get('preview', False)
     
     # Parse query if parameters not provided
     if not parameters:
@@ -1021,9 +1289,10 @@ def generate_with_ai(request):
         
         # Store blueprint in database
         from .models import Blueprint
+        from services.blueprint_codec import encode_for_storage
         Blueprint.objects.create(
             task=task,
-            blueprint_json=blueprint
+            blueprint_json=encode_for_storage(blueprint)
         )
         
         logger.info(f"AI blueprint generated and stored for task {task_id}")
@@ -1054,8 +1323,11 @@ def generate_with_ai(request):
     
     # Assemble video using VideoAssemblyService (synchronous)
     from services.video_assembly_service import VideoAssemblyService, VideoAssemblyError
+    from services.hls_publisher import playlist_storage_path
     from services.storage_service import get_storage_service
     
+    output_path = blueprint.get('output_config', {}).get('output_path')
+    
     # Progress callback to update task record
     def progress_callback(stage: str, progress: int, message: str):
         """Update task record with progress."""
@@ -1065,9 +1337,19 @@ def generate_with_ai(request):
         task.save()
         logger.debug(f"Task {task_id} progress: {stage} ({progress}%) - {message}")
     
+    # HLS output: expose the playlist as soon as playback can start
+    def playlist_callback(playlist_url: str):
+        """Record the playlist URL and storage path in the task result."""
+        task.result = {'playlist_url': playlist_url, 'playlist_path': playlist_storage_path(output_path)}
+        task.save()
+        logger.info(f"Task {task_id} playlist available: {playlist_url}")
+    
     try:
         storage_service = get_storage_service()
-        video_assembly = VideoAssemblyService(storage_service=storage_service)
+        video_assembly = VideoAssemblyService(
+            storage_service=storage_service,
+            profile=VideoAssemblyService.PROFILE_PREVIEW if preview else VideoAssemblyService.PROFILE_FULL
+        )
         
         # Check FFmpeg availability
         if not video_assembly.check_ffmpeg_available():
@@ -1081,7 +1363,8 @@ def generate_with_ai(request):
         # Assemble video with progress updates
         video_url = video_assembly.assemble_video(
             blueprint=blueprint,
-            progress_callback=progress_callback
+            progress_callback=progress_callback,
+            playlist_callback=playlist_callback
         )
         
         # Update task as completed
@@ -1091,9 +1374,13 @@ def generate_with_ai(request):
         task.message = 'AI choreography video generated successfully'
         task.result = {
             'video_url': video_url,
-            'output_path': blueprint.get('output_config', {}).get('output_path'),
-            'move_count': len(blueprint.get('moves', []))
+            'output_path': video_assembly.output_path(blueprint),
+            'move_count': len(blueprint.get('moves', [])),
+            'preview': preview
         }
+        if video_assembly.output_format == VideoAssemblyService.OUTPUT_HLS:
+            task.result['playlist_url'] = video_url
+            task.result['playlist_path'] = playlist_storage_path(output_path)
         task.save()
         
         logger.info(f"AI video generation completed for task {task_id}")
@@ -1121,7 +1408,8 @@ def generate_with_ai(request):
         'task_id': task_id,
         'status': 'completed',
         'video_url': video_url,
-        'message': 'AI choreography generation completed'
+        'message': 'AI choreography generation completed',
+        'preview': preview
     }, status=status.HTTP_200_OK)
 
 
@@ -1154,11 +1442,15 @@ def serve_video(request, task_id):
     """
     Serve the generated choreography video file.
     
-    Streams the video file for browser playback with proper headers.
+    Streams the video file for browser playback with proper headers. For
+    HLS output, serves the playlist with freshly signed segment URLs; it is
+    available while the video is still being assembled.
     """
-    from django.http import FileResponse, Http404
+    from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect
     import os
     from django.conf import settings
+    from services.hls_publisher import signed_playlist
+    from services.storage.factory import get_storage_backend
     
     # Get the task and verify ownership
     task = get_object_or_404(ChoreographyTask, task_id=task_id)
@@ -1170,6 +1462,23 @@ def serve_video(request, task_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
+    # HLS output: the playlist grows as segments are uploaded
+    if task.result and task.result.get('playlist_url') and task.status != 'failed':
+        playlist_path = task.result.get('playlist_path')
+        if not playlist_path:
+            return HttpResponseRedirect(task.result['playlist_url'])
+        try:
+            playlist = signed_playlist(get_storage_backend(), playlist_path)
+        except Exception as e:
+            logger.error(f'Error serving playlist {playlist_path}: {str(e)}')
+            return Response(
+                {'error': 'Error serving video playlist'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        response = HttpResponse(playlist, content_type='application/vnd.apple.mpegurl')
+        response['Cache-Control'] = 'no-cache'
+        return response
+    
     # Check if task is completed
     if task.status != 'completed':
         return Response(
@@ -1248,6 +1557,12 @@ def serve_video(request, task_id):
     - Real-time reasoning updates
     - Adaptive workflow based on request
     
+    **Parameters:**
+    - user_request: natural language description (required)
+    - preview: assemble a fast low-resolution draft (360p, 15 fps, hard cuts)
+      (default: false); render the full video from the same blueprint later
+      with POST /tasks/{task_id}/render/
+    
     **Response:**
     - Returns immediately with task_id (202 Accepted)
     - Poll /api/choreography/tasks/{task_id} for status
@@ -1316,6 +1631,7 @@ def describe_choreography(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     user_request = serializer.validated_data['user_request']
+    preview = serializer.validated_data.get('preview', False)
     
     # Create task
     import uuid
@@ -1426,7 +1742,8 @@ def describe_choreography(request):
                     task_id=task_id,
                     user_request=user_request,
                     user_id=request.user.id,
-                    song_path=song_path  # Pass the selected song path
+                    song_path=song_path,  # Pass the selected song path
+                    preview=preview
                 )
             except Exception as e:
                 logger.error(
@@ -1512,6 +1829,156 @@ def get_task_status(request, task_id):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@extend_schema(
+    summary="Render the full video of a preview",
+    description="""
+    Render the full-quality video of a task that was generated as a preview.
+    
+    The task's stored blueprint is assembled again with the full profile,
+    so the full video has exactly the move sequence of the preview. The
+    preview stays available until the full video is uploaded; if the full
+    render fails, the task keeps its preview and the error is recorded.
+    
+    **Response:**
+    - Returns video_url directly when complete (200 OK)
+    - Task record is updated with progress during assembly
+    """,
+    responses={
+        200: OpenApiResponse(
+            description="Full video rendered",
+            examples=[
+                OpenApiExample(
+                    'Success',
+                    value={
+                        'task_id': '550e8400-e29b-41d4-a716-446655440000',
+                        'status': 'completed',
+                        'video_url': 'https://storage.example.com/output/video.mp4',
+                        'duration_seconds': 45.2,
+                        'preview': False
+                    }
+                )
+            ]
+        ),
+        401: OpenApiResponse(description="Authentication required"),
+        404: OpenApiResponse(description="Task or blueprint not found"),
+        409: OpenApiResponse(description="Task is not a completed preview"),
+        500: OpenApiResponse(description="Video assembly failed")
+    },
+    tags=['Choreography']
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def render_full_video(request, task_id):
+    """
+    Render the full video of a completed preview task from its stored blueprint.
+    """
+    from .models import Blueprint
+    from services.video_assembly_service import VideoAssemblyService, VideoAssemblyError
+    from services.hls_publisher import playlist_storage_path
+    from services.storage.factory import get_storage_backend
+    
+    task = get_object_or_404(ChoreographyTask, task_id=task_id, user=request.user)
+    preview_result = task.result or {}
+    if task.status != 'completed' or not preview_result.get('preview'):
+        return Response(
+            {'error': 'Only a completed preview can be rendered in full', 'task_id': task.task_id},
+            status=status.HTTP_409_CONFLICT
+        )
+    try:
+        blueprint = task.blueprint.get_blueprint()
+    except Blueprint.DoesNotExist:
+        return Response(
+            {'error': 'Blueprint not found', 'task_id': task.task_id},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    output_path = blueprint.get('output_config', {}).get('output_path')
+    
+    def progress_callback(stage: str, progress: int, message: str):
+        """Update task record with progress."""
+        task.stage = stage
+        task.progress = progress
+        task.message = message
+        task.save()
+    
+    # HLS output: serve the full render's playlist as soon as playback can start
+    def playlist_callback(playlist_url: str):
+        """Record the playlist URL and storage path in the task result."""
+        task.result = {
+            **preview_result,
+            'playlist_url': playlist_url,
+            'playlist_path': playlist_storage_path(output_path)
+        }
+        task.save()
+        logger.info(f"Task {task.task_id} playlist available: {playlist_url}")
+    
+    def keep_preview(error: str):
+        """Put the task back to its completed preview after a failed render."""
+        task.status = 'completed'
+        task.progress = 100
+        task.stage = 'completed'
+        task.message = 'Full render failed, preview still available'
+        task.result = preview_result
+        task.error = error
+        task.save()
+    
+    task.status = 'started'
+    task.error = None
+    progress_callback('video_assembly', 15, 'Rendering full video...')
+    start_time = time.time()
+    
+    try:
+        video_assembly = VideoAssemblyService(storage_service=get_storage_backend())
+        if not video_assembly.check_ffmpeg_available():
+            raise VideoAssemblyError("FFmpeg is not available in the system PATH")
+        video_url = video_assembly.assemble_video(
+            blueprint=blueprint,
+            progress_callback=progress_callback,
+            playlist_callback=playlist_callback
+        )
+    except VideoAssemblyError as e:
+        logger.error(f"Full render failed for task {task.task_id}: {e}")
+        # The preview is still valid: keep serving it
+        keep_preview(str(e))
+        return Response(
+            {'error': 'Video assembly failed', 'details': str(e), 'task_id': task.task_id},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    except Exception as e:
+        logger.error(f"Failed to render full video for task {task.task_id}: {e}", exc_info=True)
+        keep_preview(str(e))
+        return Response(
+            {'error': 'Failed to render full video', 'task_id': task.task_id},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    elapsed_time = time.time() - start_time
+    task.status = 'completed'
+    task.progress = 100
+    task.stage = 'completed'
+    task.message = 'Choreography video generated successfully'
+    task.result = {
+        'video_url': video_url,
+        'output_path': video_assembly.output_path(blueprint),
+        'duration_seconds': elapsed_time,
+        'move_count': len(blueprint.get('moves', [])),
+        'preview': False,
+        'preview_url': preview_result.get('video_url')
+    }
+    if video_assembly.output_format == VideoAssemblyService.OUTPUT_HLS:
+        task.result['playlist_url'] = video_url
+        task.result['playlist_path'] = playlist_storage_path(output_path)
+    task.save()
+    logger.info(f"Full video rendered for preview task {task.task_id} in {elapsed_time:.1f}s")
+    
+    return Response({
+        'task_id': task.task_id,
+        'status': 'completed',
+        'video_url': video_url,
+        'duration_seconds': round(elapsed_time, 2),
+        'preview': False
+    }, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     summary="List user's tasks",
     description="""
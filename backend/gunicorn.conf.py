@@ -0,0 +1,15 @@
+"""
+Gunicorn configuration.
+
+Gunicorn loads this file automatically from the working directory. Command
+line flags (see Dockerfile) still take precedence over settings here.
+"""
+
+
+def post_worker_init(worker):
+    """Warm up service singletons in each worker when SERVICE_WARMUP is enabled."""
+    from services.warmup import is_warmup_enabled, warm_up_services
+
+    if is_warmup_enabled():
+        worker.log.info("Warming up services...")
+        warm_up_services()
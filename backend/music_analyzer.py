@@ -48,11 +48,61 @@ class MusicFeatures:
 class MusicAnalyzer:
     """Real music analyzer using librosa"""
     
+    AUDIO_EMBEDDING_DIM = 128
+    
+    # Bump when analysis output changes (invalidates cached blueprints)
+    ANALYZER_VERSION = '2'
+    
     def __init__(self, sample_rate: int = 22050):
         """Initialize music analyzer."""
         self.sample_rate = sample_rate
         self.hop_length = 512
     
+    def _audio_embedding(self, mfcc_mean: np.ndarray, chroma_mean: np.ndarray) -> np.ndarray:
+        """
+        Create the 128D audio component from mean MFCC and chroma features.
+        
+        Uses the 13 MFCC coefficients and 12 chroma bins, zero-padded to 128
+        dimensions. Accepts a single feature vector or a batch (last axis).
+        """
+        audio_features = np.concatenate([mfcc_mean, chroma_mean[..., :12]], axis=-1)  # 13 + 12 = 25
+        padding = [(0, 0)] * (audio_features.ndim - 1) + [(0, max(0, self.AUDIO_EMBEDDING_DIM - audio_features.shape[-1]))]
+        return np.pad(audio_features, padding)[..., :self.AUDIO_EMBEDDING_DIM]
+    
+    def segment_audio_embeddings(self, features: MusicFeatures, boundaries: np.ndarray) -> np.ndarray:
+        """
+        Compute an audio embedding for each segment between consecutive boundaries.
+        
+        Uses the same MFCC/chroma recipe as the song-level audio_embedding,
+        averaged over the frames of each segment.
+        
+        Args:
+            features: MusicFeatures from analyze_audio()
+            boundaries: Increasing segment boundaries in seconds (N + 1 values)
+        
+        Returns:
+            Array of shape (N, 128)
+        """
+        mfcc = np.asarray(features.mfcc_features)
+        chroma = np.asarray(features.chroma_features)
+        num_frames = min(mfcc.shape[1], chroma.shape[1])
+        
+        frames = librosa.time_to_frames(np.asarray(boundaries), sr=self.sample_rate, hop_length=self.hop_length)
+        frames = np.clip(frames, 0, num_frames - 1)
+        starts = frames[:-1]
+        ends = np.maximum(frames[1:], starts + 1)
+        
+        # Segment means from cumulative sums (one pass over the frames)
+        def segment_means(matrix: np.ndarray) -> np.ndarray:
+            cumulative = np.concatenate(
+                [np.zeros((matrix.shape[0], 1)), np.cumsum(matrix[:, :num_frames], axis=1)],
+                axis=1
+            )
+            ends_clipped = np.minimum(ends, num_frames)
+            return ((cumulative[:, ends_clipped] - cumulative[:, starts]) / (ends_clipped - starts)).T
+        
+        return self._audio_embedding(segment_means(mfcc), segment_means(chroma))
+    
     def analyze_audio(self, audio_path: str) -> MusicFeatures:
         """
         Analyze audio file and return features.
@@ -61,14 +111,24 @@ class MusicAnalyzer:
         """
         logger.info(f"Analyzing audio: {audio_path}")
         
-        # Load audio file and get REAL duration
+        # Load audio file
         y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        
+        return self.analyze_signal(y, sr)
+    
+    def analyze_signal(self, y: np.ndarray, sr: int) -> MusicFeatures:
+        """
+        Analyze an already-loaded audio signal and return features.
+        
+        Also used to warm up librosa's numba-compiled functions at startup.
+        """
+        # Get REAL duration
         duration = librosa.get_duration(y=y, sr=sr)
         
         logger.info(f"Audio loaded: duration={duration:.2f}s, sample_rate={sr}")
         
         # Extract tempo
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr, hop_length=self.hop_length)
+        tempo, beats = librosa.beat.beat_track(y=y, sr=sr, hop_length=self.hop_length, units='time')
         tempo = float(tempo)
         
         logger.info(f"Tempo detected: {tempo:.1f} BPM")
@@ -128,13 +188,7 @@ class MusicAnalyzer:
         
         # Create 128-dimensional audio embedding for music analysis
         # This will be combined with pose and text embeddings later by the vector search service
-        mfcc_mean = np.mean(mfcc, axis=1)
-        chroma_mean = np.mean(chroma, axis=1)
-        
-        # Create 128D audio component from MFCC and chroma features
-        # Use first 13 MFCC coefficients and pad to 128 dimensions
-        audio_features = np.concatenate([mfcc_mean, chroma_mean[:12]])  # 13 + 12 = 25
-        audio_embedding = np.pad(audio_features, (0, max(0, 128 - len(audio_features))))[:128].tolist()
+        audio_embedding = self._audio_embedding(np.mean(mfcc, axis=1), np.mean(chroma, axis=1)).tolist()
         
         # Calculate rhythm features
         rhythm_strength = 0.7  # Placeholder
@@ -88,7 +88,7 @@ def run_job(task_id: str):
     # Get blueprint from related Blueprint model
     try:
         blueprint = task.blueprint  # OneToOne relation
-        blueprint_dict = blueprint.blueprint_json
+        blueprint_dict = blueprint.get_blueprint()
         print(f"✓ Blueprint exists: True")
         print(f"✓ Moves count: {len(blueprint_dict.get('moves', []))}")
     except Exception as e:
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs pipelined (streaming) video assembly.
+
+Builds a blueprint from the clip library under data/Bachata_steps and
+assembles it twice with a simulated blueprint generation delay:
+
+- sequential: generate the whole blueprint, then assemble_video()
+- pipelined:  assemble_video_stream() over a section-by-section stream
+
+and reports time-to-first-frame (first normalized clip ready, measured from
+the start of generation) and total wall-clock for each.
+
+Requires ffmpeg on PATH. Without --audio, a silent track of the right length
+is generated with ffmpeg.
+
+Usage:
+    python scripts/benchmark_assembly_pipeline.py
+    python scripts/benchmark_assembly_pipeline.py --moves 32 --sections 4 --generation-delay 3 --workers 4
+"""
+
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Make the backend package importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.storage.local import LocalStorageBackend  # noqa: E402
+from services.video_assembly_service import VideoAssemblyService  # noqa: E402
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / 'data'
+MOVE_DURATION = 8.0
+
+
+class SimulatedStream:
+    """Blueprint stream that spends generation_delay seconds before yielding sections."""
+
+    def __init__(self, blueprint, sections, generation_delay):
+        self.blueprint_ready = blueprint
+        self.task_id = blueprint['task_id']
+        self.audio_path = blueprint['audio_path']
+        self.sections = sections
+        self.generation_delay = generation_delay
+        self.blueprint = None
+
+    def __iter__(self):
+        # Analysis and search happen before the first section is known
+        time.sleep(self.generation_delay)
+        for section in self.sections:
+            yield section
+        self.blueprint = self.blueprint_ready
+
+
+def make_blueprint(storage_root, audio_path, num_moves, seed):
+    """Build a blueprint over random clips from the library."""
+    clips = sorted(
+        str(path.relative_to(storage_root))
+        for path in (storage_root / 'Bachata_steps').rglob('*.mp4')
+    )
+    if not clips:
+        raise SystemExit(f"No clips found under {storage_root / 'Bachata_steps'}")
+    rng = random.Random(seed)
+    moves = [
+        {
+            'clip_id': f"move_{i + 1}",
+            'video_path': rng.choice(clips),
+            'start_time': i * MOVE_DURATION,
+            'duration': MOVE_DURATION,
+        }
+        for i in range(num_moves)
+    ]
+    return {
+        'task_id': 'benchmark',
+        'audio_path': audio_path,
+        'moves': moves,
+        'output_config': {'output_path': 'output/benchmark/pipeline.mp4'},
+    }
+
+
+def make_silent_audio(storage_root, duration):
+    """Write a silent AAC track to the storage root and return its relative path."""
+    audio_path = 'benchmark_silence.m4a'
+    subprocess.run(
+        ['ffmpeg', '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=stereo',
+         '-t', str(duration), '-c:a', 'aac', '-y', str(storage_root / audio_path)],
+        capture_output=True, check=True
+    )
+    return audio_path
+
+
+def run_sequential(service, blueprint, generation_delay):
+    """Generate (simulated), then assemble; return (ttff, total) in seconds."""
+    start = time.perf_counter()
+    time.sleep(generation_delay)
+    service.assemble_video(blueprint)
+    total = time.perf_counter() - start
+    ttff = generation_delay + service.last_timings['first_clip_ready']
+    return ttff, total
+
+
+def run_pipelined(service, blueprint, num_sections, generation_delay):
+    """Assemble from a section stream; return (ttff, total) in seconds."""
+    moves = blueprint['moves']
+    size = max(1, -(-len(moves) // num_sections))
+    sections = [moves[i:i + size] for i in range(0, len(moves), size)]
+    stream = SimulatedStream(blueprint, sections, generation_delay)
+
+    start = time.perf_counter()
+    service.assemble_video_stream(stream)
+    total = time.perf_counter() - start
+    return service.last_timings['first_clip_ready'], total
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--moves', type=int, default=32, help='Moves in the blueprint (default: 32)')
+    parser.add_argument('--sections', type=int, default=4, help='Streamed sections (default: 4)')
+    parser.add_argument('--generation-delay', type=float, default=3.0,
+                        help='Simulated analysis + search time in seconds (default: 3)')
+    parser.add_argument('--workers', type=int, default=0, help='Pipeline workers (default: min(4, CPU count))')
+    parser.add_argument('--audio', help='Audio file (default: generated silence)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per mode (default: 3)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if shutil.which('ffmpeg') is None:
+        raise SystemExit('ffmpeg not found on PATH')
+
+    storage_root = Path(tempfile.mkdtemp(prefix='assembly_benchmark_'))
+    try:
+        os.symlink(DATA_DIR / 'Bachata_steps', storage_root / 'Bachata_steps')
+        if args.audio:
+            audio_path = 'benchmark_audio' + Path(args.audio).suffix
+            shutil.copy(args.audio, storage_root / audio_path)
+        else:
+            audio_path = make_silent_audio(storage_root, args.moves * MOVE_DURATION)
+
+        storage = LocalStorageBackend(base_path=str(storage_root))
+        blueprint = make_blueprint(storage_root, audio_path, args.moves, args.seed)
+        service = VideoAssemblyService(storage, pipeline_workers=args.workers or None)
+
+        print(f"{args.moves} moves, {args.sections} sections, "
+              f"{args.generation_delay:.1f}s generation, {service.pipeline_workers} workers")
+        for name, run in (
+            ('sequential', lambda: run_sequential(service, blueprint, args.generation_delay)),
+            ('pipelined', lambda: run_pipelined(service, blueprint, args.sections, args.generation_delay)),
+        ):
+            results = [run() for _ in range(args.runs)]
+            ttff = min(r[0] for r in results)
+            total = min(r[1] for r in results)
+            print(f"{name:<12} time-to-first-frame={ttff:7.2f}s  total={total:7.2f}s  (best of {args.runs})")
+    finally:
+        shutil.rmtree(storage_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the DP choreography optimizer.
+
+Solves a synthetic 4-minute song (60 phrase slots) against 150 candidate
+moves and reports solve times, including the batched similarity step
+(one matrix product of slot queries against the candidate embeddings).
+
+Usage:
+    python scripts/benchmark_choreography_optimizer.py
+    python scripts/benchmark_choreography_optimizer.py --slots 60 --candidates 150 --runs 200
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+import numpy as np
+
+# Make the backend package importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.choreography_optimizer import ChoreographyOptimizer  # noqa: E402
+
+
+EMBEDDING_DIM = 1024
+ENERGY_LEVELS = ['low', 'medium', 'high']
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+
+
+def time_runs(function, runs):
+    """Run function repeatedly and return per-run times in milliseconds."""
+    function()  # warm-up
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(name, times):
+    """Print summary statistics for a list of timings."""
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(
+        f"{name:<28} mean={statistics.mean(times):7.3f}ms  "
+        f"median={statistics.median(times):7.3f}ms  p95={p95:7.3f}ms"
+    )
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--slots', type=int, default=60, help='Phrase slots (default: 60)')
+    parser.add_argument('--candidates', type=int, default=150, help='Candidate moves (default: 150)')
+    parser.add_argument('--runs', type=int, default=100, help='Timed runs (default: 100)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.standard_normal((args.slots, EMBEDDING_DIM)).astype(np.float32)
+    embeddings = rng.standard_normal((args.candidates, EMBEDDING_DIM)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    candidates = [
+        {
+            'energy_level': ENERGY_LEVELS[int(rng.integers(3))],
+            'difficulty': DIFFICULTIES[int(rng.integers(3))],
+        }
+        for _ in range(args.candidates)
+    ]
+
+    optimizer = ChoreographyOptimizer()
+    transition_cost = ChoreographyOptimizer.transition_costs(candidates)
+
+    def similarity():
+        normalized = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        return normalized @ embeddings.T
+
+    scores = similarity()
+
+    print(f"Slots: {args.slots}, candidates: {args.candidates}, runs: {args.runs}")
+    report('batched similarity', time_runs(similarity, args.runs))
+    report('viterbi (single pass)', time_runs(
+        lambda: ChoreographyOptimizer(usage_iterations=0).optimize(scores, transition_cost), args.runs
+    ))
+    report('optimize (with usage)', time_runs(
+        lambda: optimizer.optimize(scores, transition_cost), args.runs
+    ))
+    report('end to end', time_runs(
+        lambda: optimizer.optimize(similarity(), transition_cost), args.runs
+    ))
+
+    path = optimizer.optimize(scores, transition_cost)
+    print(
+        f"Solution: {len(np.unique(path))} distinct moves, "
+        f"cost={optimizer.total_cost(scores, path, transition_cost):.3f}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark staged vs single pass video rendering.
+
+Builds a blueprint from the clip library under data/Bachata_steps and
+assembles it with each VideoAssemblyService render mode:
+
+- staged:      normalize each clip, concat with stream copy, encode with audio
+- single_pass: one filter_complex command (fps/scale/concat + audio)
+
+and reports wall-clock time and SSIM of each output against a reference
+render (single pass at a high bitrate, so it has the same frame size and
+timing as both modes but negligible encoding loss).
+
+Requires ffmpeg on PATH. Without --audio, a silent track of the right length
+is generated with ffmpeg.
+
+Usage:
+    python scripts/benchmark_render_modes.py
+    python scripts/benchmark_render_modes.py --moves 32 --runs 3
+"""
+
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Make the backend package importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_assembly_pipeline import (  # noqa: E402
+    DATA_DIR, MOVE_DURATION, make_blueprint, make_silent_audio
+)
+from services.ffmpeg_builder import FFmpegCommandBuilder  # noqa: E402
+from services.storage.local import LocalStorageBackend  # noqa: E402
+from services.video_assembly_service import VideoAssemblyService  # noqa: E402
+
+
+REFERENCE_BITRATE = '50M'
+
+
+def render(storage, storage_root, blueprint, mode):
+    """Assemble the blueprint in one render mode; return (seconds, output path)."""
+    output_path = f"output/benchmark/{mode}.mp4"
+    blueprint = dict(blueprint, output_config=dict(blueprint['output_config'], output_path=output_path))
+    service = VideoAssemblyService(storage, render_mode=mode)
+
+    start = time.perf_counter()
+    service.assemble_video(blueprint)
+    return time.perf_counter() - start, storage_root / output_path
+
+
+def render_reference(storage_root, blueprint, work_dir):
+    """Single pass render at REFERENCE_BITRATE from the original clips."""
+    output_file = os.path.join(work_dir, 'reference.mp4')
+    cmd = FFmpegCommandBuilder().build_single_pass_command(
+        video_files=[str(storage_root / move['video_path']) for move in blueprint['moves']],
+        audio_file=str(storage_root / blueprint['audio_path']),
+        output_file=output_file,
+        video_bitrate=REFERENCE_BITRATE
+    )
+    subprocess.run(cmd, capture_output=True, check=True)
+    return output_file
+
+
+def ssim(video_file, reference_file):
+    """Mean SSIM of video_file against reference_file (compared at the reference frame size)."""
+    width, height = FFmpegCommandBuilder.MEZZANINE_WIDTH, FFmpegCommandBuilder.MEZZANINE_HEIGHT
+    result = subprocess.run(
+        ['ffmpeg', '-i', str(video_file), '-i', str(reference_file),
+         '-lavfi', f'[0:v]scale={width}:{height},setsar=1[a];[1:v]scale={width}:{height},setsar=1[b];[a][b]ssim',
+         '-f', 'null', '-'],
+        capture_output=True, text=True, check=True
+    )
+    match = re.search(r'All:([0-9.]+)', result.stderr)
+    return float(match.group(1)) if match else float('nan')
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--moves', type=int, default=32, help='Moves in the blueprint (default: 32)')
+    parser.add_argument('--audio', help='Audio file (default: generated silence)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per mode (default: 3)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if shutil.which('ffmpeg') is None:
+        raise SystemExit('ffmpeg not found on PATH')
+
+    storage_root = Path(tempfile.mkdtemp(prefix='render_benchmark_'))
+    try:
+        os.symlink(DATA_DIR / 'Bachata_steps', storage_root / 'Bachata_steps')
+        if args.audio:
+            audio_path = 'benchmark_audio' + Path(args.audio).suffix
+            shutil.copy(args.audio, storage_root / audio_path)
+        else:
+            audio_path = make_silent_audio(storage_root, args.moves * MOVE_DURATION)
+
+        storage = LocalStorageBackend(base_path=str(storage_root))
+        blueprint = make_blueprint(storage_root, audio_path, args.moves, args.seed)
+        reference = render_reference(storage_root, blueprint, str(storage_root))
+
+        print(f"{args.moves} moves, reference: single pass at {REFERENCE_BITRATE}")
+        for mode in VideoAssemblyService.RENDER_MODES:
+            results = [render(storage, storage_root, blueprint, mode) for _ in range(args.runs)]
+            best = min(seconds for seconds, _ in results)
+            score = ssim(results[-1][1], reference)
+            print(f"{mode:<12} total={best:7.2f}s  ssim={score:.4f}  (best of {args.runs})")
+    finally:
+        shutil.rmtree(storage_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark segmented (section-parallel) rendering across worker counts.
+
+Builds a blueprint from the clip library under data/Bachata_steps and
+assembles it in single_pass render mode (one encode on one FFmpeg process)
+and in segmented render mode with each --workers count (the timeline split
+into that many parts, encoded in parallel and joined with stream copy),
+reporting wall-clock, speedup over single pass, and SSIM of each segmented
+output against the single pass output.
+
+Requires ffmpeg on PATH. Without --audio, a silent track of the right length
+is generated with ffmpeg.
+
+Usage:
+    python scripts/benchmark_segmented_render.py
+    python scripts/benchmark_segmented_render.py --moves 64 --workers 2 4 8 --runs 3
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+# Make the backend package importable when run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_assembly_pipeline import (  # noqa: E402
+    DATA_DIR, MOVE_DURATION, make_blueprint, make_silent_audio
+)
+from benchmark_render_modes import ssim  # noqa: E402
+from services.storage.local import LocalStorageBackend  # noqa: E402
+from services.video_assembly_service import VideoAssemblyService  # noqa: E402
+
+
+def render(storage, storage_root, blueprint, name, **service_args):
+    """Assemble the blueprint with the given service settings; return (seconds, output path)."""
+    output_path = f"output/benchmark/{name}.mp4"
+    blueprint = dict(blueprint, output_config=dict(blueprint['output_config'], output_path=output_path))
+    service = VideoAssemblyService(storage, **service_args)
+
+    start = time.perf_counter()
+    service.assemble_video(blueprint)
+    return time.perf_counter() - start, storage_root / output_path
+
+
+def best_of(runs, *args, **kwargs):
+    """Best wall-clock of several renders and the last output path."""
+    results = [render(*args, **kwargs) for _ in range(runs)]
+    return min(seconds for seconds, _ in results), results[-1][1]
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--moves', type=int, default=64, help='Moves in the blueprint (default: 64)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8],
+                        help='Segmented worker counts to compare (default: 2 4 8)')
+    parser.add_argument('--audio', help='Audio file (default: generated silence)')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per configuration (default: 3)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if shutil.which('ffmpeg') is None:
+        raise SystemExit('ffmpeg not found on PATH')
+
+    storage_root = Path(tempfile.mkdtemp(prefix='segmented_benchmark_'))
+    try:
+        os.symlink(DATA_DIR / 'Bachata_steps', storage_root / 'Bachata_steps')
+        if args.audio:
+            audio_path = 'benchmark_audio' + Path(args.audio).suffix
+            shutil.copy(args.audio, storage_root / audio_path)
+        else:
+            audio_path = make_silent_audio(storage_root, args.moves * MOVE_DURATION)
+
+        storage = LocalStorageBackend(base_path=str(storage_root))
+        blueprint = make_blueprint(storage_root, audio_path, args.moves, args.seed)
+
+        print(f"{args.moves} moves ({args.moves * MOVE_DURATION:.0f}s), {os.cpu_count()} CPUs, best of {args.runs}")
+        baseline, reference = best_of(
+            args.runs, storage, storage_root, blueprint, 'single_pass', render_mode='single_pass'
+        )
+        print(f"{'single_pass':<14} total={baseline:7.2f}s")
+        for workers in args.workers:
+            seconds, output = best_of(
+                args.runs, storage, storage_root, blueprint, f'segmented_{workers}',
+                render_mode='segmented', segment_workers=workers
+            )
+            print(
+                f"{f'segmented x{workers}':<14} total={seconds:7.2f}s  speedup={baseline / seconds:4.2f}x  "
+                f"ssim={ssim(output, reference):.4f}"
+            )
+    finally:
+        shutil.rmtree(storage_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
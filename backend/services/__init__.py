@@ -22,7 +22,7 @@ def get_agent_service():
     
     This factory function initializes the AgentService with all required
     dependencies (parameter_extractor, music_analyzer, vector_search,
-    blueprint_generator, storage_service).
+    blueprint_generator, storage_service, text_encoder).
     
     Returns:
         AgentService instance
@@ -52,6 +52,7 @@ def get_agent_service():
         from services.vector_search_service import get_vector_search_service
         from services.blueprint_generator import BlueprintGenerator
         from services.storage_service import get_storage_service
+        from services.text_embedding_service import get_text_embedding_service
         
         # Import MusicAnalyzer from backend
         from music_analyzer import MusicAnalyzer
@@ -75,7 +76,8 @@ def get_agent_service():
             music_analyzer=music_analyzer,
             vector_search=vector_search,
             blueprint_generator=blueprint_generator,
-            storage_service=storage_service
+            storage_service=storage_service,
+            text_encoder=get_text_embedding_service()
         )
         
         logger.info("AgentService initialized successfully")
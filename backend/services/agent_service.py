@@ -12,6 +12,9 @@ from typing import Dict, Any, Optional, List
 from openai import OpenAI
 from django.conf import settings
 
+from services.beat_grid_sequencer import BeatGridSequencer
+from services.blueprint_codec import encode_for_storage
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,7 +39,8 @@ class AgentService:
         music_analyzer,
         vector_search,
         blueprint_generator,
-        storage_service=None
+        storage_service=None,
+        text_encoder=None
     ):
         """
         Initialize Agent Service with OpenAI client and service dependencies.
@@ -48,6 +52,7 @@ class AgentService:
             vector_search: VectorSearchService instance
             blueprint_generator: BlueprintGenerator instance
             storage_service: StorageService instance (optional, will be created if not provided)
+            text_encoder: TextEmbeddingService instance (optional, uses the global one if not provided)
         """
         self.client = OpenAI(api_key=openai_api_key)
         self.parameter_extractor = parameter_extractor
@@ -55,10 +60,15 @@ class AgentService:
         self.vector_search = vector_search
         self.blueprint_generator = blueprint_generator
         self.storage_service = storage_service
+        self.text_encoder = text_encoder
+        self.sequencer = BeatGridSequencer()
         
         # Task tracking attributes
         self.task_id = None
         self.user_id = None
+        self.user_request = None
+        self.preview = False
+        self.last_beat_positions = None
         self.conversation_messages = []
         
         logger.info("AgentService initialized with OpenAI function calling")
@@ -68,7 +78,8 @@ class AgentService:
         task_id: str,
         user_request: str,
         user_id: int,
-        song_path: str = None
+        song_path: str = None,
+        preview: bool = False
     ):
         """
         Create and execute OpenAI function calling workflow for choreography generation.
@@ -81,6 +92,7 @@ class AgentService:
             user_request: Natural language choreography request
             user_id: User ID
             song_path: Path to the selected song audio file (optional but recommended)
+            preview: Assemble a low-resolution draft with the preview profile
         
         Returns:
             ChoreographyTask with final status
@@ -92,7 +104,10 @@ class AgentService:
         self.task_id = task_id
         self.user_id = user_id
         self.song_path = song_path  # Store for use in tool functions
+        self.user_request = user_request  # Embedded as the text part of move search queries
+        self.preview = preview  # Render profile for assemble_video
         self.last_music_features = None  # Store music features for use in subsequent calls
+        self.last_beat_positions = None  # Full beat grid (music features only carry the first beats)
         self.last_moves = None  # Store moves for use in subsequent calls
         self.last_blueprint = None  # Store blueprint for use in subsequent calls
         
@@ -281,8 +296,10 @@ class AgentService:
                                 # Update task with video result
                                 task.result = {
                                     'video_url': video_result.get('video_url'),
-                                    'blueprint': self.last_blueprint,
-                                    'move_count': len(self.last_blueprint.get('moves', []))
+                                    'output_path': video_result.get('output_path'),
+                                    'blueprint': encode_for_storage(self.last_blueprint),
+                                    'move_count': len(self.last_blueprint.get('moves', [])),
+                                    'preview': self.preview
                                 }
                                 task.save()
                                 logger.info(f"Video assembled successfully: {video_result.get('video_url')}")
@@ -571,6 +588,7 @@ class AgentService:
             
             # Store for use in subsequent calls
             self.last_music_features = result
+            self.last_beat_positions = list(music_features.beat_positions)
             
             return {'music_features': result, 'status': 'success'}
             
@@ -618,7 +636,7 @@ class AgentService:
             query_embedding = VectorSearchService.combine_embeddings_weighted(
                 pose_embedding=None,
                 audio_embedding=audio_embedding,
-                text_embedding=None
+                text_embedding=self._get_request_text_embedding()
             )
             
             # Search for matching moves
@@ -682,13 +700,22 @@ class AgentService:
             import numpy as np
             from services.vector_search_service import VectorSearchService
             
-            # Use zero embedding - will rely on filters
-            query_embedding = np.zeros(
-                VectorSearchService.POSE_EMBEDDING_DIM + 
-                VectorSearchService.AUDIO_EMBEDDING_DIM + 
-                VectorSearchService.TEXT_EMBEDDING_DIM,
-                dtype=np.float32
-            )
+            # Use the user's request text if it can be embedded,
+            # otherwise a zero embedding - will rely on filters
+            text_embedding = self._get_request_text_embedding()
+            if text_embedding is not None:
+                query_embedding = VectorSearchService.combine_embeddings_weighted(
+                    pose_embedding=None,
+                    audio_embedding=None,
+                    text_embedding=text_embedding
+                )
+            else:
+                query_embedding = np.zeros(
+                    VectorSearchService.POSE_EMBEDDING_DIM + 
+                    VectorSearchService.AUDIO_EMBEDDING_DIM + 
+                    VectorSearchService.TEXT_EMBEDDING_DIM,
+                    dtype=np.float32
+                )
             
             results = self.vector_search.search_similar_moves(
                 query_embedding=query_embedding,
@@ -718,6 +745,34 @@ class AgentService:
             logger.error(f"Fallback move search failed: {e}", exc_info=True)
             return {'error': str(e), 'status': 'failed'}
     
+    def _get_request_text_embedding(self):
+        """
+        Embed the user's natural-language request for the text part of search queries.
+        
+        The encoder keeps the model warm and caches recent queries, so repeated
+        searches within a workflow cost one cache lookup.
+        
+        Returns:
+            384D text embedding, or None if there is no request text or the
+            encoder is unavailable
+        """
+        if not self.user_request:
+            return None
+        
+        try:
+            if self.text_encoder is None:
+                from services.text_embedding_service import get_text_embedding_service
+                self.text_encoder = get_text_embedding_service()
+            
+            text_embedding = self.text_encoder.encode(self.user_request)
+        except Exception as e:
+            logger.warning(f"Failed to embed user request text: {e}")
+            return None
+        
+        if text_embedding is None:
+            logger.debug("Text embedding unavailable, searching without text modality")
+        return text_embedding
+    
     def _generate_blueprint(
         self,
         moves: List[Dict] = None,
@@ -794,43 +849,29 @@ class AgentService:
                 }
             }
             
-            # Calculate how many moves we need to fill the song duration
+            # Lay moves out over the song with boundaries on 8-count phrases
             song_duration = music_features['duration']
-            avg_move_duration = sum(move.get('duration', 8.0) for move in moves) / len(moves) if moves else 8.0
-            moves_needed = int(song_duration / avg_move_duration) + 1
-            
-            logger.info(f"Song duration: {song_duration}s, avg move duration: {avg_move_duration}s, moves needed: {moves_needed}")
-            
-            # Add moves to blueprint - repeat moves if necessary to fill the song
-            current_time = 0.0
-            move_index = 0
-            clip_counter = 0
+            beat_positions = self.last_beat_positions or music_features.get('beat_positions')
+            sequence = self.sequencer.sequence(
+                moves,
+                beat_positions=beat_positions,
+                tempo=music_features['tempo'],
+                duration=song_duration
+            )
             
-            while current_time < song_duration and clip_counter < 100:  # Safety limit
-                # Cycle through available moves
-                move = moves[move_index % len(moves)]
-                move_duration = move.get('duration', 8.0)
-                
-                # Don't exceed song duration
-                if current_time + move_duration > song_duration:
-                    move_duration = song_duration - current_time
-                
-                if move_duration > 0:
-                    blueprint['moves'].append({
-                        'clip_id': f"move_{clip_counter+1}",
-                        'video_path': move['video_path'],
-                        'start_time': current_time,
-                        'duration': move_duration,
-                        'transition_type': 'crossfade' if clip_counter > 0 else 'cut',
-                        'original_duration': move.get('duration', 8.0),
-                        'trim_start': 0.0,
-                        'trim_end': 0.0,
-                        'volume_adjustment': 1.0
-                    })
-                    current_time += move_duration
-                    clip_counter += 1
-                
-                move_index += 1
+            for i, move in enumerate(sequence):
+                blueprint['moves'].append({
+                    'clip_id': f"move_{i+1}",
+                    'video_path': move['video_path'],
+                    'start_time': move['start_time'],
+                    'duration': move['duration'],
+                    'transition_type': 'crossfade' if i > 0 else 'cut',
+                    'original_duration': move['original_duration'],
+                    'trim_start': move['trim_start'],
+                    'trim_end': move['trim_end'],
+                    'playback_rate': move['playback_rate'],
+                    'volume_adjustment': 1.0
+                })
             
             logger.info(f"Generated blueprint with {len(blueprint['moves'])} moves to fill {song_duration}s")
             
@@ -841,7 +882,7 @@ class AgentService:
                 task = ChoreographyTask.objects.get(task_id=self.task_id)
                 Blueprint.objects.create(
                     task=task,
-                    blueprint_json=blueprint
+                    blueprint_json=encode_for_storage(blueprint)
                 )
                 logger.info(f"Blueprint saved to database for task {self.task_id}")
             except Exception as db_error:
@@ -897,8 +938,11 @@ class AgentService:
             if storage_service is None:
                 storage_service = get_storage_service()
             
-            # Create video assembly service
-            video_assembly = VideoAssemblyService(storage_service=storage_service)
+            # Create video assembly service (draft profile for previews)
+            video_assembly = VideoAssemblyService(
+                storage_service=storage_service,
+                profile=VideoAssemblyService.PROFILE_PREVIEW if self.preview else VideoAssemblyService.PROFILE_FULL
+            )
             
             # Check FFmpeg availability
             if not video_assembly.check_ffmpeg_available():
@@ -931,6 +975,8 @@ class AgentService:
             logger.info(f"Video assembly completed: {video_url}")
             return {
                 'video_url': video_url,
+                'output_path': video_assembly.output_path(blueprint),
+                'preview': self.preview,
                 'status': 'success',
                 'message': 'Video assembly completed'
             }
@@ -0,0 +1,324 @@
+"""
+Resumable video assembly checkpoints.
+
+A failed assembly normally deletes its temporary directory, so a retry
+downloads and normalizes every clip again. With checkpoints, each task
+assembles in a durable work directory named after its task_id, and every
+completed stage output (fetched clips and audio, normalized/cut/transition
+clips, the concatenated video) is recorded in a manifest with its SHA-256.
+A retried assembly of the same task verifies each recorded file and skips
+the work it covers; files that fail verification are redone.
+
+Features:
+- Manifest per task (checkpoint.json), written atomically after each record
+- Entries keyed by stage and a content-derived name (remote path for
+  fetched files, the normalized clip cache key for clips, the input
+  checksums for the concatenated video), so a changed blueprint never
+  reuses a stale output
+- Work directory removed when the assembly succeeds, kept when it fails
+- Age-based garbage collection of abandoned checkpoints
+- Checkpoint failures never break assembly (logged and ignored)
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Stages, in assembly order
+STAGE_FETCHED = 'fetched'
+STAGE_NORMALIZED = 'normalized'
+STAGE_CONCATENATED = 'concatenated'
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content (always read from disk, never memoized)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssemblyCheckpoint:
+    """
+    Stage outputs of one task's assembly, recorded in its work directory.
+
+    Safe to use from the assembly's worker threads.
+    """
+
+    MANIFEST_NAME = 'checkpoint.json'
+
+    def __init__(self, work_dir: str, task_id: str):
+        """
+        Open (or start) the checkpoint in a task's work directory.
+
+        Args:
+            work_dir: Durable work directory of the task (created if missing)
+            task_id: Task the checkpoint belongs to
+        """
+        self.work_dir = work_dir
+        self.task_id = task_id
+        self.restored: Counter = Counter()
+        self._lock = threading.Lock()
+        os.makedirs(work_dir, exist_ok=True)
+        self._manifest = self._load()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.work_dir, self.MANIFEST_NAME)
+
+    def entries(self, stage: str) -> Dict[str, Dict[str, Any]]:
+        """Recorded entries of a stage, by name."""
+        with self._lock:
+            return dict(self._manifest['stages'].get(stage, {}))
+
+    def restore(self, stage: str, name: str, dest_path: str) -> bool:
+        """
+        Place a recorded stage output at dest_path if it is still valid.
+
+        The recorded file must exist with the recorded size and SHA-256;
+        otherwise the entry is dropped. A file recorded elsewhere in the
+        work directory is copied to dest_path (not linked: FFmpeg may later
+        overwrite either path in place).
+
+        Args:
+            stage: Stage name (STAGE_*)
+            name: Entry name within the stage
+            dest_path: Where the caller expects the file
+
+        Returns:
+            True if dest_path now holds the recorded output
+        """
+        with self._lock:
+            entry = self._manifest['stages'].get(stage, {}).get(name)
+        if entry is None:
+            return False
+
+        path = os.path.join(self.work_dir, entry['file'])
+        try:
+            valid = os.path.getsize(path) == entry['size'] and file_sha256(path) == entry['sha256']
+        except OSError:
+            valid = False
+        if not valid:
+            logger.warning(f"Checkpoint of task {self.task_id}: {stage} '{name}' failed verification, redoing it")
+            self._drop(stage, name)
+            return False
+
+        try:
+            if os.path.abspath(path) != os.path.abspath(dest_path):
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                shutil.copyfile(path, dest_path)
+        except OSError as e:
+            logger.warning(f"Checkpoint of task {self.task_id}: cannot restore {stage} '{name}': {e}")
+            return False
+
+        with self._lock:
+            self.restored[stage] += 1
+        return True
+
+    def record(self, stage: str, name: str, file_path: str) -> bool:
+        """
+        Record a completed stage output.
+
+        Args:
+            stage: Stage name (STAGE_*)
+            name: Entry name within the stage
+            file_path: Output file inside the work directory
+
+        Returns:
+            True if recorded
+        """
+        relative = os.path.relpath(os.path.abspath(file_path), os.path.abspath(self.work_dir))
+        if relative.startswith(os.pardir):
+            logger.debug(f"Checkpoint of task {self.task_id}: {file_path} is outside the work directory")
+            return False
+        try:
+            entry = {'file': relative, 'size': os.path.getsize(file_path), 'sha256': file_sha256(file_path)}
+        except OSError as e:
+            logger.warning(f"Checkpoint of task {self.task_id}: cannot record {stage} '{name}': {e}")
+            return False
+
+        with self._lock:
+            self._manifest['stages'].setdefault(stage, {})[name] = entry
+            return self._save()
+
+    def summary(self) -> Dict[str, int]:
+        """Number of recorded entries per stage."""
+        with self._lock:
+            return {stage: len(entries) for stage, entries in self._manifest['stages'].items()}
+
+    def discard(self) -> None:
+        """Remove the work directory (the assembly succeeded)."""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _drop(self, stage: str, name: str) -> None:
+        with self._lock:
+            self._manifest['stages'].get(stage, {}).pop(name, None)
+            self._save()
+
+    def _load(self) -> Dict[str, Any]:
+        """Read the manifest; a missing or unreadable one starts empty."""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('task_id') == self.task_id and isinstance(manifest.get('stages'), dict):
+                return manifest
+            logger.warning(f"Ignoring checkpoint manifest of another task in {self.work_dir}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint manifest {self.manifest_path}: {e}")
+        return {'task_id': self.task_id, 'stages': {}}
+
+    def _save(self) -> bool:
+        """Write the manifest atomically (caller holds the lock)."""
+        self._manifest['updated_at'] = time.time()
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.work_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to write checkpoint manifest {self.manifest_path}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+
+class CheckpointStore:
+    """
+    Durable work directories of assemblies, one per task_id.
+    """
+
+    DEFAULT_MAX_AGE = 24 * 3600  # 1 day
+
+    def __init__(self, root_dir: str, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            root_dir: Directory holding one work directory per task
+            max_age: Seconds since its last update after which a checkpoint
+                is garbage-collected
+        """
+        self.root_dir = root_dir
+        self.max_age = max_age
+        os.makedirs(root_dir, exist_ok=True)
+
+        logger.info(f"CheckpointStore initialized: {root_dir} (max age {max_age:.0f}s)")
+
+    def work_dir(self, task_id: str) -> str:
+        """Work directory of a task."""
+        safe_id = ''.join(c if c.isalnum() or c in '-_' else '_' for c in str(task_id))
+        return os.path.join(self.root_dir, safe_id)
+
+    def open(self, task_id: str) -> AssemblyCheckpoint:
+        """
+        Open the checkpoint of a task, resuming any earlier attempt.
+
+        Stale checkpoints of other tasks are collected first.
+        """
+        self.collect_garbage(keep=task_id)
+        checkpoint = AssemblyCheckpoint(self.work_dir(task_id), task_id)
+        recorded = checkpoint.summary()
+        if recorded:
+            logger.info(f"Resuming assembly of task {task_id} from checkpoint: {recorded}")
+        return checkpoint
+
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        """Task work directories with their age in seconds and size in bytes."""
+        checkpoints = []
+        now = time.time()
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            return []
+        for name in names:
+            path = os.path.join(self.root_dir, name)
+            if not os.path.isdir(path):
+                continue
+            size = 0
+            for root, _, files in os.walk(path):
+                for file_name in files:
+                    try:
+                        size += os.path.getsize(os.path.join(root, file_name))
+                    except OSError:
+                        pass
+            checkpoints.append({'task_id': name, 'age': now - self._updated_at(path), 'bytes': size})
+        return checkpoints
+
+    def collect_garbage(self, max_age: Optional[float] = None, keep: Optional[str] = None) -> int:
+        """
+        Remove checkpoints not updated for max_age seconds.
+
+        Args:
+            max_age: Age limit (default: the store's max_age; 0 removes all)
+            keep: Task whose checkpoint is never removed
+
+        Returns:
+            Number of checkpoints removed
+        """
+        max_age = self.max_age if max_age is None else max_age
+        keep_dir = self.work_dir(keep) if keep else None
+        removed = 0
+        now = time.time()
+        try:
+            names = os.listdir(self.root_dir)
+        except OSError:
+            return 0
+        for name in names:
+            path = os.path.join(self.root_dir, name)
+            if not os.path.isdir(path) or path == keep_dir:
+                continue
+            if now - self._updated_at(path) >= max_age:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} stale assembly checkpoints from {self.root_dir}")
+        return removed
+
+    @staticmethod
+    def _updated_at(path: str) -> float:
+        """Last update of a work directory: its manifest's mtime, else the directory's."""
+        for candidate in (os.path.join(path, AssemblyCheckpoint.MANIFEST_NAME), path):
+            try:
+                return os.path.getmtime(candidate)
+            except OSError:
+                continue
+        return 0.0
+
+
+# Global instance for reuse across requests
+_checkpoint_store = None
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Get or create the global checkpoint store.
+
+    Returns:
+        CheckpointStore instance, or None if VIDEO_ASSEMBLY_CHECKPOINT_DIR is not set
+    """
+    global _checkpoint_store
+
+    root_dir = os.getenv('VIDEO_ASSEMBLY_CHECKPOINT_DIR', '')
+    if not root_dir:
+        return None
+
+    if _checkpoint_store is None or _checkpoint_store.root_dir != root_dir:
+        max_age_hours = float(os.getenv('VIDEO_ASSEMBLY_CHECKPOINT_MAX_AGE_HOURS', '24') or 24)
+        _checkpoint_store = CheckpointStore(root_dir, max_age=max_age_hours * 3600)
+
+    return _checkpoint_store
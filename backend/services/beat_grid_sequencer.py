@@ -0,0 +1,318 @@
+"""
+Beat-grid-aligned choreography sequencing.
+
+Bachata is danced in 8-count phrases, so move changes should land on phrase
+boundaries rather than wherever the previous clip happened to end. This
+module lays out a list of candidate moves over a song so that every move
+starts and ends on a phrase boundary derived from the detected beats.
+
+Each move gets timing instructions for the assembler:
+- playback_rate: speed factor that fits the clip to its slot
+  (played clip length = duration * playback_rate)
+- trim_start / trim_end: seconds cut from the clip when speeding it up
+  by more than max_stretch would be needed
+
+A clip too short for its slot is slowed down by at most max_stretch; the
+rest of the slot is filled by looping the clip (the move repeats within
+its phrases, each repeat a separate entry with the same phrase_index).
+
+Boundaries are found with np.searchsorted over the phrase grid for all moves
+at once, so sequencing is O(moves) regardless of how many beats a song has.
+"""
+
+import math
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BeatGridSequencer:
+    """
+    Lays out moves end to end with boundaries snapped to 8-count phrases.
+
+    Move end times are computed as the cumulative natural clip durations and
+    each one is snapped to the nearest phrase boundary. Snapping cumulative
+    times (instead of one move at a time) keeps rounding errors from piling
+    up, so the sequence never drifts more than half a phrase from the
+    clips' natural timing.
+    """
+
+    DEFAULT_BEATS_PER_PHRASE = 8
+    DEFAULT_MAX_STRETCH = 0.15  # Maximum speed change before trimming or looping (15%)
+    DEFAULT_MOVE_DURATION = 8.0
+    DEFAULT_BEAT_INTERVAL = 0.5  # 120 BPM when no tempo is known
+
+    def __init__(
+        self,
+        beats_per_phrase: int = DEFAULT_BEATS_PER_PHRASE,
+        max_stretch: float = DEFAULT_MAX_STRETCH
+    ):
+        """
+        Initialize sequencer.
+
+        Args:
+            beats_per_phrase: Beats per phrase (8 for bachata's 8-count)
+            max_stretch: Maximum fractional speed change applied to a
+                clip: beyond a speed-up of max_stretch the remainder is
+                trimmed, beyond a slow-down of max_stretch the clip loops
+        """
+        self.beats_per_phrase = max(1, int(beats_per_phrase))
+        self.max_stretch = max(0.0, float(max_stretch))
+
+    def build_beat_grid(
+        self,
+        beat_positions: Optional[Sequence[float]],
+        tempo: float,
+        duration: float
+    ) -> np.ndarray:
+        """
+        Build a clean beat grid (in seconds) covering the whole song.
+
+        Detected beats are sorted and deduplicated. The grid is extended to
+        the end of the song with the median beat interval, so truncated beat
+        lists (e.g. the 20 beats passed to the agent) still cover the song.
+        Without usable beats the grid is synthesized from the tempo.
+
+        Args:
+            beat_positions: Detected beat times in seconds (may be empty)
+            tempo: Tempo in BPM (used when fewer than two beats are known)
+            duration: Song duration in seconds
+
+        Returns:
+            Sorted array of beat times in [0, duration)
+        """
+        beats = np.asarray(beat_positions if beat_positions is not None else [], dtype=np.float64).ravel()
+        beats = beats[np.isfinite(beats)]
+        beats = np.unique(beats[(beats >= 0) & (beats < duration)])
+
+        if beats.size >= 2:
+            interval = float(np.median(np.diff(beats)))
+        elif tempo and tempo > 0:
+            interval = 60.0 / float(tempo)
+        else:
+            interval = self.DEFAULT_BEAT_INTERVAL
+        if interval <= 0:
+            interval = self.DEFAULT_BEAT_INTERVAL
+
+        if beats.size == 0:
+            beats = np.array([0.0])
+
+        # Extend the grid to the end of the song
+        remaining = duration - beats[-1]
+        if remaining > interval:
+            tail = beats[-1] + interval * np.arange(1, int(math.ceil(remaining / interval)))
+            beats = np.concatenate([beats, tail[tail < duration]])
+
+        return beats
+
+    def phrase_boundaries(self, beat_grid: np.ndarray, duration: float) -> np.ndarray:
+        """
+        Compute phrase boundaries from a beat grid.
+
+        Phrases start on every beats_per_phrase-th beat from the first
+        detected beat. The song start and end are always boundaries; a pickup
+        before the first beat joins the first phrase and a phrase boundary
+        within half a beat of the end is merged into the end.
+
+        Args:
+            beat_grid: Sorted beat times from build_beat_grid()
+            duration: Song duration in seconds
+
+        Returns:
+            Strictly increasing array of boundaries from 0.0 to duration
+        """
+        phrase_starts = beat_grid[::self.beats_per_phrase]
+
+        if beat_grid.size >= 2:
+            min_gap = float(np.median(np.diff(beat_grid))) / 2.0
+        else:
+            min_gap = self.DEFAULT_BEAT_INTERVAL / 2.0
+
+        inner = phrase_starts[(phrase_starts > min_gap) & (phrase_starts < duration - min_gap)]
+        return np.concatenate([[0.0], inner, [duration]])
+
+    def sequence(
+        self,
+        moves: List[Dict[str, Any]],
+        beat_positions: Optional[Sequence[float]],
+        tempo: float,
+        duration: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Sequence moves over the song with phrase-aligned boundaries.
+
+        Moves are used in order and repeated as needed to fill the song.
+
+        Args:
+            moves: Candidate moves (move_id, move_name, video_path, duration, ...)
+            beat_positions: Detected beat times in seconds
+            tempo: Tempo in BPM
+            duration: Song duration in seconds
+
+        Returns:
+            List of sequenced moves with start_time, duration (slot length),
+            original_duration, playback_rate, trim_start, trim_end,
+            phrase_index and phrase_count
+        """
+        if not moves or duration <= 0:
+            return []
+
+        boundaries = self.song_phrase_boundaries(beat_positions, tempo, duration)
+        num_phrases = len(boundaries) - 1
+
+        sequence = self.sequence_phrases(moves, boundaries, 0, num_phrases)
+
+        logger.info(
+            f"Beat-grid sequence: {len(sequence)} moves over {num_phrases} phrases "
+            f"({duration:.1f}s, {self.beats_per_phrase} beats/phrase)"
+        )
+        return sequence
+
+    def sequence_phrases(
+        self,
+        moves: List[Dict[str, Any]],
+        boundaries: np.ndarray,
+        first_phrase: int,
+        end_phrase: int,
+        first_move: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Sequence moves over a run of phrases, e.g. one song section.
+
+        Moves are used in order from first_move and repeated as needed to
+        fill the phrases from boundaries[first_phrase] to
+        boundaries[end_phrase].
+
+        Args:
+            moves: Candidate moves
+            boundaries: Phrase boundaries from song_phrase_boundaries()
+            first_phrase: Index of the first phrase to fill
+            end_phrase: Boundary index where the run ends (exclusive)
+            first_move: Index into moves of the first move to use
+
+        Returns:
+            List of sequenced moves (see sequence()); phrase_index counts
+            from the start of the song
+        """
+        num_phrases = end_phrase - first_phrase
+        if not moves or num_phrases <= 0:
+            return []
+
+        run = boundaries[first_phrase:end_phrase + 1]
+        clip_durations = self.clip_durations(moves)
+
+        # Every move covers at least one phrase, so num_phrases moves always suffice
+        cycle = (first_move + np.arange(num_phrases)) % len(moves)
+        natural_ends = run[0] + np.cumsum(clip_durations[cycle])
+
+        # Snap cumulative end times to the nearest phrase boundary
+        upper = np.clip(np.searchsorted(run, natural_ends), 1, num_phrases)
+        lower = upper - 1
+        nearer_lower = (natural_ends - run[lower]) < (run[upper] - natural_ends)
+        end_index = np.where(nearer_lower & (lower > 0), lower, upper)
+
+        # Force strictly increasing boundaries (each move gets >= 1 phrase)
+        ordinal = np.arange(1, num_phrases + 1)
+        end_index = np.maximum.accumulate(np.maximum(end_index - ordinal, 0)) + ordinal
+
+        # Stop at the first move that reaches the end of the song
+        count = int(np.searchsorted(end_index, num_phrases)) + 1
+        end_index = np.minimum(end_index[:count], num_phrases)
+        start_index = np.concatenate([[0], end_index[:-1]])
+
+        return self.layout(
+            moves, cycle[:count], boundaries, start_index + first_phrase, end_index + first_phrase
+        )
+
+    def song_phrase_boundaries(
+        self,
+        beat_positions: Optional[Sequence[float]],
+        tempo: float,
+        duration: float
+    ) -> np.ndarray:
+        """Compute phrase boundaries for a song from its detected beats."""
+        return self.phrase_boundaries(self.build_beat_grid(beat_positions, tempo, duration), duration)
+
+    def clip_durations(self, moves: List[Dict[str, Any]]) -> np.ndarray:
+        """Get natural clip durations (DEFAULT_MOVE_DURATION when missing)."""
+        durations = np.array(
+            [float(move.get('duration') or self.DEFAULT_MOVE_DURATION) for move in moves],
+            dtype=np.float64
+        )
+        durations[durations <= 0] = self.DEFAULT_MOVE_DURATION
+        return durations
+
+    def layout(
+        self,
+        moves: List[Dict[str, Any]],
+        move_indices: np.ndarray,
+        boundaries: np.ndarray,
+        start_index: np.ndarray,
+        end_index: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """
+        Place chosen moves into phrase slots and compute clip instructions.
+
+        A slot more than max_stretch longer than its clip is split into
+        equal repeats of the clip, as few as keep the slow-down within
+        max_stretch, so the move loops instead of playing in slow motion.
+
+        Args:
+            moves: Candidate moves
+            move_indices: Index into moves for each slot
+            boundaries: Phrase boundaries from phrase_boundaries()
+            start_index: First boundary index of each slot
+            end_index: Last boundary index of each slot (exclusive end)
+
+        Returns:
+            List of sequenced moves (see sequence()), one per slot and repeat
+        """
+        slot_starts = boundaries[start_index]
+        slot_lengths = boundaries[end_index] - slot_starts
+        slot_natural = self.clip_durations(moves)[move_indices]
+
+        # Loop clips that would play slower than the minimum rate: the
+        # fewest repeats that keep the rate above it, at least the nearest
+        min_rate = 1.0 - self.max_stretch
+        repeats_needed = slot_lengths / slot_natural
+        repeats = np.ones(len(move_indices), dtype=np.int64)
+        if min_rate > 0:
+            too_slow = slot_natural / slot_lengths < min_rate
+            repeats[too_slow] = np.maximum(
+                np.round(repeats_needed[too_slow]),
+                np.ceil(repeats_needed[too_slow] * min_rate - 1e-9)
+            ).astype(np.int64)
+
+        # One entry per repeat: slot i split into repeats[i] equal parts
+        slot = np.repeat(np.arange(len(move_indices)), repeats)
+        repeat = np.arange(len(slot)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        slots = slot_lengths[slot] / repeats[slot]
+        starts = slot_starts[slot] + repeat * slots
+        natural = slot_natural[slot]
+
+        # Fit clips to their slots: speed change within max_stretch, then trim
+        ratio = natural / slots
+        playback_rate = np.where(ratio > 1.0, np.minimum(ratio, 1.0 + self.max_stretch), ratio)
+        trim_end = np.maximum(natural - slots * playback_rate, 0.0)
+
+        sequence = []
+        for i, slot_idx in enumerate(slot):
+            move = moves[move_indices[slot_idx]]
+            sequence.append({
+                'move_id': move.get('move_id'),
+                'move_name': move.get('move_name'),
+                'video_path': move['video_path'],
+                'start_time': float(starts[i]),
+                'duration': float(slots[i]),
+                'similarity_score': move.get('similarity_score', 0.0),
+                'original_duration': float(natural[i]),
+                'playback_rate': round(float(playback_rate[i]), 4),
+                'trim_start': 0.0,
+                'trim_end': round(float(trim_end[i]), 3),
+                'phrase_index': int(start_index[slot_idx]),
+                'phrase_count': int(end_index[slot_idx] - start_index[slot_idx]),
+            })
+        return sequence
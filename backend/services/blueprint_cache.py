@@ -0,0 +1,354 @@
+"""
+Blueprint cache for repeated choreography requests.
+
+Users often generate the same song with the same difficulty, energy and
+style. The blueprint for such a request only depends on the song content,
+the generation parameters, the move index and the generator/analyzer code,
+so it can be reused across tasks once the per-task fields are stripped.
+
+Features:
+- Cache key: song content hash + parameters + move index version + generator version
+- In-process LRU tier (bounded by entry count)
+- Persistent database tier (BlueprintCacheEntry), bounded by row count
+- Explicit invalidation (all entries, one song, or stale move index versions)
+- Cache failures never break blueprint generation (logged and ignored)
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .blueprint_codec import compact_blueprint, expand_blueprint
+
+logger = logging.getLogger(__name__)
+
+
+# Song content hashes keyed by (path, size, mtime) so unchanged files are hashed once
+_file_hash_cache: Dict[Tuple[str, int, int], str] = {}
+_file_hash_lock = threading.Lock()
+
+
+def file_content_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file's content.
+
+    Args:
+        path: File path
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest of the file content
+    """
+    stat = os.stat(path)
+    cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    with _file_hash_lock:
+        cached = _file_hash_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+
+    with _file_hash_lock:
+        _file_hash_cache[cache_key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+class BlueprintCache:
+    """
+    Two-tier (memory + database) cache of task-independent blueprints.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_MAX_DB_ENTRIES = 5000
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_db_entries: int = DEFAULT_MAX_DB_ENTRIES,
+        persistent: bool = True
+    ):
+        """
+        Initialize blueprint cache.
+
+        Args:
+            max_entries: Maximum number of blueprints kept in memory
+            max_db_entries: Maximum number of rows kept in the database tier
+            persistent: Whether to use the database tier
+        """
+        self.max_entries = max(0, max_entries)
+        self.max_db_entries = max(0, max_db_entries)
+        self.persistent = persistent
+
+        # key -> (blueprint, song_hash, move_index_version)
+        self._memory: 'OrderedDict[str, Tuple[Dict[str, Any], str, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._db_hits = 0
+        self._misses = 0
+        self._move_index_version: Optional[str] = None
+
+        logger.info(
+            f"BlueprintCache initialized (max_entries: {self.max_entries}, "
+            f"persistent: {self.persistent})"
+        )
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """
+        Build a cache key from the values that determine a blueprint.
+
+        Args:
+            **parts: JSON-serializable key components (song hash, parameters,
+                move index version, generator version, ...)
+
+        Returns:
+            Hex digest cache key
+        """
+        encoded = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached blueprint.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            A copy of the cached blueprint, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry[0])
+
+        entry = self._db_get(key)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._db_hits += 1
+        self._memory_put(key, *entry)
+        return copy.deepcopy(entry[0])
+
+    def put(
+        self,
+        key: str,
+        blueprint: Dict[str, Any],
+        song_hash: str = '',
+        move_index_version: str = ''
+    ) -> None:
+        """
+        Store a task-independent blueprint.
+
+        Args:
+            key: Cache key from make_key()
+            blueprint: Blueprint with per-task fields removed
+            song_hash: Song content hash (for per-song invalidation)
+            move_index_version: Move index version (for stale-entry cleanup)
+        """
+        blueprint = copy.deepcopy(blueprint)
+        self._memory_put(key, blueprint, song_hash, move_index_version)
+        self._db_put(key, blueprint, song_hash, move_index_version)
+
+    def invalidate(self, song_hash: Optional[str] = None) -> int:
+        """
+        Remove cached blueprints.
+
+        Args:
+            song_hash: Only remove blueprints for this song (default: all)
+
+        Returns:
+            Number of database rows removed
+        """
+        with self._lock:
+            if song_hash is None:
+                self._memory.clear()
+            else:
+                for key in [k for k, entry in self._memory.items() if entry[1] == song_hash]:
+                    del self._memory[key]
+
+        deleted = 0
+        if self.persistent:
+            try:
+                from apps.choreography.models import BlueprintCacheEntry
+
+                entries = BlueprintCacheEntry.objects.all()
+                if song_hash is not None:
+                    entries = entries.filter(song_hash=song_hash)
+                deleted, _ = entries.delete()
+            except Exception as e:
+                logger.warning(f"Blueprint cache invalidation failed: {e}")
+
+        logger.info(f"Blueprint cache invalidated ({'all songs' if song_hash is None else song_hash[:12]}, {deleted} rows)")
+        return deleted
+
+    def invalidate_stale(self, move_index_version: str) -> int:
+        """
+        Remove blueprints built from a different move index version.
+
+        Such entries can never be hit again (the version is part of the key);
+        this frees their space.
+
+        Args:
+            move_index_version: Current move index version
+
+        Returns:
+            Number of database rows removed
+        """
+        with self._lock:
+            for key in [k for k, entry in self._memory.items() if entry[2] != move_index_version]:
+                del self._memory[key]
+
+        if not self.persistent:
+            return 0
+        try:
+            from apps.choreography.models import BlueprintCacheEntry
+
+            deleted, _ = BlueprintCacheEntry.objects.exclude(move_index_version=move_index_version).delete()
+            if deleted:
+                logger.info(f"Removed {deleted} cached blueprints for old move index versions")
+            return deleted
+        except Exception as e:
+            logger.warning(f"Blueprint cache cleanup failed: {e}")
+            return 0
+
+    def observe_move_index_version(self, move_index_version: str) -> None:
+        """
+        Record the move index version in use and purge entries from older ones.
+
+        Called on every cached lookup; the purge only runs when the version
+        changes (i.e. after embeddings were reloaded with different data).
+
+        Args:
+            move_index_version: Current move index version
+        """
+        with self._lock:
+            previous = self._move_index_version
+            self._move_index_version = move_index_version
+        if previous is not None and previous != move_index_version:
+            logger.info("Move index changed, removing stale cached blueprints")
+            self.invalidate_stale(move_index_version)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts and sizes
+        """
+        with self._lock:
+            lookups = self._hits + self._db_hits + self._misses
+            return {
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'persistent': self.persistent,
+                'hits': self._hits,
+                'db_hits': self._db_hits,
+                'misses': self._misses,
+                'hit_ratio': ((self._hits + self._db_hits) / lookups) if lookups else 0.0,
+            }
+
+    def _memory_put(
+        self,
+        key: str,
+        blueprint: Dict[str, Any],
+        song_hash: str,
+        move_index_version: str
+    ) -> None:
+        """Store a blueprint in the memory tier, evicting least recently used entries."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._memory[key] = (blueprint, song_hash, move_index_version)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[Tuple[Dict[str, Any], str, str]]:
+        """Look up a blueprint in the database tier."""
+        if not self.persistent:
+            return None
+        try:
+            from django.db.models import F
+            from django.utils import timezone
+            from apps.choreography.models import BlueprintCacheEntry
+
+            entry = BlueprintCacheEntry.objects.filter(cache_key=key).first()
+            if entry is None:
+                return None
+            # Track usage for LRU trimming of the table
+            BlueprintCacheEntry.objects.filter(cache_key=key).update(
+                hit_count=F('hit_count') + 1,
+                last_used_at=timezone.now()
+            )
+            return expand_blueprint(entry.blueprint_json), entry.song_hash, entry.move_index_version
+        except Exception as e:
+            logger.warning(f"Blueprint cache lookup failed: {e}")
+            return None
+
+    def _db_put(
+        self,
+        key: str,
+        blueprint: Dict[str, Any],
+        song_hash: str,
+        move_index_version: str
+    ) -> None:
+        """Store a blueprint in the database tier and trim it to max_db_entries."""
+        if not self.persistent or self.max_db_entries == 0:
+            return
+        try:
+            from apps.choreography.models import BlueprintCacheEntry
+
+            BlueprintCacheEntry.objects.update_or_create(
+                cache_key=key,
+                defaults={
+                    'song_hash': song_hash,
+                    'move_index_version': move_index_version,
+                    'blueprint_json': compact_blueprint(blueprint),
+                }
+            )
+
+            excess = BlueprintCacheEntry.objects.count() - self.max_db_entries
+            if excess > 0:
+                oldest = BlueprintCacheEntry.objects.order_by('last_used_at').values_list('cache_key', flat=True)[:excess]
+                BlueprintCacheEntry.objects.filter(cache_key__in=list(oldest)).delete()
+        except Exception as e:
+            logger.warning(f"Blueprint cache store failed: {e}")
+
+
+# Global instance for reuse across requests
+_blueprint_cache = None
+
+
+def get_blueprint_cache() -> Optional[BlueprintCache]:
+    """
+    Get or create the global blueprint cache.
+
+    Returns:
+        BlueprintCache instance, or None if disabled via BLUEPRINT_CACHE_ENABLED
+    """
+    global _blueprint_cache
+
+    if os.getenv('BLUEPRINT_CACHE_ENABLED', 'True').lower() not in ('true', '1', 'yes'):
+        return None
+
+    if _blueprint_cache is None:
+        _blueprint_cache = BlueprintCache(
+            max_entries=int(os.getenv('BLUEPRINT_CACHE_MAX_ENTRIES', str(BlueprintCache.DEFAULT_MAX_ENTRIES))),
+            max_db_entries=int(os.getenv('BLUEPRINT_CACHE_MAX_DB_ENTRIES', str(BlueprintCache.DEFAULT_MAX_DB_ENTRIES))),
+            persistent=os.getenv('BLUEPRINT_CACHE_PERSISTENT', 'True').lower() in ('true', '1', 'yes')
+        )
+
+    return _blueprint_cache
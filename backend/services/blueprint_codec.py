@@ -0,0 +1,199 @@
+"""
+Compact columnar blueprint encoding.
+
+A blueprint's moves are a list of dicts that repeat the same keys for every
+move, mostly with constant values ('crossfade', 0.0 trims, volume 1.0), and
+the same video paths many times over. The compact form stores:
+
+- clip table: each distinct video_path once ('tables' -> 'video_path')
+- columns: one array per move field (start_time, duration, trims, ...);
+  string columns hold indices into an interned value table
+- constants: fields with the same value for every move, stored once
+- derived: fields that can be recomputed (sequential clip_id 'move_<n>')
+
+All other blueprint fields are kept as-is. expand_blueprint() restores the
+exact original dict (same keys, key order and values), so consumers such as
+VideoAssemblyService.validate_blueprint keep working on today's schema.
+
+Example:
+    >>> compact = compact_blueprint(blueprint)
+    >>> expand_blueprint(compact) == blueprint
+    True
+"""
+
+import os
+import math
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+COMPACT_FORMAT = 'columnar'
+COMPACT_VERSION = 1
+
+
+class BlueprintFormatError(ValueError):
+    """Raised when a compact blueprint cannot be expanded."""
+    pass
+
+
+def is_compact_blueprint(blueprint: Any) -> bool:
+    """
+    Check whether a blueprint is in compact columnar form.
+
+    Args:
+        blueprint: Blueprint dictionary (either form)
+
+    Returns:
+        True if the blueprint is compact
+    """
+    return (
+        isinstance(blueprint, dict)
+        and isinstance(blueprint.get('moves'), dict)
+        and blueprint['moves'].get('format') == COMPACT_FORMAT
+    )
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Strict equality that keeps 1, 1.0 and True (and 0.0 and -0.0) apart."""
+    if type(a) is not type(b) or a != b:
+        return False
+    return type(a) is not float or math.copysign(1.0, a) == math.copysign(1.0, b)
+
+
+def _sequential_clip_ids(values: List[Any]) -> bool:
+    """Check whether clip ids are move_1, move_2, ... in order."""
+    return all(value == f"move_{i + 1}" for i, value in enumerate(values))
+
+
+def compact_blueprint(blueprint: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a blueprint's moves in compact columnar form.
+
+    Blueprints that are already compact, have no moves, or whose moves do
+    not all share the same keys (in the same order) are returned unchanged,
+    so encoding is always loss-free.
+
+    Args:
+        blueprint: Blueprint dictionary with a list of move dicts
+
+    Returns:
+        Blueprint dictionary with 'moves' replaced by the columnar encoding
+    """
+    moves = blueprint.get('moves') if isinstance(blueprint, dict) else None
+    if not isinstance(moves, list) or not moves or not all(isinstance(m, dict) for m in moves):
+        return blueprint
+
+    keys = list(moves[0].keys())
+    if any(list(move.keys()) != keys for move in moves):
+        logger.debug("Blueprint moves are not homogeneous, keeping expanded form")
+        return blueprint
+
+    constants: Dict[str, Any] = {}
+    columns: Dict[str, List[Any]] = {}
+    tables: Dict[str, List[str]] = {}
+    derived: List[str] = []
+
+    for key in keys:
+        values = [move[key] for move in moves]
+
+        if key == 'clip_id' and _sequential_clip_ids(values):
+            derived.append(key)
+        elif key != 'video_path' and all(_same_value(v, values[0]) for v in values):
+            constants[key] = values[0]
+        elif all(type(v) is str for v in values):
+            # Intern strings: each distinct value stored once, moves hold indices
+            table: Dict[str, int] = {}
+            columns[key] = [table.setdefault(v, len(table)) for v in values]
+            tables[key] = list(table)
+        else:
+            columns[key] = values
+
+    compact = dict(blueprint)
+    compact['moves'] = {
+        'format': COMPACT_FORMAT,
+        'version': COMPACT_VERSION,
+        'count': len(moves),
+        'keys': keys,
+        'tables': tables,
+        'columns': columns,
+        'constants': constants,
+        'derived': derived,
+    }
+    return compact
+
+
+def expand_blueprint(blueprint: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand a compact blueprint to the standard dict-per-move schema.
+
+    Blueprints that are not compact are returned unchanged.
+
+    Args:
+        blueprint: Blueprint dictionary (either form)
+
+    Returns:
+        Blueprint dictionary with 'moves' as a list of move dicts
+
+    Raises:
+        BlueprintFormatError: If the compact encoding is unsupported or corrupt
+    """
+    if not is_compact_blueprint(blueprint):
+        return blueprint
+
+    encoded = blueprint['moves']
+    version = encoded.get('version')
+    if version != COMPACT_VERSION:
+        raise BlueprintFormatError(f"Unsupported compact blueprint version: {version}")
+
+    try:
+        count = int(encoded['count'])
+        keys = encoded['keys']
+        tables = encoded.get('tables', {})
+        columns = encoded.get('columns', {})
+        constants = encoded.get('constants', {})
+        derived = set(encoded.get('derived', []))
+
+        # Resolve each field to a per-move value list once, then zip into dicts
+        resolved = []
+        for key in keys:
+            if key in columns:
+                values = columns[key]
+                if key in tables:
+                    table = tables[key]
+                    values = [table[i] for i in values]
+            elif key in constants:
+                values = [constants[key]] * count
+            elif key in derived and key == 'clip_id':
+                values = [f"move_{i + 1}" for i in range(count)]
+            else:
+                raise BlueprintFormatError(f"No data for move field '{key}'")
+            if len(values) != count:
+                raise BlueprintFormatError(
+                    f"Column '{key}' has {len(values)} values, expected {count}"
+                )
+            resolved.append(values)
+    except (KeyError, IndexError, TypeError) as e:
+        raise BlueprintFormatError(f"Corrupt compact blueprint: {e}") from e
+
+    expanded = dict(blueprint)
+    expanded['moves'] = [dict(zip(keys, row)) for row in zip(*resolved)] if keys else [{} for _ in range(count)]
+    return expanded
+
+
+def encode_for_storage(blueprint: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode a blueprint for storage (Blueprint rows, task results, cache).
+
+    Uses the compact form unless BLUEPRINT_STORAGE_FORMAT=expanded.
+
+    Args:
+        blueprint: Blueprint dictionary
+
+    Returns:
+        Blueprint dictionary in the configured storage form
+    """
+    if os.getenv('BLUEPRINT_STORAGE_FORMAT', 'compact').lower() == 'expanded':
+        return expand_blueprint(blueprint)
+    return compact_blueprint(blueprint)
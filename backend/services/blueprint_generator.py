@@ -12,14 +12,20 @@ now moved to the API/backend for the blueprint-based architecture.
 """
 
 import os
+import copy
 import logging
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, Generator, Iterator, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 import numpy as np
 
+from .beat_grid_sequencer import BeatGridSequencer
+from .blueprint_cache import BlueprintCache, file_content_hash, get_blueprint_cache
+from .choreography_optimizer import ChoreographyOptimizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,10 +56,30 @@ class BlueprintGenerator:
     4. Blueprint JSON creation
     """
     
+    # Filter relaxation tiers for move search, strictest first: (name, filter keys)
+    RELAXATION_TIERS = [
+        ('exact', ('difficulty', 'energy_level', 'style')),
+        ('without_energy', ('difficulty', 'style')),
+        ('difficulty_only', ('difficulty',)),
+        ('unfiltered', ()),
+    ]
+    
+    # Sequencing modes: modulo walk over search results, or DP optimization
+    SEQUENCING_MODES = ('rule_based', 'optimized')
+    
+    # Bump when blueprint generation output changes (invalidates cached blueprints)
+    GENERATOR_VERSION = '4'
+    
+    # Moves per streamed section when song sections are unknown (cached blueprints)
+    STREAM_SECTION_MOVES = 4
+    
     def __init__(
         self,
         vector_search_service,
-        music_analyzer
+        music_analyzer,
+        sequencer: Optional[BeatGridSequencer] = None,
+        optimizer: Optional[ChoreographyOptimizer] = None,
+        blueprint_cache: Optional[BlueprintCache] = None
     ):
         """
         Initialize blueprint generator.
@@ -61,9 +87,16 @@ class BlueprintGenerator:
         Args:
             vector_search_service: VectorSearchService instance
             music_analyzer: MusicAnalyzer instance
+            sequencer: Optional BeatGridSequencer (defaults to 8-count phrases)
+            optimizer: Optional ChoreographyOptimizer for 'optimized' sequencing
+            blueprint_cache: Optional BlueprintCache (defaults to the global
+                cache, None if BLUEPRINT_CACHE_ENABLED is false)
         """
         self.vector_search = vector_search_service
         self.music_analyzer = music_analyzer
+        self.sequencer = sequencer or BeatGridSequencer()
+        self.optimizer = optimizer or ChoreographyOptimizer()
+        self.blueprint_cache = blueprint_cache if blueprint_cache is not None else get_blueprint_cache()
         
         logger.info("BlueprintGenerator initialized")
     
@@ -75,7 +108,8 @@ class BlueprintGenerator:
         energy_level: str,
         style: str,
         user_id: Optional[int] = None,
-        tempo_preference: Optional[str] = None
+        tempo_preference: Optional[str] = None,
+        sequencing_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a complete blueprint for video assembly.
@@ -90,6 +124,8 @@ class BlueprintGenerator:
             style: romantic, energetic, sensual, or playful
             user_id: Optional user ID
             tempo_preference: Optional tempo preference
+            sequencing_mode: 'rule_based' or 'optimized' (defaults to the
+                CHOREOGRAPHY_SEQUENCING_MODE env var, then 'rule_based')
         
         Returns:
             Blueprint dictionary matching the schema
@@ -97,52 +133,435 @@ class BlueprintGenerator:
         Raises:
             BlueprintGenerationError: If generation fails
         """
+        config = BlueprintConfig(
+            task_id=task_id,
+            song_path=song_path,
+            difficulty=difficulty,
+            energy_level=energy_level,
+            style=style,
+            user_id=user_id,
+            tempo_preference=tempo_preference
+        )
         try:
-            logger.info(f"Starting blueprint generation for task {task_id}")
-            logger.info(f"Parameters: difficulty={difficulty}, energy={energy_level}, style={style}")
-            
-            # Step 1: Analyze audio features
-            logger.info("Step 1: Analyzing audio features...")
-            music_features = self._analyze_audio(song_path)
-            
-            # Step 2: Search for matching moves
-            logger.info("Step 2: Searching for matching moves...")
-            matching_moves = self._search_matching_moves(
-                music_features,
-                difficulty,
-                energy_level,
-                style
-            )
-            
-            # Step 3: Generate choreography sequence
-            logger.info("Step 3: Generating choreography sequence...")
-            choreography_sequence = self._generate_choreography_sequence(
-                music_features,
-                matching_moves,
-                difficulty,
-                energy_level,
-                style
-            )
-            
-            # Step 4: Create blueprint JSON
-            logger.info("Step 4: Creating blueprint JSON...")
-            blueprint = self._create_blueprint_json(
-                task_id,
-                song_path,
-                music_features,
-                choreography_sequence,
-                difficulty,
-                energy_level,
-                style,
-                user_id
+            return self._generate(config, sequencing_mode)
+        except Exception as e:
+            logger.error(f"Blueprint generation failed: {e}", exc_info=True)
+            raise BlueprintGenerationError(f"Failed to generate blueprint: {e}") from e
+    
+    def stream_blueprint(
+        self,
+        task_id: str,
+        song_path: str,
+        difficulty: str,
+        energy_level: str,
+        style: str,
+        user_id: Optional[int] = None,
+        tempo_preference: Optional[str] = None,
+        sequencing_mode: Optional[str] = None
+    ) -> 'BlueprintStream':
+        """
+        Generate a blueprint as a stream of moves, one song section at a time.
+        
+        Generation runs lazily while the stream is iterated, so a consumer
+        (VideoAssemblyService.assemble_video_stream) can fetch the audio
+        from stream.audio_path while the song is being analyzed, and start
+        on each section's clips as soon as the section is yielded.
+        
+        Args:
+            Same as generate_blueprint
+        
+        Returns:
+            BlueprintStream; iterating it yields lists of blueprint moves,
+            and stream.blueprint holds the complete blueprint afterwards
+        """
+        config = BlueprintConfig(
+            task_id=task_id,
+            song_path=song_path,
+            difficulty=difficulty,
+            energy_level=energy_level,
+            style=style,
+            user_id=user_id,
+            tempo_preference=tempo_preference
+        )
+        return BlueprintStream(self, config, sequencing_mode)
+    
+    def _generate(
+        self,
+        config: BlueprintConfig,
+        sequencing_mode: Optional[str]
+    ) -> Dict[str, Any]:
+        """Run the full generation flow for one request and return the blueprint."""
+        sections = self._generate_sections(config, sequencing_mode)
+        while True:
+            try:
+                next(sections)
+            except StopIteration as done:
+                return done.value
+    
+    def _generate_sections(
+        self,
+        config: BlueprintConfig,
+        sequencing_mode: Optional[str]
+    ) -> Generator[List[Dict[str, Any]], None, Dict[str, Any]]:
+        """
+        Run the full generation flow for one request, one section at a time.
+        
+        Audio analysis and move search cover the whole song; sequencing then
+        runs per song section (see _sequence_sections), and each section's
+        blueprint moves are yielded as soon as it is sequenced. A cached
+        blueprint is yielded in groups of STREAM_SECTION_MOVES moves.
+        
+        Yields:
+            Non-empty lists of blueprint moves in playback order
+        
+        Returns:
+            The complete blueprint (the generator's return value)
+        """
+        logger.info(f"Starting blueprint generation for task {config.task_id}")
+        logger.info(f"Parameters: difficulty={config.difficulty}, energy={config.energy_level}, style={config.style}")
+        
+        sequencing_mode = self._resolve_sequencing_mode(sequencing_mode)
+        
+        # Reuse a cached blueprint for the same song and parameters
+        cache_entry = self._blueprint_cache_entry(
+            config.song_path, config.difficulty, config.energy_level,
+            config.style, config.tempo_preference, sequencing_mode
+        )
+        if cache_entry is not None:
+            cached = self.blueprint_cache.get(cache_entry['key'])
+            if cached is not None:
+                logger.info(f"Using cached blueprint for task {config.task_id}: {len(cached['moves'])} moves")
+                blueprint = self._apply_task_fields(cached, config.task_id, config.song_path, config.user_id)
+                size = self.STREAM_SECTION_MOVES
+                for i in range(0, len(blueprint['moves']), size):
+                    yield blueprint['moves'][i:i + size]
+                return blueprint
+        
+        # Step 1: Analyze audio features
+        logger.info("Step 1: Analyzing audio features...")
+        music_features = self._analyze_audio(config.song_path)
+        
+        # Step 2: Search for matching moves
+        logger.info("Step 2: Searching for matching moves...")
+        matching_moves = self._search_matching_moves(
+            music_features,
+            config.difficulty,
+            config.energy_level,
+            config.style
+        )
+        
+        # Step 3: Sequence moves section by section
+        logger.info("Step 3: Generating choreography sequence...")
+        choreography_sequence: List[Dict[str, Any]] = []
+        for section in self._sequence_sections(music_features, matching_moves, sequencing_mode):
+            first = len(choreography_sequence)
+            choreography_sequence.extend(section)
+            yield [self._blueprint_move(first + i, move) for i, move in enumerate(section)]
+        
+        # Step 4: Create blueprint JSON
+        logger.info("Step 4: Creating blueprint JSON...")
+        blueprint = self._create_blueprint_json(
+            config.task_id,
+            config.song_path,
+            music_features,
+            choreography_sequence,
+            config.difficulty,
+            config.energy_level,
+            config.style,
+            config.user_id
+        )
+        self._cache_blueprint(blueprint, cache_entry)
+        
+        logger.info(f"Blueprint generation complete: {len(blueprint['moves'])} moves")
+        return blueprint
+    
+    def generate_blueprints_batch(
+        self,
+        configs: List[BlueprintConfig],
+        sequencing_mode: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate blueprints for many (song, parameters) requests at once.
+        
+        Cheaper than calling generate_blueprint() per request:
+        - cached blueprints are reused as usual
+        - each distinct song is analyzed once (songs analyzed in parallel)
+        - all move searches run in one batched vector search call
+        - sequencing and blueprint creation run in parallel
+        
+        A failure only affects the requests it belongs to (e.g. an unreadable
+        song fails every request for that song); other requests still succeed.
+        
+        Args:
+            configs: One BlueprintConfig per requested blueprint
+            sequencing_mode: 'rule_based' or 'optimized' (see generate_blueprint)
+            max_workers: Thread pool size (default: BLUEPRINT_BATCH_WORKERS env
+                var, then min(8, CPU count))
+        
+        Returns:
+            One result per config, in input order, with keys task_id, status
+            ('completed' or 'failed'), cached, and blueprint or error
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv('BLUEPRINT_BATCH_WORKERS', '0')) or min(8, os.cpu_count() or 1)
+        max_workers = max(1, max_workers)
+        sequencing_mode = self._resolve_sequencing_mode(sequencing_mode)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(configs)
+        
+        def fail(index: int, error: Exception) -> None:
+            results[index] = {
+                'task_id': configs[index].task_id,
+                'status': 'failed',
+                'cached': False,
+                'error': str(error),
+            }
+        
+        # Step 0: Serve cached blueprints
+        cache_entries: Dict[int, Optional[Dict[str, str]]] = {}
+        pending_by_song: Dict[str, List[int]] = {}
+        for index, config in enumerate(configs):
+            cache_entry = self._blueprint_cache_entry(
+                config.song_path, config.difficulty, config.energy_level, config.style,
+                config.tempo_preference, sequencing_mode
             )
+            cached = self.blueprint_cache.get(cache_entry['key']) if cache_entry is not None else None
+            if cached is not None:
+                results[index] = {
+                    'task_id': config.task_id,
+                    'status': 'completed',
+                    'cached': True,
+                    'blueprint': self._apply_task_fields(cached, config.task_id, config.song_path, config.user_id),
+                }
+                continue
+            cache_entries[index] = cache_entry
+            pending_by_song.setdefault(self._resolve_song_path(config.song_path), []).append(index)
+        
+        logger.info(
+            f"Batch blueprint generation: {len(configs)} requests, "
+            f"{len(configs) - len(cache_entries)} cached, {len(pending_by_song)} songs to analyze"
+        )
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Step 1: Analyze each distinct song once
+            futures = {
+                song: executor.submit(self._analyze_audio, configs[indices[0]].song_path)
+                for song, indices in pending_by_song.items()
+            }
+            song_features: Dict[str, Any] = {}
+            for song, future in futures.items():
+                try:
+                    song_features[song] = future.result()
+                except Exception as e:
+                    for index in pending_by_song[song]:
+                        fail(index, e)
             
-            logger.info(f"Blueprint generation complete: {len(choreography_sequence)} moves")
-            return blueprint
+            # Step 2: One batched search for every remaining request
+            song_of = {index: song for song in song_features for index in pending_by_song[song]}
+            indices = sorted(song_of)
+            matching: Dict[int, List[Dict[str, Any]]] = {}
+            if indices:
+                try:
+                    song_queries = {
+                        song: self._music_query_embedding(music_features)
+                        for song, music_features in song_features.items()
+                    }
+                    search_results = self.vector_search.tiered_search_batch(
+                        np.stack([song_queries[song_of[index]] for index in indices]),
+                        [
+                            self._filter_tiers(configs[index].difficulty, configs[index].energy_level, configs[index].style)
+                            for index in indices
+                        ],
+                        top_k=int(os.getenv('VECTOR_SEARCH_TOP_K', '20'))
+                    )
+                except Exception as e:
+                    logger.error(f"Batched move search failed: {e}")
+                    search_results = None
+                    for index in indices:
+                        fail(index, BlueprintGenerationError(f"Move search failed: {e}"))
+                
+                for index, move_results in zip(indices, search_results or []):
+                    try:
+                        matching[index] = self._matching_moves_from_results(move_results)
+                    except BlueprintGenerationError as e:
+                        fail(index, e)
             
+            # Steps 3-4: Sequence and build blueprints in parallel
+            build_futures = {
+                index: executor.submit(
+                    self._build_blueprint,
+                    configs[index],
+                    song_features[song_of[index]],
+                    moves,
+                    sequencing_mode
+                )
+                for index, moves in matching.items()
+            }
+            for index, future in build_futures.items():
+                try:
+                    blueprint = future.result()
+                except Exception as e:
+                    fail(index, e)
+                    continue
+                # Cache writes stay on this thread (database access)
+                self._cache_blueprint(blueprint, cache_entries[index])
+                results[index] = {
+                    'task_id': configs[index].task_id,
+                    'status': 'completed',
+                    'cached': False,
+                    'blueprint': blueprint,
+                }
+        
+        failed = sum(1 for result in results if result['status'] == 'failed')
+        logger.info(f"Batch blueprint generation complete: {len(configs) - failed} completed, {failed} failed")
+        return results
+    
+    def _build_blueprint(
+        self,
+        config: BlueprintConfig,
+        music_features: Any,
+        matching_moves: List[Dict[str, Any]],
+        sequencing_mode: str
+    ) -> Dict[str, Any]:
+        """
+        Sequence moves and create the blueprint JSON for one request.
+        
+        Args:
+            config: Request parameters
+            music_features: MusicFeatures from audio analysis
+            matching_moves: Candidate moves from the search
+            sequencing_mode: Resolved sequencing mode
+        
+        Returns:
+            Blueprint dictionary
+        """
+        # Step 3: Generate choreography sequence
+        logger.info("Step 3: Generating choreography sequence...")
+        choreography_sequence = self._generate_choreography_sequence(
+            music_features,
+            matching_moves,
+            config.difficulty,
+            config.energy_level,
+            config.style,
+            sequencing_mode=sequencing_mode
+        )
+        
+        # Step 4: Create blueprint JSON
+        logger.info("Step 4: Creating blueprint JSON...")
+        blueprint = self._create_blueprint_json(
+            config.task_id,
+            config.song_path,
+            music_features,
+            choreography_sequence,
+            config.difficulty,
+            config.energy_level,
+            config.style,
+            config.user_id
+        )
+        
+        return blueprint
+    
+    def _cache_blueprint(self, blueprint: Dict[str, Any], cache_entry: Optional[Dict[str, str]]) -> None:
+        """Store a blueprint (without per-task fields) under its cache entry."""
+        if cache_entry is None:
+            return
+        self.blueprint_cache.put(
+            cache_entry['key'],
+            self._strip_task_fields(blueprint),
+            song_hash=cache_entry['song_hash'],
+            move_index_version=cache_entry['move_index_version']
+        )
+    
+    def _resolve_sequencing_mode(self, sequencing_mode: Optional[str]) -> str:
+        """Resolve the sequencing mode (argument, then env var, then 'rule_based')."""
+        mode = sequencing_mode or os.getenv('CHOREOGRAPHY_SEQUENCING_MODE', 'rule_based')
+        if mode not in self.SEQUENCING_MODES:
+            logger.warning(f"Unknown sequencing mode '{mode}', using rule_based")
+            mode = 'rule_based'
+        return mode
+    
+    @staticmethod
+    def _use_mezzanine_clips() -> bool:
+        """Whether blueprints reference mezzanine clips when available (USE_MEZZANINE_CLIPS)."""
+        return os.getenv('USE_MEZZANINE_CLIPS', 'True').lower() in ('true', '1', 'yes')
+    
+    def _resolve_song_path(self, song_path: str) -> str:
+        """Convert a relative song path to an absolute path under DATA_DIR."""
+        if not os.path.isabs(song_path):
+            data_dir = os.environ.get('DATA_DIR', '/app/data')
+            song_path = os.path.join(data_dir, song_path)
+        return song_path
+    
+    def _blueprint_cache_entry(
+        self,
+        song_path: str,
+        difficulty: str,
+        energy_level: str,
+        style: str,
+        tempo_preference: Optional[str],
+        sequencing_mode: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Build the blueprint cache key for a request.
+        
+        Returns:
+            Dictionary with key, song_hash and move_index_version, or None if
+            caching is disabled or the key cannot be computed
+        """
+        if self.blueprint_cache is None:
+            return None
+        
+        try:
+            song_hash = file_content_hash(self._resolve_song_path(song_path))
+            move_index_version = self.vector_search.get_index_version()
         except Exception as e:
-            logger.error(f"Blueprint generation failed: {e}", exc_info=True)
-            raise BlueprintGenerationError(f"Failed to generate blueprint: {e}") from e
+            logger.debug(f"Blueprint cache disabled for this request: {e}")
+            return None
+        
+        self.blueprint_cache.observe_move_index_version(move_index_version)
+        
+        key = BlueprintCache.make_key(
+            song_hash=song_hash,
+            difficulty=difficulty,
+            energy_level=energy_level,
+            style=style,
+            tempo_preference=tempo_preference,
+            sequencing_mode=sequencing_mode,
+            move_index_version=move_index_version,
+            generator_version=self.GENERATOR_VERSION,
+            analyzer_version=getattr(self.music_analyzer, 'ANALYZER_VERSION', None),
+            top_k=os.getenv('VECTOR_SEARCH_TOP_K', '20'),
+            mezzanine=self._use_mezzanine_clips()
+        )
+        return {'key': key, 'song_hash': song_hash, 'move_index_version': move_index_version}
+    
+    @staticmethod
+    def _strip_task_fields(blueprint: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a blueprint without per-task fields (for caching)."""
+        blueprint = copy.deepcopy(blueprint)
+        for field in ('task_id', 'audio_path', 'generation_timestamp'):
+            blueprint.pop(field, None)
+        blueprint.get('generation_parameters', {}).pop('user_id', None)
+        blueprint.get('output_config', {}).pop('output_path', None)
+        return blueprint
+    
+    @staticmethod
+    def _apply_task_fields(
+        blueprint: Dict[str, Any],
+        task_id: str,
+        song_path: str,
+        user_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """Fill in the per-task fields of a blueprint (in place)."""
+        blueprint['task_id'] = task_id
+        blueprint['audio_path'] = song_path
+        blueprint['generation_timestamp'] = datetime.utcnow().isoformat() + 'Z'
+        blueprint.setdefault('generation_parameters', {})['user_id'] = user_id
+        blueprint.setdefault('output_config', {})['output_path'] = (
+            f"output/user_{user_id}/choreography_{task_id}.mp4"
+        )
+        return blueprint
     
     def _analyze_audio(self, song_path: str) -> Any:
         """
@@ -156,10 +575,7 @@ class BlueprintGenerator:
         """
         try:
             # Convert relative path to absolute path
-            if not os.path.isabs(song_path):
-                # Prepend data directory
-                data_dir = os.environ.get('DATA_DIR', '/app/data')
-                song_path = os.path.join(data_dir, song_path)
+            song_path = self._resolve_song_path(song_path)
             
             logger.info(f"Loading audio from: {song_path}")
             
@@ -194,9 +610,12 @@ class BlueprintGenerator:
         Uses a fallback strategy if no exact matches are found:
         1. Try exact match (difficulty + energy + style)
         2. Try relaxing energy level
-        3. Try relaxing style
-        4. Try difficulty only
-        5. Try no filters (best semantic matches)
+        3. Try difficulty only
+        4. Try no filters (best semantic matches)
+        
+        All tiers are evaluated in a single scoring pass (see
+        VectorSearchService.tiered_search); moves from the strictest tier with
+        any matches are returned.
         
         Args:
             music_features: MusicFeatures from audio analysis
@@ -205,112 +624,91 @@ class BlueprintGenerator:
             style: Style preference
         
         Returns:
-            List of matching moves with metadata
+            List of matching moves with metadata (each includes the
+            'relaxation_tier' it was selected from)
         """
         try:
-            # Create weighted query embedding matching stored embeddings
-            # Music queries use audio (35%) + zero vectors for pose (35%) and text (30%)
-            # This ensures dimensional consistency with stored move embeddings
-            from services.vector_search_service import VectorSearchService
-            
-            query_embedding = VectorSearchService.combine_embeddings_weighted(
-                pose_embedding=None,  # Music doesn't have pose info
-                audio_embedding=np.array(music_features.audio_embedding, dtype=np.float32),
-                text_embedding=None   # No text info from music analysis
-            )
-            
-            logger.info(
-                f"Created weighted query embedding: dim={len(query_embedding)}, "
-                f"audio_weight={VectorSearchService.AUDIO_WEIGHT}"
-            )
-            
-            top_k = int(os.getenv('VECTOR_SEARCH_TOP_K', '20'))
-            
-            # Strategy 1: Try exact match (all filters)
-            filters = {
-                'difficulty': difficulty,
-                'energy_level': energy_level,
-                'style': style
-            }
-            
-            results = self.vector_search.search_similar_moves(
-                query_embedding,
-                filters=filters,
-                top_k=top_k
-            )
-            
-            if len(results) > 0:
-                matching_moves = [result.to_dict() for result in results]
-                logger.info(f"Found {len(matching_moves)} moves with exact filters")
-                return matching_moves
-            
-            # Strategy 2: Relax energy level (keep difficulty + style)
-            logger.warning(f"No exact matches found. Relaxing energy_level filter...")
-            filters = {
-                'difficulty': difficulty,
-                'style': style
-            }
-            
-            results = self.vector_search.search_similar_moves(
-                query_embedding,
-                filters=filters,
-                top_k=top_k
-            )
-            
-            if len(results) > 0:
-                matching_moves = [result.to_dict() for result in results]
-                logger.info(f"Found {len(matching_moves)} moves without energy_level filter")
-                return matching_moves
-            
-            # Strategy 3: Relax style (keep difficulty only)
-            logger.warning(f"Still no matches. Relaxing style filter...")
-            filters = {
-                'difficulty': difficulty
-            }
+            query_embedding = self._music_query_embedding(music_features)
             
-            results = self.vector_search.search_similar_moves(
+            results = self.vector_search.tiered_search(
                 query_embedding,
-                filters=filters,
-                top_k=top_k
+                filter_tiers=self._filter_tiers(difficulty, energy_level, style),
+                top_k=int(os.getenv('VECTOR_SEARCH_TOP_K', '20'))
             )
             
-            if len(results) > 0:
-                matching_moves = [result.to_dict() for result in results]
-                logger.info(f"Found {len(matching_moves)} moves with difficulty filter only")
-                return matching_moves
-            
-            # Strategy 4: No filters - use best semantic matches
-            logger.warning(f"Still no matches. Using semantic similarity only (no filters)...")
-            results = self.vector_search.search_similar_moves(
-                query_embedding,
-                filters=None,
-                top_k=top_k
-            )
-            
-            matching_moves = [result.to_dict() for result in results]
-            
-            if len(matching_moves) == 0:
-                raise BlueprintGenerationError(
-                    "No moves found in database. Please ensure move embeddings are generated."
-                )
-            
-            logger.info(f"Found {len(matching_moves)} moves using semantic similarity")
-            return matching_moves
+            return self._matching_moves_from_results(results)
             
         except Exception as e:
             logger.error(f"Move search failed: {e}")
             raise BlueprintGenerationError(f"Move search failed: {e}") from e
     
+    def _music_query_embedding(self, music_features: Any) -> np.ndarray:
+        """
+        Create the weighted query embedding for a song.
+        
+        Music queries use audio (35%) + zero vectors for pose (35%) and text
+        (30%), which keeps them dimensionally consistent with stored move
+        embeddings.
+        """
+        from services.vector_search_service import VectorSearchService
+        
+        query_embedding = VectorSearchService.combine_embeddings_weighted(
+            pose_embedding=None,  # Music doesn't have pose info
+            audio_embedding=np.array(music_features.audio_embedding, dtype=np.float32),
+            text_embedding=None   # No text info from music analysis
+        )
+        
+        logger.info(
+            f"Created weighted query embedding: dim={len(query_embedding)}, "
+            f"audio_weight={VectorSearchService.AUDIO_WEIGHT}"
+        )
+        return query_embedding
+    
+    def _filter_tiers(self, difficulty: str, energy_level: str, style: str) -> List[Optional[Dict[str, str]]]:
+        """Build the move search filters for each relaxation tier."""
+        requested = {
+            'difficulty': difficulty,
+            'energy_level': energy_level,
+            'style': style
+        }
+        return [
+            {key: requested[key] for key in keys} if keys else None
+            for _, keys in self.RELAXATION_TIERS
+        ]
+    
+    def _matching_moves_from_results(self, results: List[Any]) -> List[Dict[str, Any]]:
+        """Convert tiered search results to move dicts, failing if there are none."""
+        matching_moves = [result.to_dict() for result in results]
+        
+        # Prefer pre-transcoded mezzanine clips (copy-only assembly)
+        if self._use_mezzanine_clips():
+            for move in matching_moves:
+                if move.get('mezzanine_path'):
+                    move['video_path'] = move['mezzanine_path']
+        
+        if len(matching_moves) == 0:
+            raise BlueprintGenerationError(
+                "No moves found in database. Please ensure move embeddings are generated."
+            )
+        
+        tier = matching_moves[0].get('relaxation_tier', 0)
+        tier_name = self.RELAXATION_TIERS[tier][0]
+        if tier > 0:
+            logger.warning(f"No exact matches found. Relaxed filters to tier '{tier_name}'")
+        logger.info(f"Found {len(matching_moves)} moves (relaxation tier {tier}: {tier_name})")
+        return matching_moves
+    
     def _generate_choreography_sequence(
         self,
         music_features: Any,
         matching_moves: List[Dict[str, Any]],
         difficulty: str,
         energy_level: str,
-        style: str
+        style: str,
+        sequencing_mode: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Generate choreography sequence using rule-based approach.
+        Generate choreography sequence for the whole song.
         
         Args:
             music_features: MusicFeatures from audio analysis
@@ -318,70 +716,168 @@ class BlueprintGenerator:
             difficulty: Difficulty level
             energy_level: Energy level
             style: Style preference
+            sequencing_mode: 'rule_based' or 'optimized' (see generate_blueprint)
         
         Returns:
             List of selected moves with timing
         """
-        return self._generate_rule_based_sequence(
-            music_features,
-            matching_moves
-        )
+        sequence = [
+            move
+            for section in self._sequence_sections(music_features, matching_moves, sequencing_mode)
+            for move in section
+        ]
+        
+        covered = sequence[-1]['start_time'] + sequence[-1]['duration'] if sequence else 0.0
+        logger.info(f"Choreography sequence generated with {len(sequence)} moves covering {covered:.1f}s")
+        
+        return sequence
     
-    def _generate_rule_based_sequence(
+    def _sequence_sections(
         self,
         music_features: Any,
-        matching_moves: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        matching_moves: List[Dict[str, Any]],
+        sequencing_mode: Optional[str] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Generate choreography sequence using rule-based approach.
+        Sequence moves one song section at a time.
         
-        This is a fallback when AI is not available.
-        Loops through available moves to fill the ENTIRE song duration.
+        Song sections are snapped to the nearest phrase boundary and each is
+        sequenced on its own: rule-based mode continues the move cycle where
+        the previous section stopped, optimized mode runs the DP optimizer
+        per section (falling back to rule-based for a section it fails on).
+        A song without analyzed sections is a single section.
         
         Args:
             music_features: MusicFeatures from audio analysis
             matching_moves: List of matching moves
+            sequencing_mode: 'rule_based' or 'optimized' (see generate_blueprint)
         
-        Returns:
-            List of selected moves with timing
+        Yields:
+            Non-empty lists of selected moves with timing, in playback order
         """
-        sequence = []
-        current_time = 0.0
-        move_index = 0
+        mode = self._resolve_sequencing_mode(sequencing_mode)
         
         if not matching_moves:
-            logger.error("No matching moves available for rule-based sequence")
-            return sequence
+            logger.error("No matching moves available for choreography sequence")
+            return
+        if music_features.duration <= 0:
+            return
+        
+        boundaries = self.sequencer.song_phrase_boundaries(
+            music_features.beat_positions,
+            music_features.tempo,
+            music_features.duration
+        )
         
-        # Iterate through musical sections
-        for section in music_features.sections:
-            section_duration = section.end_time - section.start_time
-            section_time = 0.0
+        next_move = 0
+        for first_phrase, end_phrase in self._section_phrase_ranges(music_features, boundaries):
+            sequence = None
+            if mode == 'optimized':
+                try:
+                    sequence = self._generate_optimized_sequence(
+                        music_features, matching_moves, boundaries, first_phrase, end_phrase
+                    )
+                except Exception as e:
+                    logger.warning(f"Optimized sequencing failed: {e}. Falling back to rule-based sequence.")
             
-            logger.info(f"Filling section {section.section_type}: {section_duration:.1f}s")
+            if sequence is None:
+                sequence = self.sequencer.sequence_phrases(
+                    matching_moves, boundaries, first_phrase, end_phrase, first_move=next_move
+                )
+                # Looped moves repeat within one slot: count slots, not entries
+                next_move += len({move['phrase_index'] for move in sequence})
             
-            # Fill section with moves - LOOP through moves if needed
-            while section_time < section_duration:
-                # Use modulo to loop through moves indefinitely
-                move = matching_moves[move_index % len(matching_moves)]
-                
-                # Use move duration or default to 8 seconds
-                move_duration = min(move.get('duration', 8.0), section_duration - section_time)
-                
-                sequence.append({
-                    'move_id': move['move_id'],
-                    'move_name': move['move_name'],
-                    'video_path': move['video_path'],
-                    'start_time': current_time,
-                    'duration': move_duration,
-                    'similarity_score': move['similarity_score']
-                })
-                
-                current_time += move_duration
-                section_time += move_duration
-                move_index += 1
+            if sequence:
+                yield sequence
+    
+    def _section_phrase_ranges(self, music_features: Any, boundaries: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Split the song's phrases into one run per analyzed song section.
+        
+        Returns:
+            (first_phrase, end_phrase) pairs covering all phrases in order
+        """
+        num_phrases = len(boundaries) - 1
+        sections = getattr(music_features, 'sections', None) or []
+        section_ends = np.array([section.end_time for section in sections[:-1]], dtype=np.float64)
+        
+        # Snap each section end to the nearest phrase boundary
+        cuts = np.unique(np.abs(boundaries[:, None] - section_ends[None, :]).argmin(axis=0))
+        cuts = cuts[(cuts > 0) & (cuts < num_phrases)]
+        
+        edges = [0, *cuts.tolist(), num_phrases]
+        return list(zip(edges[:-1], edges[1:]))
+    
+    def _generate_optimized_sequence(
+        self,
+        music_features: Any,
+        matching_moves: List[Dict[str, Any]],
+        boundaries: np.ndarray,
+        first_phrase: int,
+        end_phrase: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate choreography sequence for a run of phrases with the DP optimizer.
+        
+        The phrases are split into slots about as long as a typical clip.
+        Each slot's audio is embedded and scored against all candidate moves
+        in one batched similarity call, and ChoreographyOptimizer picks the
+        move sequence balancing music fit, transitions and repetition.
+        
+        Args:
+            music_features: MusicFeatures from audio analysis
+            matching_moves: List of matching moves (the candidates)
+            boundaries: Song phrase boundaries
+            first_phrase: Index of the first phrase to fill
+            end_phrase: Boundary index where the run ends (exclusive)
+        
+        Returns:
+            List of selected moves with timing and trim/stretch instructions
+        """
+        from services.vector_search_service import VectorSearchService
+        
+        # Slots of whole phrases, sized to the median clip length
+        phrase_length = float(np.median(np.diff(boundaries)))
+        clip_length = float(np.median(self.sequencer.clip_durations(matching_moves)))
+        phrases_per_slot = max(1, int(round(clip_length / phrase_length)))
+        start_index = np.arange(first_phrase, end_phrase, phrases_per_slot)
+        end_index = np.minimum(start_index + phrases_per_slot, end_phrase)
+        
+        # One query embedding per slot, scored against all candidates at once
+        slot_audio = self.music_analyzer.segment_audio_embeddings(
+            music_features,
+            np.append(boundaries[start_index], boundaries[end_phrase])
+        )
+        queries = np.stack([
+            VectorSearchService.combine_embeddings_weighted(
+                pose_embedding=None,
+                audio_embedding=audio,
+                text_embedding=None
+            )
+            for audio in slot_audio
+        ])
+        similarity = self.vector_search.similarity_matrix(
+            queries,
+            move_ids=[move['move_id'] for move in matching_moves]
+        )
         
-        logger.info(f"Rule-based sequence generated with {len(sequence)} moves covering {current_time:.1f}s")
+        path = self.optimizer.optimize(
+            similarity,
+            ChoreographyOptimizer.transition_costs(matching_moves)
+        )
+        
+        sequence = self.sequencer.layout(matching_moves, path, boundaries, start_index, end_index)
+        # Looped moves repeat within their slot: look the slot up by phrase
+        slot_scores = {
+            int(start_index[slot]): float(similarity[slot, path[slot]]) for slot in range(len(path))
+        }
+        for move in sequence:
+            move['similarity_score'] = slot_scores[move['phrase_index']]
+        
+        logger.info(
+            f"Optimized sequence generated with {len(sequence)} moves "
+            f"({len(np.unique(path))} distinct, {phrases_per_slot} phrases per move)"
+        )
         
         return sequence
     
@@ -413,19 +909,7 @@ class BlueprintGenerator:
             Blueprint dictionary
         """
         # Build moves array
-        moves = []
-        for i, move in enumerate(choreography_sequence):
-            moves.append({
-                'clip_id': f"move_{i+1}",
-                'video_path': move['video_path'],
-                'start_time': move['start_time'],
-                'duration': move['duration'],
-                'transition_type': 'crossfade' if i > 0 else 'cut',
-                'original_duration': move['duration'],
-                'trim_start': 0.0,
-                'trim_end': 0.0,
-                'volume_adjustment': 1.0
-            })
+        moves = [self._blueprint_move(i, move) for i, move in enumerate(choreography_sequence)]
         
         # Calculate total duration
         total_duration = max(
@@ -464,6 +948,22 @@ class BlueprintGenerator:
         
         return blueprint
     
+    @staticmethod
+    def _blueprint_move(index: int, move: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the index-th sequenced move to a blueprint move."""
+        return {
+            'clip_id': f"move_{index+1}",
+            'video_path': move['video_path'],
+            'start_time': move['start_time'],
+            'duration': move['duration'],
+            'transition_type': 'crossfade' if index > 0 else 'cut',
+            'original_duration': move.get('original_duration', move['duration']),
+            'trim_start': move.get('trim_start', 0.0),
+            'trim_end': move.get('trim_end', 0.0),
+            'playback_rate': move.get('playback_rate', 1.0),
+            'volume_adjustment': 1.0
+        }
+    
     def validate_blueprint(self, blueprint: Dict[str, Any]) -> bool:
         """
         Validate blueprint schema and required fields.
@@ -523,3 +1023,67 @@ class BlueprintGenerator:
 class BlueprintGenerationError(Exception):
     """Raised when blueprint generation fails."""
     pass
+
+
+class BlueprintStream:
+    """
+    Iterable over a blueprint's moves, one song section at a time.
+    
+    Created by BlueprintGenerator.stream_blueprint(). Fields known before
+    generation (task_id, audio_path, output_path) are available up front;
+    iterating runs generation and yields each section's moves (dicts in
+    the blueprint move schema) in playback order, as soon as the section
+    is sequenced and before the next one is. Once iteration finishes,
+    `blueprint` holds the complete blueprint.
+    
+    Example:
+        >>> stream = generator.stream_blueprint(task_id, song_path, 'beginner', 'medium', 'romantic')
+        >>> for section_moves in stream:
+        ...     start_fetching(section_moves)
+        >>> stream.blueprint['moves']
+    """
+    
+    def __init__(
+        self,
+        generator: BlueprintGenerator,
+        config: BlueprintConfig,
+        sequencing_mode: Optional[str] = None
+    ):
+        self.generator = generator
+        self.config = config
+        self.sequencing_mode = sequencing_mode
+        self.blueprint: Optional[Dict[str, Any]] = None
+        self._started = False
+    
+    @property
+    def task_id(self) -> str:
+        return self.config.task_id
+    
+    @property
+    def audio_path(self) -> str:
+        return self.config.song_path
+    
+    @property
+    def output_path(self) -> str:
+        return f"output/user_{self.config.user_id}/choreography_{self.config.task_id}.mp4"
+    
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        if self._started:
+            raise BlueprintGenerationError("Blueprint stream can only be iterated once")
+        self._started = True
+        
+        sections = self.generator._generate_sections(self.config, self.sequencing_mode)
+        count = 0
+        while True:
+            try:
+                section_moves = next(sections)
+            except StopIteration as done:
+                self.blueprint = done.value
+                break
+            except Exception as e:
+                logger.error(f"Blueprint generation failed: {e}", exc_info=True)
+                raise BlueprintGenerationError(f"Failed to generate blueprint: {e}") from e
+            count += 1
+            yield section_moves
+        
+        logger.info(f"Streamed blueprint for task {self.task_id}: {len(self.blueprint['moves'])} moves in {count} sections")
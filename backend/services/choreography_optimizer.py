@@ -0,0 +1,190 @@
+"""
+Dynamic-programming choreography optimizer.
+
+Chooses one move per phrase slot by minimizing, over the whole song,
+
+    sum(-similarity[slot, move])                  how well a move fits its music
+  + transition_weight * sum(transition[a, b])     how jarring consecutive moves are
+  + repetition_penalty * (back-to-back repeats)
+  + usage_penalty * (extra uses of any move)
+
+The first three terms form a chain, so they are minimized exactly with the
+Viterbi algorithm (O(slots * candidates^2), vectorized with NumPy). The usage
+term couples all slots; it is handled by re-solving with each move's cost
+raised by how often the previous solution used it, keeping the best path.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ChoreographyOptimizer:
+    """
+    Viterbi optimizer over per-slot move candidates.
+    """
+
+    DEFAULT_TRANSITION_WEIGHT = 0.2
+    DEFAULT_REPETITION_PENALTY = 0.5
+    DEFAULT_USAGE_PENALTY = 0.05
+    DEFAULT_USAGE_ITERATIONS = 1
+
+    # Ordinal scales used for transition costs
+    ENERGY_ORDER = {'low': 0, 'medium': 1, 'high': 2}
+    DIFFICULTY_ORDER = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+    def __init__(
+        self,
+        transition_weight: float = DEFAULT_TRANSITION_WEIGHT,
+        repetition_penalty: float = DEFAULT_REPETITION_PENALTY,
+        usage_penalty: float = DEFAULT_USAGE_PENALTY,
+        usage_iterations: int = DEFAULT_USAGE_ITERATIONS
+    ):
+        """
+        Initialize optimizer.
+
+        Args:
+            transition_weight: Weight of the transition cost between moves
+            repetition_penalty: Cost of using the same move in consecutive slots
+            usage_penalty: Cost of each additional use of a move in the song
+            usage_iterations: Number of re-solves used for the usage penalty
+        """
+        self.transition_weight = transition_weight
+        self.repetition_penalty = repetition_penalty
+        self.usage_penalty = usage_penalty
+        self.usage_iterations = max(0, int(usage_iterations))
+
+    @classmethod
+    def transition_costs(cls, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Build the transition cost matrix from move metadata.
+
+        Jumps in energy level and difficulty between consecutive moves are
+        penalized; the cost is 0 for identical levels and 1 for a jump from
+        low/beginner to high/advanced in both.
+
+        Args:
+            candidates: Candidate moves with energy_level and difficulty
+
+        Returns:
+            Array of shape (num_candidates, num_candidates)
+        """
+        energy = np.array([cls.ENERGY_ORDER.get(c.get('energy_level'), 1) for c in candidates], dtype=np.float64)
+        difficulty = np.array([cls.DIFFICULTY_ORDER.get(c.get('difficulty'), 1) for c in candidates], dtype=np.float64)
+
+        return (
+            np.abs(energy[:, None] - energy[None, :])
+            + np.abs(difficulty[:, None] - difficulty[None, :])
+        ) / 4.0
+
+    def _transition_matrix(self, transition_cost: Optional[np.ndarray], num_candidates: int) -> np.ndarray:
+        """Combine weighted transition costs with the back-to-back repetition penalty."""
+        if transition_cost is None:
+            transition = np.zeros((num_candidates, num_candidates))
+        else:
+            transition = self.transition_weight * np.asarray(transition_cost, dtype=np.float64)
+        return transition + self.repetition_penalty * np.eye(num_candidates)
+
+    @staticmethod
+    def viterbi(unary_cost: np.ndarray, transition: np.ndarray) -> np.ndarray:
+        """
+        Find the minimum-cost path through a chain of slots.
+
+        Args:
+            unary_cost: Array of shape (num_slots, num_candidates)
+            transition: Array of shape (num_candidates, num_candidates), where
+                transition[a, b] is the cost of move b following move a
+
+        Returns:
+            Array of shape (num_slots,) with the chosen candidate per slot
+        """
+        num_slots, num_candidates = unary_cost.shape
+        rows = np.arange(num_candidates)
+        backpointers = np.empty((num_slots, num_candidates), dtype=np.int32)
+
+        # incoming[b, a] = transition[a, b], contiguous so the min runs along rows
+        incoming = np.ascontiguousarray(transition.T, dtype=np.float64)
+        total = np.empty_like(incoming)
+
+        cost = unary_cost[0].astype(np.float64)
+        for slot in range(1, num_slots):
+            np.add(incoming, cost, out=total)
+            best_previous = total.argmin(axis=1)
+            backpointers[slot] = best_previous
+            cost = total[rows, best_previous] + unary_cost[slot]
+
+        path = np.empty(num_slots, dtype=np.int32)
+        path[-1] = int(np.argmin(cost))
+        for slot in range(num_slots - 1, 0, -1):
+            path[slot - 1] = backpointers[slot, path[slot]]
+        return path
+
+    def total_cost(
+        self,
+        similarity: np.ndarray,
+        path: np.ndarray,
+        transition_cost: Optional[np.ndarray] = None
+    ) -> float:
+        """
+        Evaluate the full objective (including the usage penalty) for a path.
+
+        Args:
+            similarity: Array of shape (num_slots, num_candidates)
+            path: Chosen candidate per slot
+            transition_cost: Optional transition cost matrix
+
+        Returns:
+            Objective value (lower is better)
+        """
+        transition = self._transition_matrix(transition_cost, similarity.shape[1])
+        counts = np.bincount(path, minlength=similarity.shape[1])
+        return float(
+            -similarity[np.arange(len(path)), path].sum()
+            + transition[path[:-1], path[1:]].sum()
+            + self.usage_penalty * np.maximum(counts - 1, 0).sum()
+        )
+
+    def optimize(
+        self,
+        similarity: np.ndarray,
+        transition_cost: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Choose the best move for every slot.
+
+        Args:
+            similarity: Array of shape (num_slots, num_candidates) with the
+                similarity of each candidate to each slot's music
+            transition_cost: Optional (num_candidates, num_candidates) matrix
+                (e.g. from transition_costs())
+
+        Returns:
+            Array of shape (num_slots,) with the chosen candidate per slot
+        """
+        similarity = np.asarray(similarity, dtype=np.float64)
+        if similarity.ndim != 2 or 0 in similarity.shape:
+            raise ValueError(f"similarity must be a non-empty 2D array, got shape {similarity.shape}")
+
+        num_candidates = similarity.shape[1]
+        transition = self._transition_matrix(transition_cost, num_candidates)
+        unary = -similarity
+
+        best_path = self.viterbi(unary, transition)
+        best_cost = self.total_cost(similarity, best_path, transition_cost)
+
+        path = best_path
+        for _ in range(self.usage_iterations):
+            counts = np.bincount(path, minlength=num_candidates)
+            path = self.viterbi(unary + self.usage_penalty * counts[None, :], transition)
+            cost = self.total_cost(similarity, path, transition_cost)
+            if cost < best_cost:
+                best_path, best_cost = path, cost
+
+        logger.debug(
+            f"Optimized {similarity.shape[0]} slots over {num_candidates} candidates "
+            f"(cost={best_cost:.3f}, distinct moves={len(np.unique(best_path))})"
+        )
+        return best_path
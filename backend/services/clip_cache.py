@@ -0,0 +1,347 @@
+"""
+Content-addressed cache of normalized video clips.
+
+Every assembly re-encodes its source clips to the same frame rate and codec
+settings with FFmpegCommandBuilder.build_normalize_command, although the
+library only has ~150 clips. The normalized output depends only on the
+source content, the target frame rate, the codec settings and the builder
+version, so it can be reused across assemblies.
+
+Features:
+- Cache key: source content hash + frame rate + codec settings + builder version
+  (+ the trim/speed segment when only part of the clip is used)
+- Crossfade transition clips are cached too, keyed by both source clips and
+  the transition timing (make_transition_key)
+- Local disk tier (one file per key), bounded by total size with LRU eviction
+  (recency tracked through file mtimes, refreshed on every hit)
+- Safe for concurrent writers: entries are written to a temp file in the
+  cache directory and atomically renamed into place
+- Hit ratio and bytes saved reported via get_stats()
+- Cache failures never break assembly (logged and ignored)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class NormalizedClipCache:
+    """
+    Disk cache of normalized clips, keyed by content and encoding settings.
+    """
+
+    DEFAULT_MAX_BYTES = 5 * 1024 ** 3  # 5 GB
+    ENTRY_SUFFIX = '.mp4'
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize normalized clip cache.
+
+        Args:
+            cache_dir: Directory holding cached clips (created if missing)
+            max_bytes: Maximum total size of cached clips
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._evictions = 0
+
+        logger.info(f"NormalizedClipCache initialized: {cache_dir} (max {max_bytes} bytes)")
+
+    @staticmethod
+    def make_key(
+        source_hash: str,
+        frame_rate: int,
+        codec_settings: Dict[str, Any],
+        builder_version: str,
+        segment: Optional[Tuple[float, float, float]] = None
+    ) -> str:
+        """
+        Build a cache key for a normalized clip.
+
+        Args:
+            source_hash: SHA-256 of the source clip content
+            frame_rate: Target frame rate
+            codec_settings: Encoder settings used for normalization
+            builder_version: FFmpegCommandBuilder.BUILDER_VERSION
+            segment: Optional (trim_start, duration, playback_rate) applied
+                during normalization; whole clips leave it out
+
+        Returns:
+            Hex digest identifying the normalized output
+        """
+        parts = {
+            'source_hash': source_hash,
+            'frame_rate': frame_rate,
+            'codec_settings': codec_settings,
+            'builder_version': builder_version,
+        }
+        if segment is not None:
+            parts['segment'] = list(segment)
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_transition_key(
+        outgoing_hash: str,
+        incoming_hash: str,
+        frame_rate: int,
+        codec_settings: Dict[str, Any],
+        builder_version: str,
+        transition: Tuple[Any, ...]
+    ) -> str:
+        """
+        Build a cache key for a rendered crossfade between two clips.
+
+        Args:
+            outgoing_hash: SHA-256 of the clip fading out
+            incoming_hash: SHA-256 of the clip fading in
+            frame_rate: Target frame rate
+            codec_settings: Encoder settings of the transition clip
+            builder_version: FFmpegCommandBuilder.BUILDER_VERSION
+            transition: Transition duration, length and clip timing
+
+        Returns:
+            Hex digest identifying the transition clip
+        """
+        parts = {
+            'outgoing_hash': outgoing_hash,
+            'incoming_hash': incoming_hash,
+            'frame_rate': frame_rate,
+            'codec_settings': codec_settings,
+            'builder_version': builder_version,
+            'transition': list(transition),
+        }
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """Path of the cache entry for a key (sharded by the first two hex digits)."""
+        return os.path.join(self.cache_dir, key[:2], key + self.ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a normalized clip.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Path of the cached clip, or None on a miss. The file may be
+            evicted by another process later, so callers should link or copy
+            it rather than keep the path.
+        """
+        path = self.entry_path(key)
+        try:
+            size = os.path.getsize(path)
+            os.utime(path)  # refresh recency for LRU eviction
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+            self._bytes_saved += size
+        return path
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """
+        Place a cached clip at dest_path (hard link, falling back to copy).
+
+        Args:
+            key: Cache key from make_key()
+            dest_path: Destination file path
+
+        Returns:
+            True on a hit, False on a miss
+        """
+        path = self.entry_path(key)
+        try:
+            size = os.path.getsize(path)
+            os.utime(path)  # refresh recency for LRU eviction
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            try:
+                os.link(path, dest_path)
+            except OSError:
+                shutil.copyfile(path, dest_path)
+        except OSError:
+            # Missing, or evicted by another process mid-read
+            with self._lock:
+                self._misses += 1
+            return False
+
+        with self._lock:
+            self._hits += 1
+            self._bytes_saved += size
+        return True
+
+    def put(self, key: str, file_path: str) -> Optional[str]:
+        """
+        Store a normalized clip.
+
+        The file is copied to a temp file in the cache directory and renamed
+        into place, so readers never see partial entries and concurrent
+        writers of the same key are harmless (last rename wins).
+
+        Args:
+            key: Cache key from make_key()
+            file_path: Normalized clip to store
+
+        Returns:
+            Path of the cache entry, or None if storing failed
+        """
+        path = self.entry_path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            os.close(fd)
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError as e:
+            logger.warning(f"Failed to cache normalized clip {key}: {e}")
+            return None
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Args:
+            keep: Entry path never to evict (the one just written, whose
+                mtime may tie with older entries on coarse filesystems)
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(self.ENTRY_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+
+        if removed:
+            with self._lock:
+                self._evictions += removed
+            logger.info(f"Evicted {removed} normalized clips ({total} bytes remain)")
+        return removed
+
+    def clear(self) -> int:
+        """
+        Remove every cached clip.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(self.ENTRY_SUFFIX):
+                    try:
+                        os.remove(os.path.join(root, name))
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Count cached clips and their total size."""
+        entries = 0
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(self.ENTRY_SUFFIX):
+                    try:
+                        total += os.path.getsize(os.path.join(root, name))
+                        entries += 1
+                    except OSError:
+                        pass
+        return {'entries': entries, 'bytes': total}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for this process.
+
+        Returns:
+            Dictionary with hits, misses, hit_ratio, bytes_saved (normalized
+            bytes served from the cache instead of re-encoded) and evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'cache_dir': self.cache_dir,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+                'bytes_saved': self._bytes_saved,
+                'evictions': self._evictions,
+            }
+
+
+# Global instance for reuse across requests
+_clip_cache = None
+
+
+def get_clip_cache() -> Optional[NormalizedClipCache]:
+    """
+    Get or create the global normalized clip cache.
+
+    Returns:
+        NormalizedClipCache instance, or None if NORMALIZED_CLIP_CACHE_DIR is not set
+    """
+    global _clip_cache
+
+    cache_dir = os.getenv('NORMALIZED_CLIP_CACHE_DIR', '')
+    if not cache_dir:
+        return None
+
+    if _clip_cache is None or _clip_cache.cache_dir != cache_dir:
+        max_mb = int(os.getenv('NORMALIZED_CLIP_CACHE_MAX_MB', str(NormalizedClipCache.DEFAULT_MAX_BYTES // (1024 ** 2))))
+        _clip_cache = NormalizedClipCache(cache_dir, max_bytes=max_mb * 1024 ** 2)
+
+    return _clip_cache
@@ -2,6 +2,11 @@
 Elasticsearch Service
 
 Handles search queries for dance moves.
+
+Our deployment does not run an Elasticsearch cluster, so queries are served
+by the in-process BM25 keyword index (see keyword_search_service) unless
+ELASTICSEARCH_URL is explicitly configured. Cluster errors also fall back to
+the local index instead of returning no results.
 """
 import os
 import logging
@@ -10,16 +15,21 @@ logger = logging.getLogger(__name__)
 
 
 class ElasticsearchService:
-    """Service for Elasticsearch queries"""
+    """Service for move keyword queries (Elasticsearch or local BM25 index)"""
     
     def __init__(self):
-        self.url = os.environ.get('ELASTICSEARCH_URL', 'http://elasticsearch:9200')
+        self.url = os.environ.get('ELASTICSEARCH_URL')
+        self.client = None
+        
+        if not self.url:
+            logger.debug("ELASTICSEARCH_URL not set, using local keyword index")
+            return
         
         try:
             from elasticsearch import Elasticsearch
             self.client = Elasticsearch([self.url])
         except ImportError:
-            logger.warning("elasticsearch not installed")
+            logger.warning("elasticsearch not installed, using local keyword index")
             self.client = None
     
     def search_moves(self, query, difficulty=None, limit=10):
@@ -35,8 +45,7 @@ class ElasticsearchService:
             List of matching moves
         """
         if not self.client:
-            logger.warning("Elasticsearch not configured")
-            return []
+            return self._search_local(query, difficulty, limit)
         
         try:
             # Build search query
@@ -68,5 +77,31 @@ class ElasticsearchService:
             return moves
             
         except Exception as e:
-            logger.error(f"Elasticsearch search failed: {e}")
+            logger.error(f"Elasticsearch search failed: {e}. Falling back to local keyword index.")
+            return self._search_local(query, difficulty, limit)
+    
+    def _search_local(self, query, difficulty=None, limit=10):
+        """
+        Search moves with the in-process BM25 index.
+        
+        Args:
+            query: Search query string
+            difficulty: Optional difficulty filter
+            limit: Maximum number of results
+        
+        Returns:
+            List of matching move dictionaries
+        """
+        try:
+            from services.vector_search_service import get_vector_search_service
+            
+            filters = {'difficulty': difficulty} if difficulty else None
+            results = get_vector_search_service().keyword_search(query, filters=filters, top_k=limit)
+            
+            moves = [result.to_dict() for result in results]
+            logger.info(f"Found {len(moves)} moves for query: {query} (local index)")
+            return moves
+            
+        except Exception as e:
+            logger.error(f"Local keyword search failed: {e}")
             return []
@@ -0,0 +1,198 @@
+"""
+Admission control for FFmpeg processes.
+
+Every assembly runs several FFmpeg processes (normalize jobs, renders,
+the audio mux), and concurrent generation requests each start their own.
+Under load they oversubscribe the CPU, every encode slows down and every
+request runs into VIDEO_GENERATION_TIMEOUT. FFmpegAdmission bounds the
+number of FFmpeg processes running at once: a job takes a slot before its
+process starts and gives it back when the process has exited. Jobs beyond
+the limit wait in a first-come, first-served queue.
+
+Features:
+- Process-wide limit shared by all VideoAssemblyService instances
+- Optional host-wide limit across worker processes through one lock file
+  per slot (flock; first-come, first-served only within a process)
+- Queue position and waiting time reported while a job waits, so tasks
+  can show why they are not progressing
+- Usage statistics (admitted jobs, total and longest wait)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: process-wide limit only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegAdmission:
+    """
+    Fair counting semaphore for FFmpeg jobs.
+
+    Thread-safe. Use admit() around each FFmpeg process.
+    """
+
+    def __init__(self, slots: int, lock_dir: Optional[str] = None, poll_interval: float = 0.5):
+        """
+        Initialize admission control.
+
+        Args:
+            slots: FFmpeg processes allowed to run at once
+            lock_dir: Optional directory for host-wide slot lock files,
+                shared by every process using the same directory
+            poll_interval: Seconds between waiting reports (and host-wide
+                lock attempts)
+        """
+        self.slots = max(1, slots)
+        self.lock_dir = lock_dir
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._queue: deque = deque()  # tickets of waiting jobs, oldest first
+        self._tickets = count()
+        self._active = 0
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        if lock_dir:
+            if fcntl is None:
+                logger.warning("Host-wide FFmpeg slots need fcntl; limiting this process only")
+                self.lock_dir = None
+            else:
+                os.makedirs(lock_dir, exist_ok=True)
+
+        logger.info(
+            f"FFmpegAdmission initialized: {self.slots} slots"
+            + (f" (host-wide via {self.lock_dir})" if self.lock_dir else "")
+        )
+
+    @contextmanager
+    def admit(self, on_wait: Optional[Callable[[float, int], None]] = None) -> Iterator[float]:
+        """
+        Hold a slot for the duration of the block, waiting for one first.
+
+        Args:
+            on_wait: Optional callback(seconds waited, queued jobs ahead), called
+                every poll_interval while the job waits (outside the lock;
+                an exception it raises cancels the wait)
+
+        Yields:
+            Seconds the job waited for its slot
+        """
+        started = time.monotonic()
+        self._acquire(started, on_wait)
+        lock_fd = None
+        try:
+            if self.lock_dir:
+                lock_fd = self._acquire_host_slot(started, on_wait)
+            waited = time.monotonic() - started
+            with self._cond:
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            if waited >= self.poll_interval:
+                logger.debug(f"FFmpeg job admitted after {waited:.1f}s in the queue")
+            yield waited
+        finally:
+            if lock_fd is not None:
+                os.close(lock_fd)  # releases the flock
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Slots, running and queued jobs, admitted jobs, total and longest wait in seconds."""
+        with self._cond:
+            return {
+                'slots': self.slots,
+                'active': self._active,
+                'queued': len(self._queue),
+                'admitted': self._admitted,
+                'total_wait': self._total_wait,
+                'max_wait': self._max_wait,
+            }
+
+    def _acquire(self, started: float, on_wait: Optional[Callable[[float, int], None]]) -> None:
+        """Take a process-wide slot once every earlier job has one."""
+        with self._cond:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    if self._queue[0] == ticket and self._active < self.slots:
+                        self._queue.popleft()
+                        self._active += 1
+                        self._admitted += 1
+                        # The next job may fit in a slot too
+                        self._cond.notify_all()
+                        return
+                    if self._cond.wait(self.poll_interval):
+                        continue
+                    ahead = self._queue.index(ticket)
+                if on_wait:
+                    on_wait(time.monotonic() - started, ahead)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._cond.notify_all()
+            raise
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _acquire_host_slot(self, started: float, on_wait: Optional[Callable[[float, int], None]]) -> int:
+        """Lock one of the host-wide slot files; return its descriptor."""
+        while True:
+            for slot in range(self.slots):
+                path = os.path.join(self.lock_dir, f'ffmpeg_slot_{slot}.lock')
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except OSError:
+                    os.close(fd)
+            if on_wait:
+                on_wait(time.monotonic() - started, 0)
+            time.sleep(self.poll_interval)
+
+
+# Global instance shared by every assembly in the process
+_ffmpeg_admission = None
+_ffmpeg_admission_lock = threading.Lock()
+
+
+def get_ffmpeg_admission() -> Optional[FFmpegAdmission]:
+    """
+    Get or create the global FFmpeg admission control.
+
+    Returns:
+        FFmpegAdmission instance, or None if FFMPEG_MAX_CONCURRENT is not set
+        (or 0): FFmpeg processes then start without limit
+    """
+    global _ffmpeg_admission
+
+    slots = int(os.getenv('FFMPEG_MAX_CONCURRENT', '0') or 0)
+    if slots <= 0:
+        return None
+    lock_dir = os.getenv('FFMPEG_SLOT_LOCK_DIR', '') or None
+
+    with _ffmpeg_admission_lock:
+        if (
+            _ffmpeg_admission is None
+            or _ffmpeg_admission.slots != slots
+            or _ffmpeg_admission.lock_dir != lock_dir
+        ):
+            _ffmpeg_admission = FFmpegAdmission(slots, lock_dir=lock_dir)
+
+    return _ffmpeg_admission
@@ -10,12 +10,32 @@ Features:
 - Comprehensive logging
 """
 
+import os
+import math
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def parse_bitrate(bitrate: str) -> Optional[int]:
+    """
+    Parse an FFmpeg bitrate string ('2M', '128k', '800000') to bits per second.
+    
+    Returns:
+        Bits per second, or None if the string is not a bitrate
+    """
+    multipliers = {'k': 1000, 'm': 1000 ** 2, 'g': 1000 ** 3}
+    text = str(bitrate).strip().lower()
+    multiplier = multipliers.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return None
+
+
 class FFmpegCommandBuilder:
     """
     Builder for FFmpeg commands with CPU-based encoding.
@@ -34,6 +54,46 @@ class FFmpegCommandBuilder:
     CPU_PRESET = 'ultrafast'  # For speed during normalization
     CPU_PRESET_FINAL = 'medium'  # For final output quality
     
+    # Normalization encoder settings
+    NORMALIZE_CODEC = 'libx264'
+    NORMALIZE_CRF = 18  # High quality
+    NORMALIZE_PIX_FMT = 'yuv420p'
+    
+    # Mux-only audio: ffprobe codec_name produced by each encoder, and how far
+    # above the target bitrate a stream may be and still be copied
+    ENCODER_CODEC_NAMES = {'libx264': 'h264', 'libx265': 'hevc', 'libvpx-vp9': 'vp9', 'libaom-av1': 'av1'}
+    VIDEO_COPY_BITRATE_TOLERANCE = 1.25
+    
+    # Bump when command output changes (invalidates cached normalized clips)
+    BUILDER_VERSION = '1'
+    
+    # Mezzanine format: every library clip pre-transcoded to identical stream
+    # parameters so assembly can concatenate with stream copy
+    MEZZANINE_VERSION = '1'  # Bump when the format changes (new storage prefix)
+    MEZZANINE_PREFIX = f'mezzanine/v{MEZZANINE_VERSION}'
+    MEZZANINE_FRAME_RATE = 30
+    MEZZANINE_WIDTH = 1280
+    MEZZANINE_HEIGHT = 720
+    MEZZANINE_PROFILE = 'high'
+    MEZZANINE_PRESET = 'medium'
+    MEZZANINE_CRF = 18
+    MEZZANINE_GOP = 30  # One closed GOP per second
+    MEZZANINE_TIMESCALE = 15360  # Same track timebase for every clip
+    
+    # Progressive output: HLS playlist of fragmented MP4 segments
+    HLS_SEGMENT_SECONDS = 4
+    HLS_INIT_FILENAME = 'init.mp4'
+    HLS_SEGMENT_FILENAME = 'segment_%05d.m4s'
+    
+    # Draft preview profile: small, low frame rate clips that encode in a
+    # fraction of the time of normalized clips and are muxed as-is
+    PREVIEW_FRAME_RATE = 15
+    PREVIEW_WIDTH = 640
+    PREVIEW_HEIGHT = 360
+    PREVIEW_PRESET = 'veryfast'
+    PREVIEW_CRF = 30
+    PREVIEW_AUDIO_BITRATE = '64k'
+    
     def __init__(self):
         """
         Initialize FFmpeg command builder (CPU-only).
@@ -44,37 +104,472 @@ class FFmpegCommandBuilder:
         self,
         input_file: str,
         output_file: str,
-        frame_rate: int = DEFAULT_FRAME_RATE
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        threads: Optional[int] = None,
+        trim_start: float = 0.0,
+        duration: Optional[float] = None,
+        playback_rate: float = 1.0
     ) -> List[str]:
         """
         Build FFmpeg command for normalizing video frame rate.
         
-        Uses libx264 with ultrafast preset for speed.
+        Uses libx264 with ultrafast preset for speed. The optional segment
+        arguments cut and retime the clip in the same encode: the output
+        plays the source from trim_start at playback_rate for duration
+        seconds. Input seeking is frame-accurate when re-encoding.
         
         Args:
             input_file: Input video file path
             output_file: Output video file path
             frame_rate: Target frame rate (default: 30)
+            threads: Encoder threads (default: FFmpeg picks one per core,
+                which oversubscribes the CPU when clips run in parallel)
+            trim_start: Source seconds to skip (default: 0)
+            duration: Output length in seconds (default: whole clip)
+            playback_rate: Speed factor (default: 1.0)
         
         Returns:
             List of command arguments for subprocess
         """
         cmd = [
             'ffmpeg',
+            *self._seek_args(trim_start),
             '-i', input_file,
-            '-c:v', 'libx264',  # CPU encoder
-            '-preset', self.CPU_PRESET,  # Fast preset
-            '-r', str(frame_rate),  # Target frame rate
-            '-crf', '18',  # High quality
-            '-pix_fmt', 'yuv420p',  # Pixel format
+            *self._speed_args(playback_rate),
+            *self._normalize_encode_args(frame_rate),
+            *self._duration_args(duration),
+            '-an',  # No audio
+        ]
+        
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built normalize command: {' '.join(cmd)}")
+        return cmd
+    
+    def normalize_settings(self) -> Dict[str, Any]:
+        """
+        Get the encoder settings used by build_normalize_command.
+        
+        Used (with the frame rate and BUILDER_VERSION) to key cached
+        normalized clips.
+        
+        Returns:
+            Dictionary of codec, preset, crf, pix_fmt and audio handling
+        """
+        return {
+            'codec': self.NORMALIZE_CODEC,
+            'preset': self.CPU_PRESET,
+            'crf': self.NORMALIZE_CRF,
+            'pix_fmt': self.NORMALIZE_PIX_FMT,
+            'audio': 'none',
+        }
+    
+    def build_preview_command(
+        self,
+        input_file: str,
+        output_file: str,
+        threads: Optional[int] = None,
+        trim_start: float = 0.0,
+        duration: Optional[float] = None,
+        playback_rate: float = 1.0
+    ) -> List[str]:
+        """
+        Build FFmpeg command for the draft preview version of a clip.
+        
+        Output: H.264 at PREVIEW_FRAME_RATE fps, PREVIEW_WIDTH x
+        PREVIEW_HEIGHT (letterboxed), yuv420p, fixed track timescale and no
+        audio, so preview clips join with stream copy and the joined video
+        is muxed with the audio without another encode. The segment
+        arguments work as in build_normalize_command.
+        
+        Args:
+            input_file: Input video file path
+            output_file: Output video file path
+            threads: Optional encoder thread count
+            trim_start: Source seconds to skip (default: 0)
+            duration: Output length in seconds (default: whole clip)
+            playback_rate: Speed factor (default: 1.0)
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        video_filter = self._frame_filter(self.PREVIEW_FRAME_RATE, self.PREVIEW_WIDTH, self.PREVIEW_HEIGHT)
+        if playback_rate != 1.0:
+            video_filter = f'setpts=PTS/{playback_rate:g},' + video_filter
+        cmd = [
+            'ffmpeg',
+            *self._seek_args(trim_start),
+            '-i', input_file,
+            '-map', '0:v:0',  # First video stream only
+            '-vf', video_filter,
+            '-c:v', self.NORMALIZE_CODEC,
+            '-preset', self.PREVIEW_PRESET,
+            '-crf', str(self.PREVIEW_CRF),
+            '-video_track_timescale', str(self.MEZZANINE_TIMESCALE),
+            *self._duration_args(duration),
+            '-an',  # No audio
+        ]
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built preview command: {' '.join(cmd)}")
+        return cmd
+    
+    def preview_settings(self) -> Dict[str, Any]:
+        """
+        Get the encoder settings used by build_preview_command.
+        
+        Keys cached preview clips, as normalize_settings does for
+        normalized clips.
+        
+        Returns:
+            Dictionary of codec, preset, crf, frame size and audio handling
+        """
+        return {
+            'codec': self.NORMALIZE_CODEC,
+            'preset': self.PREVIEW_PRESET,
+            'crf': self.PREVIEW_CRF,
+            'size': f'{self.PREVIEW_WIDTH}x{self.PREVIEW_HEIGHT}',
+            'pix_fmt': self.NORMALIZE_PIX_FMT,
+            'audio': 'none',
+        }
+    
+    def build_mezzanine_command(
+        self,
+        input_file: str,
+        output_file: str,
+        threads: Optional[int] = None,
+        trim_start: float = 0.0,
+        duration: Optional[float] = None,
+        playback_rate: float = 1.0
+    ) -> List[str]:
+        """
+        Build FFmpeg command for transcoding a library clip to the mezzanine format.
+        
+        Output: H.264 high profile, constant MEZZANINE_FRAME_RATE fps,
+        MEZZANINE_WIDTH x MEZZANINE_HEIGHT (letterboxed to keep the aspect
+        ratio), yuv420p, square pixels, fixed closed GOP without scene-cut
+        keyframes, fixed track timescale and no audio. Clips in this format
+        can be joined with the concat demuxer using stream copy.
+        
+        The segment arguments (as in build_normalize_command) re-cut a
+        mezzanine clip that cannot be cut with stream copy.
+        
+        Args:
+            input_file: Input video file path
+            output_file: Output video file path
+            threads: Optional encoder thread count
+            trim_start: Source seconds to skip (default: 0)
+            duration: Output length in seconds (default: whole clip)
+            playback_rate: Speed factor (default: 1.0)
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        video_filter = self._frame_filter(
+            self.MEZZANINE_FRAME_RATE, self.MEZZANINE_WIDTH, self.MEZZANINE_HEIGHT
+        )
+        if playback_rate != 1.0:
+            video_filter = f'setpts=PTS/{playback_rate:g},' + video_filter
+        cmd = [
+            'ffmpeg',
+            *self._seek_args(trim_start),
+            '-i', input_file,
+            '-map', '0:v:0',  # First video stream only
+            '-vf', video_filter,
+            *self._mezzanine_encode_args(),
+            *self._duration_args(duration),
+            '-an',  # No audio
+        ]
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built mezzanine command: {' '.join(cmd)}")
+        return cmd
+    
+    def build_cut_command(
+        self,
+        input_file: str,
+        output_file: str,
+        trim_start: float,
+        duration: float
+    ) -> List[str]:
+        """
+        Build FFmpeg command for cutting a clip with stream copy (no re-encode).
+        
+        Only exact when trim_start is on a keyframe (see
+        mezzanine_keyframe_aligned): with stream copy, FFmpeg starts at the
+        keyframe at or before the seek point.
+        
+        Args:
+            input_file: Input video file path
+            output_file: Output video file path
+            trim_start: Source seconds to skip
+            duration: Output length in seconds
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        cmd = [
+            'ffmpeg',
+            *self._seek_args(trim_start),
+            '-i', input_file,
+            *self._duration_args(duration),
+            '-c', 'copy',  # Copy codec - no re-encoding
+            '-avoid_negative_ts', 'make_zero',
             '-an',  # No audio
             '-y',  # Overwrite output
             output_file
         ]
         
-        logger.debug(f"Built normalize command: {' '.join(cmd)}")
+        logger.debug(f"Built cut command: {' '.join(cmd)}")
+        return cmd
+    
+    def mezzanine_keyframe_aligned(self, seconds: float) -> bool:
+        """
+        Whether a time falls on a mezzanine keyframe (within half a frame).
+        
+        Mezzanine clips have a fixed closed GOP of MEZZANINE_GOP frames, so
+        keyframes are at known times and no probing is needed.
+        """
+        interval = self.MEZZANINE_GOP / self.MEZZANINE_FRAME_RATE
+        offset = seconds - round(seconds / interval) * interval
+        return abs(offset) <= 0.5 / self.MEZZANINE_FRAME_RATE
+    
+    def next_mezzanine_keyframe(self, seconds: float) -> float:
+        """First mezzanine keyframe time at or after seconds (within half a frame)."""
+        interval = self.MEZZANINE_GOP / self.MEZZANINE_FRAME_RATE
+        return math.ceil(seconds / interval - 0.5 / self.MEZZANINE_GOP) * interval
+    
+    def build_transition_command(
+        self,
+        outgoing_file: str,
+        incoming_file: str,
+        output_file: str,
+        duration: float,
+        length: float,
+        outgoing_start: Optional[float] = None,
+        outgoing_rate: float = 1.0,
+        incoming_start: float = 0.0,
+        incoming_rate: float = 1.0,
+        mezzanine: bool = False,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        threads: Optional[int] = None
+    ) -> List[str]:
+        """
+        Build FFmpeg command rendering a crossfade between two clips as a short clip.
+        
+        The output is length seconds of the incoming clip (from
+        incoming_start at incoming_rate) with the outgoing clip fading out
+        over its first duration seconds. The outgoing clip continues from
+        outgoing_start (its last frame when None) and holds its last frame
+        if the source ends first. Only this overlap is encoded; the clips
+        either side are concatenated with stream copy, so the output uses
+        the same encoder settings as them: the mezzanine format, or the
+        normalize settings with the incoming clip scaled to the outgoing
+        clip's frame size.
+        
+        Args:
+            outgoing_file: Clip fading out
+            incoming_file: Clip fading in
+            output_file: Output video file path
+            duration: Crossfade length in seconds
+            length: Output length in seconds (at least duration)
+            outgoing_start: Source seconds where the outgoing clip continues
+                (default: its last frame)
+            outgoing_rate: Outgoing clip speed factor (default: 1.0)
+            incoming_start: Source seconds where the incoming clip starts
+            incoming_rate: Incoming clip speed factor (default: 1.0)
+            mezzanine: Encode in the mezzanine format instead of the
+                normalize settings
+            frame_rate: Frame rate when not in the mezzanine format
+            threads: Optional encoder thread count
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        if mezzanine:
+            frame_rate = self.MEZZANINE_FRAME_RATE
+            frame_filter = self._frame_filter(frame_rate, self.MEZZANINE_WIDTH, self.MEZZANINE_HEIGHT)
+            encode_args = self._mezzanine_encode_args()
+        else:
+            frame_filter = f'fps={frame_rate},format={self.NORMALIZE_PIX_FMT},setsar=1'
+            encode_args = self._normalize_encode_args(frame_rate)
+        
+        if outgoing_start is None:
+            outgoing_seek = ['-sseof', f'{-1.0 / frame_rate:g}']  # Last frame
+        else:
+            outgoing_seek = self._seek_args(outgoing_start)
+        
+        filters = [
+            f'[0:v:0]setpts=(PTS-STARTPTS)/{outgoing_rate:g},{frame_filter},'
+            f'tpad=stop_mode=clone:stop_duration={duration:g},trim=duration={duration:g}[out]',
+            f'[1:v:0]setpts=(PTS-STARTPTS)/{incoming_rate:g},{frame_filter},trim=duration={length:g}[in]',
+        ]
+        if mezzanine:
+            filters.append(f'[out][in]xfade=transition=fade:duration={duration:g}:offset=0[v]')
+        else:
+            # xfade needs equal frame sizes; normalized clips keep their own
+            filters.append(
+                f'[in][out]scale2ref[scaled][ref];'
+                f'[ref][scaled]xfade=transition=fade:duration={duration:g}:offset=0[v]'
+            )
+        
+        cmd = [
+            'ffmpeg',
+            *outgoing_seek,
+            '-i', outgoing_file,
+            *self._seek_args(incoming_start),
+            '-i', incoming_file,
+            '-filter_complex', ';'.join(filters),
+            '-map', '[v]',
+            *encode_args,
+            *self._duration_args(length),
+            '-an',  # No audio
+        ]
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built transition command: {' '.join(cmd)}")
         return cmd
     
+    def with_progress_output(self, cmd: List[str]) -> List[str]:
+        """
+        Copy of an FFmpeg command that writes -progress blocks to stdout.
+        
+        The periodic stats line on stderr is turned off (-nostats); errors
+        are still written there.
+        """
+        return [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+    
+    def with_hls_output(
+        self,
+        cmd: List[str],
+        playlist_file: str,
+        segment_seconds: float = HLS_SEGMENT_SECONDS,
+        frame_rate: int = DEFAULT_FRAME_RATE
+    ) -> List[str]:
+        """
+        Copy of an FFmpeg command that writes an HLS playlist of fMP4 segments.
+        
+        The command's output file (its last argument) is replaced by
+        playlist_file; the init segment and media segments are written next
+        to it. Segments and the playlist are written to temporary names and
+        renamed when complete, so every segment the playlist lists is
+        finished. The playlist is an event playlist: it keeps every segment
+        and gets #EXT-X-ENDLIST when FFmpeg exits.
+        
+        When the command encodes the video, keyframes are forced every
+        segment_seconds so segments can be cut there; a copied video stream
+        is cut at its existing keyframes.
+        
+        Args:
+            cmd: FFmpeg command ending with '-y', output_file
+            playlist_file: Local path of the .m3u8 playlist
+            segment_seconds: Target segment length
+            frame_rate: Output frame rate (sets the GOP of an encoded video)
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        output_dir = os.path.dirname(playlist_file)
+        args = cmd[:-1]
+        if args[-1:] == ['-y']:
+            args = args[:-1]
+        
+        copy_video = any(a == 'copy' and b in ('-c:v', '-vcodec') for b, a in zip(args, args[1:]))
+        if not copy_video:
+            args.extend([
+                '-force_key_frames', f'expr:gte(t,n_forced*{segment_seconds})',
+                '-g', str(int(round(frame_rate * segment_seconds))),
+            ])
+        args.extend([
+            '-f', 'hls',
+            '-hls_time', str(segment_seconds),
+            '-hls_playlist_type', 'event',  # Segments are only appended
+            '-hls_segment_type', 'fmp4',
+            '-hls_fmp4_init_filename', self.HLS_INIT_FILENAME,
+            '-hls_segment_filename', os.path.join(output_dir, self.HLS_SEGMENT_FILENAME),
+            '-hls_flags', 'independent_segments+temp_file',
+            '-y',  # Overwrite output
+            playlist_file
+        ])
+        
+        logger.debug(f"Built HLS output: {playlist_file} ({segment_seconds}s segments)")
+        return args
+    
+    def _normalize_encode_args(self, frame_rate: int) -> List[str]:
+        """Encoder arguments of normalized clips (see normalize_settings)."""
+        return [
+            '-c:v', self.NORMALIZE_CODEC,  # CPU encoder
+            '-preset', self.CPU_PRESET,  # Fast preset
+            '-r', str(frame_rate),  # Target frame rate
+            '-crf', str(self.NORMALIZE_CRF),  # High quality
+            '-pix_fmt', self.NORMALIZE_PIX_FMT,  # Pixel format
+        ]
+    
+    def _mezzanine_encode_args(self) -> List[str]:
+        """Encoder arguments of mezzanine clips."""
+        return [
+            '-c:v', 'libx264',
+            '-profile:v', self.MEZZANINE_PROFILE,
+            '-preset', self.MEZZANINE_PRESET,
+            '-crf', str(self.MEZZANINE_CRF),
+            '-g', str(self.MEZZANINE_GOP),
+            '-keyint_min', str(self.MEZZANINE_GOP),
+            '-sc_threshold', '0',  # No scene-cut keyframes: fixed GOP
+            '-flags', '+cgop',  # Closed GOPs
+            '-video_track_timescale', str(self.MEZZANINE_TIMESCALE),
+            '-movflags', '+faststart',
+        ]
+    
+    @staticmethod
+    def _seek_args(trim_start: float) -> List[str]:
+        """Input seek arguments (placed before -i) for a clip start offset."""
+        return ['-ss', f'{trim_start:g}'] if trim_start and trim_start > 0 else []
+    
+    @staticmethod
+    def _duration_args(duration: Optional[float]) -> List[str]:
+        """Output duration arguments for a clip length."""
+        return ['-t', f'{duration:g}'] if duration else []
+    
+    @staticmethod
+    def _speed_args(playback_rate: float) -> List[str]:
+        """Video filter arguments for a playback speed change."""
+        return ['-vf', f'setpts=PTS/{playback_rate:g}'] if playback_rate != 1.0 else []
+    
+    def _frame_filter(self, frame_rate: int, width: int, height: int) -> str:
+        """Filter chain converting any clip to a fixed fps, letterboxed frame size and yuv420p."""
+        return (
+            f'fps={frame_rate},'
+            f'scale={width}:{height}:force_original_aspect_ratio=decrease,'
+            f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,'
+            f'setsar=1,format=yuv420p'
+        )
+    
+    def mezzanine_path(self, video_path: str) -> str:
+        """
+        Storage path of the mezzanine version of a library clip.
+        
+        Args:
+            video_path: Storage path of the source clip
+        
+        Returns:
+            Path under MEZZANINE_PREFIX with an .mp4 extension
+        """
+        stem, _ = os.path.splitext(video_path.lstrip('/'))
+        return f'{self.MEZZANINE_PREFIX}/{stem}.mp4'
+    
+    def is_mezzanine_path(self, video_path: str) -> bool:
+        """Whether a storage path is a clip in the current mezzanine format."""
+        return isinstance(video_path, str) and video_path.startswith(self.MEZZANINE_PREFIX + '/')
+    
     def build_concat_command(
         self,
         concat_file: str,
@@ -113,7 +608,8 @@ class FFmpegCommandBuilder:
         video_codec: str = 'libx264',
         audio_codec: str = 'aac',
         video_bitrate: str = DEFAULT_VIDEO_BITRATE,
-        audio_bitrate: str = DEFAULT_AUDIO_BITRATE
+        audio_bitrate: str = DEFAULT_AUDIO_BITRATE,
+        copy_video: bool = False
     ) -> List[str]:
         """
         Build FFmpeg command for adding audio to video.
@@ -126,16 +622,24 @@ class FFmpegCommandBuilder:
             audio_codec: Audio codec (default: aac)
             video_bitrate: Video bitrate (default: 2M)
             audio_bitrate: Audio bitrate (default: 128k)
+            copy_video: Mux only: copy the video stream as-is and encode
+                just the audio (see video_matches_output)
         
         Returns:
             List of command arguments for subprocess
         """
+        if copy_video:
+            video_args = ['-c:v', 'copy']  # No video re-encode
+        else:
+            video_args = [
+                '-c:v', video_codec,  # CPU encoder
+                '-b:v', video_bitrate,  # Video bitrate
+            ]
         cmd = [
             'ffmpeg',
             '-i', video_file,
             '-i', audio_file,
-            '-c:v', video_codec,  # CPU encoder
-            '-b:v', video_bitrate,  # Video bitrate
+            *video_args,
             '-c:a', audio_codec,  # Audio codec
             '-b:a', audio_bitrate,  # Audio bitrate
             '-shortest',  # Match shortest input
@@ -146,6 +650,227 @@ class FFmpegCommandBuilder:
         logger.debug(f"Built add audio command: {' '.join(cmd)}")
         return cmd
     
+    def build_probe_command(self, input_file: str) -> List[str]:
+        """
+        Build ffprobe command reporting the first video stream as JSON.
+        
+        Args:
+            input_file: Video file path
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        return [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=codec_name,pix_fmt,width,height,bit_rate:format=bit_rate',
+            '-of', 'json',
+            input_file
+        ]
+    
+    def video_matches_output(
+        self,
+        probe: Dict[str, Any],
+        video_codec: str = 'libx264',
+        video_bitrate: str = DEFAULT_VIDEO_BITRATE
+    ) -> bool:
+        """
+        Whether a probed video can be muxed as-is instead of re-encoded.
+        
+        The stream must be in the codec the encoder would produce, in
+        yuv420p, and at most VIDEO_COPY_BITRATE_TOLERANCE times the target
+        bitrate. An unknown bitrate never matches.
+        
+        Args:
+            probe: Parsed ffprobe JSON from build_probe_command
+            video_codec: Output encoder from output_config
+            video_bitrate: Output bitrate from output_config
+        
+        Returns:
+            True if the video stream can be copied
+        """
+        streams = probe.get('streams') or []
+        if not streams:
+            return False
+        stream = streams[0]
+        
+        expected_codec = self.ENCODER_CODEC_NAMES.get(video_codec, video_codec)
+        if stream.get('codec_name') != expected_codec or stream.get('pix_fmt') != 'yuv420p':
+            return False
+        
+        target = parse_bitrate(video_bitrate)
+        # Stream bit_rate is 'N/A' for some muxers; fall back to the container's
+        for actual in (stream.get('bit_rate'), (probe.get('format') or {}).get('bit_rate')):
+            try:
+                actual = int(actual)
+            except (TypeError, ValueError):
+                continue
+            return target is not None and actual <= target * self.VIDEO_COPY_BITRATE_TOLERANCE
+        return False
+    
+    def build_single_pass_command(
+        self,
+        video_files: List[str],
+        audio_file: str,
+        output_file: str,
+        segments: Optional[List[Optional[Tuple[float, float, float]]]] = None,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        width: int = MEZZANINE_WIDTH,
+        height: int = MEZZANINE_HEIGHT,
+        video_codec: str = 'libx264',
+        audio_codec: str = 'aac',
+        video_bitrate: str = DEFAULT_VIDEO_BITRATE,
+        audio_bitrate: str = DEFAULT_AUDIO_BITRATE,
+        threads: Optional[int] = None
+    ) -> List[str]:
+        """
+        Build one FFmpeg command that renders the final video from the clips.
+        
+        Replaces normalize + concat + add audio (three encodes) with a single
+        decode/encode pass: every clip is an input, gets its own fps, scale
+        and optional trim/speed filters, and the concat filter joins them
+        before the audio is mapped in.
+        
+        Each clip is a separate input even when a file repeats, because
+        split would buffer decoded frames until the later use.
+        
+        Args:
+            video_files: Clip paths in playback order
+            audio_file: Audio file path
+            output_file: Output video file path
+            segments: Optional (trim_start, duration, playback_rate) per
+                clip, as in build_normalize_command (duration is the output
+                length); a None entry keeps the clip whole
+            frame_rate: Output frame rate (default: 30)
+            width: Output width (default: mezzanine width, so mezzanine
+                clips are not rescaled)
+            height: Output height (default: mezzanine height)
+            video_codec: Video codec (default: libx264)
+            audio_codec: Audio codec (default: aac)
+            video_bitrate: Video bitrate (default: 2M)
+            audio_bitrate: Audio bitrate (default: 128k)
+            threads: Optional encoder thread count
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        filters = self._join_clips_filter(video_files, segments, frame_rate, width, height)
+        
+        cmd = ['ffmpeg']
+        for video_file in video_files:
+            cmd.extend(['-i', video_file])
+        cmd.extend([
+            '-i', audio_file,
+            '-filter_complex', filters,
+            '-map', '[vout]',
+            '-map', f'{len(video_files)}:a:0',
+            '-c:v', video_codec,  # CPU encoder
+            '-b:v', video_bitrate,  # Video bitrate
+            '-c:a', audio_codec,  # Audio codec
+            '-b:a', audio_bitrate,  # Audio bitrate
+            '-shortest',  # Match shortest input
+        ])
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built single pass command: {len(video_files)} clips, {len(cmd)} arguments")
+        return cmd
+    
+    def build_segment_command(
+        self,
+        video_files: List[str],
+        output_file: str,
+        segments: Optional[List[Optional[Tuple[float, float, float]]]] = None,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        width: int = MEZZANINE_WIDTH,
+        height: int = MEZZANINE_HEIGHT,
+        video_codec: str = 'libx264',
+        video_bitrate: str = DEFAULT_VIDEO_BITRATE,
+        threads: Optional[int] = None
+    ) -> List[str]:
+        """
+        Build FFmpeg command that encodes one part of the final video (no audio).
+        
+        The clips are filtered and joined as in build_single_pass_command.
+        Every part of a video is encoded with the same settings, closed GOPs
+        and a fixed track timescale, so the parts can be joined with the
+        concat demuxer using stream copy.
+        
+        Args:
+            video_files: Clip paths in playback order
+            output_file: Output video file path
+            segments: Optional (trim_start, duration, playback_rate) per clip
+            frame_rate: Output frame rate (default: 30)
+            width: Output width (default: mezzanine width)
+            height: Output height (default: mezzanine height)
+            video_codec: Video codec (default: libx264)
+            video_bitrate: Video bitrate (default: 2M)
+            threads: Optional encoder thread count
+        
+        Returns:
+            List of command arguments for subprocess
+        """
+        filters = self._join_clips_filter(video_files, segments, frame_rate, width, height)
+        
+        cmd = ['ffmpeg']
+        for video_file in video_files:
+            cmd.extend(['-i', video_file])
+        cmd.extend([
+            '-filter_complex', filters,
+            '-map', '[vout]',
+            '-c:v', video_codec,  # CPU encoder
+            '-b:v', video_bitrate,  # Video bitrate
+            '-g', str(frame_rate),  # One GOP per second
+            '-flags', '+cgop',  # Closed GOPs
+            '-video_track_timescale', str(self.MEZZANINE_TIMESCALE),
+            '-an',  # Audio is added to the joined video
+        ])
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        cmd.extend(['-y', output_file])
+        
+        logger.debug(f"Built segment command: {len(video_files)} clips, {len(cmd)} arguments")
+        return cmd
+    
+    def _join_clips_filter(
+        self,
+        video_files: List[str],
+        segments: Optional[List[Optional[Tuple[float, float, float]]]],
+        frame_rate: int,
+        width: int,
+        height: int
+    ) -> str:
+        """
+        filter_complex graph that cuts, conforms and concatenates every input clip into [vout].
+        
+        Raises:
+            ValueError: If there are no clips or the segments do not match them
+        """
+        if not video_files:
+            raise ValueError("At least one video file is required")
+        if segments is not None and len(segments) != len(video_files):
+            raise ValueError("segments must have one entry per video file")
+        
+        frame_filter = self._frame_filter(frame_rate, width, height)
+        filters = []
+        for idx in range(len(video_files)):
+            segment = segments[idx] if segments else None
+            if segment:
+                trim_start, duration, playback_rate = segment
+                # Cut in source time, then retime so the segment lasts duration
+                chain = (
+                    f'trim=start={trim_start:g}:duration={duration * playback_rate:g},'
+                    f'setpts=(PTS-STARTPTS)/{playback_rate:g}'
+                )
+            else:
+                chain = 'setpts=PTS-STARTPTS'
+            filters.append(f'[{idx}:v:0]{chain},{frame_filter}[v{idx}]')
+        labels = ''.join(f'[v{idx}]' for idx in range(len(video_files)))
+        filters.append(f'{labels}concat=n={len(video_files)}:v=1:a=0[vout]')
+        return ';'.join(filters)
+    
     def get_info(self) -> Dict[str, Any]:
         """
         Get information about the FFmpeg builder configuration.
@@ -0,0 +1,232 @@
+"""
+FFmpeg progress parsing and stage progress reporting.
+
+FFmpeg run with `-progress pipe:1` writes key=value lines to stdout, one
+block per update, each ending with `progress=continue` (or `progress=end`).
+The position in the output (out_time_us) against the expected output
+duration gives the completed fraction of a long encode, and `speed` (media
+seconds per wall-clock second) gives its ETA.
+
+Features:
+- Incremental parser for -progress blocks (parse_progress)
+- StageProgress: maps a stage's completed fraction onto its slice of the
+  overall 0-100 progress, with an ETA in the message
+- Callbacks throttled to one per interval (and only when the percentage
+  changes), so progress updates do not hammer the task table
+- Time spent waiting for an FFmpeg slot (see FFmpegAdmission) shown in
+  the stage message
+"""
+
+import re
+import math
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# out_time is HH:MM:SS.microseconds
+_OUT_TIME_PATTERN = re.compile(r'^(-?\d+):(\d{2}):(\d{2}(?:\.\d+)?)$')
+
+
+def parse_progress(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """
+    Group FFmpeg -progress output lines into one dict per update.
+
+    Args:
+        lines: Lines of FFmpeg -progress output (e.g. a process's stdout)
+
+    Yields:
+        Dict of key/value pairs, ending with the 'progress' key
+    """
+    block: Dict[str, str] = {}
+    for line in lines:
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            continue
+        block[key] = value.strip()
+        if key == 'progress':
+            yield block
+            block = {}
+
+
+def progress_seconds(block: Dict[str, str]) -> Optional[float]:
+    """
+    Output position of a progress block in seconds.
+
+    Uses out_time_us, then out_time_ms (which FFmpeg also writes in
+    microseconds), then out_time.
+
+    Returns:
+        Seconds of output written, or None if the block has no valid position
+    """
+    for key in ('out_time_us', 'out_time_ms'):
+        try:
+            return max(int(block[key]) / 1_000_000, 0.0)
+        except (KeyError, ValueError):
+            continue
+    match = _OUT_TIME_PATTERN.match(block.get('out_time', ''))
+    if match:
+        hours, minutes, seconds = match.groups()
+        return max(int(hours) * 3600 + int(minutes) * 60 + float(seconds), 0.0)
+    return None
+
+
+def progress_speed(block: Dict[str, str]) -> Optional[float]:
+    """Encoding speed of a progress block ('2.5x' -> 2.5), or None if not known yet."""
+    try:
+        speed = float(block.get('speed', '').rstrip('x'))
+    except ValueError:
+        return None
+    return speed if speed > 0 else None
+
+
+class StageProgress:
+    """
+    Continuous progress for one assembly stage.
+
+    The stage owns the range [start, end] of the overall progress. Updates
+    report the stage's completed fraction; the callback receives the
+    mapped percentage and the stage message with the completed share and
+    ETA appended. Updates are throttled to one per min_interval seconds
+    and dropped when the percentage has not changed (start() is never
+    throttled). Errors raised by the callback are logged, so a failed
+    progress write never interrupts the stage.
+
+    The callback is only called on the thread that created the stage.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[str, int, str], None]],
+        stage: str,
+        start: int,
+        end: int,
+        message: str,
+        min_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize stage progress.
+
+        Args:
+            callback: Progress callback(stage, progress, message), or None
+            stage: Stage name passed to the callback
+            start: Overall progress when the stage starts
+            end: Overall progress when the stage is complete
+            message: Stage message
+            min_interval: Minimum seconds between throttled callbacks
+            clock: Monotonic clock (for tests)
+        """
+        self.callback = callback
+        self.stage = stage
+        self.start_progress = start
+        self.end_progress = end
+        self.message = message
+        self.min_interval = min_interval
+        self._clock = clock
+        self._started = clock()
+        self._last_report: Optional[float] = None
+        self._last_progress = start
+        self._thread = threading.get_ident()
+        # Longest FFmpeg slot wait of a job on another thread
+        self._worker_queue_wait = 0.0
+
+    def start(self) -> None:
+        """Report the start of the stage (never throttled)."""
+        self._started = self._clock()
+        self._emit(self.start_progress, self.message)
+
+    def update(self, fraction: float, eta: Optional[float] = None) -> None:
+        """
+        Report the completed fraction of the stage.
+
+        Args:
+            fraction: Completed share of the stage, 0-1 (clamped)
+            eta: Seconds left; estimated from the elapsed time when None
+        """
+        if self.callback is None:
+            return
+        fraction = min(max(fraction, 0.0), 1.0)
+        progress = self.start_progress + int((self.end_progress - self.start_progress) * fraction)
+        now = self._clock()
+        if progress == self._last_progress:
+            return
+        if self._last_report is not None and now - self._last_report < self.min_interval:
+            return
+
+        if eta is None and fraction > 0:
+            eta = (now - self._started) * (1 - fraction) / fraction
+        message = f"{self.message} {fraction:.0%} done"
+        if eta is not None and math.isfinite(eta):
+            message += f", about {format_eta(eta)} left"
+        if self._worker_queue_wait >= 1:
+            message += f" (waited up to {format_eta(self._worker_queue_wait)} for FFmpeg)"
+        self._last_report = now
+        self._emit(progress, message)
+
+    def queued(self, waited: float, ahead: int = 0) -> None:
+        """
+        Report that an FFmpeg job of the stage is waiting for a slot.
+
+        On the stage's own thread the wait is reported right away
+        (throttled, progress unchanged). Waits of jobs on other threads
+        (pipeline workers) are shown in the next update() instead.
+
+        Args:
+            waited: Seconds the job has waited so far
+            ahead: Jobs queued ahead of it
+        """
+        if self.callback is None:
+            return
+        if threading.get_ident() != self._thread:
+            self._worker_queue_wait = max(self._worker_queue_wait, waited)
+            return
+        now = self._clock()
+        if self._last_report is not None and now - self._last_report < self.min_interval:
+            return
+
+        message = f"{self.message} waiting for FFmpeg ({format_eta(waited)}"
+        message += f", {ahead} jobs ahead)" if ahead else ")"
+        self._last_report = now
+        self._emit(self._last_progress, message)
+
+    def ffmpeg_handler(self, total_seconds: Optional[float]) -> Callable[[Dict[str, str]], None]:
+        """
+        Progress block handler for an FFmpeg command writing total_seconds of output.
+
+        The fraction is the output position over total_seconds, and the
+        ETA is the remaining output divided by FFmpeg's speed. Without a
+        known total the handler does nothing.
+        """
+        def handle(block: Dict[str, str]) -> None:
+            if not total_seconds:
+                return
+            position = progress_seconds(block)
+            if position is None:
+                return
+            speed = progress_speed(block)
+            eta = max(total_seconds - position, 0.0) / speed if speed else None
+            self.update(position / total_seconds, eta)
+
+        return handle
+
+    def _emit(self, progress: int, message: str) -> None:
+        """Call the callback, logging (not raising) its errors."""
+        if self.callback is None:
+            return
+        self._last_progress = progress
+        try:
+            self.callback(self.stage, progress, message)
+        except Exception as e:
+            logger.warning(f"Progress callback failed for stage {self.stage}: {e}")
+
+
+def format_eta(seconds: float) -> str:
+    """Human-readable remaining time ('45s', '3m 05s')."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    return f"{seconds // 60}m {seconds % 60:02d}s"
@@ -0,0 +1,253 @@
+"""
+Progressive HLS publishing.
+
+While FFmpeg writes an HLS playlist of fragmented MP4 segments (see
+FFmpegCommandBuilder.with_hls_output), the publisher uploads each finished
+segment to storage and then the playlist that lists them. Players can
+start on the playlist as soon as the first segment is up and pick up later
+segments as the playlist grows; the final upload carries #EXT-X-ENDLIST.
+
+Features:
+- Segments uploaded once each, in playlist order, before the playlist that
+  lists them
+- Stored playlists keep segment URIs relative to the playlist, so they
+  never embed expiring (presigned) URLs; signed_playlist() points them at
+  fresh storage URLs when the playlist is served
+- One-time callback with the playlist URL once it is playable
+"""
+
+import os
+import logging
+import tempfile
+from typing import Callable, Dict, List, Optional, Set
+
+from .storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class HLSPublishError(Exception):
+    """Raised when a segment or playlist cannot be uploaded."""
+    pass
+
+
+def playlist_uris(playlist: str) -> List[str]:
+    """
+    URIs a media playlist refers to, in order.
+
+    The init segment (#EXT-X-MAP URI) and every media segment line.
+    """
+    uris = []
+    for line in playlist.splitlines():
+        line = line.strip()
+        if line.startswith('#EXT-X-MAP:'):
+            uri = _map_uri(line)
+            if uri:
+                uris.append(uri)
+        elif line and not line.startswith('#'):
+            uris.append(line)
+    return uris
+
+
+def rewrite_playlist(playlist: str, urls: Dict[str, str]) -> str:
+    """
+    Replace the URIs in a media playlist with the given URLs.
+
+    Args:
+        playlist: Playlist text
+        urls: URL for each URI (URIs without one are kept)
+
+    Returns:
+        Playlist text with the URIs replaced
+    """
+    lines = []
+    for line in playlist.splitlines():
+        stripped = line.strip()
+        if stripped.startswith('#EXT-X-MAP:'):
+            uri = _map_uri(stripped)
+            if uri in urls:
+                line = stripped.replace(f'URI="{uri}"', f'URI="{urls[uri]}"')
+        elif stripped and not stripped.startswith('#'):
+            line = urls.get(stripped, line)
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def playlist_storage_path(output_path: str) -> str:
+    """
+    Storage path of the HLS playlist published for an output path.
+
+    The playlist and segments go next to the output: output/video.mp4
+    becomes output/video/index.m3u8.
+    """
+    return f"{os.path.splitext(output_path)[0]}/{HLSPublisher.PLAYLIST_NAME}"
+
+
+def signed_playlist(storage: StorageBackend, remote_playlist: str, expiration: int = 3600) -> str:
+    """
+    Fetch a published playlist with its segment URIs replaced by storage URLs.
+
+    Segment URLs come from storage.get_url, so with S3 they are presigned
+    for the given expiration from now; serve the result to players instead
+    of the stored playlist.
+
+    Args:
+        storage: Storage backend the playlist was published to
+        remote_playlist: Storage path of the playlist
+        expiration: Lifetime of signed segment URLs in seconds
+
+    Returns:
+        Playlist text
+    """
+    remote_dir = os.path.dirname(remote_playlist)
+    with tempfile.TemporaryDirectory(prefix='hls_playlist_') as tmp:
+        local_path = storage.download_file(remote_playlist, os.path.join(tmp, HLSPublisher.PLAYLIST_NAME))
+        with open(local_path) as f:
+            playlist = f.read()
+    urls = {
+        uri: storage.get_url(f"{remote_dir}/{uri}", expiration=expiration)
+        for uri in playlist_uris(playlist)
+    }
+    return rewrite_playlist(playlist, urls)
+
+
+def _map_uri(line: str) -> Optional[str]:
+    """URI attribute of an #EXT-X-MAP tag."""
+    _, sep, rest = line.partition('URI="')
+    if not sep:
+        return None
+    return rest.split('"', 1)[0]
+
+
+class HLSPublisher:
+    """
+    Uploads an HLS output to storage while FFmpeg is still writing it.
+
+    Call sync() periodically while FFmpeg runs and finish() once it has
+    exited. Each call uploads the segments added to the local playlist
+    since the last call and then the rewritten playlist. Not thread-safe:
+    use one publisher from one thread.
+    """
+
+    PLAYLIST_NAME = 'index.m3u8'
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        local_dir: str,
+        remote_dir: str,
+        on_playlist: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize publisher.
+
+        Args:
+            storage: Storage backend segments and playlist are uploaded to
+            local_dir: Directory FFmpeg writes the playlist and segments to
+            remote_dir: Storage directory for the playlist and segments
+            on_playlist: Optional callback(playlist URL), called once when
+                the first playlist with a segment has been uploaded
+        """
+        self.storage = storage
+        self.local_dir = local_dir
+        self.remote_dir = remote_dir.rstrip('/')
+        self.on_playlist = on_playlist
+        self.playlist_url: Optional[str] = None
+        self.uploaded_segments = 0
+        self._uploaded: Set[str] = set()
+        self._published: Optional[str] = None
+        self._announced = False
+        os.makedirs(local_dir, exist_ok=True)
+
+    @property
+    def playlist_file(self) -> str:
+        """Local path FFmpeg writes the playlist to."""
+        return os.path.join(self.local_dir, self.PLAYLIST_NAME)
+
+    @property
+    def remote_playlist(self) -> str:
+        """Storage path of the playlist."""
+        return f"{self.remote_dir}/{self.PLAYLIST_NAME}"
+
+    def sync(self) -> Optional[str]:
+        """
+        Upload new segments and the playlist if FFmpeg has written more.
+
+        Returns:
+            Playlist URL once a playlist has been uploaded, else None
+
+        Raises:
+            HLSPublishError: If an upload fails
+        """
+        try:
+            with open(self.playlist_file) as f:
+                playlist = f.read()
+        except FileNotFoundError:
+            return self.playlist_url
+        if playlist == self._published:
+            return self.playlist_url
+
+        uris = playlist_uris(playlist)
+        for uri in uris:
+            if uri not in self._uploaded:
+                self._upload_segment(uri)
+                self._uploaded.add(uri)
+
+        # Segments sit next to the playlist: keep their URIs relative
+        published_file = os.path.join(self.local_dir, f'.{self.PLAYLIST_NAME}')
+        with open(published_file, 'w') as f:
+            f.write(rewrite_playlist(playlist, {uri: os.path.basename(uri) for uri in uris}))
+        try:
+            url = self.storage.upload_file(local_path=published_file, remote_path=self.remote_playlist)
+        except Exception as e:
+            raise HLSPublishError(f"Failed to upload playlist to '{self.remote_playlist}': {e}") from e
+        finally:
+            os.remove(published_file)
+        self._published = playlist
+
+        self.playlist_url = url
+        # Announce once there is something to play
+        if not self._announced and any(
+            line.strip() and not line.startswith('#') for line in playlist.splitlines()
+        ):
+            self._announced = True
+            self._notify(url)
+        return self.playlist_url
+
+    def finish(self) -> str:
+        """
+        Upload the remaining segments and the complete playlist.
+
+        Returns:
+            Playlist URL
+
+        Raises:
+            HLSPublishError: If an upload fails or FFmpeg wrote no complete playlist
+        """
+        url = self.sync()
+        if url is None or '#EXT-X-ENDLIST' not in (self._published or ''):
+            raise HLSPublishError(f"HLS playlist not completed: {self.playlist_file}")
+        logger.info(f"HLS output published: {self.uploaded_segments} segments, playlist {url}")
+        return url
+
+    def _upload_segment(self, uri: str) -> None:
+        """Upload one segment."""
+        name = os.path.basename(uri)
+        remote_path = f"{self.remote_dir}/{name}"
+        try:
+            self.storage.upload_file(
+                local_path=os.path.join(self.local_dir, name), remote_path=remote_path
+            )
+        except Exception as e:
+            raise HLSPublishError(f"Failed to upload HLS segment to '{remote_path}': {e}") from e
+        self.uploaded_segments += 1
+        logger.debug(f"HLS segment uploaded: {remote_path}")
+
+    def _notify(self, url: str) -> None:
+        """Call on_playlist, logging (not raising) its errors."""
+        if self.on_playlist is None:
+            return
+        try:
+            self.on_playlist(url)
+        except Exception as e:
+            logger.warning(f"Playlist callback failed: {e}")
@@ -0,0 +1,274 @@
+"""
+Keyword search service for dance moves using an in-memory BM25 index.
+
+Replaces the external Elasticsearch cluster for move lookups by name, label,
+category and style. The index is tiny (one document per move clip), so it is
+rebuilt in memory whenever the vector search index is reloaded and queried
+with NumPy in well under a millisecond.
+
+Features:
+- Inverted index over move names, labels, categories, styles and metadata
+- Okapi BM25 scoring with per-term weights precomputed at build time
+- Metadata enrichment from bachata_annotations.json (move labels, tempo)
+- Row-aligned with VectorSearchService so scores can be fused by index
+"""
+
+import os
+import re
+import json
+import math
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Annotation file locations (local development, Docker)
+ANNOTATION_PATHS = [
+    Path(__file__).resolve().parent.parent.parent / 'data' / 'bachata_annotations.json',
+    Path('/app/data/bachata_annotations.json'),
+    Path('/data/bachata_annotations.json'),
+]
+
+_annotations_cache: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def load_annotations(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Load clip annotations keyed by clip_id (== MoveEmbedding.move_id).
+
+    Args:
+        path: Optional explicit path (defaults to BACHATA_ANNOTATIONS_PATH or
+            the standard data directory locations)
+
+    Returns:
+        Dictionary mapping clip_id to its annotation (empty if not found)
+    """
+    global _annotations_cache
+
+    if path is None and _annotations_cache is not None:
+        return _annotations_cache
+
+    candidates = [Path(path)] if path else []
+    if not path and os.getenv('BACHATA_ANNOTATIONS_PATH'):
+        candidates.append(Path(os.getenv('BACHATA_ANNOTATIONS_PATH')))
+    if not path:
+        candidates.extend(ANNOTATION_PATHS)
+
+    annotations: Dict[str, Dict[str, Any]] = {}
+    for candidate in candidates:
+        if not candidate.exists():
+            continue
+        try:
+            with open(candidate, 'r') as f:
+                data = json.load(f)
+            for clip in data.get('clips', []):
+                if clip.get('clip_id'):
+                    annotations[clip['clip_id']] = clip
+            logger.info(f"Loaded {len(annotations)} clip annotations from {candidate}")
+            break
+        except (IOError, ValueError) as e:
+            logger.warning(f"Failed to load annotations from {candidate}: {e}")
+
+    if path is None:
+        _annotations_cache = annotations
+    return annotations
+
+
+class KeywordSearchService:
+    """
+    In-memory BM25 keyword index over move metadata.
+
+    Documents are the move metadata dictionaries used by VectorSearchService;
+    document i in this index corresponds to row i of the vector index.
+    """
+
+    # Okapi BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    # Field weights (a field's tokens are repeated this many times)
+    FIELD_WEIGHTS = {
+        'move_name': 2,
+        'move_label': 2,
+        'category': 2,
+        'move_id': 1,
+        'style': 1,
+        'difficulty': 1,
+        'energy_level': 1,
+    }
+
+    TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+    def __init__(self):
+        """Initialize an empty keyword index."""
+        self.documents: List[Dict[str, Any]] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.term_doc_ids: List[np.ndarray] = []
+        self.term_weights: List[np.ndarray] = []
+        self.num_documents = 0
+
+    @classmethod
+    def tokenize(cls, text: Optional[str]) -> List[str]:
+        """
+        Split text into lowercase terms with light plural stemming.
+
+        Args:
+            text: Text to tokenize (underscores and punctuation split terms)
+
+        Returns:
+            List of terms
+        """
+        if not text:
+            return []
+        tokens = cls.TOKEN_PATTERN.findall(str(text).lower())
+        return [
+            token[:-1] if len(token) > 3 and token.endswith('s') and not token.endswith('ss') else token
+            for token in tokens
+        ]
+
+    @staticmethod
+    def category_from_path(video_path: Optional[str]) -> str:
+        """Extract the move category (parent folder) from a clip path."""
+        if not video_path:
+            return ''
+        parts = str(video_path).replace('\\', '/').split('/')
+        return parts[-2] if len(parts) >= 2 else ''
+
+    def _document_terms(self, document: Dict[str, Any]) -> List[str]:
+        """Build the weighted term list for one move document."""
+        fields = {
+            'move_name': document.get('move_name'),
+            'move_label': document.get('move_label'),
+            'category': document.get('category') or self.category_from_path(document.get('video_path')),
+            'move_id': document.get('move_id'),
+            'style': document.get('style'),
+            'difficulty': document.get('difficulty'),
+            'energy_level': document.get('energy_level'),
+        }
+
+        terms: List[str] = []
+        for field, value in fields.items():
+            terms.extend(self.tokenize(value) * self.FIELD_WEIGHTS[field])
+        return terms
+
+    def build(
+        self,
+        documents: List[Dict[str, Any]],
+        annotations: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Build the inverted index.
+
+        Args:
+            documents: Move metadata dictionaries (move_id, move_name, video_path,
+                difficulty, energy_level, style, ...)
+            annotations: Optional clip annotations keyed by move_id, used to add
+                move labels not stored on MoveEmbedding
+        """
+        annotations = annotations or {}
+
+        self.documents = []
+        for document in documents:
+            enriched = dict(document)
+            annotation = annotations.get(document.get('move_id'), {})
+            if annotation.get('move_label') and not enriched.get('move_label'):
+                enriched['move_label'] = annotation['move_label']
+            self.documents.append(enriched)
+
+        self.num_documents = len(self.documents)
+
+        # Collect term frequencies per document
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_lengths = np.zeros(self.num_documents, dtype=np.float32)
+        for doc_id, document in enumerate(self.documents):
+            terms = self._document_terms(document)
+            doc_lengths[doc_id] = len(terms)
+            for term in terms:
+                postings.setdefault(term, {})
+                postings[term][doc_id] = postings[term].get(doc_id, 0) + 1
+
+        avg_length = float(doc_lengths.mean()) if self.num_documents else 0.0
+
+        # Precompute BM25 weight of every (term, document) pair
+        self.vocabulary = {}
+        self.term_doc_ids = []
+        self.term_weights = []
+        for term, doc_tfs in postings.items():
+            doc_ids = np.fromiter(doc_tfs.keys(), dtype=np.int32, count=len(doc_tfs))
+            tfs = np.fromiter(doc_tfs.values(), dtype=np.float32, count=len(doc_tfs))
+
+            df = len(doc_tfs)
+            idf = math.log(1.0 + (self.num_documents - df + 0.5) / (df + 0.5))
+            length_norm = 1.0 - self.B + self.B * doc_lengths[doc_ids] / (avg_length or 1.0)
+            weights = idf * tfs * (self.K1 + 1.0) / (tfs + self.K1 * length_norm)
+
+            self.vocabulary[term] = len(self.term_doc_ids)
+            self.term_doc_ids.append(doc_ids)
+            self.term_weights.append(weights.astype(np.float32))
+
+        logger.info(
+            f"Keyword index built: {self.num_documents} moves, "
+            f"{len(self.vocabulary)} terms"
+        )
+
+    def score(self, query: str) -> np.ndarray:
+        """
+        Compute BM25 scores of all documents for a query.
+
+        Args:
+            query: Free-text query
+
+        Returns:
+            Array of shape (num_documents,) with BM25 scores (0 = no match)
+        """
+        scores = np.zeros(self.num_documents, dtype=np.float32)
+        for term in set(self.tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                continue
+            scores[self.term_doc_ids[term_id]] += self.term_weights[term_id]
+        return scores
+
+    def search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> List[Tuple[int, float]]:
+        """
+        Find the best keyword matches for a query.
+
+        Args:
+            query: Free-text query
+            filters: Metadata filters (difficulty, energy_level, style)
+            top_k: Number of results to return
+
+        Returns:
+            List of (document index, BM25 score) sorted by score, matches only
+        """
+        if self.num_documents == 0:
+            return []
+
+        scores = self.score(query)
+        matched = np.flatnonzero(scores > 0)
+        if matched.size == 0:
+            return []
+
+        ranked = matched[np.argsort(-scores[matched], kind='stable')]
+
+        results = []
+        for idx in ranked:
+            document = self.documents[idx]
+            if filters and any(
+                key in document and document[key] != value
+                for key, value in filters.items()
+            ):
+                continue
+            results.append((int(idx), float(scores[idx])))
+            if len(results) >= top_k:
+                break
+        return results
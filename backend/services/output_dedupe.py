@@ -0,0 +1,144 @@
+"""
+Output-level deduplication of assembled videos.
+
+Identical blueprints (same audio, same clip sequence and trims, same
+output_config) assemble to identical videos. The render fingerprint hashes
+exactly the blueprint fields and service settings that affect the output;
+task_id and output_path are left out. After a render is uploaded, a copy is
+kept in storage under its fingerprint, and a later assembly with the same
+fingerprint copies that render to its own output_path instead of fetching,
+encoding and uploading again.
+
+Features:
+- Storage-side copies (S3 copy, hard link on local storage), so the video
+  never passes through the assembling worker
+- Each task still gets its own output file: deleting one user's video never
+  breaks another's
+- Deduplication failures never break assembly (logged, then rendered)
+
+Songs and clips are identified by their storage path (storage objects are
+not rewritten in place); a changed FFmpegCommandBuilder.BUILDER_VERSION
+starts a new set of fingerprints.
+"""
+
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from .storage.base import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+# Move fields that affect the assembled video
+RENDER_MOVE_FIELDS = (
+    'video_path', 'duration', 'trim_start', 'playback_rate', 'original_duration',
+    'transition_type', 'transition_duration',
+)
+
+
+def _canonical(value: Any) -> Any:
+    """Numbers as floats (8 and 8.0 render the same), recursively."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def render_fingerprint(blueprint: Dict, settings: Dict[str, Any]) -> str:
+    """
+    Fingerprint of everything that determines an assembled video.
+
+    Args:
+        blueprint: Expanded blueprint
+        settings: Service settings that affect the output (render mode,
+            builder version, ...)
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    output_config = {
+        key: value for key, value in blueprint.get('output_config', {}).items() if key != 'output_path'
+    }
+    moves = [
+        {field: move.get(field) for field in RENDER_MOVE_FIELDS}
+        for move in blueprint.get('moves', [])
+    ]
+    payload = {
+        'audio_path': blueprint.get('audio_path'),
+        'moves': moves,
+        'output_config': output_config,
+        'settings': settings,
+    }
+    return hashlib.sha256(
+        json.dumps(_canonical(payload), sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+
+
+class OutputDeduplicator:
+    """
+    Finished renders in storage, keyed by render fingerprint.
+    """
+
+    DEFAULT_PREFIX = 'output/renders'
+
+    def __init__(self, storage: StorageBackend, prefix: str = DEFAULT_PREFIX):
+        """
+        Initialize deduplicator.
+
+        Args:
+            storage: Storage backend holding the outputs
+            prefix: Storage directory for the fingerprinted renders
+        """
+        self.storage = storage
+        self.prefix = prefix.rstrip('/')
+        self.hits = 0
+        self.misses = 0
+
+    def render_path(self, fingerprint: str) -> str:
+        """Storage path of the render with a fingerprint."""
+        return f"{self.prefix}/{fingerprint}.mp4"
+
+    def reuse(self, fingerprint: str, output_path: str) -> Optional[str]:
+        """
+        Copy a finished render with this fingerprint to output_path.
+
+        Returns:
+            URL of output_path, or None if there is no such render (or it
+            cannot be copied) and the video has to be assembled
+        """
+        render_path = self.render_path(fingerprint)
+        try:
+            if not self.storage.file_exists(render_path):
+                self.misses += 1
+                return None
+            url = self.storage.copy_file(render_path, output_path)
+        except Exception as e:
+            logger.warning(f"Cannot reuse render {render_path} for {output_path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.info(f"Reused identical render {render_path} for {output_path}")
+        return url
+
+    def register(self, fingerprint: str, output_path: str) -> bool:
+        """
+        Keep a copy of a finished output under its fingerprint.
+
+        Returns:
+            True if registered
+        """
+        render_path = self.render_path(fingerprint)
+        try:
+            self.storage.copy_file(output_path, render_path)
+        except Exception as e:
+            logger.warning(f"Cannot register render {output_path} as {render_path}: {e}")
+            return False
+        logger.debug(f"Registered render {output_path} as {render_path}")
+        return True
@@ -4,7 +4,10 @@ Abstract base class for storage backends.
 Defines the interface that all storage backends must implement.
 """
 
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from pathlib import Path
 from typing import Optional
 
 
@@ -100,3 +103,28 @@ class StorageBackend(ABC):
             List of file paths
         """
         pass
+    
+    def copy_file(self, source_path: str, dest_path: str) -> str:
+        """
+        Copy a file within storage, replacing dest_path if it exists.
+        
+        Backends override this with a server-side copy; the default
+        downloads the file and uploads it again.
+        
+        Args:
+            source_path: Path of the file to copy
+            dest_path: Destination path in storage
+            
+        Returns:
+            Public URL or path to access the copy
+            
+        Raises:
+            Exception: If the copy fails
+        """
+        fd, local_path = tempfile.mkstemp(suffix=Path(source_path).suffix)
+        os.close(fd)
+        try:
+            self.download_file(source_path, local_path)
+            return self.upload_file(local_path, dest_path)
+        finally:
+            os.remove(local_path)
@@ -63,6 +63,11 @@ class LocalStorageBackend(StorageBackend):
             # Create parent directories if they don't exist
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
+            # Replace rather than overwrite: the file may be a hard link
+            # shared with another path (see copy_file)
+            if full_path.is_file():
+                full_path.unlink()
+            
             # Copy file to destination
             shutil.copy2(local_path, full_path)
             
@@ -97,6 +102,33 @@ class LocalStorageBackend(StorageBackend):
             logger.error(f"Failed to download file {remote_path} to {local_path}: {e}")
             raise
     
+    def copy_file(self, source_path: str, dest_path: str) -> str:
+        """Copy a file within local storage as a hard link (a real copy across filesystems)"""
+        try:
+            source = self._get_full_path(source_path)
+            dest = self._get_full_path(dest_path)
+            
+            if not source.is_file():
+                raise FileNotFoundError(f"File not found: {source_path}")
+            
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if dest.is_file():
+                if os.path.samefile(source, dest):
+                    return self.get_url(dest_path)
+                dest.unlink()
+            
+            try:
+                os.link(source, dest)
+            except OSError:
+                shutil.copy2(source, dest)
+            
+            logger.info(f"Copied {source} to {dest}")
+            return self.get_url(dest_path)
+            
+        except Exception as e:
+            logger.error(f"Failed to copy file {source_path} to {dest_path}: {e}")
+            raise
+    
     def get_url(self, remote_path: str, expiration: int = 3600) -> str:
         """Get URL for accessing a file (expiration not used for local storage)"""
         normalized_path = self._normalize_remote_path(remote_path)
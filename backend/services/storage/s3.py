@@ -140,6 +140,33 @@ class S3StorageBackend(StorageBackend):
             logger.error(f"Unexpected error downloading file {remote_path} from S3: {e}")
             raise
     
+    def copy_file(self, source_path: str, dest_path: str) -> str:
+        """Copy a file within the bucket (server-side, nothing is downloaded)"""
+        try:
+            source_key = self._normalize_remote_path(source_path)
+            dest_key = self._normalize_remote_path(dest_path)
+            
+            # Managed copy: switches to multipart copy for large objects
+            self.s3_client.copy(
+                {'Bucket': self.bucket_name, 'Key': source_key},
+                self.bucket_name,
+                dest_key,
+                ExtraArgs={'ACL': 'private'}
+            )
+            
+            logger.info(f"Copied s3://{self.bucket_name}/{source_key} to s3://{self.bucket_name}/{dest_key}")
+            return self.get_url(dest_key)
+            
+        except self.ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ('404', 'NoSuchKey'):
+                raise FileNotFoundError(f"File not found in S3: {source_path}")
+            logger.error(f"Failed to copy file {source_path} to {dest_path} in S3: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error copying file {source_path} to {dest_path} in S3: {e}")
+            raise
+    
     def get_url(self, remote_path: str, expiration: int = 3600) -> str:
         """Get URL for accessing a file"""
         try:
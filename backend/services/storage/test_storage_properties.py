@@ -1031,3 +1031,65 @@ class TestStorageAbstractionIsCloudAgnostic:
             if os.path.exists(temp_file):
                 os.unlink(temp_file)
             shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestServerSideCopy:
+    """
+    Property: copy_file copies within storage without going through the
+    caller: a hard link on local storage (so a later upload to either path
+    leaves the other intact) and an S3 copy in the bucket.
+    """
+    
+    @settings(max_examples=30, deadline=None)
+    @given(source_path=file_path(), dest_path=file_path())
+    def test_local_copy_is_independent_hard_link(self, source_path, dest_path):
+        # Disjoint trees, so neither path is a directory of the other
+        source_path = f"renders/{source_path.lstrip('/')}"
+        dest_path = f"users/{dest_path.lstrip('/')}"
+        temp_dir = tempfile.mkdtemp()
+        fd, temp_file = tempfile.mkstemp()
+        os.write(fd, b"rendered video")
+        os.close(fd)
+        
+        try:
+            backend = LocalStorageBackend(base_path=temp_dir)
+            backend.upload_file(temp_file, source_path)
+            
+            url = backend.copy_file(source_path, dest_path)
+            
+            assert url == backend.get_url(dest_path)
+            source = backend._get_full_path(source_path)
+            dest = backend._get_full_path(dest_path)
+            assert os.path.samefile(source, dest)
+            
+            with open(temp_file, 'wb') as f:
+                f.write(b"replaced video")
+            backend.upload_file(temp_file, dest_path)
+            assert source.read_bytes() == b"rendered video"
+            assert dest.read_bytes() == b"replaced video"
+        finally:
+            os.unlink(temp_file)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_local_copy_of_missing_file_raises(self, temp_dir):
+        backend = LocalStorageBackend(base_path=temp_dir)
+        with pytest.raises(FileNotFoundError):
+            backend.copy_file('output/missing.mp4', 'output/copy.mp4')
+    
+    def test_s3_copy_is_server_side(self):
+        with patch('boto3.client') as mock_client_factory:
+            mock_client = MagicMock()
+            mock_client_factory.return_value = mock_client
+            mock_client.head_bucket.return_value = {}
+            backend = S3StorageBackend(bucket_name='test-bucket', region='us-east-1')
+            
+            backend.copy_file('media/output/renders/abc.mp4', '/output/user_1/video.mp4')
+            
+            mock_client.copy.assert_called_once_with(
+                {'Bucket': 'test-bucket', 'Key': 'output/renders/abc.mp4'},
+                'test-bucket',
+                'output/user_1/video.mp4',
+                ExtraArgs={'ACL': 'private'}
+            )
+            mock_client.download_file.assert_not_called()
+            mock_client.upload_file.assert_not_called()
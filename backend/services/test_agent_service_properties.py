@@ -580,3 +580,76 @@ class TestAgentServiceProperties:
                 
                 # Verify message was set
                 assert mock_task.message != '', "Message should be set after function execution"
+
+
+class TestRequestTextEmbedding:
+    """
+    Property: The user's request text, embedded by the injected text
+    encoder, is the text embedding of the move search query.
+    """
+    
+    @pytest.mark.parametrize('with_audio', [True, False])
+    def test_injected_encoder_reaches_query(self, with_audio):
+        import numpy as np
+        text_vector = np.full(384, 0.5, dtype=np.float32)
+        text_encoder = Mock()
+        text_encoder.encode.return_value = text_vector
+        vector_search = Mock()
+        vector_search.search_similar_moves.return_value = []
+        agent_service = AgentService(
+            openai_api_key='test-key',
+            parameter_extractor=Mock(),
+            music_analyzer=Mock(),
+            vector_search=vector_search,
+            blueprint_generator=Mock(),
+            storage_service=Mock(),
+            text_encoder=text_encoder
+        )
+        agent_service.user_request = 'romantic beginner bachata'
+        agent_service.last_music_features = (
+            {'audio_embedding': [0.1] * 128} if with_audio else None
+        )
+        
+        with patch.object(agent_service, '_update_task_status'), \
+                patch('services.vector_search_service.VectorSearchService.combine_embeddings_weighted',
+                      return_value=np.zeros(8, dtype=np.float32)) as combine:
+            result = agent_service._search_moves()
+        
+        assert result['status'] == 'success'
+        text_encoder.encode.assert_called_once_with('romantic beginner bachata')
+        assert combine.call_args.kwargs['text_embedding'] is text_vector
+
+
+class TestAssembleVideoProfile:
+    """
+    Property: A workflow started with preview=True assembles with the
+    preview profile and marks its result as a preview.
+    """
+    
+    @pytest.mark.parametrize('preview', [True, False])
+    def test_preview_selects_profile(self, preview):
+        agent_service = AgentService(
+            openai_api_key='test-key',
+            parameter_extractor=Mock(),
+            music_analyzer=Mock(),
+            vector_search=Mock(),
+            blueprint_generator=Mock(),
+            storage_service=Mock()
+        )
+        agent_service.preview = preview
+        agent_service.last_blueprint = {'moves': [], 'output_config': {'output_path': 'output/video.mp4'}}
+        
+        with patch.object(agent_service, '_update_task_status'), \
+                patch('services.video_assembly_service.VideoAssemblyService') as mock_assembly:
+            mock_assembly.PROFILE_FULL = 'full'
+            mock_assembly.PROFILE_PREVIEW = 'preview'
+            assembly = mock_assembly.return_value
+            assembly.check_ffmpeg_available.return_value = True
+            assembly.assemble_video.return_value = 'https://storage.example.com/output/video.mp4'
+            assembly.output_path.return_value = 'output/video.mp4'
+            result = agent_service._assemble_video()
+        
+        assert result['status'] == 'success'
+        assert mock_assembly.call_args.kwargs['profile'] == ('preview' if preview else 'full')
+        assert result['preview'] is preview
+        assert result['output_path'] == 'output/video.mp4'
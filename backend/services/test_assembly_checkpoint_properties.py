@@ -0,0 +1,227 @@
+"""
+Property-based tests for resumable video assembly checkpoints.
+
+These tests verify that AssemblyCheckpoint restores exactly the stage
+outputs recorded with a matching checksum, that CheckpointStore collects
+checkpoints by age, and that a retried VideoAssemblyService assembly of a
+failed task resumes from its checkpoint without downloading, normalizing
+or concatenating again, then removes the work directory.
+"""
+
+import os
+import json
+import subprocess
+import time
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .assembly_checkpoint import (
+    STAGE_CONCATENATED, STAGE_FETCHED, STAGE_NORMALIZED, AssemblyCheckpoint, CheckpointStore,
+    get_checkpoint_store
+)
+from .test_assembly_pipeline_properties import ListStream, expected_video, fake_ffmpeg, fake_storage, split_moves
+from .video_assembly_service import VideoAssemblyService, VideoAssemblyError
+
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        f.write(content)
+
+
+class TestCheckpointRestore:
+    """
+    Property: A recorded output is restored, across reopening, exactly
+    while its file keeps the recorded content; a changed or missing file
+    is dropped from the manifest.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        contents=st.dictionaries(st.text('abc', min_size=1, max_size=5), st.text(max_size=20), min_size=1),
+        tampered=st.sets(st.text('abc', min_size=1, max_size=5))
+    )
+    def test_restores_only_intact_outputs(self, tmp_path_factory, contents, tampered):
+        work_dir = str(tmp_path_factory.mktemp('work'))
+        checkpoint = AssemblyCheckpoint(work_dir, 'task-1')
+        for idx, (name, content) in enumerate(contents.items()):
+            path = os.path.join(work_dir, 'normalized', f'norm_{idx:04d}.mp4')
+            write_file(path, content)
+            assert checkpoint.record(STAGE_NORMALIZED, name, path)
+        for idx, name in enumerate(contents):
+            if name in tampered:
+                write_file(os.path.join(work_dir, 'normalized', f'norm_{idx:04d}.mp4'), contents[name] + 'x')
+
+        resumed = AssemblyCheckpoint(work_dir, 'task-1')
+        for name, content in contents.items():
+            dest = os.path.join(work_dir, 'restored', f'{name}.mp4')
+            assert resumed.restore(STAGE_NORMALIZED, name, dest) == (name not in tampered)
+            if name not in tampered:
+                assert open(dest, newline='').read() == content
+
+        intact = set(contents) - tampered
+        assert set(AssemblyCheckpoint(work_dir, 'task-1').entries(STAGE_NORMALIZED)) == intact
+        assert resumed.restored[STAGE_NORMALIZED] == len(intact)
+
+    def test_missing_file_and_other_stage(self, tmp_path):
+        checkpoint = AssemblyCheckpoint(str(tmp_path), 'task-1')
+        path = str(tmp_path / 'clips' / 'clip_0000.mp4')
+        write_file(path, 'clip')
+        checkpoint.record(STAGE_FETCHED, 'clips/a.mp4', path)
+
+        assert not checkpoint.restore(STAGE_CONCATENATED, 'clips/a.mp4', path)
+        os.remove(path)
+        assert not checkpoint.restore(STAGE_FETCHED, 'clips/a.mp4', path)
+        assert checkpoint.entries(STAGE_FETCHED) == {}
+
+    def test_files_outside_work_dir_not_recorded(self, tmp_path):
+        checkpoint = AssemblyCheckpoint(str(tmp_path / 'work'), 'task-1')
+        write_file(str(tmp_path / 'elsewhere.mp4'), 'clip')
+
+        assert not checkpoint.record(STAGE_FETCHED, 'a', str(tmp_path / 'elsewhere.mp4'))
+
+    def test_corrupt_or_foreign_manifest_starts_empty(self, tmp_path):
+        write_file(str(tmp_path / AssemblyCheckpoint.MANIFEST_NAME), '{not json')
+        assert AssemblyCheckpoint(str(tmp_path), 'task-1').summary() == {}
+
+        write_file(str(tmp_path / AssemblyCheckpoint.MANIFEST_NAME), json.dumps(
+            {'task_id': 'task-2', 'stages': {STAGE_FETCHED: {}}}
+        ))
+        assert AssemblyCheckpoint(str(tmp_path), 'task-1').summary() == {}
+
+
+class TestGarbageCollection:
+    """
+    Property: Garbage collection removes exactly the checkpoints last
+    updated at least max_age ago, never the one being opened.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(ages=st.lists(st.integers(min_value=0, max_value=48), min_size=1, max_size=8))
+    def test_removes_stale_checkpoints(self, tmp_path_factory, ages):
+        store = CheckpointStore(str(tmp_path_factory.mktemp('checkpoints')), max_age=24 * 3600)
+        checkpoints = [store.open(f'task-{idx}') for idx in range(len(ages))]
+        now = time.time()
+        for checkpoint, hours in zip(checkpoints, ages):
+            path = os.path.join(checkpoint.work_dir, 'audio.mp3')
+            write_file(path, 'audio')
+            checkpoint.record(STAGE_FETCHED, 'songs/song.mp3', path)
+            os.utime(checkpoint.manifest_path, (now - hours * 3600, now - hours * 3600))
+
+        removed = store.collect_garbage()
+
+        assert removed == sum(1 for hours in ages if hours >= 24)
+        assert sorted(c['task_id'] for c in store.list_checkpoints()) == sorted(
+            f'task-{idx}' for idx, hours in enumerate(ages) if hours < 24
+        )
+
+    def test_open_keeps_own_stale_checkpoint(self, tmp_path):
+        store = CheckpointStore(str(tmp_path), max_age=3600)
+        for task_id in ('task-1', 'task-2'):
+            store.open(task_id)
+            os.utime(store.work_dir(task_id), (0, 0))
+
+        store.open('task-1')
+
+        assert [c['task_id'] for c in store.list_checkpoints()] == ['task-1']
+
+    def test_disabled_without_checkpoint_dir(self):
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_CHECKPOINT_DIR': ''}):
+            assert get_checkpoint_store() is None
+
+
+class TestAssemblyResumes:
+    """
+    Property: After an assembly fails at the audio mux, a retry of the
+    same task skips every download, normalization and the concat, uploads
+    the same video as an uninterrupted assembly, and removes the task's
+    work directory; the temp directory is left empty either way.
+    """
+
+    def make_blueprint(self, count=5):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f'clips/clip_{i % 3}.mp4', 'duration': 8.0} for i in range(count)],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_retry_resumes_after_audio_failure(self, tmp_path, streaming):
+        temp_dir, store = tmp_path / 'tmp', CheckpointStore(str(tmp_path / 'checkpoints'))
+        temp_dir.mkdir()
+        uploads, commands = [], []
+        storage = fake_storage(uploads)
+        service = VideoAssemblyService(storage, temp_dir=str(temp_dir), checkpoints=store)
+        blueprint = self.make_blueprint()
+
+        def assemble():
+            if streaming:
+                return service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2])))
+            return service.assemble_video(blueprint)
+
+        def failing_audio(cmd, **kwargs):
+            if any(arg.endswith('audio.mp3') for arg in cmd):
+                raise subprocess.CalledProcessError(1, cmd, stderr='muxer crashed')
+            return fake_ffmpeg(cmd, **kwargs)
+
+        def recording(cmd, **kwargs):
+            commands.append(cmd)
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=failing_audio):
+            with pytest.raises(VideoAssemblyError):
+                assemble()
+
+        assert [c['task_id'] for c in store.list_checkpoints()] == ['task-1']
+        assert os.listdir(temp_dir) == []
+        downloads = storage.download_file.call_count
+
+        with patch('subprocess.run', side_effect=recording):
+            url = assemble()
+
+        assert url == 'https://storage.example.com/output/task-1.mp4'
+        assert uploads == [expected_video(blueprint)]
+        assert storage.download_file.call_count == downloads
+        ffmpeg_commands = [cmd for cmd in commands if cmd[0] == 'ffmpeg']
+        assert len(ffmpeg_commands) == 1 and any(arg.endswith('audio.mp3') for arg in ffmpeg_commands[0])
+        assert service.last_checkpoint_restores[STAGE_FETCHED] >= 1
+        assert service.last_checkpoint_restores[STAGE_CONCATENATED] == 1
+        assert store.list_checkpoints() == []
+        assert os.listdir(temp_dir) == []
+
+    def test_changed_blueprint_does_not_reuse_outputs(self, tmp_path):
+        store = CheckpointStore(str(tmp_path / 'checkpoints'))
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path / 'tmp'), checkpoints=store)
+        blueprint = self.make_blueprint()
+
+        def failing_audio(cmd, **kwargs):
+            if any(arg.endswith('audio.mp3') for arg in cmd):
+                raise subprocess.CalledProcessError(1, cmd, stderr='muxer crashed')
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=failing_audio):
+            with pytest.raises(VideoAssemblyError):
+                service.assemble_video(blueprint)
+
+        blueprint['moves'] = list(reversed(blueprint['moves']))
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            service.assemble_video(blueprint)
+
+        assert uploads == [expected_video(blueprint)]
+        assert STAGE_CONCATENATED not in service.last_checkpoint_restores
+
+    def test_no_checkpoint_without_store(self, tmp_path):
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path))
+
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_CHECKPOINT_DIR': ''}):
+            service.checkpoints = get_checkpoint_store()
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            service.assemble_video(self.make_blueprint())
+
+        assert service.last_checkpoint_restores == {}
+        assert os.listdir(tmp_path) == []
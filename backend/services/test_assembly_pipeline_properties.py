@@ -0,0 +1,948 @@
+"""
+Property-based tests for pipelined blueprint-to-assembly streaming.
+
+These tests verify that BlueprintGenerator.stream_blueprint yields the same
+moves as generate_blueprint, section by section, and that
+VideoAssemblyService.assemble_video_stream produces the same video as
+assemble_video while starting clip work before the stream has ended.
+Both assembly paths fetch and normalize each distinct clip only once, and
+skip normalization for mezzanine clips. assemble_video normalizes clips in
+parallel without oversubscribing the CPU. Single pass render mode produces
+the same video with one FFmpeg command. Adding audio copies the video
+stream when ffprobe shows it already matches the output config. Clips are
+cut to each move's trim_start/duration/playback_rate, and crossfades are
+rendered as separate short transition clips. Segmented render mode encodes
+parts of the timeline in parallel and joins them.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .blueprint_generator import BlueprintGenerationError
+from .storage.base import StorageBackend
+from .test_blueprint_batch_properties import fake_features, make_generator
+from .test_video_assembly_properties import valid_blueprint
+from .video_assembly_service import ClipSegment, ClipTransition, VideoAssemblyService, VideoAssemblyError
+
+
+class ListStream:
+    """Minimal blueprint stream over pre-split sections."""
+
+    def __init__(self, blueprint, sections, before_section=None):
+        self.task_id = blueprint['task_id']
+        self.audio_path = blueprint['audio_path']
+        self._blueprint = blueprint
+        self._sections = sections
+        self._before_section = before_section
+        self.blueprint = None
+
+    def __iter__(self):
+        for idx, section in enumerate(self._sections):
+            if self._before_section:
+                self._before_section(idx)
+            yield section
+        self.blueprint = self._blueprint
+
+
+def split_moves(moves, cuts):
+    """Split moves into sections at the given (sorted, unique) cut indices."""
+    bounds = [0] + [c for c in cuts if 0 < c < len(moves)] + [len(moves)]
+    return [moves[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def fake_storage(uploads):
+    """Storage whose downloads contain the remote path and whose uploads are captured."""
+    storage = Mock(spec=StorageBackend)
+
+    def download(remote_path, local_path):
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, 'w') as f:
+            f.write(remote_path)
+        return local_path
+
+    def upload(local_path, remote_path):
+        with open(local_path) as f:
+            uploads.append(f.read())
+        return f"https://storage.example.com/{remote_path}"
+
+    storage.download_file.side_effect = download
+    storage.upload_file.side_effect = upload
+    return storage
+
+
+def fake_ffmpeg(cmd, **kwargs):
+    """
+    Content-preserving ffmpeg stand-in: normalize copies, concat joins,
+    audio copies, single pass joins every input except the audio.
+    """
+    output_file = cmd[-1]
+    if '-filter_complex' in cmd:
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i'][:-1]
+        content = '|'.join(open(path).read() for path in inputs)
+    elif '-f' in cmd and 'concat' in cmd:
+        with open(cmd[cmd.index('-i') + 1]) as f:
+            inputs = [line.strip()[len("file '"):-1] for line in f if line.strip()]
+        content = '|'.join(open(path).read() for path in inputs)
+    else:
+        with open(cmd[cmd.index('-i') + 1]) as f:
+            content = f.read()
+    with open(output_file, 'w') as f:
+        f.write(content)
+    return Mock(returncode=0, stdout='', stderr='')
+
+
+def expected_video(blueprint):
+    return '|'.join(move['video_path'] for move in blueprint['moves'])
+
+
+class TestStreamMatchesSequential:
+    """
+    Property: For any blueprint and any split into sections, pipelined
+    assembly uploads the same video as assemble_video, with clips in
+    playback order, and leaves the temp directory empty.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        blueprint=valid_blueprint(),
+        cuts=st.lists(st.integers(min_value=1, max_value=9), unique=True).map(sorted),
+        workers=st.integers(min_value=1, max_value=4)
+    )
+    def test_same_output_as_assemble_video(self, blueprint, cuts, workers):
+        temp_dir = tempfile.mkdtemp(prefix='test_pipeline_')
+        try:
+            uploads = []
+            storage = fake_storage(uploads)
+            service = VideoAssemblyService(storage, temp_dir=temp_dir, pipeline_workers=workers)
+
+            with patch('subprocess.run', side_effect=fake_ffmpeg):
+                service.assemble_video(blueprint)
+                stream = ListStream(blueprint, split_moves(blueprint['moves'], cuts))
+                url = service.assemble_video_stream(stream)
+
+            assert url == f"https://storage.example.com/{blueprint['output_config']['output_path']}"
+            assert uploads[0] == uploads[1] == expected_video(blueprint)
+            assert os.listdir(temp_dir) == []
+            assert set(service.last_timings) == {'first_clip_ready', 'total'}
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_clips_start_before_stream_ends(self):
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f"clips/move_{i}.mp4"} for i in range(6)],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+        first_section_fetched = threading.Event()
+        uploads = []
+        storage = fake_storage(uploads)
+        download = storage.download_file.side_effect
+
+        def tracking_download(remote_path, local_path):
+            result = download(remote_path, local_path)
+            if remote_path == 'clips/move_0.mp4':
+                first_section_fetched.set()
+            return result
+
+        storage.download_file.side_effect = tracking_download
+        seen_before_second_section = []
+
+        def before_section(idx):
+            if idx == 1:
+                seen_before_second_section.append(first_section_fetched.wait(timeout=5))
+
+        service = VideoAssemblyService(storage, pipeline_workers=2)
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            service.assemble_video_stream(
+                ListStream(blueprint, split_moves(blueprint['moves'], [3]), before_section)
+            )
+
+        assert seen_before_second_section == [True]
+        assert uploads == [expected_video(blueprint)]
+
+
+class TestClipDeduplication:
+    """
+    Property: Each distinct video_path is downloaded and normalized once per
+    assembly, and the concat list still references it for every move.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        blueprint=valid_blueprint(),
+        picks=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=24),
+        streaming=st.booleans()
+    )
+    def test_unique_clips_processed_once(self, blueprint, picks, streaming):
+        blueprint = dict(blueprint, moves=[{'video_path': f"clips/clip_{p}.mp4"} for p in picks])
+        temp_dir = tempfile.mkdtemp(prefix='test_dedup_')
+        try:
+            uploads = []
+            storage = fake_storage(uploads)
+            service = VideoAssemblyService(storage, temp_dir=temp_dir)
+            normalize_calls = []
+
+            def recording_ffmpeg(cmd, **kwargs):
+                if 'normalized' in os.path.basename(cmd[-1]):
+                    normalize_calls.append(cmd[-1])
+                return fake_ffmpeg(cmd, **kwargs)
+
+            with patch('subprocess.run', side_effect=recording_ffmpeg):
+                if streaming:
+                    service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [3, 7])))
+                else:
+                    service.assemble_video(blueprint)
+
+            clip_downloads = [
+                call.args[0] for call in storage.download_file.call_args_list
+                if call.args[0] != blueprint['audio_path']
+            ]
+            assert sorted(clip_downloads) == sorted({f"clips/clip_{p}.mp4" for p in picks})
+            assert len(normalize_calls) == len(set(picks))
+            assert uploads == [expected_video(blueprint)]
+            assert os.listdir(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestMezzanineClips:
+    """
+    Property: Blueprints made only of mezzanine clips are concatenated
+    without any normalize command; mixed blueprints normalize every clip.
+    """
+
+    MEZZANINE = 'mezzanine/v1/clips/a.mp4', 'mezzanine/v1/clips/b.mp4'
+
+    def assemble(self, tmp_path, paths, streaming):
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': path} for path in paths],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path), pipeline_workers=2)
+        normalize_calls = []
+
+        def recording_ffmpeg(cmd, **kwargs):
+            if 'normalized' in os.path.basename(cmd[-1]):
+                normalize_calls.append(cmd[cmd.index('-i') + 1])
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=recording_ffmpeg):
+            if streaming:
+                service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2])))
+            else:
+                service.assemble_video(blueprint)
+
+        assert uploads == [expected_video(blueprint)]
+        assert os.listdir(tmp_path) == []
+        return normalize_calls
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_all_mezzanine_skips_normalization(self, tmp_path, streaming):
+        paths = [self.MEZZANINE[0], self.MEZZANINE[1], self.MEZZANINE[0]]
+
+        assert self.assemble(tmp_path, paths, streaming) == []
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_mixed_blueprint_normalizes_every_clip(self, tmp_path, streaming):
+        paths = [self.MEZZANINE[0], 'clips/c.mp4', self.MEZZANINE[1], self.MEZZANINE[0]]
+
+        assert len(self.assemble(tmp_path, paths, streaming)) == 3
+
+
+class TestParallelNormalization:
+    """
+    Property: assemble_video normalizes unique clips on at most
+    normalize_workers FFmpeg processes with CPU count / workers threads
+    each, keeps playback order however the jobs finish, stops queued jobs
+    after the first failure and records a timing per clip.
+    """
+
+    def make_blueprint(self, picks):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f"clips/clip_{p}.mp4"} for p in picks],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    @settings(max_examples=15, deadline=None)
+    @given(
+        picks=st.lists(st.integers(min_value=0, max_value=7), min_size=1, max_size=16),
+        workers=st.integers(min_value=1, max_value=6),
+        delays=st.lists(st.sampled_from([0, 0.001, 0.005]), min_size=8, max_size=8)
+    )
+    def test_bounded_concurrency_and_ordered_output(self, picks, workers, delays):
+        blueprint = self.make_blueprint(picks)
+        temp_dir = tempfile.mkdtemp(prefix='test_parallel_')
+        try:
+            uploads = []
+            service = VideoAssemblyService(fake_storage(uploads), temp_dir=temp_dir, normalize_workers=workers)
+            lock = threading.Lock()
+            running = [0]
+            peak = [0]
+            thread_args = []
+
+            def slow_ffmpeg(cmd, **kwargs):
+                if 'normalized' not in os.path.basename(cmd[-1]):
+                    return fake_ffmpeg(cmd, **kwargs)
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                    thread_args.append(int(cmd[cmd.index('-threads') + 1]))
+                # Finish out of order
+                with open(cmd[cmd.index('-i') + 1]) as f:
+                    time.sleep(delays[int(f.read().split('_')[-1].split('.')[0])])
+                try:
+                    return fake_ffmpeg(cmd, **kwargs)
+                finally:
+                    with lock:
+                        running[0] -= 1
+
+            with patch('os.cpu_count', return_value=8), patch('subprocess.run', side_effect=slow_ffmpeg):
+                service.assemble_video(blueprint)
+
+            expected_workers = min(workers, len(set(picks)))
+            assert uploads == [expected_video(blueprint)]
+            assert peak[0] <= expected_workers
+            assert set(thread_args) == {max(1, 8 // expected_workers)}
+            assert sorted(service.last_clip_timings) == sorted({picks.index(p) for p in picks})
+            assert os.listdir(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_first_failure_cancels_queued_clips(self, tmp_path):
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path), normalize_workers=2)
+        started = []
+        release = threading.Event()
+
+        def failing_ffmpeg(cmd, **kwargs):
+            if 'normalized' not in os.path.basename(cmd[-1]):
+                return fake_ffmpeg(cmd, **kwargs)
+            started.append(cmd[-1])
+            if cmd[-1].endswith('normalized_0000.mp4'):
+                raise subprocess.CalledProcessError(1, cmd, stderr='corrupt clip')
+            # The other running job is still allowed to finish
+            release.wait(timeout=0.05)
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=failing_ffmpeg):
+            with pytest.raises(VideoAssemblyError, match='clip 0'):
+                service.assemble_video(self.make_blueprint(range(10)))
+
+        assert len(started) < 10
+        assert os.listdir(tmp_path) == []
+
+    def test_default_workers_use_half_the_cpus(self):
+        with patch('os.cpu_count', return_value=16), patch.dict(os.environ, {'VIDEO_ASSEMBLY_NORMALIZE_WORKERS': ''}):
+            service = VideoAssemblyService(Mock(spec=StorageBackend))
+
+            assert service.normalize_workers == 8
+            assert service._normalize_concurrency(100) == (8, 2)
+            # Few clips: fewer processes, more threads each
+            assert service._normalize_concurrency(3) == (3, 5)
+
+
+class TestSinglePassRender:
+    """
+    Property: In single_pass render mode both assembly paths run exactly
+    one FFmpeg command (no normalize, concat or add-audio step) with every
+    move as an input and the audio mapped in, and upload the same video as
+    staged mode.
+    """
+
+    @settings(max_examples=15, deadline=None)
+    @given(
+        picks=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=12),
+        streaming=st.booleans()
+    )
+    def test_single_command_same_video(self, picks, streaming):
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f"clips/clip_{p}.mp4"} for p in picks],
+            'output_config': {'output_path': 'output/task-1.mp4', 'video_bitrate': '3M'},
+        }
+        temp_dir = tempfile.mkdtemp(prefix='test_single_pass_')
+        try:
+            uploads = []
+            service = VideoAssemblyService(
+                fake_storage(uploads), temp_dir=temp_dir, pipeline_workers=2, render_mode='single_pass'
+            )
+            commands = []
+
+            def recording_ffmpeg(cmd, **kwargs):
+                commands.append(cmd)
+                return fake_ffmpeg(cmd, **kwargs)
+
+            with patch('subprocess.run', side_effect=recording_ffmpeg):
+                if streaming:
+                    service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2, 5])))
+                else:
+                    service.assemble_video(blueprint)
+
+            assert len(commands) == 1
+            cmd = commands[0]
+            inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+            assert len(inputs) == len(picks) + 1
+            assert cmd[cmd.index('-map', cmd.index('-map') + 1) + 1] == f"{len(picks)}:a:0"
+            assert cmd[cmd.index('-b:v') + 1] == '3M'
+            assert uploads == [expected_video(blueprint)]
+            assert os.listdir(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_render_failure_cleans_up(self, tmp_path):
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path), render_mode='single_pass')
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': 'clips/a.mp4'}, {'video_path': 'clips/b.mp4'}],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+        error = subprocess.CalledProcessError(1, ['ffmpeg'], stderr='Invalid filtergraph')
+        with patch('subprocess.run', side_effect=error):
+            with pytest.raises(VideoAssemblyError, match='single pass render failed: Invalid filtergraph'):
+                service.assemble_video(blueprint)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_render_mode_from_environment(self):
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_RENDER_MODE': 'single_pass'}):
+            assert VideoAssemblyService(Mock(spec=StorageBackend)).render_mode == 'single_pass'
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_RENDER_MODE': 'bogus'}):
+            assert VideoAssemblyService(Mock(spec=StorageBackend)).render_mode == 'staged'
+
+
+class TestSegmentedRender:
+    """
+    Property: In segmented render mode both assembly paths encode the
+    timeline as consecutive parts (at most segment_workers, split at move
+    boundaries), join them with stream copy and mux the audio without
+    re-encoding or probing the video, uploading the same video as staged
+    mode.
+    """
+
+    @settings(max_examples=15, deadline=None)
+    @given(
+        picks=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=12),
+        workers=st.integers(min_value=1, max_value=4),
+        streaming=st.booleans()
+    )
+    def test_parts_join_to_same_video(self, picks, workers, streaming):
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f"clips/clip_{p}.mp4", 'duration': 4.0} for p in picks],
+            'output_config': {'output_path': 'output/task-1.mp4', 'video_bitrate': '3M'},
+        }
+        temp_dir = tempfile.mkdtemp(prefix='test_segmented_')
+        try:
+            uploads = []
+            service = VideoAssemblyService(
+                fake_storage(uploads), temp_dir=temp_dir, pipeline_workers=2,
+                render_mode='segmented', segment_workers=workers
+            )
+            commands = []
+            lock = threading.Lock()
+
+            def part_ffmpeg(cmd, **kwargs):
+                with lock:
+                    commands.append(cmd)
+                if os.path.basename(cmd[-1]).startswith('part_'):
+                    inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+                    with open(cmd[-1], 'w') as f:
+                        f.write('|'.join(open(path).read() for path in inputs))
+                    return Mock(returncode=0, stdout='', stderr='')
+                return fake_ffmpeg(cmd, **kwargs)
+
+            with patch('subprocess.run', side_effect=part_ffmpeg):
+                if streaming:
+                    service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2, 5])))
+                else:
+                    service.assemble_video(blueprint)
+
+            parts = [cmd for cmd in commands if os.path.basename(cmd[-1]).startswith('part_')]
+            assert len(parts) == min(workers, len(picks))
+            assert all('-an' in cmd and cmd[cmd.index('-b:v') + 1] == '3M' for cmd in parts)
+            assert [cmd[0] for cmd in commands].count('ffprobe') == 0
+            audio = commands[-1]
+            assert audio[audio.index('-c:v') + 1] == 'copy'
+            assert uploads == [expected_video(blueprint)]
+            assert os.listdir(temp_dir) == []
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        durations=st.lists(st.floats(min_value=0.5, max_value=20, allow_nan=False), min_size=1, max_size=40),
+        parts=st.integers(min_value=1, max_value=8)
+    )
+    def test_split_timeline_covers_moves_in_order(self, durations, parts):
+        service = VideoAssemblyService(Mock(spec=StorageBackend))
+        moves = [{'video_path': 'a.mp4', 'duration': duration} for duration in durations]
+
+        runs = service._split_timeline(moves, parts)
+
+        assert 1 <= len(runs) <= parts
+        assert runs[0][0] == 0 and runs[-1][1] == len(moves)
+        assert all(start < end for start, end in runs)
+        assert all(a[1] == b[0] for a, b in zip(runs, runs[1:]))
+        # Equal moves split into equal-sized parts
+        equal = service._split_timeline([{'duration': 4.0}] * len(durations), parts)
+        assert len(equal) == min(parts, len(durations))
+        sizes = [end - start for start, end in equal]
+        assert max(sizes) - min(sizes) <= 1
+
+    def test_part_failure_cleans_up(self, tmp_path):
+        service = VideoAssemblyService(
+            fake_storage([]), temp_dir=str(tmp_path), render_mode='segmented', segment_workers=2
+        )
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': 'clips/a.mp4'}, {'video_path': 'clips/b.mp4'}],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+        error = subprocess.CalledProcessError(1, ['ffmpeg'], stderr='Invalid filtergraph')
+        with patch('subprocess.run', side_effect=error):
+            with pytest.raises(VideoAssemblyError, match='render failed for part [01]: Invalid filtergraph'):
+                service.assemble_video(blueprint)
+
+        assert os.listdir(tmp_path) == []
+
+
+class TestMuxOnlyAudio:
+    """
+    Property: The add audio step copies the video stream exactly when
+    ffprobe reports it matches the output codec and bitrate policy, and
+    falls back to re-encoding when ffprobe fails.
+    """
+
+    def assemble(self, tmp_path, probe):
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': 'clips/a.mp4'}, {'video_path': 'clips/b.mp4'}],
+            'output_config': {'output_path': 'output/task-1.mp4', 'video_bitrate': '2M'},
+        }
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path))
+        audio_commands = []
+
+        def probing_ffmpeg(cmd, **kwargs):
+            if cmd[0] == 'ffprobe':
+                if probe is None:
+                    raise subprocess.CalledProcessError(1, cmd, stderr='Invalid data')
+                return Mock(returncode=0, stdout=json.dumps(probe), stderr='')
+            if os.path.basename(cmd[-1]) == 'final_output.mp4':
+                audio_commands.append(cmd)
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=probing_ffmpeg):
+            service.assemble_video(blueprint)
+
+        assert uploads == [expected_video(blueprint)]
+        assert os.listdir(tmp_path) == []
+        assert len(audio_commands) == 1
+        return audio_commands[0]
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        codec_name=st.sampled_from(['h264', 'hevc']),
+        bit_rate=st.integers(min_value=500_000, max_value=5_000_000)
+    )
+    def test_copy_when_stream_matches(self, codec_name, bit_rate):
+        probe = {'streams': [{'codec_name': codec_name, 'pix_fmt': 'yuv420p', 'bit_rate': str(bit_rate)}]}
+        temp_dir = tempfile.mkdtemp(prefix='test_mux_')
+        try:
+            cmd = self.assemble(temp_dir, probe)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        copied = cmd[cmd.index('-c:v') + 1] == 'copy'
+        assert copied == (codec_name == 'h264' and bit_rate <= 2_500_000)
+        assert ('-b:v' in cmd) == (not copied)
+
+    def test_probe_failure_reencodes(self, tmp_path):
+        cmd = self.assemble(tmp_path, None)
+
+        assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+
+
+class TestMoveTiming:
+    """
+    Property: Each move's clip is cut to its trim_start/duration and
+    retimed by playback_rate during normalization (one job per distinct
+    clip and segment); mezzanine clips are cut with stream copy when the
+    cut starts on a keyframe at normal speed, and re-encoded in the
+    mezzanine format otherwise.
+    """
+
+    def make_blueprint(self, moves):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': moves,
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    def assemble(self, tmp_path, blueprint, streaming):
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path), pipeline_workers=2)
+        commands = []
+
+        def recording_ffmpeg(cmd, **kwargs):
+            name = os.path.basename(cmd[-1])
+            if name.startswith(('normalized_', 'cut_')):
+                commands.append(cmd)
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=recording_ffmpeg):
+            if streaming:
+                service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [1])))
+            else:
+                service.assemble_video(blueprint)
+
+        assert uploads == [expected_video(blueprint)]
+        assert os.listdir(tmp_path) == []
+        return commands
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_normalize_applies_segments(self, tmp_path, streaming):
+        moves = [
+            {'video_path': 'clips/a.mp4', 'duration': 7.5, 'original_duration': 8.0,
+             'trim_start': 0.0, 'trim_end': 0.5, 'playback_rate': 1.0},
+            {'video_path': 'clips/a.mp4', 'duration': 7.0, 'original_duration': 8.0,
+             'trim_start': 0.0, 'trim_end': 0.0, 'playback_rate': 1.1429},
+            {'video_path': 'clips/a.mp4', 'duration': 7.5, 'original_duration': 8.0,
+             'trim_start': 0.0, 'trim_end': 0.5, 'playback_rate': 1.0},
+            {'video_path': 'clips/b.mp4', 'duration': 8.0, 'original_duration': 8.0,
+             'trim_start': 0.0, 'trim_end': 0.0, 'playback_rate': 1.0},
+        ]
+
+        commands = self.assemble(tmp_path, self.make_blueprint(moves), streaming)
+
+        # clips/a.mp4 in two segments, clips/b.mp4 whole
+        by_output = {os.path.basename(cmd[-1]): cmd for cmd in commands}
+        assert sorted(by_output) == ['normalized_0000.mp4', 'normalized_0001.mp4', 'normalized_0003.mp4']
+        first, second, whole = (by_output[name] for name in sorted(by_output))
+        assert first[first.index('-t') + 1] == '7.5' and '-vf' not in first
+        assert second[second.index('-t') + 1] == '7'
+        assert second[second.index('-vf') + 1] == 'setpts=PTS/1.1429'
+        assert '-t' not in whole and '-ss' not in whole
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_mezzanine_cuts_on_keyframes_with_stream_copy(self, tmp_path, streaming):
+        moves = [
+            {'video_path': 'mezzanine/v1/clips/a.mp4', 'duration': 6.0, 'trim_start': 2.0, 'playback_rate': 1.0},
+            {'video_path': 'mezzanine/v1/clips/a.mp4', 'duration': 6.0, 'trim_start': 1.5, 'playback_rate': 1.0},
+            {'video_path': 'mezzanine/v1/clips/b.mp4', 'duration': 6.0, 'trim_start': 0.0, 'playback_rate': 1.1},
+            {'video_path': 'mezzanine/v1/clips/b.mp4'},
+        ]
+
+        commands = self.assemble(tmp_path, self.make_blueprint(moves), streaming)
+
+        by_output = {os.path.basename(cmd[-1]): cmd for cmd in commands}
+        assert sorted(by_output) == ['cut_0000.mp4', 'cut_0001.mp4', 'cut_0002.mp4']
+        copy_cut, misaligned, retimed = (by_output[name] for name in sorted(by_output))
+        assert copy_cut[copy_cut.index('-c') + 1] == 'copy'
+        assert copy_cut[:copy_cut.index('-i')] == ['ffmpeg', '-ss', '2']
+        for cmd in (misaligned, retimed):
+            assert '-c' not in cmd and cmd[cmd.index('-g') + 1] == '30'
+        assert retimed[retimed.index('-vf') + 1].startswith('setpts=PTS/1.1,')
+
+    def test_move_segment(self):
+        service = VideoAssemblyService(Mock(spec=StorageBackend))
+
+        assert service._move_segment({'video_path': 'a.mp4'}) is None
+        assert service._move_segment({'duration': 8.0, 'original_duration': 8.0}) is None
+        assert service._move_segment({'duration': 8.0, 'original_duration': 8.0, 'playback_rate': 0.9}) == \
+            ClipSegment(0.0, 8.0, 0.9)
+        assert service._move_segment({'duration': 7.25, 'original_duration': 8.0, 'trim_end': 0.75}) == \
+            ClipSegment(0.0, 7.25, 1.0)
+        assert service._move_segment({'duration': 0, 'original_duration': 8.0}) is None
+
+
+class TestCrossfadeTransitions:
+    """
+    Property: A crossfade renders only a transition clip (the outgoing
+    clip fading into the start of the incoming move) placed before the
+    rest of the incoming move, once per unique clip pair and timing; the
+    other clips are processed as with hard cuts.
+    """
+
+    def make_blueprint(self, moves):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': moves,
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    def assemble(self, tmp_path, blueprint, streaming, **service_args):
+        uploads = []
+        service = VideoAssemblyService(
+            fake_storage(uploads), temp_dir=str(tmp_path), pipeline_workers=2, **service_args
+        )
+        commands = []
+
+        def transition_ffmpeg(cmd, **kwargs):
+            name = os.path.basename(cmd[-1])
+            if name.startswith(('normalized_', 'cut_', 'transition_')):
+                commands.append(cmd)
+            if name.startswith('transition_'):
+                inputs = [open(cmd[i + 1]).read() for i, arg in enumerate(cmd) if arg == '-i']
+                with open(cmd[-1], 'w') as f:
+                    f.write('>'.join(inputs))
+                return Mock(returncode=0, stdout='', stderr='')
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=transition_ffmpeg):
+            if streaming:
+                service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [1, 2])))
+            else:
+                service.assemble_video(blueprint)
+
+        assert os.listdir(tmp_path) == []
+        return uploads, commands
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_crossfades_render_transition_clips(self, tmp_path, streaming):
+        moves = [
+            {'video_path': 'clips/a.mp4', 'duration': 8.0, 'original_duration': 8.0, 'transition_type': 'cut'},
+            {'video_path': 'clips/b.mp4', 'duration': 6.0, 'original_duration': 8.0,
+             'transition_type': 'crossfade', 'transition_duration': 0.5},
+            {'video_path': 'clips/a.mp4', 'duration': 8.0, 'original_duration': 8.0,
+             'transition_type': 'crossfade', 'transition_duration': 0.5},
+            {'video_path': 'clips/b.mp4', 'duration': 6.0, 'original_duration': 8.0,
+             'transition_type': 'crossfade', 'transition_duration': 0.5},
+        ]
+
+        uploads, commands = self.assemble(tmp_path, self.make_blueprint(moves), streaming)
+
+        assert uploads == [
+            'clips/a.mp4|clips/a.mp4>clips/b.mp4|clips/b.mp4|clips/b.mp4>clips/a.mp4|clips/a.mp4'
+            '|clips/a.mp4>clips/b.mp4|clips/b.mp4'
+        ]
+        by_output = {os.path.basename(cmd[-1]): cmd for cmd in commands}
+        assert sorted(by_output) == [
+            'normalized_0000.mp4', 'normalized_0001.mp4', 'normalized_0002.mp4',
+            'transition_0001.mp4', 'transition_0002.mp4'
+        ]
+        # a continues from its last frame, b from the end of its 6 s move
+        into_b, into_a = by_output['transition_0001.mp4'], by_output['transition_0002.mp4']
+        assert into_b[:into_b.index('-i')] == ['ffmpeg', '-sseof', '-0.0333333']
+        assert into_a[:into_a.index('-i')] == ['ffmpeg', '-ss', '6']
+        # The rest of each incoming move starts after the transition
+        rest_of_b = by_output['normalized_0001.mp4']
+        assert rest_of_b[:rest_of_b.index('-i')] == ['ffmpeg', '-ss', '0.5']
+        assert rest_of_b[rest_of_b.index('-t') + 1] == '5.5'
+        assert '-ss' not in by_output['normalized_0000.mp4']
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_transitions_disabled_keep_hard_cuts(self, tmp_path, streaming):
+        moves = [
+            {'video_path': 'clips/a.mp4', 'duration': 8.0, 'original_duration': 8.0},
+            {'video_path': 'clips/b.mp4', 'duration': 8.0, 'original_duration': 8.0,
+             'transition_type': 'crossfade', 'transition_duration': 0.5},
+            {'video_path': 'clips/c.mp4'},
+        ]
+        blueprint = self.make_blueprint(moves)
+
+        uploads, commands = self.assemble(tmp_path, blueprint, streaming, transitions=False)
+
+        assert uploads == [expected_video(blueprint)]
+        assert not any(os.path.basename(cmd[-1]).startswith('transition_') for cmd in commands)
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_mezzanine_rest_of_move_is_stream_copied(self, tmp_path, streaming):
+        moves = [
+            {'video_path': 'mezzanine/v1/clips/a.mp4', 'duration': 8.0, 'original_duration': 8.0},
+            {'video_path': 'mezzanine/v1/clips/b.mp4', 'duration': 8.0, 'original_duration': 8.0,
+             'transition_type': 'crossfade', 'transition_duration': 0.5},
+        ]
+
+        uploads, commands = self.assemble(tmp_path, self.make_blueprint(moves), streaming)
+
+        assert uploads == ['mezzanine/v1/clips/a.mp4|mezzanine/v1/clips/a.mp4>mezzanine/v1/clips/b.mp4'
+                           '|mezzanine/v1/clips/b.mp4']
+        by_output = {os.path.basename(cmd[-1]): cmd for cmd in commands}
+        assert sorted(by_output) == ['cut_0001.mp4', 'transition_0001.mp4']
+        transition, rest = by_output['transition_0001.mp4'], by_output['cut_0001.mp4']
+        # The transition runs on to the keyframe at 1 s
+        assert transition[transition.index('-t') + 1] == '1'
+        assert transition[transition.index('-g') + 1] == '30'
+        assert rest[:rest.index('-i')] == ['ffmpeg', '-ss', '1']
+        assert rest[rest.index('-c') + 1] == 'copy'
+
+    def test_plan_move(self):
+        service = VideoAssemblyService(Mock(spec=StorageBackend), transitions=True)
+        previous = {'video_path': 'clips/a.mp4', 'duration': 4.0, 'original_duration': 8.0,
+                    'trim_start': 1.0, 'playback_rate': 1.25}
+        move = {'video_path': 'clips/b.mp4', 'duration': 0.6, 'original_duration': 8.0,
+                'transition_type': 'crossfade', 'transition_duration': 0.5}
+
+        # The fade is capped at half the move
+        assert service._plan_move(move, previous) == (
+            ClipSegment(0.3, 0.3, 1.0),
+            ClipTransition(duration=0.3, length=0.3, outgoing_start=6.0, outgoing_rate=1.25,
+                           incoming_start=0.0, incoming_rate=1.0)
+        )
+        assert service._plan_move(move) == (ClipSegment(0.0, 0.6, 1.0), None)
+        assert service._plan_move(dict(move, transition_type='cut'), previous) == (ClipSegment(0.0, 0.6, 1.0), None)
+        legacy = {'video_path': 'clips/b.mp4', 'transition_type': 'crossfade', 'transition_duration': 0.5}
+        assert service._plan_move(legacy, previous) == (None, None)
+
+
+class TestStreamFailures:
+    """
+    Property: Failures abort the pipeline with the same errors as
+    assemble_video, unsafe paths are rejected before download, and the
+    temp directory is always cleaned up.
+    """
+
+    def make_blueprint(self, num_moves=5):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f"clips/move_{i}.mp4"} for i in range(num_moves)],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    def test_normalization_failure_reports_clip(self, tmp_path):
+        import subprocess
+
+        def failing_ffmpeg(cmd, **kwargs):
+            if 'normalized_0002.mp4' in cmd[-1]:
+                raise subprocess.CalledProcessError(1, cmd, stderr='Invalid data found')
+            return fake_ffmpeg(cmd, **kwargs)
+
+        blueprint = self.make_blueprint()
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path), pipeline_workers=2)
+
+        with patch('subprocess.run', side_effect=failing_ffmpeg):
+            with pytest.raises(VideoAssemblyError, match='clip 2: Invalid data found'):
+                service.assemble_video_stream(ListStream(blueprint, [blueprint['moves']]))
+
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.parametrize('bad_path', ['../secret.mp4', '/etc/passwd'])
+    def test_unsafe_move_path_never_downloaded(self, tmp_path, bad_path):
+        blueprint = self.make_blueprint()
+        blueprint['moves'][3]['video_path'] = bad_path
+        storage = fake_storage([])
+        service = VideoAssemblyService(storage, temp_dir=str(tmp_path))
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            with pytest.raises(VideoAssemblyError, match='Security error'):
+                service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2])))
+
+        downloaded = [call.args[0] for call in storage.download_file.call_args_list]
+        assert bad_path not in downloaded
+        assert os.listdir(tmp_path) == []
+
+    def test_stream_error_propagates_unchanged(self, tmp_path):
+        class FailingStream(ListStream):
+            def __iter__(self):
+                yield self._sections[0]
+                raise BlueprintGenerationError('Failed to generate blueprint: boom')
+
+        blueprint = self.make_blueprint()
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path))
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            with pytest.raises(BlueprintGenerationError):
+                service.assemble_video_stream(FailingStream(blueprint, [blueprint['moves']]))
+
+        assert os.listdir(tmp_path) == []
+
+    def test_move_count_mismatch_rejected(self, tmp_path):
+        blueprint = self.make_blueprint()
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path))
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            with pytest.raises(VideoAssemblyError, match='stream yielded 4 moves'):
+                service.assemble_video_stream(ListStream(blueprint, [blueprint['moves'][:4]]))
+
+
+class TestBlueprintStream:
+    """
+    Property: stream_blueprint yields exactly generate_blueprint's moves,
+    one song section at a time, yielding each section before sequencing
+    the next, and exposes the full blueprint afterwards.
+    """
+
+    @settings(max_examples=10, deadline=None)
+    @given(song=st.sampled_from(['songs/a.mp3', 'songs/b.mp3', 'songs/c.mp3']))
+    def test_sections_concatenate_to_blueprint_moves(self, song):
+        expected = make_generator().generate_blueprint('task-1', song, 'beginner', 'medium', 'romantic', user_id=3)
+
+        stream = make_generator().stream_blueprint('task-1', song, 'beginner', 'medium', 'romantic', user_id=3)
+        assert stream.audio_path == song
+        assert stream.output_path == expected['output_config']['output_path']
+        assert stream.blueprint is None
+
+        sections = list(stream)
+        assert all(sections)
+        assert [move for section in sections for move in section] == expected['moves']
+        assert stream.blueprint['moves'] == expected['moves']
+
+    @staticmethod
+    def with_sections(song_path):
+        features = fake_features(song_path)
+        quarter = features.duration / 4
+        features.sections = [
+            SimpleNamespace(start_time=i * quarter, end_time=(i + 1) * quarter) for i in range(4)
+        ]
+        return features
+
+    @pytest.mark.parametrize('sequencing_mode', ['rule_based', 'optimized'])
+    def test_sequenced_section_by_section(self, sequencing_mode):
+        generator = make_generator()
+        generator._analyze_audio = Mock(side_effect=self.with_sections)
+        generator.sequencer.sequence_phrases = Mock(wraps=generator.sequencer.sequence_phrases)
+        # No music analyzer here: optimized mode falls back per section
+        generator._generate_optimized_sequence = Mock(side_effect=RuntimeError('no audio analysis'))
+        stream = generator.stream_blueprint(
+            'task-1', 'songs/a.mp3', 'beginner', 'medium', 'romantic', sequencing_mode=sequencing_mode
+        )
+
+        sections = iter(stream)
+        first = next(sections)
+        assert generator.sequencer.sequence_phrases.call_count == 1
+        sections = [first, *sections]
+
+        assert len(sections) == 4
+        assert generator.sequencer.sequence_phrases.call_count == 4
+        assert generator._generate_optimized_sequence.call_count == (4 if sequencing_mode == 'optimized' else 0)
+        features = self.with_sections('songs/a.mp3')
+        phrase = generator.sequencer.beats_per_phrase * 60.0 / features.tempo
+        for idx, section in enumerate(sections[1:], start=1):
+            # Each section starts on the phrase boundary nearest its song section
+            assert abs(section[0]['start_time'] - idx * features.duration / 4) <= phrase / 2 + 1e-6
+        moves = [move for section in sections for move in section]
+        assert [move['clip_id'] for move in moves] == [f"move_{i + 1}" for i in range(len(moves))]
+        assert stream.blueprint['moves'] == moves
+
+    def test_stream_iterates_once(self):
+        stream = make_generator().stream_blueprint('task-1', 'songs/a.mp3', 'beginner', 'medium', 'romantic')
+        list(stream)
+
+        with pytest.raises(BlueprintGenerationError):
+            list(stream)
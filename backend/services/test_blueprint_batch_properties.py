@@ -0,0 +1,179 @@
+"""
+Property-based tests for batch blueprint generation.
+
+These tests verify that BlueprintGenerator.generate_blueprints_batch
+produces the same blueprints as one generate_blueprint call per request,
+analyzes each song once, searches in one batched call, and isolates
+per-item failures.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .blueprint_cache import BlueprintCache
+from .blueprint_generator import BlueprintConfig, BlueprintGenerator
+from .test_blueprint_generator_properties import EMBEDDING_DIM
+from .test_keyword_search_service_properties import (
+    DIFFICULTIES, ENERGY_LEVELS, STYLES, make_catalog, make_vector_service
+)
+
+
+def fake_features(song_path):
+    """Deterministic per-song music features."""
+    rng = np.random.default_rng(abs(hash(song_path)) % (2 ** 32))
+    duration = float(rng.uniform(30, 90))
+    tempo = float(rng.uniform(110, 140))
+    return SimpleNamespace(
+        tempo=tempo,
+        duration=duration,
+        beat_positions=list(np.arange(0.0, duration, 60.0 / tempo)),
+        audio_embedding=rng.standard_normal(128).astype(np.float32),
+    )
+
+
+def make_generator(catalog_size=40, cache=None):
+    """Create a generator over an in-memory catalog with mocked audio analysis."""
+    service = make_vector_service(make_catalog(catalog_size), dim=EMBEDDING_DIM)
+    generator = BlueprintGenerator(
+        vector_search_service=service,
+        music_analyzer=None,
+        blueprint_cache=cache or BlueprintCache(max_entries=0, persistent=False)
+    )
+    generator._analyze_audio = Mock(side_effect=fake_features)
+    return generator
+
+
+request_strategy = st.tuples(
+    st.sampled_from(['songs/a.mp3', 'songs/b.mp3', 'songs/c.mp3']),
+    st.sampled_from(DIFFICULTIES),
+    st.sampled_from(ENERGY_LEVELS),
+    st.sampled_from(STYLES),
+)
+
+
+class TestBatchMatchesSingle:
+    """
+    Property: Every batch item equals the blueprint generate_blueprint
+    returns for the same request (apart from the timestamp).
+    """
+
+    @settings(max_examples=15, deadline=None)
+    @given(requests=st.lists(request_strategy, min_size=1, max_size=8))
+    def test_same_blueprints_as_single_calls(self, requests):
+        configs = [
+            BlueprintConfig(task_id=f"task-{i}", song_path=song, difficulty=d, energy_level=e, style=s, user_id=7)
+            for i, (song, d, e, s) in enumerate(requests)
+        ]
+
+        batch = make_generator().generate_blueprints_batch(configs, max_workers=4)
+
+        single = make_generator()
+        for config, result in zip(configs, batch):
+            expected = single.generate_blueprint(
+                config.task_id, config.song_path, config.difficulty,
+                config.energy_level, config.style, user_id=config.user_id
+            )
+            assert result['status'] == 'completed'
+            assert result['task_id'] == config.task_id
+            blueprint = result['blueprint']
+            for field in ('task_id', 'audio_path', 'moves', 'total_duration', 'output_config', 'generation_parameters'):
+                assert blueprint[field] == expected[field]
+
+    def test_each_song_analyzed_once_and_one_search(self):
+        generator = make_generator()
+        generator.vector_search.tiered_search_batch = Mock(wraps=generator.vector_search.tiered_search_batch)
+        configs = [
+            BlueprintConfig(task_id=f"task-{i}", song_path=song, difficulty=d, energy_level='medium', style='romantic')
+            for i, (song, d) in enumerate(
+                (song, d) for song in ('songs/a.mp3', 'songs/b.mp3') for d in DIFFICULTIES
+            )
+        ]
+
+        results = generator.generate_blueprints_batch(configs)
+
+        assert [r['status'] for r in results] == ['completed'] * 6
+        assert generator._analyze_audio.call_count == 2
+        assert generator.vector_search.tiered_search_batch.call_count == 1
+
+
+class TestBatchFailureIsolation:
+    """
+    Property: A failing song only fails its own items, and results keep
+    the input order.
+    """
+
+    def test_failed_analysis_only_fails_its_song(self):
+        generator = make_generator()
+
+        def analyze(song_path):
+            if song_path == 'songs/broken.mp3':
+                raise FileNotFoundError('Audio file not found: songs/broken.mp3')
+            return fake_features(song_path)
+
+        generator._analyze_audio = Mock(side_effect=analyze)
+        songs = ['songs/a.mp3', 'songs/broken.mp3', 'songs/b.mp3', 'songs/broken.mp3']
+        configs = [
+            BlueprintConfig(task_id=f"task-{i}", song_path=song, difficulty='beginner', energy_level='medium', style='romantic')
+            for i, song in enumerate(songs)
+        ]
+
+        results = generator.generate_blueprints_batch(configs)
+
+        assert [r['task_id'] for r in results] == [c.task_id for c in configs]
+        assert [r['status'] for r in results] == ['completed', 'failed', 'completed', 'failed']
+        assert 'not found' in results[1]['error']
+        assert generator._analyze_audio.call_count == 3
+
+    def test_empty_index_fails_every_item(self):
+        generator = make_generator(catalog_size=0)
+        configs = [
+            BlueprintConfig(task_id='task-0', song_path='songs/a.mp3', difficulty='beginner', energy_level='medium', style='romantic')
+        ]
+
+        results = generator.generate_blueprints_batch(configs)
+
+        assert results[0]['status'] == 'failed'
+
+    def test_cached_items_skip_analysis(self, tmp_path):
+        song = tmp_path / 'song.mp3'
+        song.write_bytes(b'fake audio content')
+        generator = make_generator(cache=BlueprintCache(persistent=False))
+        generator._analyze_audio = Mock(side_effect=lambda path: fake_features('songs/a.mp3'))
+        config = BlueprintConfig(task_id='task-0', song_path=str(song), difficulty='beginner', energy_level='medium', style='romantic')
+
+        generator.generate_blueprint('task-first', str(song), 'beginner', 'medium', 'romantic')
+        results = generator.generate_blueprints_batch([config])
+
+        assert results[0]['cached'] is True
+        assert results[0]['blueprint']['task_id'] == 'task-0'
+        assert generator._analyze_audio.call_count == 1
+
+
+class TestTieredSearchBatch:
+    """
+    Property: Batched tiered search returns the same results as one
+    tiered_search call per query.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        filters=st.lists(st.tuples(st.sampled_from(DIFFICULTIES), st.sampled_from(STYLES)), min_size=1, max_size=6)
+    )
+    def test_matches_individual_searches(self, seed, filters):
+        service = make_vector_service(make_catalog(30, seed=seed), dim=16, seed=seed)
+        queries = np.random.default_rng(seed).standard_normal((len(filters), 16)).astype(np.float32)
+        tiers = [[{'difficulty': d, 'style': s}, {'difficulty': d}, None] for d, s in filters]
+
+        batch = service.tiered_search_batch(queries, tiers, top_k=5)
+
+        for query, filter_tiers, results in zip(queries, tiers, batch):
+            expected = service.tiered_search(query, filter_tiers, top_k=5)
+            assert [r.move_id for r in results] == [r.move_id for r in expected]
+            assert [r.similarity_score for r in results] == pytest.approx(
+                [r.similarity_score for r in expected], abs=1e-5
+            )
@@ -0,0 +1,238 @@
+"""
+Property-based tests for the blueprint cache.
+
+These tests verify LRU behaviour of the memory tier, the database tier,
+invalidation, and that BlueprintGenerator reuses cached blueprints without
+re-analyzing the song while still filling in per-task fields.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .blueprint_cache import BlueprintCache
+from .blueprint_generator import BlueprintGenerator
+from .test_blueprint_generator_properties import EMBEDDING_DIM
+from .test_keyword_search_service_properties import make_catalog, make_vector_service
+
+
+KEY_PARTS = {
+    'song_hash': 'abc',
+    'difficulty': 'beginner',
+    'energy_level': 'medium',
+    'style': 'romantic',
+    'move_index_version': 'v1',
+    'generator_version': '1',
+}
+
+
+def make_blueprint(num_moves: int = 3):
+    """Create a minimal task-independent blueprint."""
+    return {
+        'moves': [{'clip_id': f"move_{i + 1}", 'video_path': f"clip_{i}.mp4"} for i in range(num_moves)],
+        'generation_parameters': {'style': 'romantic'},
+        'output_config': {'output_format': 'mp4'},
+    }
+
+
+class TestCacheKey:
+    """
+    Property: The cache key changes whenever any component changes and is
+    independent of argument order.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(component=st.sampled_from(sorted(KEY_PARTS)), value=st.text(min_size=1, max_size=8))
+    def test_key_changes_with_each_component(self, component, value):
+        changed = dict(KEY_PARTS, **{component: KEY_PARTS[component] + value})
+
+        assert BlueprintCache.make_key(**changed) != BlueprintCache.make_key(**KEY_PARTS)
+
+    def test_key_is_order_independent(self):
+        reordered = dict(reversed(list(KEY_PARTS.items())))
+
+        assert BlueprintCache.make_key(**reordered) == BlueprintCache.make_key(**KEY_PARTS)
+
+
+class TestMemoryTier:
+    """
+    Property: The memory tier holds at most max_entries blueprints, evicts
+    the least recently used one, and never hands out shared objects.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        max_entries=st.integers(min_value=1, max_value=8),
+        num_puts=st.integers(min_value=1, max_value=20)
+    )
+    def test_bounded_lru(self, max_entries, num_puts):
+        cache = BlueprintCache(max_entries=max_entries, persistent=False)
+        for i in range(num_puts):
+            cache.put(f"key_{i}", make_blueprint(i + 1))
+
+        assert cache.get_stats()['memory_entries'] == min(max_entries, num_puts)
+        # Most recent entries survive, older ones were evicted
+        assert cache.get(f"key_{num_puts - 1}") is not None
+        if num_puts > max_entries:
+            assert cache.get(f"key_{num_puts - max_entries - 1}") is None
+
+    def test_get_refreshes_recency(self):
+        cache = BlueprintCache(max_entries=2, persistent=False)
+        cache.put('a', make_blueprint())
+        cache.put('b', make_blueprint())
+        cache.get('a')
+        cache.put('c', make_blueprint())
+
+        assert cache.get('a') is not None
+        assert cache.get('b') is None
+
+    def test_returns_copies(self):
+        cache = BlueprintCache(persistent=False)
+        cache.put('a', make_blueprint())
+
+        first = cache.get('a')
+        first['generation_parameters']['ai_mode'] = True
+        first['moves'].clear()
+
+        second = cache.get('a')
+        assert 'ai_mode' not in second['generation_parameters']
+        assert len(second['moves']) == 3
+
+    def test_invalidation(self):
+        cache = BlueprintCache(persistent=False)
+        cache.put('a', make_blueprint(), song_hash='song1', move_index_version='v1')
+        cache.put('b', make_blueprint(), song_hash='song2', move_index_version='v1')
+        cache.put('c', make_blueprint(), song_hash='song2', move_index_version='v2')
+
+        cache.invalidate_stale('v2')
+        assert cache.get('a') is None and cache.get('b') is None
+        assert cache.get('c') is not None
+
+        cache.invalidate(song_hash='song2')
+        assert cache.get('c') is None
+
+    def test_index_version_change_purges_stale_entries(self):
+        cache = BlueprintCache(persistent=False)
+        cache.observe_move_index_version('v1')
+        cache.put('a', make_blueprint(), move_index_version='v1')
+
+        cache.observe_move_index_version('v1')
+        assert cache.get('a') is not None
+
+        cache.observe_move_index_version('v2')
+        assert cache.get('a') is None
+
+
+@pytest.mark.django_db
+class TestDatabaseTier:
+    """
+    Property: Blueprints survive a cold memory tier via the database, and
+    the table stays within max_db_entries.
+    """
+
+    def test_database_hit_after_memory_eviction(self):
+        from apps.choreography.models import BlueprintCacheEntry
+
+        cache = BlueprintCache(max_entries=1, max_db_entries=10)
+        cache.put('a', make_blueprint(2), song_hash='song1', move_index_version='v1')
+        cache.put('b', make_blueprint(4), song_hash='song1', move_index_version='v1')
+
+        # 'a' was evicted from memory but is still in the database
+        assert len(cache.get('a')['moves']) == 2
+        assert cache.get_stats()['db_hits'] == 1
+        assert BlueprintCacheEntry.objects.get(cache_key='a').hit_count == 1
+
+        # A fresh cache (e.g. another worker) reads the same rows
+        assert BlueprintCache().get('b') is not None
+
+    def test_database_tier_is_bounded(self):
+        from apps.choreography.models import BlueprintCacheEntry
+
+        cache = BlueprintCache(max_entries=0, max_db_entries=3)
+        for i in range(6):
+            cache.put(f"key_{i}", make_blueprint(), song_hash='song', move_index_version='v1')
+
+        assert BlueprintCacheEntry.objects.count() == 3
+
+    def test_database_invalidation(self):
+        from apps.choreography.models import BlueprintCacheEntry
+
+        cache = BlueprintCache()
+        cache.put('a', make_blueprint(), song_hash='song1', move_index_version='v1')
+        cache.put('b', make_blueprint(), song_hash='song2', move_index_version='v2')
+
+        assert cache.invalidate_stale('v2') == 1
+        assert list(BlueprintCacheEntry.objects.values_list('cache_key', flat=True)) == ['b']
+        assert cache.invalidate(song_hash='song2') == 1
+        assert BlueprintCacheEntry.objects.count() == 0
+
+
+class TestGeneratorCaching:
+    """
+    Property: A repeated request is served from the cache without running
+    audio analysis, with its own task_id and output path.
+    """
+
+    @pytest.fixture
+    def song_file(self, tmp_path):
+        path = tmp_path / 'song.mp3'
+        path.write_bytes(b'fake audio content')
+        return str(path)
+
+    def make_generator(self, cache):
+        service = make_vector_service(make_catalog(30), dim=EMBEDDING_DIM)
+        generator = BlueprintGenerator(vector_search_service=service, music_analyzer=None, blueprint_cache=cache)
+        duration = 60.0
+        generator._analyze_audio = Mock(return_value=SimpleNamespace(
+            tempo=120.0,
+            duration=duration,
+            beat_positions=list(np.arange(0.0, duration, 0.5)),
+            audio_embedding=np.ones(128, dtype=np.float32),
+        ))
+        return generator
+
+    def test_repeated_request_skips_analysis(self, song_file):
+        generator = self.make_generator(BlueprintCache(persistent=False))
+
+        first = generator.generate_blueprint('task-1', song_file, 'beginner', 'medium', 'romantic', user_id=1)
+        second = generator.generate_blueprint('task-2', song_file, 'beginner', 'medium', 'romantic', user_id=2)
+
+        assert generator._analyze_audio.call_count == 1
+        assert second['task_id'] == 'task-2'
+        assert second['generation_parameters']['user_id'] == 2
+        assert second['output_config']['output_path'] == 'output/user_2/choreography_task-2.mp4'
+        assert second['moves'] == first['moves']
+        assert first['task_id'] == 'task-1'
+        generator.validate_blueprint(second)
+
+    def test_different_parameters_or_song_miss(self, song_file, tmp_path):
+        generator = self.make_generator(BlueprintCache(persistent=False))
+        other_song = tmp_path / 'other.mp3'
+        other_song.write_bytes(b'different audio content')
+
+        generator.generate_blueprint('task-1', song_file, 'beginner', 'medium', 'romantic')
+        generator.generate_blueprint('task-2', song_file, 'advanced', 'medium', 'romantic')
+        generator.generate_blueprint('task-3', str(other_song), 'beginner', 'medium', 'romantic')
+
+        assert generator._analyze_audio.call_count == 3
+
+    def test_song_content_change_misses(self, song_file):
+        generator = self.make_generator(BlueprintCache(persistent=False))
+        generator.generate_blueprint('task-1', song_file, 'beginner', 'medium', 'romantic')
+
+        with open(song_file, 'wb') as f:
+            f.write(b'replaced audio content!')
+        generator.generate_blueprint('task-2', song_file, 'beginner', 'medium', 'romantic')
+
+        assert generator._analyze_audio.call_count == 2
+
+    def test_missing_song_file_bypasses_cache(self):
+        cache = BlueprintCache(persistent=False)
+        generator = self.make_generator(cache)
+
+        generator.generate_blueprint('task-1', '/nonexistent/song.mp3', 'beginner', 'medium', 'romantic')
+
+        assert cache.get_stats()['memory_entries'] == 0
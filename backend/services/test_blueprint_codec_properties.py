@@ -0,0 +1,181 @@
+"""
+Property-based tests for the compact columnar blueprint encoding.
+
+These tests verify that compacting a blueprint is loss-free, that compact
+blueprints are smaller, and that consumers (VideoAssemblyService, the
+blueprint cache) accept either form.
+"""
+
+import json
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .blueprint_cache import BlueprintCache
+from .blueprint_codec import (
+    BlueprintFormatError, compact_blueprint, expand_blueprint, is_compact_blueprint
+)
+from .test_video_assembly_properties import MockStorageBackend, valid_blueprint
+from .video_assembly_service import VideoAssemblyService
+
+
+json_scalars = st.one_of(
+    st.none(),
+    st.booleans(),
+    st.integers(min_value=-1000, max_value=1000),
+    st.floats(allow_nan=False, allow_infinity=False),
+    st.text(max_size=10),
+)
+
+
+@st.composite
+def homogeneous_moves(draw):
+    """Generate move lists that share the same keys with arbitrary JSON values."""
+    keys = draw(st.lists(st.text(min_size=1, max_size=12), min_size=1, max_size=8, unique=True))
+    count = draw(st.integers(min_value=1, max_value=20))
+    return [{key: draw(json_scalars) for key in keys} for _ in range(count)]
+
+
+def make_generated_blueprint(num_moves: int = 120, num_clips: int = 25):
+    """Create a blueprint shaped like BlueprintGenerator output."""
+    moves = []
+    for i in range(num_moves):
+        moves.append({
+            'clip_id': f"move_{i + 1}",
+            'video_path': f"data/Bachata_steps/basic_steps/basic_{i % num_clips}.mp4",
+            'start_time': round(i * 7.742, 3),
+            'duration': 7.742,
+            'transition_type': 'crossfade' if i > 0 else 'cut',
+            'original_duration': 8.0 + (i % 5) * 0.5,
+            'trim_start': 0.0,
+            'trim_end': 0.0,
+            'playback_rate': round(1.0 + (i % 5) * 0.05, 4),
+            'volume_adjustment': 1.0,
+        })
+    return {
+        'task_id': 'task-1',
+        'audio_path': 'songs/test.mp3',
+        'audio_tempo': 129.2,
+        'moves': moves,
+        'total_duration': num_moves * 7.742,
+        'difficulty_level': 'beginner',
+        'generation_timestamp': '2025-01-01T00:00:00Z',
+        'generation_parameters': {'energy_level': 'medium', 'style': 'romantic', 'user_id': 1},
+        'output_config': {
+            'output_path': 'output/user_1/choreography_task-1.mp4',
+            'output_format': 'mp4',
+            'video_codec': 'libx264',
+            'audio_codec': 'aac',
+            'video_bitrate': '2M',
+            'audio_bitrate': '128k',
+        },
+    }
+
+
+class TestLossFreeRoundTrip:
+    """
+    Property: expand_blueprint(compact_blueprint(b)) == b, including key
+    order and value types, and survives a JSON round trip.
+    """
+
+    @settings(max_examples=100, deadline=None)
+    @given(moves=homogeneous_moves())
+    def test_round_trip_arbitrary_moves(self, moves):
+        blueprint = {'task_id': 't', 'moves': moves}
+
+        compact = compact_blueprint(blueprint)
+        assert is_compact_blueprint(compact)
+
+        expanded = expand_blueprint(json.loads(json.dumps(compact)))
+        assert json.dumps(expanded) == json.dumps(blueprint)
+        for original, restored in zip(moves, expanded['moves']):
+            assert list(restored) == list(original)
+            assert [type(v) for v in restored.values()] == [type(v) for v in original.values()]
+
+    @settings(max_examples=30, deadline=None)
+    @given(blueprint=valid_blueprint())
+    def test_round_trip_assembly_blueprints(self, blueprint):
+        assert expand_blueprint(compact_blueprint(blueprint)) == blueprint
+
+    def test_signed_zero_preserved(self):
+        blueprint = {'moves': [{'trim': 0.0}, {'trim': -0.0}]}
+
+        expanded = expand_blueprint(compact_blueprint(blueprint))
+        assert json.dumps(expanded) == json.dumps(blueprint)
+
+    def test_heterogeneous_moves_stay_expanded(self):
+        blueprint = {'moves': [{'a': 1}, {'a': 1, 'b': 2}]}
+
+        assert compact_blueprint(blueprint) is blueprint
+
+    def test_expanded_blueprint_passes_through(self):
+        blueprint = make_generated_blueprint(3)
+
+        assert expand_blueprint(blueprint) is blueprint
+        assert compact_blueprint(compact_blueprint(blueprint)) == compact_blueprint(blueprint)
+
+
+class TestCompactSize:
+    """
+    Property: The compact form stores each clip path once and is much
+    smaller than the expanded form for long songs.
+    """
+
+    def test_compact_is_smaller(self):
+        blueprint = make_generated_blueprint(num_moves=120, num_clips=25)
+        compact = compact_blueprint(blueprint)
+
+        assert compact['moves']['tables']['video_path'] == [
+            f"data/Bachata_steps/basic_steps/basic_{i}.mp4" for i in range(25)
+        ]
+        assert compact['moves']['constants'] == {
+            'duration': 7.742, 'trim_start': 0.0, 'trim_end': 0.0, 'volume_adjustment': 1.0
+        }
+        assert len(json.dumps(compact)) < 0.5 * len(json.dumps(blueprint))
+
+    def test_unsupported_version_rejected(self):
+        compact = compact_blueprint(make_generated_blueprint(3))
+        compact['moves']['version'] = 99
+
+        with pytest.raises(BlueprintFormatError):
+            expand_blueprint(compact)
+
+    def test_corrupt_column_rejected(self):
+        compact = compact_blueprint(make_generated_blueprint(3))
+        compact['moves']['columns']['start_time'].pop()
+
+        with pytest.raises(BlueprintFormatError):
+            expand_blueprint(compact)
+
+
+class TestConsumersAcceptCompact:
+    """
+    Property: Validation gives the same verdict for both forms, and the
+    cache's database tier returns expanded blueprints.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(blueprint=valid_blueprint())
+    def test_validation_matches_expanded(self, blueprint):
+        service = VideoAssemblyService(MockStorageBackend())
+
+        assert service.validate_blueprint(compact_blueprint(blueprint)) == service.validate_blueprint(blueprint)
+
+    def test_corrupt_compact_blueprint_is_invalid(self):
+        service = VideoAssemblyService(MockStorageBackend())
+        compact = compact_blueprint(make_generated_blueprint(3))
+        compact['moves']['version'] = 99
+
+        is_valid, error_msg = service.validate_blueprint(compact)
+        assert is_valid is False
+        assert 'version' in error_msg
+
+    @pytest.mark.django_db
+    def test_cache_stores_compact_rows(self):
+        from apps.choreography.models import BlueprintCacheEntry
+
+        blueprint = make_generated_blueprint(10)
+        BlueprintCache(max_entries=0).put('key', blueprint, song_hash='song', move_index_version='v1')
+
+        assert is_compact_blueprint(BlueprintCacheEntry.objects.get(cache_key='key').blueprint_json)
+        assert BlueprintCache(max_entries=0).get('key') == blueprint
@@ -0,0 +1,211 @@
+"""
+Property-based tests for BlueprintGenerator move search and sequencing.
+
+These tests use an in-memory VectorSearchService (no database) populated
+with synthetic move metadata.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .beat_grid_sequencer import BeatGridSequencer
+from .blueprint_generator import BlueprintGenerator
+from .test_keyword_search_service_properties import (
+    DIFFICULTIES, ENERGY_LEVELS, STYLES, make_catalog, make_vector_service
+)
+from .vector_search_service import VectorSearchService
+
+
+EMBEDDING_DIM = (
+    VectorSearchService.POSE_EMBEDDING_DIM
+    + VectorSearchService.AUDIO_EMBEDDING_DIM
+    + VectorSearchService.TEXT_EMBEDDING_DIM
+)
+
+
+def sequential_fallback(service, query, filter_tiers, top_k):
+    """Reference implementation: one full search per tier until results are found."""
+    for tier, filters in enumerate(filter_tiers):
+        results = service._numpy_search(query.reshape(1, -1), filters, top_k)
+        if results:
+            return tier, results
+    return None, []
+
+
+class TestTieredMoveSearch:
+    """
+    Property: One tiered search pass returns the same moves as running the
+    fallback searches one after another, and reports the tier used.
+    """
+
+    @settings(max_examples=40, deadline=None)
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        size=st.integers(min_value=1, max_value=40),
+        difficulty=st.sampled_from(DIFFICULTIES),
+        energy_level=st.sampled_from(ENERGY_LEVELS),
+        style=st.sampled_from(STYLES),
+        top_k=st.integers(min_value=1, max_value=20)
+    )
+    def test_matches_sequential_fallback(self, seed, size, difficulty, energy_level, style, top_k):
+        service = make_vector_service(make_catalog(size, seed=seed), dim=16, seed=seed)
+        query = np.random.default_rng(seed + 1).standard_normal(16).astype(np.float32)
+        filter_tiers = [
+            {'difficulty': difficulty, 'energy_level': energy_level, 'style': style},
+            {'difficulty': difficulty, 'style': style},
+            {'difficulty': difficulty},
+            None,
+        ]
+
+        results = service.tiered_search(query, filter_tiers=filter_tiers, top_k=top_k)
+        expected_tier, expected = sequential_fallback(service, query, filter_tiers, top_k)
+
+        assert {r.relaxation_tier for r in results} == {expected_tier}
+        assert [r.similarity_score for r in results] == pytest.approx(
+            [r.similarity_score for r in expected], abs=1e-5
+        )
+        assert {r.move_id for r in results} == {r.move_id for r in expected}
+        for result in results:
+            assert result.to_dict()['relaxation_tier'] == expected_tier
+
+    def test_generator_reports_relaxation_tier(self):
+        catalog = make_catalog(30)
+        for move in catalog:
+            move['style'] = 'romantic'
+        service = make_vector_service(catalog, dim=EMBEDDING_DIM)
+        generator = BlueprintGenerator(vector_search_service=service, music_analyzer=None)
+        music_features = SimpleNamespace(audio_embedding=np.ones(128, dtype=np.float32))
+
+        moves = generator._search_matching_moves(music_features, 'beginner', 'high', 'sensual')
+
+        assert moves
+        assert all(move['relaxation_tier'] == 2 for move in moves)
+        assert all(move['difficulty'] == 'beginner' for move in moves)
+
+
+class TestBeatGridSequencing:
+    """
+    Property: Sequenced moves tile the song exactly, every move starts on
+    a phrase boundary (a looped move's repeats split its slot evenly), and
+    clip instructions fit each clip to its slot within max_stretch.
+    """
+
+    @settings(max_examples=60, deadline=None)
+    @given(
+        tempo=st.floats(min_value=90, max_value=180),
+        duration=st.floats(min_value=5, max_value=400),
+        offset=st.floats(min_value=0, max_value=1),
+        clip_durations=st.lists(st.floats(min_value=2, max_value=15), min_size=1, max_size=12)
+    )
+    def test_moves_snap_to_phrases_and_cover_song(self, tempo, duration, offset, clip_durations):
+        sequencer = BeatGridSequencer()
+        beats = np.arange(offset, duration, 60.0 / tempo)
+        moves = [
+            {'move_id': f"m{i}", 'move_name': f"Move {i}", 'video_path': f"clips/m{i}.mp4",
+             'duration': d, 'similarity_score': 0.5}
+            for i, d in enumerate(clip_durations)
+        ]
+
+        sequence = sequencer.sequence(moves, beats, tempo, duration)
+        boundaries = sequencer.phrase_boundaries(sequencer.build_beat_grid(beats, tempo, duration), duration)
+
+        assert sequence
+        assert sequence[0]['start_time'] == 0.0
+        assert sequence[-1]['start_time'] + sequence[-1]['duration'] == pytest.approx(duration)
+        for prev, move in zip(sequence, sequence[1:]):
+            assert move['start_time'] == pytest.approx(prev['start_time'] + prev['duration'])
+        slots = {}
+        for move in sequence:
+            slots.setdefault(move['phrase_index'], []).append(move)
+            assert move['duration'] > 0
+            assert move['phrase_count'] >= 1
+            # Played clip content fills the slot exactly
+            played = move['original_duration'] - move['trim_start'] - move['trim_end']
+            assert played == pytest.approx(move['duration'] * move['playback_rate'], abs=2e-3)
+            assert 1.0 - sequencer.max_stretch - 1e-9 <= move['playback_rate'] <= 1.0 + sequencer.max_stretch + 1e-9
+        for repeats in slots.values():
+            assert np.isclose(boundaries, repeats[0]['start_time']).any()
+            assert len({m['move_id'] for m in repeats}) == 1
+
+        # Moves are used in order, cycling as needed
+        slot_moves = [repeats[0]['move_id'] for repeats in slots.values()]
+        assert slot_moves == [moves[i % len(moves)]['move_id'] for i in range(len(slot_moves))]
+
+    @settings(max_examples=40, deadline=None)
+    @given(clip_duration=st.floats(min_value=0.3, max_value=3.3))
+    def test_short_clips_loop_instead_of_slowing_down(self, clip_duration):
+        sequencer = BeatGridSequencer()
+        beats = np.arange(0.0, 16.0, 0.5)  # 120 BPM: 4s phrases
+        moves = [{'move_id': 'm', 'move_name': 'M', 'video_path': 'm.mp4', 'duration': clip_duration}]
+
+        sequence = sequencer.sequence(moves, beats, 120.0, 16.0)
+
+        assert sum(m['duration'] for m in sequence) == pytest.approx(16.0)
+        for move in sequence:
+            assert move['playback_rate'] >= 1.0 - sequencer.max_stretch - 1e-9
+        # Each 4s phrase is filled with whole repeats of the clip
+        first_phrase = [m for m in sequence if m['phrase_index'] == 0]
+        assert len(first_phrase) >= 2
+        assert first_phrase[0]['start_time'] == 0.0
+        assert sum(m['duration'] for m in first_phrase) == pytest.approx(4.0)
+
+    def test_phrases_span_eight_beats(self):
+        sequencer = BeatGridSequencer()
+        beats = np.arange(0.25, 60.0, 0.5)  # 120 BPM, first beat at 0.25s
+
+        boundaries = sequencer.phrase_boundaries(sequencer.build_beat_grid(beats, 120.0, 60.0), 60.0)
+
+        assert boundaries[0] == 0.0 and boundaries[-1] == 60.0
+        assert np.allclose(np.diff(boundaries[1:-1]), 4.0)
+        assert np.allclose((boundaries[1:-1] - 0.25) % 4.0, 0.0)
+
+    def test_truncated_beat_list_is_extrapolated(self):
+        sequencer = BeatGridSequencer()
+        beats = np.arange(0.0, 10.0, 0.5)[:20]
+
+        grid = sequencer.build_beat_grid(beats, 120.0, 180.0)
+
+        assert grid[-1] > 179.0
+        assert np.allclose(np.diff(grid), 0.5)
+
+    def test_long_song_uses_at_most_one_move_per_phrase(self):
+        sequencer = BeatGridSequencer()
+        beats = np.arange(0.0, 3600.0, 60.0 / 130)  # one hour, ~7800 beats
+        moves = [{'move_id': 'm', 'move_name': 'M', 'video_path': 'm.mp4', 'duration': 6.0}]
+
+        sequence = sequencer.sequence(moves, beats, 130.0, 3600.0)
+
+        assert len(sequence) <= len(sequencer.phrase_boundaries(beats, 3600.0))
+
+
+class TestMezzanineClipSelection:
+    """
+    Property: Blueprints reference a move's mezzanine clip when one is
+    recorded, unless USE_MEZZANINE_CLIPS is disabled.
+    """
+
+    def make_generator(self):
+        catalog = make_catalog(20)
+        for move in catalog[::2]:
+            move['mezzanine_path'] = 'mezzanine/v1/' + move['video_path']
+        service = make_vector_service(catalog, dim=EMBEDDING_DIM)
+        return BlueprintGenerator(vector_search_service=service, music_analyzer=None, blueprint_cache=None), catalog
+
+    @pytest.mark.parametrize('enabled', ['True', 'False'])
+    def test_mezzanine_paths_used_when_enabled(self, enabled, monkeypatch):
+        monkeypatch.setenv('USE_MEZZANINE_CLIPS', enabled)
+        generator, catalog = self.make_generator()
+        results = generator.vector_search.tiered_search(
+            np.ones(EMBEDDING_DIM, dtype=np.float32), [None], top_k=20
+        )
+
+        moves = generator._matching_moves_from_results(results)
+
+        expected = {
+            m['move_id']: (m.get('mezzanine_path') if enabled == 'True' else None) or m['video_path']
+            for m in catalog
+        }
+        assert {move['move_id']: move['video_path'] for move in moves} == expected
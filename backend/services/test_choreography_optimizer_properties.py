@@ -0,0 +1,162 @@
+"""
+Property-based tests for the DP choreography optimizer.
+
+These tests verify that the Viterbi solver finds the optimal move sequence,
+that repetition is discouraged, and that BlueprintGenerator's optimized mode
+produces a phrase-aligned sequence.
+"""
+
+import itertools
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from music_analyzer import MusicAnalyzer
+
+from .blueprint_generator import BlueprintGenerator
+from .choreography_optimizer import ChoreographyOptimizer
+from .test_blueprint_generator_properties import EMBEDDING_DIM
+from .test_keyword_search_service_properties import make_catalog, make_vector_service
+
+
+class TestViterbiOptimality:
+    """
+    Property: Without the usage penalty the solver returns a path whose
+    cost equals the brute-force minimum.
+    """
+
+    @settings(max_examples=40, deadline=None)
+    @given(
+        seed=st.integers(min_value=0, max_value=10000),
+        num_slots=st.integers(min_value=1, max_value=5),
+        num_candidates=st.integers(min_value=1, max_value=4)
+    )
+    def test_matches_brute_force(self, seed, num_slots, num_candidates):
+        rng = np.random.default_rng(seed)
+        similarity = rng.uniform(-1, 1, size=(num_slots, num_candidates))
+        transition_cost = rng.uniform(0, 1, size=(num_candidates, num_candidates))
+        optimizer = ChoreographyOptimizer(usage_penalty=0.0, usage_iterations=0)
+
+        path = optimizer.optimize(similarity, transition_cost)
+
+        best = min(
+            optimizer.total_cost(similarity, np.array(candidate), transition_cost)
+            for candidate in itertools.product(range(num_candidates), repeat=num_slots)
+        )
+        assert optimizer.total_cost(similarity, path, transition_cost) == pytest.approx(best)
+
+    def test_back_to_back_repeats_are_penalized(self):
+        # One move fits every slot slightly better than the others
+        similarity = np.tile([0.9, 0.8, 0.8], (6, 1))
+        path = ChoreographyOptimizer(repetition_penalty=0.5, usage_iterations=0).optimize(similarity)
+
+        assert all(a != b for a, b in zip(path, path[1:]))
+
+    def test_usage_penalty_never_worsens_objective(self):
+        rng = np.random.default_rng(7)
+        similarity = rng.uniform(0, 1, size=(60, 150))
+        optimizer = ChoreographyOptimizer(usage_penalty=0.2, usage_iterations=3)
+        baseline = ChoreographyOptimizer(usage_penalty=0.2, usage_iterations=0)
+
+        assert optimizer.total_cost(similarity, optimizer.optimize(similarity)) <= \
+            baseline.total_cost(similarity, baseline.optimize(similarity))
+
+    def test_transition_costs_penalize_level_jumps(self):
+        candidates = [
+            {'energy_level': 'low', 'difficulty': 'beginner'},
+            {'energy_level': 'medium', 'difficulty': 'beginner'},
+            {'energy_level': 'high', 'difficulty': 'advanced'},
+        ]
+        costs = ChoreographyOptimizer.transition_costs(candidates)
+
+        assert np.allclose(np.diag(costs), 0.0)
+        assert costs[0, 1] == pytest.approx(0.25)
+        assert costs[0, 2] == pytest.approx(1.0)
+        assert np.allclose(costs, costs.T)
+
+    def test_solves_four_minute_song_quickly(self):
+        rng = np.random.default_rng(0)
+        similarity = rng.uniform(0, 1, size=(60, 150))
+        transition_cost = rng.uniform(0, 1, size=(150, 150))
+        optimizer = ChoreographyOptimizer()
+
+        optimizer.optimize(similarity, transition_cost)
+        start = time.perf_counter()
+        optimizer.optimize(similarity, transition_cost)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        # A few milliseconds in practice; generous bound to avoid CI flakiness
+        assert elapsed_ms < 100.0
+
+
+class TestOptimizedBlueprintSequence:
+    """
+    Property: Optimized sequencing covers the song with phrase-aligned
+    slots chosen from the candidate moves.
+    """
+
+    def test_optimized_mode_produces_aligned_sequence(self):
+        catalog = make_catalog(40)
+        service = make_vector_service(catalog, dim=EMBEDDING_DIM)
+        generator = BlueprintGenerator(vector_search_service=service, music_analyzer=MusicAnalyzer())
+        generator.optimizer.optimize = Mock(wraps=generator.optimizer.optimize)
+
+        duration = 120.0
+        num_frames = int(duration * 22050 / 512) + 1
+        rng = np.random.default_rng(3)
+        music_features = SimpleNamespace(
+            tempo=128.0,
+            duration=duration,
+            beat_positions=list(np.arange(0.1, duration, 60.0 / 128)),
+            mfcc_features=rng.standard_normal((13, num_frames)),
+            chroma_features=rng.uniform(0, 1, (12, num_frames)),
+        )
+
+        sequence = generator._generate_choreography_sequence(
+            music_features, catalog, 'beginner', 'medium', 'romantic', sequencing_mode='optimized'
+        )
+
+        assert generator.optimizer.optimize.call_count == 1
+        similarity = generator.optimizer.optimize.call_args[0][0]
+        # One optimized slot per phrase_index; short clips loop within their slot
+        slots = list({move['phrase_index']: move for move in sequence}.values())
+        assert similarity.shape == (len(slots), len(catalog))
+
+        assert sequence[0]['start_time'] == 0.0
+        assert sequence[-1]['start_time'] + sequence[-1]['duration'] == pytest.approx(duration)
+        move_ids = {move['move_id'] for move in catalog}
+        assert all(move['move_id'] in move_ids for move in sequence)
+        assert all(a['move_id'] != b['move_id'] for a, b in zip(slots, slots[1:]))
+
+    def test_optimized_per_song_section(self):
+        catalog = make_catalog(40)
+        service = make_vector_service(catalog, dim=EMBEDDING_DIM)
+        generator = BlueprintGenerator(vector_search_service=service, music_analyzer=MusicAnalyzer())
+        generator.optimizer.optimize = Mock(wraps=generator.optimizer.optimize)
+
+        duration = 120.0
+        num_frames = int(duration * 22050 / 512) + 1
+        rng = np.random.default_rng(5)
+        music_features = SimpleNamespace(
+            tempo=128.0,
+            duration=duration,
+            beat_positions=list(np.arange(0.1, duration, 60.0 / 128)),
+            mfcc_features=rng.standard_normal((13, num_frames)),
+            chroma_features=rng.uniform(0, 1, (12, num_frames)),
+            sections=[SimpleNamespace(start_time=start, end_time=start + 40.0) for start in (0.0, 40.0, 80.0)],
+        )
+
+        sections = list(generator._sequence_sections(music_features, catalog, sequencing_mode='optimized'))
+
+        assert len(sections) == 3
+        assert generator.optimizer.optimize.call_count == 3
+        moves = [move for section in sections for move in section]
+        assert moves[0]['start_time'] == 0.0
+        assert all(
+            a['start_time'] + a['duration'] == pytest.approx(b['start_time']) for a, b in zip(moves, moves[1:])
+        )
+        assert moves[-1]['start_time'] + moves[-1]['duration'] == pytest.approx(duration)
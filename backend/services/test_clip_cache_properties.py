@@ -0,0 +1,210 @@
+"""
+Property-based tests for the normalized clip cache.
+
+These tests verify cache keys, size-bounded LRU eviction, atomic writes,
+and that VideoAssemblyService skips FFmpeg for clips it has normalized
+before while producing the same output.
+"""
+
+import os
+import threading
+from unittest.mock import patch
+
+from hypothesis import given, strategies as st, settings
+
+from .clip_cache import NormalizedClipCache, get_clip_cache
+from .ffmpeg_builder import FFmpegCommandBuilder
+from .test_assembly_pipeline_properties import expected_video, fake_ffmpeg, fake_storage
+from .video_assembly_service import VideoAssemblyService
+
+
+KEY_PARTS = {
+    'source_hash': 'abc',
+    'frame_rate': 30,
+    'codec_settings': FFmpegCommandBuilder().normalize_settings(),
+    'builder_version': FFmpegCommandBuilder.BUILDER_VERSION,
+}
+
+
+def write_file(path, size):
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    return str(path)
+
+
+class TestCacheKey:
+    """
+    Property: The key changes with the source content, frame rate, any
+    codec setting, or the builder version.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        component=st.sampled_from(['source_hash', 'frame_rate', 'builder_version', 'crf', 'preset']),
+        value=st.integers(min_value=1, max_value=1000)
+    )
+    def test_key_changes_with_each_component(self, component, value):
+        changed = dict(KEY_PARTS, codec_settings=dict(KEY_PARTS['codec_settings']))
+        if component in ('crf', 'preset'):
+            changed['codec_settings'][component] = f"{changed['codec_settings'][component]}-{value}"
+        elif component == 'frame_rate':
+            changed['frame_rate'] = KEY_PARTS['frame_rate'] + value
+        else:
+            changed[component] = f"{KEY_PARTS[component]}-{value}"
+
+        assert NormalizedClipCache.make_key(**changed) != NormalizedClipCache.make_key(**KEY_PARTS)
+
+    def test_segment_changes_key(self):
+        whole = NormalizedClipCache.make_key(**KEY_PARTS)
+        cut = NormalizedClipCache.make_key(**KEY_PARTS, segment=(0.0, 7.5, 1.0))
+
+        assert cut != whole
+        assert cut != NormalizedClipCache.make_key(**KEY_PARTS, segment=(0.0, 7.5, 1.1))
+        assert NormalizedClipCache.make_key(**KEY_PARTS, segment=None) == whole
+
+    def test_transition_key_depends_on_clip_order_and_timing(self):
+        parts = dict(KEY_PARTS)
+        source_hash = parts.pop('source_hash')
+        transition = (0.5, 0.5, None, 1.0, 0.0, 1.0)
+        key = NormalizedClipCache.make_transition_key(source_hash, 'def', transition=transition, **parts)
+
+        assert key == NormalizedClipCache.make_transition_key(source_hash, 'def', transition=transition, **parts)
+        assert key != NormalizedClipCache.make_transition_key('def', source_hash, transition=transition, **parts)
+        assert key != NormalizedClipCache.make_transition_key(
+            source_hash, 'def', transition=(0.5, 1.0, None, 1.0, 0.0, 1.0), **parts
+        )
+        assert key != NormalizedClipCache.make_key(**KEY_PARTS)
+
+    def test_normalize_settings_match_command(self):
+        builder = FFmpegCommandBuilder()
+        cmd = builder.build_normalize_command('in.mp4', 'out.mp4')
+        settings = builder.normalize_settings()
+
+        assert cmd[cmd.index('-c:v') + 1] == settings['codec']
+        assert cmd[cmd.index('-preset') + 1] == settings['preset']
+        assert cmd[cmd.index('-crf') + 1] == str(settings['crf'])
+        assert cmd[cmd.index('-pix_fmt') + 1] == settings['pix_fmt']
+
+
+class TestDiskTier:
+    """
+    Property: The cache stays within max_bytes, evicts the least recently
+    used clips, and reports hit ratio and bytes saved.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(sizes=st.lists(st.integers(min_value=1, max_value=400), min_size=1, max_size=12))
+    def test_bounded_by_size(self, sizes):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = NormalizedClipCache(os.path.join(tmp, 'cache'), max_bytes=1000)
+            for i, size in enumerate(sizes):
+                cache.put(f"{i:064x}", write_file(os.path.join(tmp, f"clip_{i}.mp4"), size))
+
+            assert cache.disk_usage()['bytes'] <= 1000
+            # The most recent entry always fits and survives
+            assert cache.get(f"{len(sizes) - 1:064x}") is not None
+
+    def test_hit_refreshes_recency(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'), max_bytes=250)
+        for key in ('a' * 64, 'b' * 64):
+            cache.put(key, write_file(tmp_path / 'clip.mp4', 100))
+        old = os.path.getmtime(cache.entry_path('a' * 64)) - 100
+        os.utime(cache.entry_path('a' * 64), (old, old))
+        os.utime(cache.entry_path('b' * 64), (old + 1, old + 1))
+
+        assert cache.fetch('a' * 64, str(tmp_path / 'out.mp4'))
+        cache.put('c' * 64, write_file(tmp_path / 'clip.mp4', 100))
+
+        assert cache.get('a' * 64) is not None
+        assert cache.get('b' * 64) is None
+
+    def test_stats_report_hits_and_bytes_saved(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'))
+        cache.put('a' * 64, write_file(tmp_path / 'clip.mp4', 123))
+
+        assert cache.fetch('a' * 64, str(tmp_path / 'out1.mp4'))
+        assert cache.fetch('a' * 64, str(tmp_path / 'out2.mp4'))
+        assert not cache.fetch('b' * 64, str(tmp_path / 'out3.mp4'))
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['bytes_saved']) == (2, 1, 246)
+        assert abs(stats['hit_ratio'] - 2 / 3) < 1e-9
+        assert os.path.getsize(tmp_path / 'out2.mp4') == 123
+
+    def test_concurrent_writers_leave_complete_entry(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'))
+        sources = [write_file(tmp_path / f"clip_{i}.mp4", 1000 + i) for i in range(8)]
+
+        threads = [threading.Thread(target=cache.put, args=('a' * 64, src)) for src in sources]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert os.path.getsize(cache.entry_path('a' * 64)) in {1000 + i for i in range(8)}
+        leftovers = [name for _, _, files in os.walk(cache.cache_dir) for name in files if name.endswith('.tmp')]
+        assert leftovers == []
+
+    def test_disabled_without_cache_dir(self):
+        with patch.dict(os.environ, {'NORMALIZED_CLIP_CACHE_DIR': ''}):
+            assert get_clip_cache() is None
+
+
+class TestAssemblyUsesCache:
+    """
+    Property: A second assembly of the same clips runs no normalize
+    commands and uploads the same video; the temp dir is cleaned but the
+    cache keeps its entries.
+    """
+
+    def make_blueprint(self, paths):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': path} for path in paths],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    def test_second_assembly_skips_normalization(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'))
+        uploads = []
+        work_dir = tmp_path / 'work'
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(work_dir), clip_cache=cache)
+        normalize_calls = []
+
+        def recording_ffmpeg(cmd, **kwargs):
+            if 'normalized' in os.path.basename(cmd[-1]):
+                normalize_calls.append(cmd[-1])
+            return fake_ffmpeg(cmd, **kwargs)
+
+        first = self.make_blueprint(['clips/a.mp4', 'clips/b.mp4', 'clips/a.mp4'])
+        second = self.make_blueprint(['clips/b.mp4', 'clips/c.mp4', 'clips/a.mp4'])
+        with patch('subprocess.run', side_effect=recording_ffmpeg):
+            service.assemble_video(first)
+            assert len(normalize_calls) == 2
+            assert service.last_clip_cache_stats['hits'] == 0
+
+            service.assemble_video(second)
+
+        # Only clips/c.mp4 was new
+        assert len(normalize_calls) == 3
+        assert uploads == [expected_video(first), expected_video(second)]
+        assert service.last_clip_cache_stats['hits'] == 2
+        assert service.last_clip_cache_stats['misses'] == 1
+        assert service.last_clip_cache_stats['bytes_saved'] == len('clips/b.mp4') + len('clips/a.mp4')
+        assert os.listdir(work_dir) == []
+        assert cache.disk_usage()['entries'] == 3
+
+    def test_builder_version_change_misses(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'))
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path / 'work'), clip_cache=cache)
+        blueprint = self.make_blueprint(['clips/a.mp4'])
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            service.assemble_video(blueprint)
+            service.ffmpeg_builder.BUILDER_VERSION = 'next'
+            service.assemble_video(blueprint)
+
+        assert service.last_clip_cache_stats['hits'] == 0
+        assert cache.disk_usage()['entries'] == 2
@@ -0,0 +1,228 @@
+"""
+Property-based tests for FFmpeg admission control.
+
+These tests verify that FFmpegAdmission never runs more jobs than it has
+slots, within a process and across instances sharing a lock directory,
+admits waiting jobs in arrival order and reports their wait, and that
+VideoAssemblyService runs every FFmpeg process inside a slot and reports
+the queue wait in its progress messages.
+"""
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .ffmpeg_admission import FFmpegAdmission, get_ffmpeg_admission
+from .ffmpeg_progress import StageProgress
+from .test_assembly_pipeline_properties import expected_video, fake_ffmpeg, fake_storage
+from .video_assembly_service import VideoAssemblyService
+
+
+class ConcurrencyProbe:
+    """Tracks how many jobs run at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def run(self, seconds=0.01):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not reached'
+        time.sleep(0.005)
+
+
+class TestSlotLimit:
+    """
+    Property: However many jobs arrive at once, at most `slots` of them
+    run concurrently, and every job is admitted exactly once.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(slots=st.integers(min_value=1, max_value=4), jobs=st.integers(min_value=1, max_value=12))
+    def test_never_more_than_slots(self, slots, jobs):
+        admission = FFmpegAdmission(slots, poll_interval=0.01)
+        probe = ConcurrencyProbe()
+
+        def job():
+            with admission.admit():
+                probe.run()
+
+        threads = [threading.Thread(target=job) for _ in range(jobs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert probe.max_running <= slots
+        stats = admission.get_stats()
+        assert (stats['admitted'], stats['active'], stats['queued']) == (jobs, 0, 0)
+
+    def test_host_wide_slots_shared_by_instances(self, tmp_path):
+        # Two "processes" (instances) with one slot each, sharing the lock directory
+        first = FFmpegAdmission(1, lock_dir=str(tmp_path), poll_interval=0.01)
+        second = FFmpegAdmission(1, lock_dir=str(tmp_path), poll_interval=0.01)
+        probe = ConcurrencyProbe()
+
+        def job(admission):
+            with admission.admit():
+                probe.run(0.02)
+
+        threads = [threading.Thread(target=job, args=(a,)) for a in (first, second) * 3]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert probe.max_running == 1
+        assert first.get_stats()['admitted'] == second.get_stats()['admitted'] == 3
+
+
+class TestFairQueue:
+    """
+    Property: Jobs waiting for a slot are admitted in arrival order, see
+    their queue position while waiting, and a cancelled wait leaves the
+    queue.
+    """
+
+    @settings(max_examples=10, deadline=None)
+    @given(jobs=st.integers(min_value=2, max_value=6))
+    def test_admitted_in_arrival_order(self, jobs):
+        admission = FFmpegAdmission(1, poll_interval=0.01)
+        order, positions = [], {}
+        blocker = admission.admit()
+        blocker.__enter__()
+
+        def job(idx):
+            def on_wait(waited, ahead):
+                positions.setdefault(idx, ahead)
+            with admission.admit(on_wait):
+                order.append(idx)
+
+        threads = []
+        for idx in range(jobs):
+            threads.append(threading.Thread(target=job, args=(idx,)))
+            threads[-1].start()
+            wait_until(lambda: admission.get_stats()['queued'] == idx + 1)
+        wait_until(lambda: len(positions) == jobs)
+        blocker.__exit__(None, None, None)
+        for thread in threads:
+            thread.join()
+
+        assert order == list(range(jobs))
+        assert positions == {idx: idx for idx in range(jobs)}
+        assert admission.get_stats()['max_wait'] > 0
+
+    def test_cancelled_wait_leaves_queue(self):
+        admission = FFmpegAdmission(1, poll_interval=0.01)
+
+        def give_up(waited, ahead):
+            raise TimeoutError('request cancelled')
+
+        with admission.admit():
+            with pytest.raises(TimeoutError):
+                with admission.admit(give_up):
+                    pass
+            assert admission.get_stats()['queued'] == 0
+
+        with admission.admit() as waited:
+            assert waited < 0.5
+
+    def test_disabled_without_slot_count(self):
+        with patch.dict(os.environ, {'FFMPEG_MAX_CONCURRENT': '0'}):
+            assert get_ffmpeg_admission() is None
+        with patch.dict(os.environ, {'FFMPEG_MAX_CONCURRENT': '3', 'FFMPEG_SLOT_LOCK_DIR': ''}):
+            admission = get_ffmpeg_admission()
+            assert admission.slots == 3 and admission is get_ffmpeg_admission()
+
+
+class TestAssemblyAdmission:
+    """
+    Property: With admission control, an assembly never has more FFmpeg
+    processes running than there are slots, produces the same video, and
+    reports time spent waiting for a slot.
+    """
+
+    @pytest.mark.parametrize('render_mode', ['staged', 'segmented'])
+    def test_ffmpeg_processes_bounded(self, tmp_path, render_mode):
+        admission = FFmpegAdmission(2, poll_interval=0.01)
+        probe = ConcurrencyProbe()
+        uploads = []
+        service = VideoAssemblyService(
+            fake_storage(uploads), temp_dir=str(tmp_path), render_mode=render_mode,
+            normalize_workers=4, segment_workers=4, admission=admission
+        )
+        blueprint = {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f'clips/clip_{i}.mp4', 'duration': 8.0} for i in range(8)],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+        def probed_ffmpeg(cmd, **kwargs):
+            if cmd[0] == 'ffmpeg':
+                probe.run(0.005)
+            if os.path.basename(cmd[-1]).startswith('part_'):
+                inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+                with open(cmd[-1], 'w') as f:
+                    f.write('|'.join(open(path).read() for path in inputs))
+                return None
+            return fake_ffmpeg(cmd, **kwargs)
+
+        with patch('subprocess.run', side_effect=probed_ffmpeg):
+            service.assemble_video(blueprint)
+
+        assert uploads == [expected_video(blueprint)]
+        assert 1 <= probe.max_running <= 2
+        assert service.last_timings['ffmpeg_queue_wait'] >= 0
+        assert admission.get_stats()['active'] == 0
+
+    def test_queue_wait_in_progress_messages(self, tmp_path):
+        admission = FFmpegAdmission(1, poll_interval=0.01)
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path), admission=admission)
+        calls = []
+        progress = StageProgress(lambda *args: calls.append(args), 'adding_audio', 70, 85, 'Adding audio...', 0)
+        holder_admitted, release = threading.Event(), threading.Event()
+
+        def hold_slot():
+            with admission.admit():
+                holder_admitted.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        holder_admitted.wait()
+        threading.Timer(0.1, release.set).start()
+        with service._ffmpeg_slot(progress):
+            pass
+        holder.join()
+
+        assert calls and all(call[:2] == ('adding_audio', 70) for call in calls)
+        assert 'waiting for FFmpeg' in calls[0][2]
+        assert service.last_timings['ffmpeg_queue_wait'] >= 0.05
+
+    def test_worker_waits_shown_in_next_update(self):
+        calls = []
+        progress = StageProgress(lambda *args: calls.append(args), 'concatenating', 50, 70, 'Concatenating...', 0)
+
+        worker = threading.Thread(target=progress.queued, args=(3.0, 2))
+        worker.start()
+        worker.join()
+        assert calls == []
+
+        progress.update(0.5)
+        assert calls[-1][1] == 60 and 'waited up to 3s for FFmpeg' in calls[-1][2]
@@ -10,7 +10,7 @@ as defined in the design document.
 import pytest
 from hypothesis import given, strategies as st, settings, assume
 
-from .ffmpeg_builder import FFmpegCommandBuilder
+from .ffmpeg_builder import FFmpegCommandBuilder, parse_bitrate
 
 
 # Hypothesis strategies for generating test data
@@ -216,7 +216,28 @@ class TestFFmpegCommandBuilderProperties:
         # Verify default frame rate is used
         assert str(FFmpegCommandBuilder.DEFAULT_FRAME_RATE) in cmd, \
             f"Default frame rate {FFmpegCommandBuilder.DEFAULT_FRAME_RATE} should be in command"
-    
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        input_file=valid_file_path(),
+        output_file=valid_file_path(),
+        threads=st.one_of(st.none(), st.integers(min_value=1, max_value=64))
+    )
+    def test_normalize_command_threads(self, input_file, output_file, threads):
+        """
+        Property: build_normalize_command() passes -threads only when a
+        thread count is given, and the output file stays last.
+        """
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_normalize_command(input_file, output_file, threads=threads)
+
+        assert cmd[-1] == output_file
+        if threads:
+            assert cmd[cmd.index('-threads') + 1] == str(threads)
+        else:
+            assert '-threads' not in cmd
+
     @settings(max_examples=50, deadline=None)
     @given(
         video_file=valid_file_path(),
@@ -266,3 +287,340 @@ class TestFFmpegCommandBuilderProperties:
         assert isinstance(info['use_gpu'], bool), "use_gpu should be a boolean"
         assert isinstance(info['gpu_available'], bool), "gpu_available should be a boolean"
         assert isinstance(info['cpu_preset'], str), "cpu_preset should be a string"
+
+
+class TestMezzanineCommand:
+    """
+    Property: Mezzanine commands pin every stream parameter that stream-copy
+    concatenation depends on, and mezzanine paths are recognized.
+    """
+    
+    @settings(max_examples=50, deadline=None)
+    @given(
+        input_file=valid_file_path(),
+        output_file=valid_file_path(),
+        threads=st.one_of(st.none(), st.integers(min_value=1, max_value=16))
+    )
+    def test_mezzanine_command_pins_stream_parameters(self, input_file, output_file, threads):
+        builder = FFmpegCommandBuilder()
+        
+        cmd = builder.build_mezzanine_command(input_file, output_file, threads=threads)
+        
+        assert all(isinstance(arg, str) for arg in cmd)
+        assert cmd[0] == 'ffmpeg' and cmd[-1] == output_file
+        assert cmd[cmd.index('-i') + 1] == input_file
+        video_filter = cmd[cmd.index('-vf') + 1]
+        assert f'fps={builder.MEZZANINE_FRAME_RATE}' in video_filter
+        assert f'scale={builder.MEZZANINE_WIDTH}:{builder.MEZZANINE_HEIGHT}' in video_filter
+        assert 'format=yuv420p' in video_filter
+        assert cmd[cmd.index('-g') + 1] == str(builder.MEZZANINE_GOP)
+        assert cmd[cmd.index('-sc_threshold') + 1] == '0'
+        assert cmd[cmd.index('-flags') + 1] == '+cgop'
+        assert cmd[cmd.index('-video_track_timescale') + 1] == str(builder.MEZZANINE_TIMESCALE)
+        assert '-an' in cmd
+        if threads:
+            assert cmd[cmd.index('-threads') + 1] == str(threads)
+        else:
+            assert '-threads' not in cmd
+    
+    @settings(max_examples=50, deadline=None)
+    @given(video_path=valid_file_path())
+    def test_mezzanine_paths_are_recognized(self, video_path):
+        builder = FFmpegCommandBuilder()
+        
+        mezzanine = builder.mezzanine_path(video_path)
+        
+        assert mezzanine.endswith('.mp4')
+        assert builder.is_mezzanine_path(mezzanine)
+        assert not builder.is_mezzanine_path(video_path)
+
+
+class TestSinglePassCommand:
+    """
+    Property: The single pass command has one input per clip plus the audio,
+    one filter chain per clip feeding a concat filter in playback order, and
+    trims and retimes only the clips that have a segment.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        video_files=st.lists(valid_file_path(), min_size=1, max_size=12),
+        audio_file=valid_file_path(),
+        output_file=valid_file_path(),
+        data=st.data()
+    )
+    def test_single_pass_command_structure(self, video_files, audio_file, output_file, data):
+        builder = FFmpegCommandBuilder()
+        segments = data.draw(st.one_of(st.none(), st.lists(
+            st.one_of(st.none(), st.tuples(
+                st.floats(min_value=0, max_value=5, allow_nan=False),
+                st.floats(min_value=0.1, max_value=10, allow_nan=False),
+                st.sampled_from([1.0, 0.9, 1.15])
+            )),
+            min_size=len(video_files), max_size=len(video_files)
+        )))
+
+        cmd = builder.build_single_pass_command(video_files, audio_file, output_file, segments=segments)
+
+        assert all(isinstance(arg, str) for arg in cmd)
+        assert cmd[0] == 'ffmpeg' and cmd[-1] == output_file
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+        assert inputs == video_files + [audio_file]
+
+        chains = cmd[cmd.index('-filter_complex') + 1].split(';')
+        assert len(chains) == len(video_files) + 1
+        for idx, chain in enumerate(chains[:-1]):
+            assert chain.startswith(f'[{idx}:v:0]') and chain.endswith(f'[v{idx}]')
+            assert f'fps={builder.DEFAULT_FRAME_RATE}' in chain
+            segment = segments[idx] if segments else None
+            assert ('trim=' in chain) == bool(segment)
+            if segment:
+                assert f'setpts=(PTS-STARTPTS)/{segment[2]:g}' in chain
+        assert chains[-1] == ''.join(f'[v{i}]' for i in range(len(video_files))) + \
+            f'concat=n={len(video_files)}:v=1:a=0[vout]'
+
+        maps = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-map']
+        assert maps == ['[vout]', f'{len(video_files)}:a:0']
+
+    def test_single_pass_rejects_mismatched_segments(self):
+        builder = FFmpegCommandBuilder()
+
+        with pytest.raises(ValueError):
+            builder.build_single_pass_command(['a.mp4', 'b.mp4'], 'song.mp3', 'out.mp4', segments=[None])
+        with pytest.raises(ValueError):
+            builder.build_single_pass_command([], 'song.mp3', 'out.mp4')
+
+
+class TestMuxOnlyAudio:
+    """
+    Property: The add audio command copies the video stream only when asked,
+    and video_matches_output accepts a probed stream only if codec, pixel
+    format and bitrate fit the output config.
+    """
+
+    def probe(self, codec_name='h264', pix_fmt='yuv420p', bit_rate='1800000', format_bit_rate=None):
+        return {
+            'streams': [{'codec_name': codec_name, 'pix_fmt': pix_fmt, 'bit_rate': bit_rate}],
+            'format': {'bit_rate': format_bit_rate},
+        }
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        video_file=valid_file_path(),
+        audio_file=valid_file_path(),
+        output_file=valid_file_path(),
+        copy_video=st.booleans()
+    )
+    def test_copy_video_skips_video_encode(self, video_file, audio_file, output_file, copy_video):
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_add_audio_command(video_file, audio_file, output_file, copy_video=copy_video)
+
+        assert cmd[-1] == output_file
+        assert cmd[cmd.index('-c:a') + 1] == 'aac'
+        if copy_video:
+            assert cmd[cmd.index('-c:v') + 1] == 'copy'
+            assert '-b:v' not in cmd
+        else:
+            assert cmd[cmd.index('-c:v') + 1] == 'libx264'
+            assert cmd[cmd.index('-b:v') + 1] == builder.DEFAULT_VIDEO_BITRATE
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        target_kbps=st.integers(min_value=100, max_value=20000),
+        actual_bps=st.integers(min_value=1, max_value=40_000_000)
+    )
+    def test_bitrate_policy(self, target_kbps, actual_bps):
+        builder = FFmpegCommandBuilder()
+
+        matches = builder.video_matches_output(self.probe(bit_rate=str(actual_bps)), video_bitrate=f'{target_kbps}k')
+
+        assert matches == (actual_bps <= target_kbps * 1000 * builder.VIDEO_COPY_BITRATE_TOLERANCE)
+
+    def test_codec_and_format_must_match(self):
+        builder = FFmpegCommandBuilder()
+
+        assert builder.video_matches_output(self.probe())
+        assert builder.video_matches_output(self.probe(codec_name='hevc'), video_codec='libx265')
+        assert not builder.video_matches_output(self.probe(codec_name='hevc'))
+        assert not builder.video_matches_output(self.probe(pix_fmt='yuv444p'))
+        assert not builder.video_matches_output({'streams': []})
+
+    def test_unknown_stream_bitrate_uses_container_bitrate(self):
+        builder = FFmpegCommandBuilder()
+
+        assert builder.video_matches_output(self.probe(bit_rate='N/A', format_bit_rate='1500000'))
+        assert not builder.video_matches_output(self.probe(bit_rate=None, format_bit_rate=None))
+
+    def test_parse_bitrate(self):
+        assert parse_bitrate('2M') == 2_000_000
+        assert parse_bitrate('128k') == 128_000
+        assert parse_bitrate('1.5m') == 1_500_000
+        assert parse_bitrate('800000') == 800_000
+        assert parse_bitrate('fast') is None
+
+
+class TestClipSegments:
+    """
+    Property: Segment arguments seek before the input (frame-accurate when
+    re-encoding), limit the output duration and retime with setpts, and
+    mezzanine keyframes are every MEZZANINE_GOP frames.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        input_file=valid_file_path(),
+        output_file=valid_file_path(),
+        trim_start=st.floats(min_value=0, max_value=10, allow_nan=False),
+        duration=st.one_of(st.none(), st.floats(min_value=0.1, max_value=10, allow_nan=False)),
+        playback_rate=st.sampled_from([1.0, 0.85, 1.15])
+    )
+    def test_normalize_segment_arguments(self, input_file, output_file, trim_start, duration, playback_rate):
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_normalize_command(
+            input_file, output_file, trim_start=trim_start, duration=duration, playback_rate=playback_rate
+        )
+
+        assert cmd[-1] == output_file
+        input_index = cmd.index('-i')
+        assert ('-ss' in cmd[:input_index]) == (trim_start > 0)
+        assert '-ss' not in cmd[input_index:]
+        assert ('-t' in cmd) == bool(duration)
+        assert ('-vf' in cmd) == (playback_rate != 1.0)
+
+    def test_cut_command_copies_streams(self):
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_cut_command('in.mp4', 'out.mp4', 3.0, 5.5)
+
+        assert cmd[:cmd.index('-i')] == ['ffmpeg', '-ss', '3']
+        assert cmd[cmd.index('-t') + 1] == '5.5'
+        assert cmd[cmd.index('-c') + 1] == 'copy'
+
+    @settings(max_examples=100, deadline=None)
+    @given(seconds=st.integers(min_value=0, max_value=600), frames=st.integers(min_value=-29, max_value=29))
+    def test_mezzanine_keyframe_alignment(self, seconds, frames):
+        builder = FFmpegCommandBuilder()
+        fps = builder.MEZZANINE_FRAME_RATE
+
+        assert builder.mezzanine_keyframe_aligned(seconds + frames / fps) == (frames == 0)
+
+
+class TestTransitionCommand:
+    """
+    Property: A transition command crossfades the continuation of the
+    outgoing clip into the start of the incoming clip for duration
+    seconds, outputs length seconds in the format of the surrounding
+    clips, and holds the outgoing clip's last frame when it has no
+    continuation.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        duration=st.sampled_from([0.25, 0.5, 1.0]),
+        extra=st.sampled_from([0.0, 0.5]),
+        outgoing_start=st.one_of(st.none(), st.floats(min_value=0.5, max_value=10, allow_nan=False)),
+        incoming_start=st.floats(min_value=0, max_value=10, allow_nan=False),
+        mezzanine=st.booleans()
+    )
+    def test_transition_command(self, duration, extra, outgoing_start, incoming_start, mezzanine):
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_transition_command(
+            'a.mp4', 'b.mp4', 'out.mp4', duration, duration + extra,
+            outgoing_start=outgoing_start, incoming_start=incoming_start, mezzanine=mezzanine
+        )
+
+        assert cmd[-1] == 'out.mp4'
+        inputs = [i for i, arg in enumerate(cmd) if arg == '-i']
+        assert [cmd[i + 1] for i in inputs] == ['a.mp4', 'b.mp4']
+        assert ('-sseof' in cmd[:inputs[0]]) == (outgoing_start is None)
+        assert ('-ss' in cmd[inputs[0]:inputs[1]]) == (incoming_start > 0)
+        filters = cmd[cmd.index('-filter_complex') + 1]
+        assert f'xfade=transition=fade:duration={duration:g}:offset=0' in filters
+        assert ('scale2ref' in filters) == (not mezzanine)
+        assert cmd[cmd.index('-t') + 1] == f'{duration + extra:g}'
+        assert ('-g' in cmd) == mezzanine
+        assert '-an' in cmd
+
+    @settings(max_examples=100, deadline=None)
+    @given(seconds=st.floats(min_value=0, max_value=600, allow_nan=False))
+    def test_next_mezzanine_keyframe(self, seconds):
+        builder = FFmpegCommandBuilder()
+
+        keyframe = builder.next_mezzanine_keyframe(seconds)
+
+        assert builder.mezzanine_keyframe_aligned(keyframe)
+        assert keyframe >= seconds - 0.5 / builder.MEZZANINE_FRAME_RATE
+        assert keyframe - seconds < builder.MEZZANINE_GOP / builder.MEZZANINE_FRAME_RATE
+
+
+class TestSegmentCommand:
+    """
+    Property: A segment command encodes its clips like the single pass
+    command, without audio, with closed one-second GOPs and a fixed track
+    timescale so parts concatenate with stream copy.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        video_files=st.lists(valid_file_path(), min_size=1, max_size=6),
+        output_file=valid_file_path()
+    )
+    def test_segment_command(self, video_files, output_file):
+        builder = FFmpegCommandBuilder()
+
+        cmd = builder.build_segment_command(video_files, output_file, video_bitrate='3M')
+        single_pass = builder.build_single_pass_command(video_files, 'audio.mp3', 'out.mp4')
+
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i'] == video_files
+        filters = cmd[cmd.index('-filter_complex') + 1]
+        assert filters == single_pass[single_pass.index('-filter_complex') + 1]
+        assert cmd[cmd.index('-g') + 1] == '30'
+        assert cmd[cmd.index('-flags') + 1] == '+cgop'
+        assert cmd[cmd.index('-video_track_timescale') + 1] == str(builder.MEZZANINE_TIMESCALE)
+        assert cmd[cmd.index('-b:v') + 1] == '3M'
+        assert '-an' in cmd and cmd[-1] == output_file
+
+
+class TestHLSOutput:
+    """
+    Property: HLS output replaces the command's output file with an event
+    playlist of fMP4 segments written next to it, forces keyframes at
+    segment starts when the video is encoded, and keeps the rest of the
+    command unchanged.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        video_files=st.lists(valid_file_path(), min_size=1, max_size=6),
+        segment_seconds=st.integers(min_value=1, max_value=10)
+    )
+    def test_single_pass_to_hls(self, video_files, segment_seconds):
+        builder = FFmpegCommandBuilder()
+        cmd = builder.build_single_pass_command(video_files, 'audio.mp3', 'out.mp4')
+
+        hls = builder.with_hls_output(cmd, '/tmp/hls/index.m3u8', segment_seconds)
+
+        assert hls[:len(cmd) - 2] == cmd[:-2]
+        assert hls[-2:] == ['-y', '/tmp/hls/index.m3u8']
+        assert hls[hls.index('-f') + 1] == 'hls'
+        assert hls[hls.index('-hls_time') + 1] == str(segment_seconds)
+        assert hls[hls.index('-hls_playlist_type') + 1] == 'event'
+        assert hls[hls.index('-hls_segment_type') + 1] == 'fmp4'
+        assert hls[hls.index('-hls_segment_filename') + 1] == '/tmp/hls/segment_%05d.m4s'
+        assert 'temp_file' in hls[hls.index('-hls_flags') + 1]
+        assert hls[hls.index('-force_key_frames') + 1] == f'expr:gte(t,n_forced*{segment_seconds})'
+        assert hls[hls.index('-g') + 1] == str(30 * segment_seconds)
+
+    def test_copied_video_keeps_its_keyframes(self):
+        builder = FFmpegCommandBuilder()
+        cmd = builder.build_add_audio_command('video.mp4', 'audio.mp3', 'out.mp4', copy_video=True)
+
+        hls = builder.with_hls_output(cmd, 'hls/index.m3u8')
+
+        assert '-force_key_frames' not in hls and '-g' not in hls
+        assert hls[hls.index('-c:v') + 1] == 'copy'
+        assert hls[hls.index('-hls_time') + 1] == str(builder.HLS_SEGMENT_SECONDS)
+        assert hls[-1] == 'hls/index.m3u8' and 'out.mp4' not in hls
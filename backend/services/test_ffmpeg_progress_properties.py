@@ -0,0 +1,210 @@
+"""
+Property-based tests for FFmpeg progress reporting.
+
+These tests verify parsing of FFmpeg -progress output, the mapping of a
+stage's completed fraction onto its progress range with throttling and
+ETA, and that VideoAssemblyService reports continuous progress while
+FFmpeg adds the audio track.
+"""
+
+import io
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .ffmpeg_progress import StageProgress, format_eta, parse_progress, progress_seconds, progress_speed
+from .test_assembly_pipeline_properties import expected_video, fake_ffmpeg, fake_storage
+from .video_assembly_service import VideoAssemblyService, VideoAssemblyError
+
+
+def progress_output(positions, speed='2x'):
+    """FFmpeg -progress output for the given output positions in seconds."""
+    blocks = []
+    for idx, position in enumerate(positions):
+        blocks.append(
+            f"frame={int(position * 30)}\nfps=60.0\nout_time_us={int(position * 1_000_000)}\n"
+            f"out_time_ms={int(position * 1_000_000)}\nspeed={speed}\n"
+            f"progress={'end' if idx == len(positions) - 1 else 'continue'}\n"
+        )
+    return ''.join(blocks)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseProgress:
+    """
+    Property: Progress output splits into one block per update, and each
+    block's output position and speed are recovered.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(positions=st.lists(st.floats(min_value=0, max_value=3600, allow_nan=False), min_size=1, max_size=20))
+    def test_blocks_and_positions(self, positions):
+        blocks = list(parse_progress(io.StringIO(progress_output(positions))))
+
+        assert len(blocks) == len(positions)
+        for block, position in zip(blocks, positions):
+            assert progress_seconds(block) == pytest.approx(position, abs=1e-6)
+            assert progress_speed(block) == 2.0
+        assert blocks[-1]['progress'] == 'end'
+
+    def test_position_fallbacks(self):
+        assert progress_seconds({'out_time_ms': '1500000'}) == 1.5
+        assert progress_seconds({'out_time_us': 'N/A', 'out_time': '00:01:02.500000'}) == 62.5
+        assert progress_seconds({'out_time': 'N/A'}) is None
+        assert progress_speed({'speed': 'N/A'}) is None
+        assert progress_speed({'speed': '0x'}) is None
+
+
+class TestStageProgress:
+    """
+    Property: Updates map into the stage's range without going backwards
+    past it, are throttled to one per interval, and carry an ETA.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        fractions=st.lists(st.floats(min_value=-0.5, max_value=1.5, allow_nan=False), min_size=1, max_size=30),
+        start=st.integers(min_value=0, max_value=50),
+        span=st.integers(min_value=1, max_value=50)
+    )
+    def test_progress_stays_in_range(self, fractions, start, span):
+        calls = []
+        clock = FakeClock()
+        progress = StageProgress(
+            lambda *args: calls.append(args), 'stage', start, start + span, 'Working...',
+            min_interval=0, clock=clock
+        )
+
+        progress.start()
+        for fraction in fractions:
+            clock.now += 1
+            progress.update(fraction)
+
+        assert calls[0] == ('stage', start, 'Working...')
+        assert all(start <= value <= start + span for _, value, _ in calls)
+        assert all(a[1] != b[1] for a, b in zip(calls, calls[1:]))
+
+    def test_updates_are_throttled(self):
+        calls = []
+        clock = FakeClock()
+        progress = StageProgress(lambda *args: calls.append(args), 'stage', 0, 100, 'Working...', 2.0, clock)
+
+        progress.start()
+        for step in range(1, 21):
+            clock.now = step * 0.5
+            progress.update(step / 20)
+
+        # Ten seconds of updates every half second: one callback per 2 s
+        assert [value for _, value, _ in calls] == [0, 5, 25, 45, 65, 85]
+
+    def test_eta_from_speed(self):
+        calls = []
+        progress = StageProgress(lambda *args: calls.append(args), 'adding_audio', 70, 85, 'Adding audio track...')
+
+        handle = progress.ffmpeg_handler(120.0)
+        for block in parse_progress(io.StringIO(progress_output([30.0], speed='1.5x'))):
+            handle(block)
+
+        assert calls == [('adding_audio', 73, 'Adding audio track... 25% done, about 1m 00s left')]
+
+    def test_callback_errors_do_not_propagate(self):
+        progress = StageProgress(Mock(side_effect=RuntimeError('db down')), 'stage', 0, 100, 'Working...')
+
+        progress.start()
+        progress.update(0.5)
+
+    def test_format_eta(self):
+        assert format_eta(44.6) == '45s'
+        assert format_eta(185) == '3m 05s'
+
+
+class FakePopen:
+    """subprocess.Popen stand-in: runs fake_ffmpeg and replays progress output."""
+
+    def __init__(self, cmd, stdout=None, stderr=None, text=None, returncode=0, positions=(), error=''):
+        self.cmd = cmd
+        self.returncode = returncode
+        if returncode == 0:
+            fake_ffmpeg(cmd)
+        self.stdout = io.StringIO(progress_output(positions) if positions else '')
+        self.stderr = io.StringIO(error)
+
+    def wait(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestAssemblyProgress:
+    """
+    Property: With a progress callback, adding the audio track runs FFmpeg
+    with -progress and reports increasing progress within the stage;
+    without one, FFmpeg runs as before.
+    """
+
+    def make_blueprint(self):
+        moves = [{'video_path': f'clips/{name}.mp4', 'duration': 10.0} for name in 'abcd']
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': moves,
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    def test_audio_stage_reports_ffmpeg_progress(self, tmp_path):
+        uploads, calls, commands = [], [], []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path), progress_interval=0)
+        blueprint = self.make_blueprint()
+
+        def popen(cmd, **kwargs):
+            commands.append(cmd)
+            return FakePopen(cmd, positions=[5.0, 10.0, 20.0, 30.0, 40.0], **kwargs)
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg), patch('subprocess.Popen', side_effect=popen):
+            service.assemble_video(blueprint, progress_callback=lambda *args: calls.append(args))
+
+        assert uploads == [expected_video(blueprint)]
+        assert len(commands) == 1 and commands[0][:4] == ['ffmpeg', '-progress', 'pipe:1', '-nostats']
+        audio = [value for stage, value, _ in calls if stage == 'adding_audio']
+        assert audio == sorted(audio) and audio[0] == 70 and audio[-1] == 85 and len(audio) > 2
+        values = [value for _, value, _ in calls]
+        assert values == sorted(values) and values[-1] == 100
+        assert os.listdir(tmp_path) == []
+
+    def test_ffmpeg_failure_keeps_error_detail(self, tmp_path):
+        service = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path))
+
+        def popen(cmd, **kwargs):
+            return FakePopen(cmd, returncode=1, error='Invalid codec parameters', **kwargs)
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg), patch('subprocess.Popen', side_effect=popen):
+            with pytest.raises(VideoAssemblyError, match='Invalid codec parameters'):
+                service.assemble_video(self.make_blueprint(), progress_callback=lambda *args: None)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_no_callback_runs_without_progress(self, tmp_path):
+        uploads = []
+        service = VideoAssemblyService(fake_storage(uploads), temp_dir=str(tmp_path))
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg), \
+                patch('subprocess.Popen', side_effect=AssertionError('Popen used')):
+            service.assemble_video(self.make_blueprint())
+
+        assert uploads == [expected_video(self.make_blueprint())]
@@ -0,0 +1,323 @@
+"""
+Property-based tests for progressive HLS output.
+
+These tests verify parsing and rewriting of media playlists, that
+HLSPublisher uploads each finished segment once and before the playlist
+that lists it by relative URI, that signed_playlist points a published
+playlist at fresh storage URLs, and that VideoAssemblyService with HLS
+output uploads segments while FFmpeg is still running and reports the
+playlist URL before assembly completes.
+"""
+
+import io
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .hls_publisher import (
+    HLSPublisher, HLSPublishError, playlist_storage_path, playlist_uris, rewrite_playlist, signed_playlist
+)
+from .storage.base import StorageBackend
+from .test_assembly_pipeline_properties import ListStream, expected_video, fake_ffmpeg, split_moves
+from .video_assembly_service import VideoAssemblyService, VideoAssemblyError
+
+
+def media_playlist(names, ended=False):
+    """Event playlist as FFmpeg writes it for fMP4 segments."""
+    lines = [
+        '#EXTM3U', '#EXT-X-VERSION:7', '#EXT-X-TARGETDURATION:4', '#EXT-X-MEDIA-SEQUENCE:0',
+        '#EXT-X-PLAYLIST-TYPE:EVENT', '#EXT-X-INDEPENDENT-SEGMENTS', '#EXT-X-MAP:URI="init.mp4"',
+    ]
+    for name in names:
+        lines.extend(['#EXTINF:4.000000,', name])
+    if ended:
+        lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+def recording_storage(uploads, fail_on=None):
+    """Storage recording (remote_path, content) of every upload."""
+    storage = Mock(spec=StorageBackend)
+
+    def download(remote_path, local_path):
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, 'w') as f:
+            f.write(remote_path)
+        return local_path
+
+    def upload(local_path, remote_path):
+        if fail_on and fail_on in remote_path:
+            raise IOError('bucket unavailable')
+        with open(local_path) as f:
+            uploads.append((remote_path, f.read()))
+        return f"https://storage.example.com/{remote_path}"
+
+    storage.download_file.side_effect = download
+    storage.upload_file.side_effect = upload
+    return storage
+
+
+def part_aware_ffmpeg(cmd, **kwargs):
+    """fake_ffmpeg that also joins every input of a segmented render part (no audio input)."""
+    if os.path.basename(cmd[-1]).startswith('part_'):
+        inputs = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-i']
+        write_file(cmd[-1], '|'.join(open(path).read() for path in inputs))
+        return Mock(returncode=0, stdout='', stderr='')
+    return fake_ffmpeg(cmd, **kwargs)
+
+
+def write_file(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class HLSPopen:
+    """
+    subprocess.Popen stand-in for an HLS command: writes the fake_ffmpeg
+    output as segments, one per -progress block, rewriting the playlist
+    after each.
+    """
+
+    def __init__(self, cmd, stdout=None, stderr=None, text=None, segments=3):
+        self.cmd = cmd
+        self.returncode = 0
+        self.killed = False
+        self.playlist = cmd[-1]
+        fake_ffmpeg(cmd)
+        with open(self.playlist) as f:
+            content = f.read()
+        os.remove(self.playlist)
+        size = max(1, -(-len(content) // segments))
+        self.chunks = [content[i:i + size] for i in range(0, len(content), size)] or ['']
+        self.stdout = self._write_segments()
+        self.stderr = io.StringIO('')
+
+    def _write_segments(self):
+        output_dir = os.path.dirname(self.playlist)
+        write_file(os.path.join(output_dir, 'init.mp4'), 'init')
+        names = []
+        for idx, chunk in enumerate(self.chunks):
+            names.append(f'segment_{idx:05d}.m4s')
+            write_file(os.path.join(output_dir, names[-1]), chunk)
+            write_file(self.playlist, media_playlist(names, ended=idx == len(self.chunks) - 1))
+            yield f"out_time_us={(idx + 1) * 4_000_000}\n"
+            yield 'progress=continue\n'
+
+    def wait(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestPlaylistRewrite:
+    """
+    Property: The URIs of a media playlist are its init segment and media
+    segments in order, and rewriting replaces exactly those.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(count=st.integers(min_value=0, max_value=20), ended=st.booleans())
+    def test_uris_and_rewrite(self, count, ended):
+        names = [f'segment_{i:05d}.m4s' for i in range(count)]
+        playlist = media_playlist(names, ended)
+        urls = {uri: f'https://cdn.example.com/v/{uri}?sig=1' for uri in ['init.mp4'] + names}
+
+        assert playlist_uris(playlist) == ['init.mp4'] + names
+
+        rewritten = rewrite_playlist(playlist, urls)
+        assert playlist_uris(rewritten) == [urls[uri] for uri in ['init.mp4'] + names]
+        assert [line for line in rewritten.splitlines() if line.startswith('#') and 'MAP' not in line] == \
+            [line for line in playlist.splitlines() if line.startswith('#') and 'MAP' not in line]
+
+
+class TestHLSPublisher:
+    """
+    Property: However FFmpeg's writes interleave with syncs, every segment
+    is uploaded once, before any playlist that lists it; the playlist URL
+    is announced once, with the first segment; finish() needs the
+    complete playlist.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(syncs=st.lists(st.booleans(), min_size=1, max_size=12))
+    def test_segments_before_playlist(self, syncs):
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            uploads, announced = [], []
+            publisher = HLSPublisher(recording_storage(uploads), tmp, 'output/task-1', announced.append)
+            assert publisher.sync() is None
+
+            write_file(os.path.join(tmp, 'init.mp4'), 'init')
+            names = []
+            for idx, sync in enumerate(syncs):
+                names.append(f'segment_{idx:05d}.m4s')
+                write_file(os.path.join(tmp, names[-1]), f'data{idx}')
+                write_file(publisher.playlist_file, media_playlist(names, ended=idx == len(syncs) - 1))
+                if sync:
+                    publisher.sync()
+
+            url = publisher.finish()
+
+            assert url == 'https://storage.example.com/output/task-1/index.m3u8'
+            assert announced == [url]
+            paths = [path for path, _ in uploads]
+            segments = [path for path in paths if not path.endswith('.m3u8')]
+            assert segments == [f'output/task-1/{name}' for name in ['init.mp4'] + names]
+            for idx, (path, content) in enumerate(uploads):
+                if path.endswith('.m3u8'):
+                    # Relative URIs only: stored playlists never hold expiring URLs
+                    listed = playlist_uris(content)
+                    assert all('/' not in uri for uri in listed)
+                    assert all(f'output/task-1/{name}' in paths[:idx] for name in listed)
+            assert '#EXT-X-ENDLIST' in uploads[-1][1]
+            assert os.listdir(tmp) != [] and not any(name.startswith('.') for name in os.listdir(tmp))
+
+    def test_not_announced_before_first_segment(self, tmp_path):
+        announced = []
+        publisher = HLSPublisher(recording_storage([]), str(tmp_path), 'output/task-1', announced.append)
+        write_file(tmp_path / 'init.mp4', 'init')
+        write_file(publisher.playlist_file, media_playlist([]))
+
+        assert publisher.sync() is not None
+        assert announced == []
+
+    def test_finish_requires_complete_playlist(self, tmp_path):
+        publisher = HLSPublisher(recording_storage([]), str(tmp_path), 'output/task-1')
+        write_file(tmp_path / 'init.mp4', 'init')
+        write_file(tmp_path / 'segment_00000.m4s', 'data')
+        write_file(publisher.playlist_file, media_playlist(['segment_00000.m4s']))
+
+        with pytest.raises(HLSPublishError, match='not completed'):
+            publisher.finish()
+
+    def test_upload_failure(self, tmp_path):
+        publisher = HLSPublisher(recording_storage([], fail_on='segment'), str(tmp_path), 'output/task-1')
+        write_file(tmp_path / 'init.mp4', 'init')
+        write_file(tmp_path / 'segment_00000.m4s', 'data')
+        write_file(publisher.playlist_file, media_playlist(['segment_00000.m4s']))
+
+        with pytest.raises(HLSPublishError, match='segment_00000.m4s'):
+            publisher.sync()
+
+
+class TestSignedPlaylist:
+    """
+    Property: A served playlist lists the published segments in order, each
+    at a URL from storage.get_url (signed on every call), with every other
+    line unchanged.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(count=st.integers(min_value=0, max_value=10), ended=st.booleans())
+    def test_segments_signed_at_serve_time(self, count, ended):
+        names = [f'segment_{i:05d}.m4s' for i in range(count)]
+        stored = media_playlist(names, ended)
+        storage = Mock(spec=StorageBackend)
+        signatures = iter(range(1000))
+
+        def download(remote_path, local_path):
+            assert remote_path == 'output/task-1/index.m3u8'
+            write_file(local_path, stored)
+            return local_path
+
+        storage.download_file.side_effect = download
+        storage.get_url.side_effect = lambda path, expiration: f'https://s3.example.com/{path}?sig={next(signatures)}'
+
+        first = signed_playlist(storage, playlist_storage_path('output/task-1.mp4'))
+        second = signed_playlist(storage, 'output/task-1/index.m3u8')
+
+        assert playlist_uris(first) == [
+            f'https://s3.example.com/output/task-1/{name}?sig={i}' for i, name in enumerate(['init.mp4'] + names)
+        ]
+        assert first != second
+        assert [line for line in first.splitlines() if line.startswith('#') and 'MAP' not in line] == \
+            [line for line in stored.splitlines() if line.startswith('#') and 'MAP' not in line]
+
+
+class TestAssemblyHLSOutput:
+    """
+    Property: With HLS output, the final FFmpeg command writes a playlist,
+    its segments are uploaded while FFmpeg runs, the playlist URL is
+    reported before assembly completes, and the segments hold the same
+    video as MP4 output.
+    """
+
+    def make_blueprint(self, count=5):
+        return {
+            'task_id': 'task-1',
+            'audio_path': 'songs/song.mp3',
+            'moves': [{'video_path': f'clips/clip_{i % 3}.mp4', 'duration': 8.0} for i in range(count)],
+            'output_config': {'output_path': 'output/task-1.mp4'},
+        }
+
+    @pytest.mark.parametrize('render_mode', ['staged', 'single_pass', 'segmented'])
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_segments_uploaded_during_render(self, tmp_path, render_mode, streaming):
+        uploads, announced, processes = [], [], []
+        service = VideoAssemblyService(
+            recording_storage(uploads), temp_dir=str(tmp_path), render_mode=render_mode,
+            output_format='hls', segment_workers=2
+        )
+        blueprint = self.make_blueprint()
+
+        def popen(cmd, **kwargs):
+            processes.append(HLSPopen(cmd, **kwargs))
+            return processes[-1]
+
+        def on_playlist(url):
+            # Reported while FFmpeg is still writing segments
+            announced.append((url, len([path for path, _ in uploads if path.endswith('.m4s')])))
+
+        with patch('subprocess.run', side_effect=part_aware_ffmpeg), patch('subprocess.Popen', side_effect=popen):
+            if streaming:
+                url = service.assemble_video_stream(
+                    ListStream(blueprint, split_moves(blueprint['moves'], [2])), playlist_callback=on_playlist
+                )
+            else:
+                url = service.assemble_video(blueprint, playlist_callback=on_playlist)
+
+        assert url == 'https://storage.example.com/output/task-1/index.m3u8'
+        assert len(processes) == 1 and processes[0].cmd[processes[0].cmd.index('-f') + 1] == 'hls'
+        assert announced == [(url, 1)]
+        segments = [content for path, content in uploads if path.endswith('.m4s')]
+        assert len(segments) == 3 and ''.join(segments) == expected_video(blueprint)
+        playlists = [content for path, content in uploads if path.endswith('.m3u8')]
+        assert len(playlists) == 3 and '#EXT-X-ENDLIST' in playlists[-1]
+        assert playlist_uris(playlists[-1]) == ['init.mp4', 'segment_00000.m4s', 'segment_00001.m4s', 'segment_00002.m4s']
+        assert os.listdir(tmp_path) == []
+
+    def test_upload_failure_stops_ffmpeg(self, tmp_path):
+        processes = []
+        service = VideoAssemblyService(
+            recording_storage([], fail_on='segment_00001'), temp_dir=str(tmp_path),
+            render_mode='single_pass', output_format='hls'
+        )
+
+        def popen(cmd, **kwargs):
+            processes.append(HLSPopen(cmd, **kwargs))
+            return processes[-1]
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg), patch('subprocess.Popen', side_effect=popen):
+            with pytest.raises(VideoAssemblyError, match='segment_00001.m4s'):
+                service.assemble_video(self.make_blueprint())
+
+        assert processes[0].killed
+        assert os.listdir(tmp_path) == []
+
+    def test_mp4_output_by_default(self):
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_OUTPUT_FORMAT': ''}):
+            assert VideoAssemblyService(Mock(spec=StorageBackend)).output_format == 'mp4'
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_OUTPUT_FORMAT': 'hls', 'VIDEO_ASSEMBLY_HLS_SEGMENT_SECONDS': '6'}):
+            service = VideoAssemblyService(Mock(spec=StorageBackend))
+            assert (service.output_format, service.hls_segment_seconds) == ('hls', 6.0)
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_OUTPUT_FORMAT': 'webm'}):
+            assert VideoAssemblyService(Mock(spec=StorageBackend)).output_format == 'mp4'
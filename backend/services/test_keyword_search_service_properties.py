@@ -0,0 +1,192 @@
+"""
+Property-based tests for the in-memory BM25 keyword index and hybrid search.
+
+These tests build the index from synthetic move metadata (no database) and
+verify ranking, filtering and reciprocal rank fusion behavior.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .keyword_search_service import KeywordSearchService, load_annotations
+from .vector_search_service import VectorSearchService
+
+
+CATEGORIES = ['basic', 'spin', 'hiprolls', 'bodywaves', 'footwork', 'ladyturn', 'shadow']
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+ENERGY_LEVELS = ['low', 'medium', 'high']
+STYLES = ['romantic', 'energetic', 'sensual', 'playful']
+
+
+def make_catalog(size: int, seed: int = 0):
+    """Create synthetic move metadata shaped like VectorSearchService.move_metadata."""
+    rng = np.random.default_rng(seed)
+    catalog = []
+    for i in range(size):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        catalog.append({
+            'move_id': f"{category}_{i}",
+            'move_name': f"{category.title()} {i}",
+            'video_path': f"data/Bachata_steps/{category}/{category}_{i}.mp4",
+            'difficulty': DIFFICULTIES[int(rng.integers(3))],
+            'energy_level': ENERGY_LEVELS[int(rng.integers(3))],
+            'style': STYLES[int(rng.integers(4))],
+            'duration': float(rng.uniform(4, 12)),
+        })
+    return catalog
+
+
+def make_vector_service(catalog, dim: int = 16, seed: int = 0) -> VectorSearchService:
+    """Populate a VectorSearchService in memory without touching the database."""
+    rng = np.random.default_rng(seed)
+    service = VectorSearchService()
+    service.use_faiss = False
+    service.embeddings = rng.standard_normal((len(catalog), dim)).astype(np.float32)
+    service.normalized_embeddings = service.embeddings / np.linalg.norm(
+        service.embeddings, axis=1, keepdims=True
+    )
+    service.embedding_dimension = dim
+    service.move_metadata = catalog
+    service.build_keyword_index(catalog)
+    service.cache_timestamp = datetime.now()
+    return service
+
+
+class TestKeywordIndexRanking:
+    """
+    Property: Moves whose category matches the query term rank above moves
+    that don't, and filters are always respected.
+    """
+
+    @settings(max_examples=20, deadline=None)
+    @given(
+        category=st.sampled_from(CATEGORIES),
+        difficulty=st.sampled_from(DIFFICULTIES),
+        top_k=st.integers(min_value=1, max_value=30)
+    )
+    def test_category_query_returns_matching_moves(self, category, difficulty, top_k):
+        catalog = make_catalog(60)
+        index = KeywordSearchService()
+        index.build(catalog)
+
+        results = index.search(category, filters={'difficulty': difficulty}, top_k=top_k)
+
+        expected = [
+            m for m in catalog
+            if index.category_from_path(m['video_path']) == category and m['difficulty'] == difficulty
+        ]
+        assert len(results) == min(top_k, len(expected))
+        for idx, score in results:
+            assert score > 0
+            assert catalog[idx]['difficulty'] == difficulty
+            assert index.category_from_path(catalog[idx]['video_path']) == category
+
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_plural_and_case_insensitive_match(self):
+        index = KeywordSearchService()
+        index.build(make_catalog(14))
+
+        singular = index.search('SPIN', top_k=50)
+        plural = index.search('spins', top_k=50)
+        assert singular and [i for i, _ in singular] == [i for i, _ in plural]
+
+    def test_unknown_terms_return_nothing(self):
+        index = KeywordSearchService()
+        index.build(make_catalog(14))
+        assert index.search('tango milonga') == []
+
+    def test_annotation_labels_are_indexed(self):
+        catalog = [{
+            'move_id': 'paseala',
+            'move_name': 'Paseala',
+            'video_path': 'data/Bachata_steps/arm_styling/paseala.mp4',
+            'difficulty': 'intermediate',
+            'energy_level': 'medium',
+            'style': 'playful',
+            'duration': 6.0,
+        }]
+        index = KeywordSearchService()
+        index.build(catalog, annotations={'paseala': {'move_label': 'cross_body_lead'}})
+
+        assert [idx for idx, _ in index.search('cross body lead')] == [0]
+        assert index.search('cross body lead')[0][1] > index.search('lead')[0][1]
+
+    def test_repository_annotations_load(self):
+        annotations = load_annotations()
+        if not annotations:
+            pytest.skip("bachata_annotations.json not available")
+        assert all('video_path' in clip for clip in annotations.values())
+
+
+class TestHybridSearch:
+    """
+    Property: Hybrid search fuses keyword and vector rankings with RRF.
+    """
+
+    @settings(max_examples=10, deadline=None)
+    @given(category=st.sampled_from(CATEGORIES), seed=st.integers(min_value=0, max_value=1000))
+    def test_hybrid_scores_follow_rrf(self, category, seed):
+        catalog = make_catalog(40, seed=seed)
+        service = make_vector_service(catalog, seed=seed)
+        query = np.random.default_rng(seed + 1).standard_normal(16).astype(np.float32)
+
+        results = service.hybrid_search(category, query_embedding=query, top_k=len(catalog))
+
+        keyword_scores = service.keyword_index.score(category)
+        similarities = service._score_all(query)
+        vector_rank = {int(i): r + 1 for r, i in enumerate(np.argsort(-similarities, kind='stable'))}
+        matched = np.flatnonzero(keyword_scores > 0)
+        keyword_order = matched[np.argsort(-keyword_scores[matched], kind='stable')]
+        keyword_rank = {int(i): r + 1 for r, i in enumerate(keyword_order)}
+
+        ids = [m['move_id'] for m in catalog]
+        for result in results:
+            idx = ids.index(result.move_id)
+            expected = 1.0 / (60 + vector_rank[idx])
+            if idx in keyword_rank:
+                expected += 1.0 / (60 + keyword_rank[idx])
+            assert result.similarity_score == pytest.approx(expected)
+
+        fused = [r.similarity_score for r in results]
+        assert fused == sorted(fused, reverse=True)
+
+    def test_keyword_matches_boost_ranking(self):
+        catalog = make_catalog(40)
+        service = make_vector_service(catalog)
+
+        results = service.hybrid_search('hiprolls', query_embedding=None, top_k=5)
+
+        assert results
+        assert all('hiprolls' in r.video_path for r in results)
+
+    def test_hybrid_search_respects_filters(self):
+        catalog = make_catalog(40)
+        service = make_vector_service(catalog)
+        query = np.ones(16, dtype=np.float32)
+
+        results = service.hybrid_search(
+            'spin', query_embedding=query, filters={'style': 'sensual'}, top_k=40
+        )
+        assert results
+        assert all(r.style == 'sensual' for r in results)
+
+    def test_hybrid_search_is_fast_for_catalog_size(self):
+        catalog = make_catalog(150)
+        service = make_vector_service(catalog, dim=1024)
+        query = np.ones(1024, dtype=np.float32)
+
+        service.hybrid_search('sensual hiproll', query_embedding=query, top_k=20)
+        runs = 200
+        start = time.perf_counter()
+        for _ in range(runs):
+            service.hybrid_search('sensual hiproll', query_embedding=query, top_k=20)
+        per_query_ms = (time.perf_counter() - start) / runs * 1000
+
+        # Sub-millisecond in practice; generous bound to avoid CI flakiness
+        assert per_query_ms < 5.0
@@ -0,0 +1,176 @@
+"""
+Property-based tests for output-level deduplication.
+
+These tests verify that the render fingerprint covers exactly the
+render-relevant blueprint fields and service settings, and that
+VideoAssemblyService with deduplication on serves a blueprint identical to
+a finished render by a storage-side copy, without downloading or running
+FFmpeg, in both assembly paths.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .output_dedupe import OutputDeduplicator, RENDER_MOVE_FIELDS, render_fingerprint
+from .storage.base import StorageBackend
+from .storage.local import LocalStorageBackend
+from .test_assembly_pipeline_properties import ListStream, expected_video, fake_ffmpeg, split_moves
+from .video_assembly_service import VideoAssemblyService
+
+
+SETTINGS = {'render_mode': 'staged', 'transitions': True, 'output_format': 'mp4', 'builder_version': '1'}
+
+
+def make_blueprint(task_id='task-1', count=5):
+    return {
+        'task_id': task_id,
+        'audio_path': 'songs/song.mp3',
+        'moves': [
+            {'video_path': f'clips/clip_{i % 3}.mp4', 'duration': 8.0, 'trim_start': 0.0, 'move_name': f'move {i}'}
+            for i in range(count)
+        ],
+        'output_config': {'output_path': f'output/user_1/choreography_{task_id}.mp4', 'video_bitrate': '2M'},
+    }
+
+
+def local_storage(base_path):
+    """LocalStorageBackend holding the song and clips, each containing its own path."""
+    storage = LocalStorageBackend(base_path=str(base_path))
+    for remote_path in ['songs/song.mp3'] + [f'clips/clip_{i}.mp4' for i in range(3)]:
+        path = base_path / remote_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(remote_path)
+    return storage
+
+
+class TestRenderFingerprint:
+    """
+    Property: The fingerprint ignores task_id, output_path and fields the
+    render does not read, treats 8 and 8.0 alike, and changes with every
+    render-relevant move field, the audio, the output config and the
+    service settings.
+    """
+
+    def test_ignores_task_and_output_path(self):
+        blueprint = make_blueprint('task-1')
+        other = make_blueprint('task-2')
+        other['moves'][0]['move_name'] = 'renamed'
+        other['moves'][1]['duration'] = 8
+
+        assert render_fingerprint(blueprint, SETTINGS) == render_fingerprint(other, SETTINGS)
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        idx=st.integers(min_value=0, max_value=4),
+        field=st.sampled_from(RENDER_MOVE_FIELDS),
+        value=st.one_of(st.floats(min_value=0.1, max_value=30), st.sampled_from(['crossfade', 'clips/x.mp4']))
+    )
+    def test_changes_with_move_fields(self, idx, field, value):
+        blueprint = make_blueprint()
+        changed = make_blueprint()
+        if changed['moves'][idx].get(field) == value:
+            return
+        changed['moves'][idx][field] = value
+
+        assert render_fingerprint(blueprint, SETTINGS) != render_fingerprint(changed, SETTINGS)
+
+    def test_changes_with_audio_output_config_and_settings(self):
+        fingerprint = render_fingerprint(make_blueprint(), SETTINGS)
+        audio = make_blueprint()
+        audio['audio_path'] = 'songs/other.mp3'
+        bitrate = make_blueprint()
+        bitrate['output_config']['video_bitrate'] = '4M'
+        reordered = make_blueprint()
+        reordered['moves'].reverse()
+
+        assert len({
+            fingerprint,
+            render_fingerprint(audio, SETTINGS),
+            render_fingerprint(bitrate, SETTINGS),
+            render_fingerprint(reordered, SETTINGS),
+            render_fingerprint(make_blueprint(), {**SETTINGS, 'render_mode': 'single_pass'}),
+        }) == 5
+
+
+class TestAssemblyReusesRenders:
+    """
+    Property: After one render, an identical blueprint under another task
+    is served by copying it: no downloads, no FFmpeg, its own output file
+    with the same content (a hard link on local storage). A different
+    blueprint is rendered.
+    """
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_identical_blueprint_copied(self, tmp_path, streaming):
+        storage = local_storage(tmp_path / 'media')
+        temp_dir = tmp_path / 'tmp'
+        service = VideoAssemblyService(storage, temp_dir=str(temp_dir), dedupe_outputs=True)
+        commands, progress = [], []
+
+        def recording(cmd, **kwargs):
+            commands.append(cmd)
+            return fake_ffmpeg(cmd, **kwargs)
+
+        def assemble(blueprint, progress_callback=None):
+            if streaming:
+                stream = ListStream(blueprint, split_moves(blueprint['moves'], [2]))
+                return service.assemble_video_stream(stream, progress_callback)
+            return service.assemble_video(blueprint, progress_callback)
+
+        with patch('subprocess.run', side_effect=recording):
+            first_url = assemble(make_blueprint('task-1'))
+            rendered = len(commands)
+            with patch.object(storage, 'download_file', wraps=storage.download_file) as download:
+                second_url = assemble(make_blueprint('task-2'), lambda *args: progress.append(args))
+                reused = service.last_output_reused
+
+        first = tmp_path / 'media' / 'output/user_1/choreography_task-1.mp4'
+        second = tmp_path / 'media' / 'output/user_1/choreography_task-2.mp4'
+        assert (first_url, second_url) == (storage.get_url(str(first.relative_to(tmp_path / 'media'))),
+                                           storage.get_url(str(second.relative_to(tmp_path / 'media'))))
+        assert reused and rendered > 0
+        assert second.read_text() == first.read_text() == expected_video(make_blueprint())
+        assert os.path.samefile(first, second)
+        if not streaming:
+            assert len(commands) == rendered and download.call_count == 0
+        assert progress[-1] == ('completed', 100, 'Reused an identical video')
+        assert os.listdir(temp_dir) == []
+
+        # Deleting one task's video leaves the other's intact
+        storage.delete_file('output/user_1/choreography_task-1.mp4')
+        assert second.read_text() == expected_video(make_blueprint())
+
+    def test_different_blueprint_rendered(self, tmp_path):
+        storage = local_storage(tmp_path / 'media')
+        service = VideoAssemblyService(storage, temp_dir=str(tmp_path / 'tmp'), dedupe_outputs=True)
+        changed = make_blueprint('task-2')
+        changed['moves'].reverse()
+
+        with patch('subprocess.run', side_effect=fake_ffmpeg):
+            service.assemble_video(make_blueprint('task-1'))
+            service.assemble_video(changed)
+
+        assert not service.last_output_reused
+        assert (tmp_path / 'media' / 'output/user_1/choreography_task-2.mp4').read_text() == expected_video(changed)
+        assert len(os.listdir(tmp_path / 'media' / 'output' / 'renders')) == 2
+
+    def test_off_by_default_and_not_for_hls(self):
+        storage = Mock(spec=StorageBackend)
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_OUTPUT_DEDUPE': ''}):
+            assert VideoAssemblyService(storage).output_dedupe is None
+        with patch.dict(os.environ, {'VIDEO_ASSEMBLY_OUTPUT_DEDUPE': 'True'}):
+            service = VideoAssemblyService(storage, output_format='hls')
+        assert service.output_dedupe is not None
+        assert service._reuse_output(make_blueprint()) is None
+        storage.file_exists.assert_not_called()
+
+    def test_copy_failure_falls_back_to_render(self, tmp_path):
+        storage = local_storage(tmp_path / 'media')
+        dedupe = OutputDeduplicator(storage)
+        with patch.object(storage, 'file_exists', return_value=True), \
+                patch.object(storage, 'copy_file', side_effect=IOError('copy failed')):
+            assert dedupe.reuse('abc', 'output/task.mp4') is None
+        assert (dedupe.hits, dedupe.misses) == (0, 1)
@@ -0,0 +1,156 @@
+"""
+Property-based tests for the draft preview profile.
+
+These tests verify that FFmpegCommandBuilder builds small, low frame rate
+preview clips, and that VideoAssemblyService with the preview profile
+encodes every clip (mezzanine clips included) to its preview variant once,
+joins them with hard cuts, muxes the audio without re-encoding the video,
+uploads the draft next to the full video, and keeps its clips and renders
+apart from full-quality ones.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, strategies as st, settings
+
+from .clip_cache import NormalizedClipCache
+from .ffmpeg_builder import FFmpegCommandBuilder
+from .test_assembly_pipeline_properties import ListStream, expected_video, fake_ffmpeg, fake_storage, split_moves
+from .video_assembly_service import VideoAssemblyService
+
+
+def make_blueprint(paths=('clips/a.mp4', 'clips/b.mp4', 'clips/a.mp4', 'mezzanine/v1/clips/c.mp4')):
+    return {
+        'task_id': 'task-1',
+        'audio_path': 'songs/song.mp3',
+        'moves': [
+            {
+                'video_path': path, 'duration': 8.0, 'trim_start': 1.0,
+                'transition_type': 'crossfade', 'transition_duration': 1.0,
+            }
+            for path in paths
+        ],
+        'output_config': {'output_path': 'output/user_1/choreography_task-1.mp4'},
+    }
+
+
+def recording_ffmpeg(commands):
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        return fake_ffmpeg(cmd, **kwargs)
+    return run
+
+
+class TestPreviewCommand:
+    """
+    Property: A preview clip command letterboxes to the preview size at the
+    preview frame rate with the fast preset, cuts and retimes the segment in
+    the same encode, and keys the clip cache apart from normalized clips.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(
+        trim_start=st.floats(min_value=0, max_value=30),
+        duration=st.one_of(st.none(), st.floats(min_value=0.5, max_value=30)),
+        playback_rate=st.sampled_from([1.0, 0.9, 1.1])
+    )
+    def test_preview_command(self, trim_start, duration, playback_rate):
+        builder = FFmpegCommandBuilder()
+        cmd = builder.build_preview_command(
+            'in.mp4', 'out.mp4', threads=2, trim_start=trim_start, duration=duration, playback_rate=playback_rate
+        )
+
+        video_filter = cmd[cmd.index('-vf') + 1]
+        assert 'fps=15,' in video_filter and 'scale=640:360' in video_filter and 'pad=640:360' in video_filter
+        assert video_filter.startswith('setpts=') == (playback_rate != 1.0)
+        assert cmd[cmd.index('-preset') + 1] == 'veryfast'
+        assert cmd[cmd.index('-crf') + 1] == str(builder.PREVIEW_CRF)
+        assert ('-ss' in cmd) == (trim_start > 0)
+        assert ('-t' in cmd) == bool(duration)
+        assert '-an' in cmd and cmd[-2:] == ['-y', 'out.mp4']
+
+    def test_settings_differ_from_normalized_clips(self):
+        builder = FFmpegCommandBuilder()
+
+        assert builder.preview_settings() != builder.normalize_settings()
+
+
+class TestPreviewAssembly:
+    """
+    Property: A preview assembly encodes each unique clip segment once with
+    the preview command, plays the moves in blueprint order with hard cuts,
+    copies the video stream when adding the audio, and uploads to the
+    output path with a _preview suffix, in both assembly paths.
+    """
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    @pytest.mark.parametrize('render_mode', ['staged', 'segmented'])
+    def test_preview_render(self, tmp_path, streaming, render_mode):
+        uploads, commands = [], []
+        storage = fake_storage(uploads)
+        service = VideoAssemblyService(
+            storage, temp_dir=str(tmp_path), render_mode=render_mode, transitions=True, profile='preview'
+        )
+        blueprint = make_blueprint()
+
+        with patch('subprocess.run', side_effect=recording_ffmpeg(commands)):
+            if streaming:
+                url = service.assemble_video_stream(ListStream(blueprint, split_moves(blueprint['moves'], [2])))
+            else:
+                url = service.assemble_video(blueprint)
+
+        assert url == 'https://storage.example.com/output/user_1/choreography_task-1_preview.mp4'
+        assert uploads == [expected_video(blueprint)]
+        clip_commands = [cmd for cmd in commands if '-vf' in cmd]
+        assert len(clip_commands) == 3  # a, b and the mezzanine clip c; no transitions
+        assert all(cmd[cmd.index('-preset') + 1] == 'veryfast' for cmd in clip_commands)
+        add_audio = commands[-1]
+        assert add_audio[add_audio.index('-c:v') + 1] == 'copy'
+        assert add_audio[add_audio.index('-b:a') + 1] == '64k'
+        assert not any('ffprobe' in cmd[0] for cmd in commands)
+        assert os.listdir(tmp_path) == []
+
+    def test_profile_defaults_to_full(self):
+        service = VideoAssemblyService(fake_storage([]), profile='draft')
+        blueprint = make_blueprint()
+
+        assert service.profile == 'full'
+        assert service.output_path(blueprint) == blueprint['output_config']['output_path']
+
+
+class TestPreviewReuse:
+    """
+    Property: Preview clips are served from the normalized clip cache on
+    the next preview of the same clips, but never used for a full render,
+    and a preview never dedupes against a full render of its blueprint.
+    """
+
+    def test_preview_clips_cached_separately(self, tmp_path):
+        cache = NormalizedClipCache(str(tmp_path / 'cache'))
+        blueprint = make_blueprint(('clips/a.mp4', 'clips/b.mp4'))
+        preview = VideoAssemblyService(
+            fake_storage([]), temp_dir=str(tmp_path / 'tmp'), clip_cache=cache, profile='preview'
+        )
+        full = VideoAssemblyService(fake_storage([]), temp_dir=str(tmp_path / 'tmp'), clip_cache=cache)
+        commands = []
+
+        with patch('subprocess.run', side_effect=recording_ffmpeg(commands)):
+            preview.assemble_video(blueprint)
+            first_preview = len(commands)
+            preview.assemble_video(blueprint)
+            second_preview = len(commands) - first_preview
+            full.assemble_video(blueprint)
+
+        assert preview.last_clip_cache_stats['hits'] == 2
+        assert second_preview == first_preview - 2  # only concat and mux run again
+        assert full.last_clip_cache_stats['hits'] == 0
+
+    def test_fingerprints_differ(self):
+        blueprint = make_blueprint()
+        full = VideoAssemblyService(fake_storage([]), render_mode='staged', transitions=False, dedupe_outputs=True)
+        preview = VideoAssemblyService(fake_storage([]), dedupe_outputs=True, profile='preview')
+
+        assert full._render_settings() != preview._render_settings()
+        assert 'profile' not in full._render_settings()
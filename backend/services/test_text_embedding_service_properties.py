@@ -0,0 +1,150 @@
+"""
+Property-based tests for Text Embedding Service.
+
+These tests verify caching, batching and graceful degradation of the
+query-side text encoder using a deterministic fake model.
+"""
+
+import threading
+import hashlib
+
+import numpy as np
+from hypothesis import given, strategies as st, settings
+
+from .text_embedding_service import TextEmbeddingService
+
+
+class FakeSentenceModel:
+    """Deterministic stand-in for SentenceTransformer.encode()."""
+
+    def __init__(self, dim: int = TextEmbeddingService.EMBEDDING_DIM):
+        self.dim = dim
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False):
+        with self._lock:
+            self.calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16)
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.stack(vectors)
+
+
+query_text = st.text(
+    alphabet='abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ',
+    min_size=1,
+    max_size=60
+).filter(lambda t: t.strip())
+
+
+class TestTextEmbeddingCache:
+    """
+    Property: Repeated queries are served from the LRU cache without
+    another model call, and cached embeddings match fresh ones.
+    """
+
+    @settings(max_examples=50, deadline=None)
+    @given(text=query_text)
+    def test_repeated_query_hits_cache(self, text):
+        model = FakeSentenceModel()
+        service = TextEmbeddingService(model=model, batch_window_ms=0)
+
+        first = service.encode(text)
+        second = service.encode(f"  {text.upper()}  ")
+
+        assert first is not None
+        assert first.shape == (TextEmbeddingService.EMBEDDING_DIM,)
+        assert np.array_equal(first, second)
+        assert len(model.calls) == 1, "Second lookup should be served from cache"
+        assert service.get_cache_info()['hits'] == 1
+
+    def test_lru_evicts_least_recently_used(self):
+        model = FakeSentenceModel()
+        service = TextEmbeddingService(model=model, cache_size=2, batch_window_ms=0)
+
+        service.encode('sensual basic')
+        service.encode('energetic spin')
+        service.encode('sensual basic')  # refresh
+        service.encode('romantic dip')  # evicts 'energetic spin'
+
+        calls_before = len(model.calls)
+        service.encode('sensual basic')
+        assert len(model.calls) == calls_before
+
+        service.encode('energetic spin')
+        assert len(model.calls) == calls_before + 1
+
+    def test_encode_batch_matches_single_encode(self):
+        model = FakeSentenceModel()
+        service = TextEmbeddingService(model=model, batch_window_ms=0)
+
+        texts = ['slow bolero', 'fast footwork', 'slow bolero', '']
+        batch = service.encode_batch(texts)
+
+        assert batch[3] is None
+        assert np.array_equal(batch[0], batch[2])
+        assert model.calls == [['slow bolero', 'fast footwork']]
+        assert np.array_equal(service.encode('fast footwork'), batch[1])
+
+
+class TestTextEmbeddingBatching:
+    """
+    Property: Concurrent encode calls are coalesced into fewer model calls
+    and every caller receives the embedding for its own text.
+    """
+
+    def test_concurrent_calls_are_batched(self):
+        model = FakeSentenceModel()
+        service = TextEmbeddingService(model=model, batch_window_ms=50)
+
+        texts = [f"query number {i}" for i in range(16)]
+        results = {}
+        barrier = threading.Barrier(len(texts))
+
+        def worker(text):
+            barrier.wait()
+            results[text] = service.encode(text)
+
+        threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert len(results) == len(texts)
+        assert len(model.calls) < len(texts), "Concurrent calls should share model calls"
+        assert sum(len(call) for call in model.calls) == len(texts)
+
+        reference = FakeSentenceModel()
+        for text, embedding in results.items():
+            assert np.allclose(embedding, reference.encode([text])[0])
+
+
+class TestTextEmbeddingDegradation:
+    """
+    Property: Without a usable model the service returns None instead of raising.
+    """
+
+    def test_empty_text_returns_none(self):
+        service = TextEmbeddingService(model=FakeSentenceModel())
+        assert service.encode('') is None
+        assert service.encode('   ') is None
+        assert service.encode(None) is None
+
+    def test_unavailable_model_returns_none(self):
+        service = TextEmbeddingService()
+        service._model_failed = True
+
+        assert service.encode('sensual bachata') is None
+        assert service.is_available() is False
+
+    def test_model_error_returns_none(self):
+        class BrokenModel:
+            def encode(self, *args, **kwargs):
+                raise RuntimeError('model exploded')
+
+        service = TextEmbeddingService(model=BrokenModel(), batch_window_ms=0)
+        assert service.encode('sensual bachata') is None
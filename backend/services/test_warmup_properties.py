@@ -0,0 +1,67 @@
+"""
+Property-based tests for startup warm-up.
+
+These tests verify component selection, timing reports and that warm-up
+failures never propagate to the worker.
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+from hypothesis import given, strategies as st, settings
+
+from . import warmup
+from .warmup import WARMUP_COMPONENTS, get_warmup_components, make_warmup_signal, warm_up_services
+
+
+class TestWarmupComponents:
+    """
+    Property: SERVICE_WARMUP_COMPONENTS selects a subset in canonical order.
+    """
+
+    @settings(max_examples=30, deadline=None)
+    @given(selected=st.lists(st.sampled_from(WARMUP_COMPONENTS + ['bogus']), max_size=6))
+    def test_component_selection(self, selected):
+        with patch.dict('os.environ', {'SERVICE_WARMUP_COMPONENTS': ','.join(selected)}):
+            components = get_warmup_components()
+
+        if not selected:
+            assert components == WARMUP_COMPONENTS
+        else:
+            assert components == [c for c in WARMUP_COMPONENTS if c in selected]
+
+    def test_timings_reported_and_failures_contained(self):
+        def broken():
+            raise RuntimeError('database unavailable')
+
+        functions = {
+            'vector_index': broken,
+            'librosa_jit': lambda: None,
+            'text_model': lambda: None,
+            'agent_service': lambda: None,
+        }
+        with patch.dict(warmup._WARMUP_FUNCTIONS, functions), \
+                patch.dict('os.environ', {'OPENAI_API_KEY': ''}):
+            timings = warm_up_services(list(WARMUP_COMPONENTS))
+
+        assert timings['vector_index'] is None
+        assert timings['librosa_jit'] >= 0
+        assert timings['text_model'] >= 0
+        assert timings['agent_service'] is None  # skipped without API key
+
+
+class TestLibrosaWarmup:
+    """
+    Property: The synthetic warm-up signal runs through the real analyzer.
+    """
+
+    def test_synthetic_signal_analyzes(self):
+        from music_analyzer import MusicAnalyzer
+
+        analyzer = MusicAnalyzer()
+        y = make_warmup_signal(sample_rate=analyzer.sample_rate)
+
+        assert y.dtype == np.float32
+        features = analyzer.analyze_signal(y, analyzer.sample_rate)
+        assert abs(features.duration - warmup.WARMUP_SIGNAL_SECONDS) < 0.1
+        assert len(features.energy_profile) > 0
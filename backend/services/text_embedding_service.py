@@ -0,0 +1,358 @@
+"""
+Text embedding service for natural-language move queries.
+
+Encodes user requests with the same sentence-transformers model that was used
+to build MoveEmbedding.text_embedding (all-MiniLM-L6-v2, 384D), so the text
+modality can take part in vector search.
+
+Features:
+- Model loaded once per process (lazily on first use, or eagerly via preload())
+- Concurrent encode calls are coalesced into a single batched model call
+- LRU cache of recent query embeddings (normalized query text as key)
+- Graceful degradation: returns None when sentence-transformers is unavailable
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TextEmbeddingService:
+    """
+    Query-side text encoder with a warm model and an LRU query cache.
+
+    Encoding is done by a "leader" caller: the first thread that finds no
+    batch in flight waits a short window for other callers to queue their
+    texts, then encodes everything pending in one model call. Other callers
+    simply wait for their result.
+    """
+
+    MODEL_NAME = 'all-MiniLM-L6-v2'
+    EMBEDDING_DIM = 384
+
+    DEFAULT_CACHE_SIZE = 1024
+    DEFAULT_BATCH_WINDOW_MS = 5.0
+    DEFAULT_MAX_BATCH_SIZE = 32
+    ENCODE_TIMEOUT = 30  # seconds a follower waits for the leader's batch
+
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        model: Optional[Any] = None
+    ):
+        """
+        Initialize text embedding service.
+
+        Args:
+            model_name: sentence-transformers model name
+            cache_size: Maximum number of query embeddings kept in the LRU cache
+            batch_window_ms: Time the batch leader waits for concurrent callers
+            max_batch_size: Maximum number of texts encoded in one model call
+            model: Optional pre-loaded model (anything with a compatible encode())
+        """
+        self.model_name = model_name
+        self.cache_size = max(0, cache_size)
+        self.batch_window_seconds = max(0.0, batch_window_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._model = model
+        self._model_failed = False
+        self._model_lock = threading.Lock()
+
+        self._cache: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self._pending: List[Tuple[str, Future]] = []
+        self._pending_lock = threading.Lock()
+        self._leader_active = False
+        self._batches_encoded = 0
+
+        logger.info(
+            f"TextEmbeddingService initialized (model: {model_name}, "
+            f"cache_size: {self.cache_size}, batch_window: {batch_window_ms}ms)"
+        )
+
+    @staticmethod
+    def normalize_query(text: Optional[str]) -> str:
+        """
+        Normalize query text for caching.
+
+        The MiniLM tokenizer is uncased and ignores runs of whitespace, so
+        lowercasing and collapsing whitespace does not change the embedding.
+
+        Args:
+            text: Raw query text
+
+        Returns:
+            Normalized text ('' for empty input)
+        """
+        if not text:
+            return ''
+        return ' '.join(str(text).split()).lower()
+
+    def _ensure_model(self) -> bool:
+        """
+        Load the sentence-transformers model once per process.
+
+        Returns:
+            True if a model is available, False otherwise
+        """
+        if self._model is not None:
+            return True
+        if self._model_failed:
+            return False
+
+        with self._model_lock:
+            if self._model is not None:
+                return True
+            if self._model_failed:
+                return False
+
+            start = time.time()
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                logger.warning(
+                    "sentence-transformers is not available. Text queries will not "
+                    "be embedded. Install it with: pip install sentence-transformers"
+                )
+                self._model_failed = True
+                return False
+
+            try:
+                self._model = SentenceTransformer(self.model_name)
+            except Exception as e:
+                logger.error(f"Failed to load text embedding model {self.model_name}: {e}")
+                self._model_failed = True
+                return False
+
+            logger.info(
+                f"Text embedding model loaded: {self.model_name} "
+                f"({time.time() - start:.2f}s)"
+            )
+            return True
+
+    def preload(self) -> bool:
+        """
+        Load the model eagerly (e.g. at process startup).
+
+        Returns:
+            True if the model is ready for encoding
+        """
+        return self._ensure_model()
+
+    def is_available(self) -> bool:
+        """Check whether the model is (or can be) loaded."""
+        return self._ensure_model()
+
+    def encode(self, text: Optional[str]) -> Optional[np.ndarray]:
+        """
+        Encode a single query text.
+
+        Cached queries return immediately. Uncached queries are queued and
+        encoded together with any concurrent callers.
+
+        Args:
+            text: Natural-language query
+
+        Returns:
+            Normalized 384D float32 embedding, or None if text is empty or the
+            model is unavailable
+        """
+        key = self.normalize_query(text)
+        if not key:
+            return None
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        if not self._ensure_model():
+            return None
+
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending.append((key, future))
+            become_leader = not self._leader_active
+            if become_leader:
+                self._leader_active = True
+
+        if become_leader:
+            self._run_batches()
+
+        try:
+            return future.result(timeout=self.ENCODE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Text embedding failed for query '{key[:50]}': {e}")
+            return None
+
+    def encode_batch(self, texts: List[Optional[str]]) -> List[Optional[np.ndarray]]:
+        """
+        Encode several query texts with a single model call for cache misses.
+
+        Args:
+            texts: List of natural-language queries
+
+        Returns:
+            List of embeddings (None for empty texts or when unavailable)
+        """
+        keys = [self.normalize_query(text) for text in texts]
+        results: Dict[str, Optional[np.ndarray]] = {}
+
+        missing = []
+        for key in keys:
+            if not key or key in results:
+                continue
+            cached = self._cache_get(key)
+            results[key] = cached
+            if cached is None:
+                missing.append(key)
+
+        if missing and self._ensure_model():
+            try:
+                for key, embedding in zip(missing, self._encode_with_model(missing)):
+                    results[key] = embedding
+            except Exception as e:
+                logger.warning(f"Batch text embedding failed: {e}")
+
+        return [results.get(key) if key else None for key in keys]
+
+    def _run_batches(self) -> None:
+        """Drain the pending queue in batches (called by the leader thread)."""
+        if self.batch_window_seconds > 0:
+            time.sleep(self.batch_window_seconds)
+
+        while True:
+            with self._pending_lock:
+                if not self._pending:
+                    self._leader_active = False
+                    return
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+
+            unique_texts = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                embeddings = dict(zip(unique_texts, self._encode_with_model(unique_texts)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for key, future in batch:
+                future.set_result(embeddings[key])
+
+    def _encode_with_model(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Run the model on a list of texts and populate the cache.
+
+        Args:
+            texts: Normalized, unique query texts
+
+        Returns:
+            List of float32 embeddings in the same order
+        """
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.max_batch_size,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+        self._batches_encoded += 1
+        logger.debug(f"Encoded {len(texts)} query texts in one batch")
+
+        embeddings = []
+        for key, vector in zip(texts, vectors):
+            embedding = np.array(vector, dtype=np.float32)
+            embedding.setflags(write=False)
+            self._cache_put(key, embedding)
+            embeddings.append(embedding)
+        return embeddings
+
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        """Look up a query embedding and mark it most recently used."""
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is None:
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return embedding
+
+    def _cache_put(self, key: str, embedding: np.ndarray) -> None:
+        """Store a query embedding, evicting the least recently used entry."""
+        if self.cache_size == 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Clear cached query embeddings."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """
+        Get information about the model and cache state.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._cache_lock:
+            lookups = self._hits + self._misses
+            return {
+                'model_name': self.model_name,
+                'model_loaded': self._model is not None,
+                'cache_size': len(self._cache),
+                'cache_capacity': self.cache_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': (self._hits / lookups) if lookups else 0.0,
+                'batches_encoded': self._batches_encoded,
+            }
+
+
+# Global instance for reuse across requests
+_text_embedding_service = None
+
+
+def get_text_embedding_service() -> TextEmbeddingService:
+    """
+    Get or create the global text embedding service instance.
+
+    This ensures the model and query cache are shared by all requests
+    in the process.
+
+    Returns:
+        TextEmbeddingService instance
+    """
+    global _text_embedding_service
+
+    if _text_embedding_service is None:
+        _text_embedding_service = TextEmbeddingService(
+            model_name=os.getenv('TEXT_EMBEDDING_MODEL', TextEmbeddingService.MODEL_NAME),
+            cache_size=int(os.getenv('TEXT_EMBEDDING_CACHE_SIZE', str(TextEmbeddingService.DEFAULT_CACHE_SIZE))),
+            batch_window_ms=float(os.getenv('TEXT_EMBEDDING_BATCH_WINDOW_MS', str(TextEmbeddingService.DEFAULT_BATCH_WINDOW_MS)))
+        )
+
+    return _text_embedding_service
@@ -11,12 +11,15 @@ Features:
 - Metadata filtering (difficulty, energy_level, style)
 - Fallback to NumPy-based search if FAISS fails
 - Automatic embedding normalization for cosine similarity
+- BM25 keyword index over move metadata, rebuilt alongside the vector index
+- Hybrid keyword + vector search with reciprocal rank fusion
 """
 
 import os
 import time
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -29,6 +32,8 @@ except ImportError:
     FAISS_AVAILABLE = False
     faiss = None
 
+from .keyword_search_service import KeywordSearchService, load_annotations
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,10 +48,12 @@ class MoveResult:
     energy_level: str
     style: str
     duration: float
+    relaxation_tier: Optional[int] = None  # Set by tiered_search()
+    mezzanine_path: Optional[str] = None  # Pre-transcoded clip, if available
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
+        result = {
             'move_id': self.move_id,
             'move_name': self.move_name,
             'video_path': self.video_path,
@@ -56,6 +63,11 @@ class MoveResult:
             'style': self.style,
             'duration': self.duration,
         }
+        if self.relaxation_tier is not None:
+            result['relaxation_tier'] = self.relaxation_tier
+        if self.mezzanine_path:
+            result['mezzanine_path'] = self.mezzanine_path
+        return result
 
 
 class VectorSearchService:
@@ -80,6 +92,9 @@ class VectorSearchService:
     AUDIO_WEIGHT = 0.35
     TEXT_WEIGHT = 0.30
     
+    # Reciprocal rank fusion constant (standard value from the RRF paper)
+    RRF_K = 60
+    
     @staticmethod
     def combine_embeddings_weighted(
         pose_embedding: Optional[np.ndarray],
@@ -175,8 +190,11 @@ class VectorSearchService:
         self.faiss_index = None
         self.move_metadata = []
         self.embeddings = None
+        self.normalized_embeddings = None
         self.embedding_dimension = None
         self.cache_timestamp = None
+        self.keyword_index = None
+        self._index_version = None
         self.use_faiss = FAISS_AVAILABLE
         
         # GPU configuration
@@ -314,11 +332,13 @@ class VectorSearchService:
                 'energy_level': move_emb.energy_level,
                 'style': move_emb.style,
                 'duration': move_emb.duration,
+                'mezzanine_path': move_emb.mezzanine_path or None,
             })
         
         # Convert to numpy array
         self.embeddings = np.array(embeddings_list, dtype=np.float32)
         self.move_metadata = metadata_list
+        self._index_version = None
         self.embedding_dimension = self.embeddings.shape[1]
         
         logger.info(
@@ -326,10 +346,17 @@ class VectorSearchService:
             f"(dimension: {self.embedding_dimension})"
         )
         
+        # Unit-length copy of the embeddings for whole-index NumPy scoring
+        norms = np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        self.normalized_embeddings = self.embeddings / np.maximum(norms, 1e-8)
+        
         # Build FAISS index
         if self.use_faiss:
             self.build_faiss_index(self.embeddings)
         
+        # Rebuild keyword index (rows aligned with the vector index)
+        self.build_keyword_index(self.move_metadata)
+        
         # Update cache timestamp
         self.cache_timestamp = datetime.now()
     
@@ -384,6 +411,20 @@ class VectorSearchService:
                 f"(dimension: {dimension})"
             )
     
+    def build_keyword_index(self, metadata: List[Dict[str, Any]]) -> None:
+        """
+        Build the BM25 keyword index over move metadata.
+        
+        Move labels from bachata_annotations.json are merged in by move_id.
+        Document i of the keyword index corresponds to row i of the vector index.
+        
+        Args:
+            metadata: Move metadata list (same order as the embeddings)
+        """
+        keyword_index = KeywordSearchService()
+        keyword_index.build(metadata, annotations=load_annotations())
+        self.keyword_index = keyword_index
+    
     def _index_cpu_to_gpu(self, cpu_index: 'faiss.Index') -> 'faiss.Index':
         """
         Transfer FAISS index from CPU to GPU.
@@ -514,6 +555,7 @@ class VectorSearchService:
                     energy_level=metadata['energy_level'],
                     style=metadata['style'],
                     duration=metadata['duration'],
+                    mezzanine_path=metadata.get('mezzanine_path'),
                 ))
                 
                 # Stop when we have enough results
@@ -600,6 +642,7 @@ class VectorSearchService:
                 energy_level=metadata['energy_level'],
                 style=metadata['style'],
                 duration=metadata['duration'],
+                mezzanine_path=metadata.get('mezzanine_path'),
             ))
             
             # Stop when we have enough results
@@ -609,6 +652,296 @@ class VectorSearchService:
         logger.debug(f"NumPy search returned {len(results)} results")
         return results
     
+    def _ensure_loaded(self) -> None:
+        """Load embeddings (and the keyword index) if missing or expired."""
+        if self.embeddings is None or not self._is_cache_valid():
+            self.load_embeddings_from_db()
+    
+    def _score_all(self, query_embedding: np.ndarray) -> np.ndarray:
+        """
+        Compute cosine similarity between a query and every indexed move.
+        
+        Args:
+            query_embedding: Query vector of the index dimension
+        
+        Returns:
+            Array of shape (n_moves,) with cosine similarities
+        """
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.embedding_dimension:
+            raise ValueError(
+                f"Query embedding dimension {query.shape[0]} "
+                f"does not match index dimension {self.embedding_dimension}"
+            )
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+        return self.normalized_embeddings @ query
+    
+    def similarity_matrix(
+        self,
+        query_embeddings: np.ndarray,
+        move_ids: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Score a batch of queries against indexed moves with one matrix product.
+        
+        Args:
+            query_embeddings: Array of shape (num_queries, index dimension)
+            move_ids: Moves to score, in output column order (default: all
+                moves in index order)
+        
+        Returns:
+            Array of shape (num_queries, num_moves) with cosine similarities
+        
+        Raises:
+            KeyError: If a move_id is not in the index
+        """
+        self._ensure_loaded()
+        
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if queries.shape[1] != self.embedding_dimension:
+            raise ValueError(
+                f"Query embedding dimension {queries.shape[1]} "
+                f"does not match index dimension {self.embedding_dimension}"
+            )
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-8)
+        
+        embeddings = self.normalized_embeddings
+        if move_ids is not None:
+            rows = {metadata['move_id']: i for i, metadata in enumerate(self.move_metadata)}
+            embeddings = embeddings[[rows[move_id] for move_id in move_ids]]
+        
+        return queries @ embeddings.T
+    
+    def _build_move_result(self, idx: int, score: float) -> MoveResult:
+        """Create a MoveResult for the move at index row idx."""
+        metadata = self.move_metadata[idx]
+        return MoveResult(
+            move_id=metadata['move_id'],
+            move_name=metadata['move_name'],
+            video_path=metadata['video_path'],
+            similarity_score=float(score),
+            difficulty=metadata['difficulty'],
+            energy_level=metadata['energy_level'],
+            style=metadata['style'],
+            duration=metadata['duration'],
+            mezzanine_path=metadata.get('mezzanine_path'),
+        )
+    
+    def keyword_search(
+        self,
+        query_text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10
+    ) -> List[MoveResult]:
+        """
+        Find moves by keyword using the in-memory BM25 index.
+        
+        Args:
+            query_text: Free-text query (e.g. "sensual hiproll")
+            filters: Metadata filters (difficulty, energy_level, style)
+            top_k: Number of results to return
+        
+        Returns:
+            List of MoveResult objects sorted by BM25 score
+            (similarity_score holds the BM25 score)
+        """
+        self._ensure_loaded()
+        
+        hits = self.keyword_index.search(query_text, filters=filters, top_k=top_k)
+        return [self._build_move_result(idx, score) for idx, score in hits]
+    
+    def hybrid_search(
+        self,
+        query_text: str,
+        query_embedding: Optional[np.ndarray] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = 10,
+        rrf_k: int = RRF_K
+    ) -> List[MoveResult]:
+        """
+        Find moves by fusing BM25 keyword ranks with vector similarity ranks.
+        
+        Both rankings are computed over the whole (small) index in one pass and
+        combined with reciprocal rank fusion:
+            score = 1 / (rrf_k + vector_rank) + 1 / (rrf_k + keyword_rank)
+        Moves without any keyword match only receive the vector term.
+        
+        Args:
+            query_text: Free-text query for the keyword index
+            query_embedding: Optional query vector (keyword-only fusion if None)
+            filters: Metadata filters (difficulty, energy_level, style)
+            top_k: Number of results to return
+            rrf_k: Rank fusion constant (higher = flatter fusion)
+        
+        Returns:
+            List of MoveResult objects sorted by fused score
+            (similarity_score holds the fused RRF score)
+        """
+        self._ensure_loaded()
+        
+        num_moves = len(self.move_metadata)
+        fused = np.zeros(num_moves, dtype=np.float64)
+        
+        # Keyword ranks (only moves that match at least one term)
+        keyword_scores = self.keyword_index.score(query_text)
+        matched = np.flatnonzero(keyword_scores > 0)
+        if matched.size:
+            order = matched[np.argsort(-keyword_scores[matched], kind='stable')]
+            fused[order] += 1.0 / (rrf_k + np.arange(1, order.size + 1))
+        
+        # Vector ranks (all moves)
+        if query_embedding is not None:
+            similarities = self._score_all(query_embedding)
+            order = np.argsort(-similarities, kind='stable')
+            fused[order] += 1.0 / (rrf_k + np.arange(1, num_moves + 1))
+        
+        results = []
+        for idx in np.argsort(-fused, kind='stable'):
+            if fused[idx] <= 0:
+                break
+            if filters and not self._matches_filters(self.move_metadata[idx], filters):
+                continue
+            results.append(self._build_move_result(int(idx), fused[idx]))
+            if len(results) >= top_k:
+                break
+        
+        logger.debug(f"Hybrid search returned {len(results)} results")
+        return results
+    
+    def tiered_search(
+        self,
+        query_embedding: np.ndarray,
+        filter_tiers: List[Optional[Dict[str, Any]]],
+        top_k: int = 10
+    ) -> List[MoveResult]:
+        """
+        Find similar moves with progressive filter relaxation in one pass.
+        
+        Similarity is computed once for every move. Each move is assigned the
+        first (strictest) tier whose filters it matches, and moves are ranked
+        by (tier, -similarity). Only the best non-empty tier is returned, which
+        is equivalent to searching each tier in turn and stopping at the first
+        one with results.
+        
+        Args:
+            query_embedding: Query vector of the index dimension
+            filter_tiers: Filters ordered from strictest to loosest
+                (None or {} matches every move)
+            top_k: Number of results to return
+        
+        Returns:
+            List of MoveResult objects sorted by similarity, with
+            relaxation_tier set to the index of the tier they matched
+        """
+        self._ensure_loaded()
+        
+        similarities = self._score_all(query_embedding)
+        tiers = self._assign_tiers(filter_tiers, {})
+        return self._select_best_tier(similarities, tiers, len(filter_tiers), top_k)
+    
+    def tiered_search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        filter_tiers_list: List[List[Optional[Dict[str, Any]]]],
+        top_k: int = 10
+    ) -> List[List[MoveResult]]:
+        """
+        Run tiered_search for many queries with one similarity computation.
+        
+        All queries are scored with a single matrix product and filter masks
+        are computed once per distinct filter, so a batch costs little more
+        than a single search.
+        
+        Args:
+            query_embeddings: Array of shape (num_queries, index dimension)
+            filter_tiers_list: Filter tiers for each query (see tiered_search)
+            top_k: Number of results per query
+        
+        Returns:
+            One list of MoveResult objects per query (as from tiered_search)
+        """
+        self._ensure_loaded()
+        
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if len(queries) != len(filter_tiers_list):
+            raise ValueError(
+                f"Got {len(queries)} queries but {len(filter_tiers_list)} filter tier lists"
+            )
+        if len(queries) == 0:
+            return []
+        
+        similarities = self.similarity_matrix(queries)
+        mask_cache: Dict[Tuple, np.ndarray] = {}
+        
+        results = []
+        for row, filter_tiers in enumerate(filter_tiers_list):
+            tiers = self._assign_tiers(filter_tiers, mask_cache)
+            results.append(self._select_best_tier(similarities[row], tiers, len(filter_tiers), top_k))
+        
+        logger.debug(f"Batched tiered search ran {len(queries)} queries ({len(mask_cache)} distinct filters)")
+        return results
+    
+    def _assign_tiers(
+        self,
+        filter_tiers: List[Optional[Dict[str, Any]]],
+        mask_cache: Dict[Tuple, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Assign each move the index of the first tier whose filters it matches.
+        
+        Args:
+            filter_tiers: Filters ordered from strictest to loosest
+            mask_cache: Filter masks keyed by filter items (shared across calls)
+        
+        Returns:
+            Array of shape (num_moves,); moves matching no tier get len(filter_tiers)
+        """
+        num_moves = len(self.move_metadata)
+        tiers = np.full(num_moves, len(filter_tiers), dtype=np.int32)
+        for tier, filters in reversed(list(enumerate(filter_tiers))):
+            if not filters:
+                tiers[:] = tier
+                continue
+            key = tuple(sorted(filters.items()))
+            mask = mask_cache.get(key)
+            if mask is None:
+                mask = np.fromiter(
+                    (self._matches_filters(metadata, filters) for metadata in self.move_metadata),
+                    dtype=bool,
+                    count=num_moves
+                )
+                mask_cache[key] = mask
+            tiers[mask] = tier
+        return tiers
+    
+    def _select_best_tier(
+        self,
+        similarities: np.ndarray,
+        tiers: np.ndarray,
+        unmatched: int,
+        top_k: int
+    ) -> List[MoveResult]:
+        """Rank moves by (tier, -similarity) and return the best non-empty tier."""
+        if len(tiers) == 0 or tiers.min() == unmatched:
+            return []
+        
+        order = np.lexsort((-similarities, tiers))
+        best_tier = int(tiers[order[0]])
+        selected = order[tiers[order] == best_tier][:top_k]
+        
+        results = []
+        for idx in selected:
+            result = self._build_move_result(int(idx), similarities[idx])
+            result.relaxation_tier = best_tier
+            results.append(result)
+        
+        logger.debug(f"Tiered search returned {len(results)} results from tier {best_tier}")
+        return results
+    
     def _matches_filters(self, metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """
         Check if metadata matches filter criteria.
@@ -644,7 +977,32 @@ class VectorSearchService:
         self.faiss_index = None
         self.move_metadata = []
         self.embeddings = None
+        self.normalized_embeddings = None
         self.cache_timestamp = None
+        self.keyword_index = None
+        self._index_version = None
+    
+    def get_index_version(self) -> str:
+        """
+        Get a content hash of the loaded move index.
+        
+        The version changes whenever move embeddings or their metadata
+        change, and is identical across processes for the same data, so it
+        can be used as part of persistent cache keys.
+        
+        Returns:
+            Hex digest identifying the current index contents
+        """
+        self._ensure_loaded()
+        
+        if self._index_version is None:
+            digest = hashlib.sha256()
+            for metadata in self.move_metadata:
+                digest.update(repr(sorted(metadata.items())).encode('utf-8'))
+            digest.update(np.ascontiguousarray(self.embeddings, dtype=np.float32).tobytes())
+            self._index_version = digest.hexdigest()[:16]
+        
+        return self._index_version
     
     def get_cache_info(self) -> Dict[str, Any]:
         """
@@ -673,6 +1031,7 @@ class VectorSearchService:
             'cache_valid': self._is_cache_valid(),
             'using_faiss': self.use_faiss and self.faiss_index is not None,
             'using_gpu': self.use_gpu,
+            'keyword_terms': len(self.keyword_index.vocabulary) if self.keyword_index else 0,
         }
         
         # Add GPU memory info if available
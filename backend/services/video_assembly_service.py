@@ -17,15 +17,33 @@ Key responsibilities:
 """
 
 import os
+import json
+import hashlib
 import logging
 import tempfile
 import subprocess
 import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Callable
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Callable
 
 from .storage.base import StorageBackend
 from .ffmpeg_builder import FFmpegCommandBuilder
+from .blueprint_codec import BlueprintFormatError, expand_blueprint
+from .blueprint_cache import file_content_hash
+from .clip_cache import NormalizedClipCache, get_clip_cache
+from .ffmpeg_progress import StageProgress, parse_progress
+from .hls_publisher import HLSPublisher, HLSPublishError, playlist_storage_path
+from .assembly_checkpoint import (
+    STAGE_CONCATENATED, STAGE_FETCHED, STAGE_NORMALIZED, AssemblyCheckpoint, CheckpointStore,
+    get_checkpoint_store
+)
+from .output_dedupe import OutputDeduplicator, render_fingerprint
+from .ffmpeg_admission import FFmpegAdmission, get_ffmpeg_admission
 
 logger = logging.getLogger(__name__)
 
@@ -35,18 +53,99 @@ class VideoAssemblyError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class ClipSegment:
+    """
+    Part of a source clip played by one move (see BeatGridSequencer).
+    
+    The move plays the source from trim_start at playback_rate for
+    duration output seconds, i.e. duration * playback_rate source seconds.
+    """
+    trim_start: float
+    duration: float
+    playback_rate: float = 1.0
+    
+    def as_tuple(self) -> Tuple[float, float, float]:
+        """(trim_start, duration, playback_rate), as taken by FFmpegCommandBuilder."""
+        return (self.trim_start, self.duration, self.playback_rate)
+
+
+@dataclass(frozen=True)
+class ClipTransition:
+    """
+    Crossfade into a move, rendered as a short clip of its own.
+    
+    The transition clip fills the first length output seconds of the
+    incoming move: the outgoing clip continues past the end of its move
+    (from outgoing_start, or its last frame when None, holding the last
+    frame if the source ends) and fades into the incoming clip, played
+    from incoming_start, over duration seconds. The rest of the incoming
+    move is an ordinary clip.
+    """
+    duration: float
+    length: float
+    outgoing_start: Optional[float]
+    outgoing_rate: float
+    incoming_start: float
+    incoming_rate: float
+    
+    def as_tuple(self) -> Tuple[Optional[float], ...]:
+        """All fields, in declaration order (part of the cache key)."""
+        return (
+            self.duration, self.length, self.outgoing_start, self.outgoing_rate,
+            self.incoming_start, self.incoming_rate
+        )
+
+
 class VideoAssemblyService:
     """
     Assembles videos from blueprints using FFmpeg.
     
-    This service:
+    This service (staged render mode, the default):
     1. Validates blueprint structure
     2. Downloads media files from storage
-    3. Normalizes video clips to consistent frame rate
+    3. Normalizes video clips to consistent frame rate, cut to each move's
+       trim_start/duration/playback_rate (mezzanine clips are only cut, with
+       stream copy when the cut is on a keyframe), and renders crossfade
+       transitions as short separate clips (see ClipTransition)
     4. Concatenates clips using FFmpeg
     5. Adds audio track
     6. Uploads result to storage
     7. Cleans up temporary files
+    
+    In single_pass render mode, steps 3-5 are one FFmpeg command
+    (FFmpegCommandBuilder.build_single_pass_command) that filters, joins
+    and encodes the clips with the audio in a single encode (with hard
+    cuts between moves). In segmented render mode, the timeline is split
+    into parts at move boundaries that are filtered and encoded in
+    parallel (FFmpegCommandBuilder.build_segment_command), joined with
+    stream copy, and the audio is muxed in without re-encoding the video.
+    
+    With HLS output, the final FFmpeg command (the single pass render, or
+    adding the audio track) writes an HLS playlist of fMP4 segments, and
+    each segment is uploaded as soon as it is finished (see HLSPublisher),
+    so playback can start before assembly completes.
+    
+    With a checkpoint store, each task assembles in a durable work
+    directory and completed stage outputs are recorded with checksums, so
+    a retried assembly of the same task_id resumes where the last attempt
+    failed (see AssemblyCheckpoint).
+    
+    With output deduplication, an MP4 assembly whose render fingerprint
+    matches a finished render is served by a storage-side copy of that
+    render instead of being assembled (see OutputDeduplicator).
+    
+    With admission control, every FFmpeg process waits for a slot shared
+    by all assemblies in the process (or on the host), and the wait shows
+    up in the progress messages (see FFmpegAdmission).
+    
+    The preview profile renders a draft for checking the move sequence:
+    every clip is encoded once to a small, low frame rate variant
+    (FFmpegCommandBuilder.build_preview_command, kept in the normalized
+    clip cache), the variants are joined with hard cuts and the audio is
+    muxed in without another encode. The draft is uploaded next to the
+    full video (see output_path), so the same blueprint can be rendered in
+    full later.
     """
     
     # Required blueprint fields
@@ -62,25 +161,177 @@ class VideoAssemblyService:
     FFMPEG_TIMEOUT_NORMALIZE = 60  # 1 minute per clip
     FFMPEG_TIMEOUT_CONCAT = 300  # 5 minutes
     FFMPEG_TIMEOUT_AUDIO = 600  # 10 minutes
+    FFMPEG_TIMEOUT_SINGLE_PASS = 900  # 15 minutes
+    FFMPEG_TIMEOUT_SEGMENT = 600  # 10 minutes per part
+    FFPROBE_TIMEOUT = 30
+    
+    # Render modes: normalize + concat + add audio, or one filter_complex pass
+    RENDER_STAGED = 'staged'
+    RENDER_SINGLE_PASS = 'single_pass'
+    RENDER_SEGMENTED = 'segmented'
+    RENDER_MODES = (RENDER_STAGED, RENDER_SINGLE_PASS, RENDER_SEGMENTED)
     
-    def __init__(self, storage_service: StorageBackend, temp_dir: Optional[str] = None):
+    # Output formats: one MP4 uploaded at the end, or an HLS playlist of
+    # fMP4 segments uploaded while the final FFmpeg command runs
+    OUTPUT_MP4 = 'mp4'
+    OUTPUT_HLS = 'hls'
+    OUTPUT_FORMATS = (OUTPUT_MP4, OUTPUT_HLS)
+    
+    # Output profiles: the full-quality video, or a low-resolution draft
+    PROFILE_FULL = 'full'
+    PROFILE_PREVIEW = 'preview'
+    PROFILES = (PROFILE_FULL, PROFILE_PREVIEW)
+    PREVIEW_SUFFIX = '_preview'
+    
+    def __init__(
+        self,
+        storage_service: StorageBackend,
+        temp_dir: Optional[str] = None,
+        pipeline_workers: Optional[int] = None,
+        clip_cache: Optional[NormalizedClipCache] = None,
+        normalize_workers: Optional[int] = None,
+        render_mode: Optional[str] = None,
+        transitions: Optional[bool] = None,
+        progress_interval: Optional[float] = None,
+        segment_workers: Optional[int] = None,
+        output_format: Optional[str] = None,
+        hls_segment_seconds: Optional[float] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        dedupe_outputs: Optional[bool] = None,
+        admission: Optional[FFmpegAdmission] = None,
+        profile: Optional[str] = None
+    ):
         """
         Initialize with storage service.
         
         Args:
             storage_service: Storage backend for file operations
             temp_dir: Optional custom temporary directory
+            pipeline_workers: Worker threads for assemble_video_stream
+                (defaults to VIDEO_ASSEMBLY_PIPELINE_WORKERS, then
+                min(4, CPU count))
+            clip_cache: Optional NormalizedClipCache (defaults to the global
+                cache, None unless NORMALIZED_CLIP_CACHE_DIR is set)
+            normalize_workers: Parallel FFmpeg normalize jobs for
+                assemble_video (defaults to VIDEO_ASSEMBLY_NORMALIZE_WORKERS,
+                then half the CPU count)
+            render_mode: 'staged', 'single_pass' or 'segmented' (defaults
+                to VIDEO_ASSEMBLY_RENDER_MODE, then 'staged')
+            transitions: Render the blueprint's crossfade transitions in
+                staged mode (defaults to VIDEO_ASSEMBLY_TRANSITIONS, then
+                True); hard cuts otherwise
+            progress_interval: Minimum seconds between progress callbacks
+                within a stage (defaults to VIDEO_ASSEMBLY_PROGRESS_INTERVAL,
+                then 2)
+            segment_workers: Parts encoded in parallel in segmented render
+                mode (defaults to VIDEO_ASSEMBLY_SEGMENT_WORKERS, then half
+                the CPU count)
+            output_format: 'mp4' or 'hls' (defaults to
+                VIDEO_ASSEMBLY_OUTPUT_FORMAT, then 'mp4'); see HLSPublisher
+            hls_segment_seconds: Target HLS segment length (defaults to
+                VIDEO_ASSEMBLY_HLS_SEGMENT_SECONDS, then 4)
+            checkpoints: Optional CheckpointStore (defaults to the global
+                store, None unless VIDEO_ASSEMBLY_CHECKPOINT_DIR is set)
+            dedupe_outputs: Reuse finished renders of identical blueprints
+                (defaults to VIDEO_ASSEMBLY_OUTPUT_DEDUPE, then False)
+            admission: Optional FFmpegAdmission (defaults to the global
+                one, None unless FFMPEG_MAX_CONCURRENT is set)
+            profile: 'full' or 'preview' (default: 'full'); a preview is
+                always a staged MP4 render with hard cuts
         """
         self.storage = storage_service
         self._temp_dir = temp_dir
         self._created_temp_dir: Optional[str] = None
         self.ffmpeg_builder = FFmpegCommandBuilder()
+        self.clip_cache = clip_cache if clip_cache is not None else get_clip_cache()
+        self.checkpoints = checkpoints if checkpoints is not None else get_checkpoint_store()
+        self._checkpoint: Optional[AssemblyCheckpoint] = None
+        self.admission = admission if admission is not None else get_ffmpeg_admission()
+        
+        if pipeline_workers is None:
+            pipeline_workers = int(os.getenv('VIDEO_ASSEMBLY_PIPELINE_WORKERS', '0') or 0)
+        self.pipeline_workers = pipeline_workers if pipeline_workers > 0 else min(4, os.cpu_count() or 1)
+        
+        if normalize_workers is None:
+            normalize_workers = int(os.getenv('VIDEO_ASSEMBLY_NORMALIZE_WORKERS', '0') or 0)
+        self.normalize_workers = normalize_workers if normalize_workers > 0 else max(1, (os.cpu_count() or 1) // 2)
+        
+        render_mode = render_mode or os.getenv('VIDEO_ASSEMBLY_RENDER_MODE', '') or self.RENDER_STAGED
+        if render_mode not in self.RENDER_MODES:
+            logger.warning(f"Unknown render mode '{render_mode}', using '{self.RENDER_STAGED}'")
+            render_mode = self.RENDER_STAGED
+        self.render_mode = render_mode
+        
+        if transitions is None:
+            transitions = os.getenv('VIDEO_ASSEMBLY_TRANSITIONS', 'True').lower() in ('true', '1', 'yes')
+        self.transitions = transitions
+        
+        if progress_interval is None:
+            progress_interval = float(os.getenv('VIDEO_ASSEMBLY_PROGRESS_INTERVAL', '2') or 2)
+        self.progress_interval = progress_interval
+        
+        if segment_workers is None:
+            segment_workers = int(os.getenv('VIDEO_ASSEMBLY_SEGMENT_WORKERS', '0') or 0)
+        self.segment_workers = segment_workers if segment_workers > 0 else max(1, (os.cpu_count() or 1) // 2)
+        
+        output_format = output_format or os.getenv('VIDEO_ASSEMBLY_OUTPUT_FORMAT', '') or self.OUTPUT_MP4
+        if output_format not in self.OUTPUT_FORMATS:
+            logger.warning(f"Unknown output format '{output_format}', using '{self.OUTPUT_MP4}'")
+            output_format = self.OUTPUT_MP4
+        self.output_format = output_format
+        
+        if hls_segment_seconds is None:
+            hls_segment_seconds = float(os.getenv('VIDEO_ASSEMBLY_HLS_SEGMENT_SECONDS', '0') or 0)
+        self.hls_segment_seconds = (
+            hls_segment_seconds if hls_segment_seconds > 0 else FFmpegCommandBuilder.HLS_SEGMENT_SECONDS
+        )
         
-        logger.info("VideoAssemblyService initialized")
+        if dedupe_outputs is None:
+            dedupe_outputs = os.getenv('VIDEO_ASSEMBLY_OUTPUT_DEDUPE', 'False').lower() in ('true', '1', 'yes')
+        self.output_dedupe = OutputDeduplicator(storage_service) if dedupe_outputs else None
+        self._render_fingerprint: Optional[str] = None
+        
+        profile = profile or self.PROFILE_FULL
+        if profile not in self.PROFILES:
+            logger.warning(f"Unknown profile '{profile}', using '{self.PROFILE_FULL}'")
+            profile = self.PROFILE_FULL
+        self.profile = profile
+        if profile == self.PROFILE_PREVIEW:
+            # Per-clip preview variants are what makes the draft cheap (and cacheable)
+            self.render_mode = self.RENDER_STAGED
+            self.transitions = False
+            self.output_format = self.OUTPUT_MP4
+        
+        # Timings of the last assembly in seconds (first_clip_ready, total)
+        self.last_timings: Dict[str, float] = {}
+        # Seconds spent normalizing each unique clip, keyed by clip index
+        self.last_clip_timings: Dict[int, float] = {}
+        self._assembly_started: Optional[float] = None
+        # Stage FFmpeg slot waits are reported to, and their total
+        self._current_progress: Optional[StageProgress] = None
+        self._queue_wait_lock = threading.Lock()
+        
+        # Normalized clip cache hits/misses/bytes_saved of the last assembly
+        self.last_clip_cache_stats: Dict[str, float] = {}
+        self._clip_cache_baseline: Dict[str, float] = {}
+        
+        # Stage outputs restored from a checkpoint in the last assembly
+        self.last_checkpoint_restores: Dict[str, int] = {}
+        
+        # Whether the last assembly was served by copying an identical render
+        self.last_output_reused = False
+        
+        logger.info(
+            f"VideoAssemblyService initialized (render mode: {self.render_mode}, "
+            f"output format: {self.output_format}, profile: {self.profile})"
+        )
     
     @property
     def temp_dir(self) -> str:
-        """Get or create temporary directory."""
+        """Get or create temporary directory (the task's work directory when checkpointing)."""
+        if self._checkpoint is not None:
+            os.makedirs(self._checkpoint.work_dir, exist_ok=True)
+            return self._checkpoint.work_dir
         if self._temp_dir:
             os.makedirs(self._temp_dir, exist_ok=True)
             return self._temp_dir
@@ -122,6 +373,8 @@ class VideoAssemblyService:
         3. Each move has required fields
         4. No path traversal or absolute paths (security)
         
+        Compact (columnar) blueprints are expanded before validation.
+        
         Args:
             blueprint: Blueprint dictionary to validate
             
@@ -130,6 +383,11 @@ class VideoAssemblyService:
             - (True, None) if valid
             - (False, "error description") if invalid
         """
+        try:
+            blueprint = expand_blueprint(blueprint)
+        except BlueprintFormatError as e:
+            return False, str(e)
+        
         # Check required top-level fields
         for field in self.REQUIRED_FIELDS:
             if field not in blueprint:
@@ -169,20 +427,37 @@ class VideoAssemblyService:
             paths_to_check.append((f'moves[{idx}].video_path', move.get('video_path', '')))
         
         for path_name, path_value in paths_to_check:
-            if not isinstance(path_value, str):
-                return False, f"Path '{path_name}' must be a string"
-            
-            # Check for directory traversal
-            for pattern in self.DANGEROUS_PATH_PATTERNS:
-                if pattern in path_value:
-                    return False, f"Security error: Path '{path_name}' contains invalid pattern '{pattern}'"
-            
-            # Check for absolute paths (Unix-style)
-            if path_value.startswith('/'):
-                return False, f"Security error: Path '{path_name}' cannot be an absolute path"
+            error_msg = self._check_path(path_name, path_value)
+            if error_msg:
+                return False, error_msg
         
         return True, None
 
+    def _check_path(self, path_name: str, path_value) -> Optional[str]:
+        """
+        Security check for a single storage path.
+        
+        Args:
+            path_name: Field name used in the error message
+            path_value: Path to check
+            
+        Returns:
+            Error message if the path is rejected, None otherwise
+        """
+        if not isinstance(path_value, str):
+            return f"Path '{path_name}' must be a string"
+        
+        # Check for directory traversal
+        for pattern in self.DANGEROUS_PATH_PATTERNS:
+            if pattern in path_value:
+                return f"Security error: Path '{path_name}' contains invalid pattern '{pattern}'"
+        
+        # Check for absolute paths (Unix-style)
+        if path_value.startswith('/'):
+            return f"Security error: Path '{path_name}' cannot be an absolute path"
+        
+        return None
+
     def _fetch_media_files(self, blueprint: Dict) -> Tuple[str, List[str]]:
         """
         Fetch audio and video files from storage.
@@ -201,8 +476,43 @@ class VideoAssemblyService:
         
         logger.info(f"Fetching media files: audio={audio_path}, clips={len(moves)}")
         
-        # Fetch audio file
+        audio_local_path = self._fetch_audio(audio_path)
+        
+        # Fetch video files
+        video_clips_dir = os.path.join(self.temp_dir, 'clips')
+        os.makedirs(video_clips_dir, exist_ok=True)
+        
+        # Blueprints reuse clips many times: download each video_path once
+        # (named after its first move) and reference it for every move
+        video_files = []
+        fetched: Dict[str, str] = {}
+        for idx, move in enumerate(moves):
+            video_path = move.get('video_path')
+            if video_path not in fetched:
+                fetched[video_path] = self._fetch_clip(idx, video_path, video_clips_dir)
+                logger.debug(f"Downloaded clip {idx+1}/{len(moves)}: {video_path}")
+            video_files.append(fetched[video_path])
+        
+        logger.info(f"All media files fetched: audio + {len(fetched)} unique clips for {len(video_files)} moves")
+        return audio_local_path, video_files
+    
+    def _fetch_audio(self, audio_path: str) -> str:
+        """
+        Fetch the audio file from storage.
+        
+        Args:
+            audio_path: Remote audio path
+            
+        Returns:
+            Local audio file path
+            
+        Raises:
+            VideoAssemblyError: If fetching fails
+        """
         audio_local_path = os.path.join(self.temp_dir, 'audio' + Path(audio_path).suffix)
+        if self._restore_checkpoint(STAGE_FETCHED, audio_path, audio_local_path):
+            logger.debug(f"Audio restored from checkpoint: {audio_local_path}")
+            return audio_local_path
         
         try:
             self.storage.download_file(audio_path, audio_local_path)
@@ -215,187 +525,850 @@ class VideoAssemblyService:
                 raise VideoAssemblyError(f"Downloaded audio file is empty: {audio_path}")
             
             logger.debug(f"Audio downloaded: {audio_local_path} ({file_size} bytes)")
+            self._record_checkpoint(STAGE_FETCHED, audio_path, audio_local_path)
+            return audio_local_path
             
         except VideoAssemblyError:
             raise
         except Exception as e:
             raise VideoAssemblyError(f"Failed to fetch audio file '{audio_path}': {str(e)}") from e
+    
+    def _fetch_clip(self, idx: int, video_path: str, clips_dir: str) -> str:
+        """
+        Fetch one video clip from storage.
         
-        # Fetch video files
-        video_clips_dir = os.path.join(self.temp_dir, 'clips')
-        os.makedirs(video_clips_dir, exist_ok=True)
-        
-        video_files = []
-        for idx, move in enumerate(moves):
-            video_path = move.get('video_path')
-            filename = f'clip_{idx:04d}.mp4'
-            local_path = os.path.join(video_clips_dir, filename)
+        Args:
+            idx: Index of the first move that uses the clip
+            video_path: Remote video path
+            clips_dir: Local directory for downloaded clips
             
-            try:
-                self.storage.download_file(video_path, local_path)
-                
-                if not os.path.exists(local_path):
-                    raise VideoAssemblyError(f"Video clip {idx} not found after download: {video_path}")
-                
-                file_size = os.path.getsize(local_path)
-                if file_size == 0:
-                    raise VideoAssemblyError(f"Video clip {idx} is empty: {video_path}")
-                
-                video_files.append(local_path)
-                logger.debug(f"Downloaded clip {idx+1}/{len(moves)}: {video_path}")
-                
-            except VideoAssemblyError:
-                raise
-            except Exception as e:
-                raise VideoAssemblyError(f"Failed to fetch video clip '{video_path}': {str(e)}") from e
+        Returns:
+            Local clip file path
+            
+        Raises:
+            VideoAssemblyError: If fetching fails
+        """
+        local_path = os.path.join(clips_dir, f'clip_{idx:04d}.mp4')
+        if self._restore_checkpoint(STAGE_FETCHED, video_path, local_path):
+            logger.debug(f"Clip {idx} restored from checkpoint: {video_path}")
+            return local_path
         
-        logger.info(f"All media files fetched: audio + {len(video_files)} clips")
-        return audio_local_path, video_files
+        try:
+            self.storage.download_file(video_path, local_path)
+            
+            if not os.path.exists(local_path):
+                raise VideoAssemblyError(f"Video clip {idx} not found after download: {video_path}")
+            
+            file_size = os.path.getsize(local_path)
+            if file_size == 0:
+                raise VideoAssemblyError(f"Video clip {idx} is empty: {video_path}")
+            
+            self._record_checkpoint(STAGE_FETCHED, video_path, local_path)
+            return local_path
+            
+        except VideoAssemblyError:
+            raise
+        except Exception as e:
+            raise VideoAssemblyError(f"Failed to fetch video clip '{video_path}': {str(e)}") from e
     
-    def _normalize_clip_framerates(self, video_files: List[str]) -> List[str]:
+    def _normalize_clip_framerates(
+        self,
+        video_files: List[str],
+        segments: Optional[List[Optional[ClipSegment]]] = None,
+        transitions: Optional[List[Optional[ClipTransition]]] = None,
+        progress: Optional[StageProgress] = None
+    ) -> List[str]:
         """
         Normalize all video clips to consistent frame rate.
         
+        Unique (clip, segment) pairs are normalized in parallel FFmpeg
+        processes (see _run_clip_jobs); the returned list keeps playback
+        order.
+        
         Args:
             video_files: List of source video file paths
+            segments: Optional segment per move (None plays the whole clip)
+            transitions: Optional transition into each move
+            progress: Optional stage progress, updated as clips complete
             
         Returns:
-            List of normalized video file paths
+            List of normalized video file paths (transition clips included)
             
         Raises:
             VideoAssemblyError: If normalization fails
         """
-        normalized_files = []
-        normalized_dir = os.path.join(self.temp_dir, 'normalized')
-        os.makedirs(normalized_dir, exist_ok=True)
-        
-        logger.info(f"Normalizing {len(video_files)} clips to {self.DEFAULT_FRAME_RATE} fps")
+        description = (
+            "Encoding preview clips" if self.profile == self.PROFILE_PREVIEW
+            else f"Normalizing to {self.DEFAULT_FRAME_RATE} fps"
+        )
+        return self._run_clip_jobs(
+            video_files, segments, self._normalize_clip, description, transitions, progress=progress
+        )
+    
+    def _cut_mezzanine_clips(
+        self,
+        video_files: List[str],
+        segments: List[Optional[ClipSegment]],
+        transitions: Optional[List[Optional[ClipTransition]]] = None,
+        progress: Optional[StageProgress] = None
+    ) -> List[str]:
+        """
+        Cut mezzanine clips to their move segments, keeping the mezzanine format.
         
-        for idx, video_file in enumerate(video_files):
-            output_file = os.path.join(normalized_dir, f'normalized_{idx:04d}.mp4')
+        Args:
+            video_files: List of local mezzanine clip paths
+            segments: Segment per move (None plays the whole clip)
+            transitions: Optional transition into each move
+            progress: Optional stage progress, updated as clips complete
             
-            ffmpeg_cmd = self.ffmpeg_builder.build_normalize_command(
-                input_file=video_file,
-                output_file=output_file,
-                frame_rate=self.DEFAULT_FRAME_RATE
-            )
+        Returns:
+            List of clip paths ready for stream-copy concatenation
             
-            try:
-                subprocess.run(
-                    ffmpeg_cmd,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    timeout=self.FFMPEG_TIMEOUT_NORMALIZE
-                )
-                
-                if not os.path.exists(output_file):
-                    raise VideoAssemblyError(f"Normalized clip {idx} not created")
-                
-                normalized_files.append(output_file)
-                
-                if (idx + 1) % 10 == 0:
-                    logger.info(f"Normalized {idx + 1}/{len(video_files)} clips")
-                
-            except subprocess.TimeoutExpired:
-                raise VideoAssemblyError(f"Normalization timed out for clip {idx}")
-            except subprocess.CalledProcessError as e:
-                error_detail = e.stderr[-500:] if e.stderr else 'No error output'
-                raise VideoAssemblyError(f"FFmpeg normalization failed for clip {idx}: {error_detail}")
-        
-        logger.info(f"All {len(normalized_files)} clips normalized")
-        return normalized_files
-
-    def _concatenate_videos(self, video_files: List[str], blueprint: Dict) -> str:
+        Raises:
+            VideoAssemblyError: If cutting fails
         """
-        Concatenate video clips using FFmpeg.
+        return self._run_clip_jobs(
+            video_files, segments, self._cut_mezzanine_clip, "Cutting mezzanine clips",
+            transitions, mezzanine=True, progress=progress
+        )
+    
+    def _run_clip_jobs(
+        self,
+        video_files: List[str],
+        segments: Optional[List[Optional[ClipSegment]]],
+        job: Callable[..., str],
+        description: str,
+        transitions: Optional[List[Optional[ClipTransition]]] = None,
+        mezzanine: bool = False,
+        progress: Optional[StageProgress] = None
+    ) -> List[str]:
+        """
+        Run a per-clip FFmpeg job for every unique (clip, segment) pair in parallel.
+        
+        Jobs run on a thread pool sized by _normalize_concurrency. A clip
+        repeated with the same segment is processed once and referenced
+        again. Transition clips are rendered on the same pool (once per
+        unique clip pair and transition). The first failure cancels jobs
+        that have not started yet.
         
         Args:
-            video_files: List of local video file paths
-            blueprint: Blueprint dictionary
+            video_files: List of local clip paths, one per move
+            segments: Optional segment per move
+            job: job(idx, video_file, output_dir, threads, segment) -> path
+            description: Log message prefix
+            transitions: Optional transition into each move (see
+                _render_transition)
+            mezzanine: Render transitions in the mezzanine format
+            progress: Optional stage progress, updated as jobs complete
             
         Returns:
-            Path to concatenated video file
+            Job output paths in playback order, each move's transition
+            clip before the move's own clip
             
         Raises:
-            VideoAssemblyError: If concatenation fails
+            VideoAssemblyError: If a job fails
         """
-        logger.info(f"Concatenating {len(video_files)} video clips")
-        
-        # Validate input files exist
-        for idx, video_file in enumerate(video_files):
-            if not os.path.exists(video_file):
-                raise VideoAssemblyError(f"Video file {idx} does not exist: {video_file}")
+        output_dir = os.path.join(self.temp_dir, 'normalized')
+        os.makedirs(output_dir, exist_ok=True)
         
-        # Normalize clips to consistent frame rate
-        normalized_files = self._normalize_clip_framerates(video_files)
+        keys = list(zip(video_files, segments or [None] * len(video_files)))
+        first_move: Dict[Tuple, int] = {}
+        for idx, key in enumerate(keys):
+            first_move.setdefault(key, idx)
+        # Transition keys are (outgoing clip, incoming clip, transition)
+        transition_keys: List[Optional[Tuple[str, str, ClipTransition]]] = [
+            (video_files[idx - 1], video_files[idx], transition) if transition and idx > 0 else None
+            for idx, transition in enumerate(transitions or [None] * len(video_files))
+        ]
+        first_transition: Dict[Tuple, int] = {}
+        for idx, key in enumerate(transition_keys):
+            if key:
+                first_transition.setdefault(key, idx)
+        unique_count = len(first_move) + len(first_transition)
+        workers, threads = self._normalize_concurrency(unique_count)
         
-        # Create concat file
-        concat_file = os.path.join(self.temp_dir, 'concat.txt')
+        logger.info(
+            f"{description}: {len(first_move)} unique clips ({len(video_files)} moves), "
+            f"{len(first_transition)} transitions with {workers} workers x {threads} threads"
+        )
+        started = time.perf_counter()
         
+        results: Dict[Tuple, str] = {}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='normalize')
         try:
-            with open(concat_file, 'w') as f:
-                for video_file in normalized_files:
-                    abs_path = os.path.abspath(video_file)
-                    f.write(f"file '{abs_path}'\n")
-        except IOError as e:
-            raise VideoAssemblyError(f"Failed to create concat file: {str(e)}") from e
-        
-        # Output file for concatenated video
-        output_file = os.path.join(self.temp_dir, 'concatenated.mp4')
+            futures = {
+                executor.submit(job, idx, video_file, output_dir, threads, segment): (video_file, segment)
+                for (video_file, segment), idx in first_move.items()
+            }
+            for key, idx in first_transition.items():
+                outgoing_file, incoming_file, transition = key
+                future = executor.submit(
+                    self._render_transition, idx, outgoing_file, incoming_file, output_dir,
+                    threads, transition, mezzanine
+                )
+                futures[future] = key
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress:
+                    progress.update(len(results) / unique_count)
+                
+                if len(results) % 10 == 0:
+                    logger.info(f"Processed {len(results)}/{unique_count} clips")
+        finally:
+            # On failure, drop queued clips and wait for running FFmpeg processes
+            executor.shutdown(wait=True, cancel_futures=True)
         
-        # Build and execute FFmpeg concat command
-        ffmpeg_cmd = self.ffmpeg_builder.build_concat_command(
-            concat_file=concat_file,
-            output_file=output_file
+        elapsed = time.perf_counter() - started
+        slowest = max(self.last_clip_timings.items(), key=lambda item: item[1], default=None)
+        logger.info(
+            f"All {unique_count} unique clips processed in {elapsed:.2f}s"
+            + (f" (slowest: clip {slowest[0]}, {slowest[1]:.2f}s)" if slowest else "")
         )
+        playback = []
+        for key, transition_key in zip(keys, transition_keys):
+            if transition_key:
+                playback.append(results[transition_key])
+            playback.append(results[key])
+        return playback
+    
+    def _normalize_concurrency(self, job_count: int, workers: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Size a batch of parallel FFmpeg jobs to the CPU.
         
-        try:
-            subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=self.FFMPEG_TIMEOUT_CONCAT
-            )
-            
-            if not os.path.exists(output_file):
-                raise VideoAssemblyError("Concatenated video file not created by FFmpeg")
+        Each job gets an equal share of the cores through FFmpeg -threads, so
+        workers x threads never exceeds the CPU count (except when there are
+        more workers than cores, where each job gets one thread).
+        
+        Args:
+            job_count: Number of clips to normalize
+            workers: Worker limit (default: normalize_workers)
             
-            file_size = os.path.getsize(output_file)
-            if file_size == 0:
-                raise VideoAssemblyError("Concatenated video file is empty")
+        Returns:
+            Tuple of (worker count, FFmpeg threads per job)
+        """
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(job_count, workers or self.normalize_workers))
+        return workers, max(1, cpu_count // workers)
+
+    def _normalize_clip(
+        self,
+        idx: int,
+        video_file: str,
+        normalized_dir: str,
+        threads: Optional[int] = None,
+        segment: Optional[ClipSegment] = None
+    ) -> str:
+        """
+        Normalize one video clip to the default frame rate.
+        
+        With the preview profile, the clip is encoded to its preview
+        variant instead. The normalized clip cache (if configured) is
+        consulted first; fresh FFmpeg output is added to it. The time taken
+        is recorded in last_clip_timings.
+        
+        Args:
+            idx: Clip index in the blueprint
+            video_file: Local source clip path
+            normalized_dir: Directory for normalized clips
+            threads: FFmpeg encoder threads (default: FFmpeg decides)
+            segment: Optional part of the clip to keep (cut and retimed in
+                the same encode, frame-accurately)
             
-            logger.info(f"Videos concatenated: {output_file} ({file_size} bytes)")
-            return output_file
+        Returns:
+            Normalized clip file path
             
+        Raises:
+            VideoAssemblyError: If normalization fails
+        """
+        output_file = os.path.join(normalized_dir, f'normalized_{idx:04d}.mp4')
+        started = time.perf_counter()
+        
+        cache_key = self._clip_cache_key(video_file, segment)
+        source = self._reuse_clip(cache_key, output_file)
+        if source:
+            logger.debug(f"Clip {idx} served from {source}")
+        else:
+            self._run_normalize(idx, video_file, output_file, threads, segment)
+            self._store_clip(cache_key, output_file)
+        
+        self.last_clip_timings[idx] = time.perf_counter() - started
+        logger.debug(f"Clip {idx} normalized in {self.last_clip_timings[idx]:.2f}s")
+        self._mark_clip_ready(idx)
+        return output_file
+    
+    def _run_normalize(
+        self,
+        idx: int,
+        video_file: str,
+        output_file: str,
+        threads: Optional[int] = None,
+        segment: Optional[ClipSegment] = None
+    ) -> None:
+        """
+        Run the FFmpeg normalize (or preview) command for one clip.
+        
+        Raises:
+            VideoAssemblyError: If FFmpeg fails or produces no output
+        """
+        segment_args = {}
+        if segment:
+            segment_args = {
+                'trim_start': segment.trim_start,
+                'duration': segment.duration,
+                'playback_rate': segment.playback_rate,
+            }
+        if self.profile == self.PROFILE_PREVIEW:
+            ffmpeg_cmd = self.ffmpeg_builder.build_preview_command(
+                input_file=video_file,
+                output_file=output_file,
+                threads=threads,
+                **segment_args
+            )
+        else:
+            ffmpeg_cmd = self.ffmpeg_builder.build_normalize_command(
+                input_file=video_file,
+                output_file=output_file,
+                frame_rate=self.DEFAULT_FRAME_RATE,
+                threads=threads,
+                **segment_args
+            )
+        
+        try:
+            with self._ffmpeg_slot():
+                subprocess.run(
+                    ffmpeg_cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=self.FFMPEG_TIMEOUT_NORMALIZE
+                )
         except subprocess.TimeoutExpired:
-            raise VideoAssemblyError(f"FFmpeg concatenation timed out after {self.FFMPEG_TIMEOUT_CONCAT} seconds")
+            raise VideoAssemblyError(f"Normalization timed out for clip {idx}")
         except subprocess.CalledProcessError as e:
             error_detail = e.stderr[-500:] if e.stderr else 'No error output'
-            raise VideoAssemblyError(f"FFmpeg concatenation failed: {error_detail}")
-        except FileNotFoundError:
-            raise VideoAssemblyError("FFmpeg executable not found")
+            raise VideoAssemblyError(f"FFmpeg normalization failed for clip {idx}: {error_detail}")
+        
+        if not os.path.exists(output_file):
+            raise VideoAssemblyError(f"Normalized clip {idx} not created")
     
-    def _add_audio_track(
+    def _clip_cache_key(self, video_file: str, segment: Optional[ClipSegment] = None) -> Optional[str]:
+        """
+        Normalized clip cache key for a source clip (segment).
+        
+        Also names the clip in the assembly checkpoint. None if neither the
+        cache nor checkpointing is on.
+        """
+        if self.clip_cache is None and self._checkpoint is None:
+            return None
+        try:
+            source_hash = file_content_hash(video_file)
+        except OSError as e:
+            logger.debug(f"Normalized clip cache skipped for {video_file}: {e}")
+            return None
+        if self.profile == self.PROFILE_PREVIEW:
+            frame_rate = self.ffmpeg_builder.PREVIEW_FRAME_RATE
+            codec_settings = self.ffmpeg_builder.preview_settings()
+        else:
+            frame_rate = self.DEFAULT_FRAME_RATE
+            codec_settings = self.ffmpeg_builder.normalize_settings()
+        return NormalizedClipCache.make_key(
+            source_hash=source_hash,
+            frame_rate=frame_rate,
+            codec_settings=codec_settings,
+            builder_version=self.ffmpeg_builder.BUILDER_VERSION,
+            segment=segment.as_tuple() if segment else None
+        )
+    
+    def _reuse_clip(self, key: Optional[str], output_file: str, cached: bool = True) -> Optional[str]:
+        """
+        Place an already prepared clip at output_file, from the checkpoint or the clip cache.
+        
+        Args:
+            key: Clip key (see _clip_cache_key), or None
+            output_file: Where the clip is expected
+            cached: Whether the clip kind is kept in the normalized clip cache
+        
+        Returns:
+            Where the clip came from ('checkpoint' or 'normalized clip
+            cache'), or None if it has to be made
+        """
+        if not key:
+            return None
+        if self._restore_checkpoint(STAGE_NORMALIZED, key, output_file):
+            return 'checkpoint'
+        if cached and self.clip_cache is not None and self.clip_cache.fetch(key, output_file):
+            self._record_checkpoint(STAGE_NORMALIZED, key, output_file)
+            return 'normalized clip cache'
+        return None
+    
+    def _store_clip(self, key: Optional[str], output_file: str, cached: bool = True) -> None:
+        """Add a freshly prepared clip to the clip cache and the checkpoint."""
+        if not key:
+            return
+        if cached and self.clip_cache is not None:
+            self.clip_cache.put(key, output_file)
+        self._record_checkpoint(STAGE_NORMALIZED, key, output_file)
+    
+    def _cut_mezzanine_clip(
         self,
+        idx: int,
         video_file: str,
-        audio_file: str,
-        output_config: Dict
+        output_dir: str,
+        threads: Optional[int] = None,
+        segment: Optional[ClipSegment] = None
     ) -> str:
         """
-        Add audio track to video using FFmpeg.
+        Cut one mezzanine clip to its segment without leaving the mezzanine format.
+        
+        A segment starting on a mezzanine keyframe at normal speed is cut
+        with stream copy; anything else is re-encoded with the mezzanine
+        settings so the result still concatenates with stream copy.
         
         Args:
-            video_file: Path to video file (without audio)
-            audio_file: Path to audio file
-            output_config: Output configuration from blueprint
+            idx: Clip index in the blueprint
+            video_file: Local mezzanine clip path
+            output_dir: Directory for cut clips
+            threads: FFmpeg encoder threads (default: FFmpeg decides)
+            segment: Part of the clip to keep (None keeps the whole clip)
             
         Returns:
-            Path to final video file with audio
+            Path of the cut clip (video_file itself when there is no segment)
             
         Raises:
-            VideoAssemblyError: If adding audio fails
+            VideoAssemblyError: If cutting fails
+        """
+        if segment is None:
+            self._mark_clip_ready(idx)
+            return video_file
+        
+        output_file = os.path.join(output_dir, f'cut_{idx:04d}.mp4')
+        started = time.perf_counter()
+        
+        # Cut clips are checkpointed but not cached (cutting is cheap)
+        checkpoint_key = self._mezzanine_cut_key(video_file, segment)
+        if self._reuse_clip(checkpoint_key, output_file, cached=False):
+            logger.debug(f"Clip {idx} cut restored from checkpoint")
+            self._mark_clip_ready(idx)
+            return output_file
+        
+        if segment.playback_rate == 1.0 and self.ffmpeg_builder.mezzanine_keyframe_aligned(segment.trim_start):
+            ffmpeg_cmd = self.ffmpeg_builder.build_cut_command(
+                video_file, output_file, segment.trim_start, segment.duration
+            )
+            method = 'stream copy'
+        else:
+            ffmpeg_cmd = self.ffmpeg_builder.build_mezzanine_command(
+                video_file, output_file, threads=threads,
+                trim_start=segment.trim_start,
+                duration=segment.duration,
+                playback_rate=segment.playback_rate
+            )
+            method = 're-encode'
+        
+        try:
+            with self._ffmpeg_slot():
+                subprocess.run(
+                    ffmpeg_cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=self.FFMPEG_TIMEOUT_NORMALIZE
+                )
+        except subprocess.TimeoutExpired:
+            raise VideoAssemblyError(f"Cutting timed out for clip {idx}")
+        except subprocess.CalledProcessError as e:
+            error_detail = e.stderr[-500:] if e.stderr else 'No error output'
+            raise VideoAssemblyError(f"FFmpeg cut failed for clip {idx}: {error_detail}")
+        
+        if not os.path.exists(output_file):
+            raise VideoAssemblyError(f"Cut clip {idx} not created")
+        self._store_clip(checkpoint_key, output_file, cached=False)
+        
+        self.last_clip_timings[idx] = time.perf_counter() - started
+        logger.debug(f"Clip {idx} cut ({method}) in {self.last_clip_timings[idx]:.2f}s")
+        self._mark_clip_ready(idx)
+        return output_file
+    
+    def _mezzanine_cut_key(self, video_file: str, segment: ClipSegment) -> Optional[str]:
+        """Checkpoint name of a cut mezzanine clip, or None if checkpointing is off."""
+        if self._checkpoint is None:
+            return None
+        try:
+            source_hash = file_content_hash(video_file)
+        except OSError:
+            return None
+        return NormalizedClipCache.make_key(
+            source_hash=source_hash,
+            frame_rate=self.ffmpeg_builder.MEZZANINE_FRAME_RATE,
+            codec_settings={'format': 'mezzanine', 'version': self.ffmpeg_builder.MEZZANINE_VERSION},
+            builder_version=self.ffmpeg_builder.BUILDER_VERSION,
+            segment=segment.as_tuple()
+        )
+    
+    def _move_segment(self, move: Dict) -> Optional[ClipSegment]:
+        """
+        Segment of its clip a move plays, or None to play the whole clip.
+        
+        Moves without a duration (older blueprints) play the whole clip, as
+        do moves whose segment covers the clip's original_duration as-is.
+        """
+        try:
+            duration = float(move['duration'])
+            trim_start = max(float(move.get('trim_start') or 0.0), 0.0)
+            playback_rate = float(move.get('playback_rate') or 1.0)
+        except (KeyError, TypeError, ValueError):
+            return None
+        if duration <= 0 or playback_rate <= 0:
+            return None
+        
+        # Round to FFmpeg-friendly precision (and stable cache keys)
+        trim_start = round(trim_start, 3)
+        duration = round(duration, 3)
+        playback_rate = round(playback_rate, 4)
+        
+        original_duration = move.get('original_duration')
+        if trim_start == 0 and playback_rate == 1.0 and original_duration is not None:
+            try:
+                if duration >= float(original_duration) - 0.5 / self.DEFAULT_FRAME_RATE:
+                    return None
+            except (TypeError, ValueError):
+                pass
+        return ClipSegment(trim_start, duration, playback_rate)
+    
+    def _plan_clips(self, moves: List[Dict]) -> Tuple[List[Optional[ClipSegment]], List[Optional[ClipTransition]]]:
+        """Segment and incoming transition of every move (see _plan_move)."""
+        plans = [
+            self._plan_move(move, moves[idx - 1] if idx > 0 else None)
+            for idx, move in enumerate(moves)
+        ]
+        return [segment for segment, _ in plans], [transition for _, transition in plans]
+    
+    def _plan_move(
+        self,
+        move: Dict,
+        previous_move: Optional[Dict] = None
+    ) -> Tuple[Optional[ClipSegment], Optional[ClipTransition]]:
+        """
+        Clip segment and incoming crossfade of a move.
+        
+        A move with transition_type 'crossfade' and a positive
+        transition_duration (capped at half the move) starts with a
+        transition clip; the segment returned is then what remains of the
+        move after it. For a mezzanine clip at normal speed the transition
+        clip runs on to the next keyframe, so the remainder can still be
+        cut with stream copy. Moves without a duration (older blueprints),
+        the first move, and every move when transitions are off keep a
+        hard cut.
+        
+        Returns:
+            Tuple of (segment or None for the whole clip, transition or None)
+        """
+        segment = self._move_segment(move)
+        if not self.transitions or previous_move is None or move.get('transition_type') != 'crossfade':
+            return segment, None
+        try:
+            move_duration = float(move['duration'])
+            fade = min(float(move.get('transition_duration') or 0), move_duration / 2)
+        except (KeyError, TypeError, ValueError):
+            return segment, None
+        frame = 1.0 / self.DEFAULT_FRAME_RATE
+        if fade < frame:
+            return segment, None
+        
+        whole = segment or ClipSegment(0.0, round(move_duration, 3))
+        length = fade
+        if whole.playback_rate == 1.0 and self.ffmpeg_builder.is_mezzanine_path(move.get('video_path')):
+            keyframe_length = self.ffmpeg_builder.next_mezzanine_keyframe(whole.trim_start + fade) - whole.trim_start
+            if keyframe_length < whole.duration - frame:
+                length = keyframe_length
+        length = round(length, 3)
+        
+        # The outgoing clip continues from where its own move ends
+        previous_segment = self._move_segment(previous_move)
+        outgoing_start, outgoing_rate = None, 1.0
+        if previous_segment:
+            outgoing_start = round(
+                previous_segment.trim_start + previous_segment.duration * previous_segment.playback_rate, 3
+            )
+            outgoing_rate = previous_segment.playback_rate
+        
+        transition = ClipTransition(
+            duration=round(fade, 3),
+            length=length,
+            outgoing_start=outgoing_start,
+            outgoing_rate=outgoing_rate,
+            incoming_start=whole.trim_start,
+            incoming_rate=whole.playback_rate
+        )
+        remainder = ClipSegment(
+            round(whole.trim_start + length * whole.playback_rate, 3),
+            round(whole.duration - length, 3),
+            whole.playback_rate
+        )
+        return remainder, transition
+    
+    def _render_transition(
+        self,
+        idx: int,
+        outgoing_file: str,
+        incoming_file: str,
+        output_dir: str,
+        threads: Optional[int] = None,
+        transition: Optional[ClipTransition] = None,
+        mezzanine: bool = False
+    ) -> str:
+        """
+        Render the crossfade into move idx as a short clip.
+        
+        Only the transition's few seconds are encoded, in the same format
+        as the clips around it (mezzanine or normalized) so the result
+        still concatenates with stream copy. Transition clips are kept in
+        the normalized clip cache, keyed by both source clips and the
+        transition timing.
+        
+        Args:
+            idx: Index of the incoming move
+            outgoing_file: Local path of the previous move's clip
+            incoming_file: Local path of this move's clip
+            output_dir: Directory for transition clips
+            threads: FFmpeg encoder threads (default: FFmpeg decides)
+            transition: Transition timing (from _plan_move)
+            mezzanine: Encode in the mezzanine format
+            
+        Returns:
+            Transition clip path
+            
+        Raises:
+            VideoAssemblyError: If rendering fails
+        """
+        output_file = os.path.join(output_dir, f'transition_{idx:04d}.mp4')
+        started = time.perf_counter()
+        
+        cache_key = self._transition_cache_key(outgoing_file, incoming_file, transition, mezzanine)
+        source = self._reuse_clip(cache_key, output_file)
+        if source:
+            logger.debug(f"Transition into clip {idx} served from {source}")
+            return output_file
+        
+        ffmpeg_cmd = self.ffmpeg_builder.build_transition_command(
+            outgoing_file=outgoing_file,
+            incoming_file=incoming_file,
+            output_file=output_file,
+            duration=transition.duration,
+            length=transition.length,
+            outgoing_start=transition.outgoing_start,
+            outgoing_rate=transition.outgoing_rate,
+            incoming_start=transition.incoming_start,
+            incoming_rate=transition.incoming_rate,
+            mezzanine=mezzanine,
+            frame_rate=self.DEFAULT_FRAME_RATE,
+            threads=threads
+        )
+        
+        try:
+            with self._ffmpeg_slot():
+                subprocess.run(
+                    ffmpeg_cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=self.FFMPEG_TIMEOUT_NORMALIZE
+                )
+        except subprocess.TimeoutExpired:
+            raise VideoAssemblyError(f"Transition rendering timed out for clip {idx}")
+        except subprocess.CalledProcessError as e:
+            error_detail = e.stderr[-500:] if e.stderr else 'No error output'
+            raise VideoAssemblyError(f"FFmpeg transition failed for clip {idx}: {error_detail}")
+        
+        if not os.path.exists(output_file):
+            raise VideoAssemblyError(f"Transition clip {idx} not created")
+        self._store_clip(cache_key, output_file)
+        
+        logger.debug(f"Transition into clip {idx} rendered in {time.perf_counter() - started:.2f}s")
+        return output_file
+    
+    def _transition_cache_key(
+        self,
+        outgoing_file: str,
+        incoming_file: str,
+        transition: ClipTransition,
+        mezzanine: bool
+    ) -> Optional[str]:
+        """Normalized clip cache (and checkpoint) key for a transition clip, or None if both are off."""
+        if self.clip_cache is None and self._checkpoint is None:
+            return None
+        try:
+            outgoing_hash = file_content_hash(outgoing_file)
+            incoming_hash = file_content_hash(incoming_file)
+        except OSError as e:
+            logger.debug(f"Normalized clip cache skipped for transition into {incoming_file}: {e}")
+            return None
+        if mezzanine:
+            codec_settings = {'format': 'mezzanine', 'version': self.ffmpeg_builder.MEZZANINE_VERSION}
+        else:
+            codec_settings = self.ffmpeg_builder.normalize_settings()
+        return NormalizedClipCache.make_transition_key(
+            outgoing_hash=outgoing_hash,
+            incoming_hash=incoming_hash,
+            frame_rate=self.DEFAULT_FRAME_RATE,
+            codec_settings=codec_settings,
+            builder_version=self.ffmpeg_builder.BUILDER_VERSION,
+            transition=transition.as_tuple()
+        )
+
+    def _concatenate_videos(
+        self,
+        video_files: List[str],
+        blueprint: Dict,
+        progress: Optional[StageProgress] = None
+    ) -> str:
+        """
+        Concatenate video clips using FFmpeg.
+        
+        Args:
+            video_files: List of local video file paths
+            blueprint: Blueprint dictionary
+            progress: Optional stage progress, updated as clips are prepared
+            
+        Returns:
+            Path to concatenated video file
+            
+        Raises:
+            VideoAssemblyError: If concatenation fails
+        """
+        logger.info(f"Concatenating {len(video_files)} video clips")
+        
+        # Validate input files exist
+        for idx, video_file in enumerate(video_files):
+            if not os.path.exists(video_file):
+                raise VideoAssemblyError(f"Video file {idx} does not exist: {video_file}")
+        
+        moves = blueprint.get('moves', [])
+        segments, transitions = self._plan_clips(moves)
+        
+        if self._all_mezzanine(moves):
+            # Mezzanine clips share codec, fps, resolution and timebase:
+            # cut them to their segments and concatenate with stream copy
+            logger.info("All clips are mezzanine clips, skipping normalization")
+            return self._concat_clips(self._cut_mezzanine_clips(video_files, segments, transitions, progress))
+        
+        # Normalize clips to consistent frame rate and cut them to their segments
+        normalized_files = self._normalize_clip_framerates(video_files, segments, transitions, progress)
+        
+        return self._concat_clips(normalized_files)
+    
+    def _concat_clips(self, normalized_files: List[str]) -> str:
+        """
+        Join normalized clips with the FFmpeg concat demuxer (stream copy).
+        
+        Args:
+            normalized_files: Normalized clip paths in playback order
+            
+        Returns:
+            Path to concatenated video file
+            
+        Raises:
+            VideoAssemblyError: If concatenation fails
+        """
+        # Create concat file
+        concat_file = os.path.join(self.temp_dir, 'concat.txt')
+        
+        try:
+            with open(concat_file, 'w') as f:
+                for video_file in normalized_files:
+                    abs_path = os.path.abspath(video_file)
+                    f.write(f"file '{abs_path}'\n")
+        except IOError as e:
+            raise VideoAssemblyError(f"Failed to create concat file: {str(e)}") from e
+        
+        # Output file for concatenated video
+        output_file = os.path.join(self.temp_dir, 'concatenated.mp4')
+        
+        checkpoint_key = self._concat_checkpoint_key(normalized_files)
+        if checkpoint_key and self._restore_checkpoint(STAGE_CONCATENATED, checkpoint_key, output_file):
+            logger.info(f"Concatenated video restored from checkpoint: {output_file}")
+            return output_file
+        
+        # Build and execute FFmpeg concat command
+        ffmpeg_cmd = self.ffmpeg_builder.build_concat_command(
+            concat_file=concat_file,
+            output_file=output_file
+        )
+        
+        try:
+            with self._ffmpeg_slot():
+                subprocess.run(
+                    ffmpeg_cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=self.FFMPEG_TIMEOUT_CONCAT
+                )
+            
+            if not os.path.exists(output_file):
+                raise VideoAssemblyError("Concatenated video file not created by FFmpeg")
+            
+            file_size = os.path.getsize(output_file)
+            if file_size == 0:
+                raise VideoAssemblyError("Concatenated video file is empty")
+            
+            logger.info(f"Videos concatenated: {output_file} ({file_size} bytes)")
+            if checkpoint_key:
+                self._record_checkpoint(STAGE_CONCATENATED, checkpoint_key, output_file)
+            return output_file
+            
+        except subprocess.TimeoutExpired:
+            raise VideoAssemblyError(f"FFmpeg concatenation timed out after {self.FFMPEG_TIMEOUT_CONCAT} seconds")
+        except subprocess.CalledProcessError as e:
+            error_detail = e.stderr[-500:] if e.stderr else 'No error output'
+            raise VideoAssemblyError(f"FFmpeg concatenation failed: {error_detail}")
+        except FileNotFoundError:
+            raise VideoAssemblyError("FFmpeg executable not found")
+    
+    def _concat_checkpoint_key(self, normalized_files: List[str]) -> Optional[str]:
+        """Checkpoint name of the concatenated video: hash of its inputs' content, in order."""
+        if self._checkpoint is None:
+            return None
+        try:
+            hashes = [file_content_hash(video_file) for video_file in normalized_files]
+        except OSError:
+            return None
+        return hashlib.sha256(json.dumps(hashes).encode('utf-8')).hexdigest()
+    
+    def _add_audio_track(
+        self,
+        video_file: str,
+        audio_file: str,
+        output_config: Dict,
+        progress: Optional[StageProgress] = None,
+        duration: Optional[float] = None,
+        copy_video: Optional[bool] = None,
+        publisher: Optional[HLSPublisher] = None
+    ) -> str:
+        """
+        Add audio track to video using FFmpeg.
+        
+        When ffprobe shows the video already matches the output codec and
+        bitrate policy (FFmpegCommandBuilder.video_matches_output), the video
+        stream is copied and only the audio is encoded.
+        
+        Args:
+            video_file: Path to video file (without audio)
+            audio_file: Path to audio file
+            output_config: Output configuration from blueprint
+            progress: Optional stage progress, updated from FFmpeg's
+                -progress output
+            duration: Expected output length in seconds (needed for progress)
+            copy_video: Copy (True) or re-encode (False) the video stream;
+                decided with ffprobe when None
+            publisher: Optional HLS publisher; FFmpeg then writes its
+                playlist, uploaded as segments are finished
+            
+        Returns:
+            Path to final video file with audio (the playlist for HLS output)
+            
+        Raises:
+            VideoAssemblyError: If adding audio fails
         """
         logger.info(f"Adding audio track to video")
         
@@ -406,7 +1379,7 @@ class VideoAssemblyService:
             raise VideoAssemblyError(f"Audio file does not exist: {audio_file}")
         
         # Output file for final video
-        output_file = os.path.join(self.temp_dir, 'final_output.mp4')
+        output_file = publisher.playlist_file if publisher else os.path.join(self.temp_dir, 'final_output.mp4')
         
         # Get output configuration with defaults
         video_codec = output_config.get('video_codec', 'libx264')
@@ -414,6 +1387,16 @@ class VideoAssemblyService:
         video_bitrate = output_config.get('video_bitrate', '2M')
         audio_bitrate = output_config.get('audio_bitrate', '128k')
         
+        if copy_video is None:
+            probe = self._probe_video(video_file)
+            copy_video = probe is not None and self.ffmpeg_builder.video_matches_output(
+                probe, video_codec=video_codec, video_bitrate=video_bitrate
+            )
+        logger.info(
+            "Video stream matches output config, muxing audio only" if copy_video
+            else f"Re-encoding video to {video_codec} at {video_bitrate}"
+        )
+        
         # Build and execute FFmpeg command
         ffmpeg_cmd = self.ffmpeg_builder.build_add_audio_command(
             video_file=video_file,
@@ -422,16 +1405,17 @@ class VideoAssemblyService:
             video_codec=video_codec,
             audio_codec=audio_codec,
             video_bitrate=video_bitrate,
-            audio_bitrate=audio_bitrate
+            audio_bitrate=audio_bitrate,
+            copy_video=copy_video
         )
+        if publisher:
+            ffmpeg_cmd = self.ffmpeg_builder.with_hls_output(
+                ffmpeg_cmd, output_file, self.hls_segment_seconds, self.DEFAULT_FRAME_RATE
+            )
         
         try:
-            subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=self.FFMPEG_TIMEOUT_AUDIO
+            self._run_ffmpeg(
+                ffmpeg_cmd, self.FFMPEG_TIMEOUT_AUDIO, progress, duration, publisher.sync if publisher else None
             )
             
             if not os.path.exists(output_file):
@@ -449,9 +1433,33 @@ class VideoAssemblyService:
         except subprocess.CalledProcessError as e:
             error_detail = e.stderr[-500:] if e.stderr else 'No error output'
             raise VideoAssemblyError(f"FFmpeg audio addition failed: {error_detail}")
+        except HLSPublishError as e:
+            raise VideoAssemblyError(str(e)) from e
         except FileNotFoundError:
             raise VideoAssemblyError("FFmpeg executable not found")
 
+    def _probe_video(self, video_file: str) -> Optional[Dict]:
+        """
+        Probe the first video stream with ffprobe.
+        
+        Returns:
+            Parsed ffprobe JSON, or None if probing failed (the caller then
+            re-encodes, which is always safe)
+        """
+        try:
+            result = subprocess.run(
+                self.ffmpeg_builder.build_probe_command(video_file),
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=self.FFPROBE_TIMEOUT
+            )
+            probe = json.loads(result.stdout)
+        except Exception as e:
+            logger.debug(f"ffprobe failed for {video_file}: {e}")
+            return None
+        return probe if isinstance(probe, dict) else None
+    
     def _upload_result(self, video_file: str, blueprint: Dict) -> str:
         """
         Upload final video to storage.
@@ -466,8 +1474,7 @@ class VideoAssemblyService:
         Raises:
             VideoAssemblyError: If upload fails
         """
-        output_config = blueprint.get('output_config', {})
-        output_path = output_config.get('output_path')
+        output_path = self.output_path(blueprint)
         
         if not output_path:
             raise VideoAssemblyError("No output_path specified in blueprint output_config")
@@ -494,12 +1501,24 @@ class VideoAssemblyService:
         except Exception as e:
             raise VideoAssemblyError(f"Failed to upload result to '{output_path}': {str(e)}") from e
     
-    def _cleanup_temp_files(self):
+    def _cleanup_temp_files(self, failed: bool = False):
         """
         Clean up temporary files.
         
-        Removes all files in the temp directory.
+        Removes all files in the temp directory. With a checkpoint, the
+        task's work directory is removed on success and kept (for a retry
+        to resume from) when the assembly failed.
+        
+        Args:
+            failed: Whether the assembly failed
         """
+        if self._checkpoint is not None:
+            checkpoint, self._checkpoint = self._checkpoint, None
+            self.last_checkpoint_restores = dict(checkpoint.restored)
+            if failed:
+                logger.info(f"Keeping checkpoint of task {checkpoint.task_id} for a retry: {checkpoint.work_dir}")
+            else:
+                checkpoint.discard()
         try:
             temp_dir = self._created_temp_dir or self._temp_dir
             if temp_dir and os.path.exists(temp_dir):
@@ -528,84 +1547,1010 @@ class VideoAssemblyService:
     def assemble_video(
         self,
         blueprint: Dict,
-        progress_callback: Optional[Callable[[str, int, str], None]] = None
+        progress_callback: Optional[Callable[[str, int, str], None]] = None,
+        playlist_callback: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Assemble video from blueprint.
         
         Args:
             blueprint: Blueprint dictionary with assembly instructions
+                (standard or compact columnar form)
             progress_callback: Optional callback(stage, progress, message)
+            playlist_callback: Optional callback(playlist URL) for HLS
+                output, called as soon as the first segment is uploaded
         
         Returns:
-            URL to the assembled video
+            URL to the assembled video (the playlist for HLS output)
             
         Raises:
             VideoAssemblyError: If assembly fails
         """
+        try:
+            blueprint = expand_blueprint(blueprint)
+        except BlueprintFormatError as e:
+            raise VideoAssemblyError(f"Invalid blueprint: {e}")
+        
         task_id = blueprint.get('task_id', 'unknown')
         
         logger.info(f"Starting video assembly for task {task_id}")
+        self._start_timer()
         
         # Validate blueprint first
         is_valid, error_msg = self.validate_blueprint(blueprint)
         if not is_valid:
             raise VideoAssemblyError(f"Invalid blueprint: {error_msg}")
         
+        reused_url = self._reuse_output(blueprint, progress_callback)
+        if reused_url:
+            return reused_url
+        
+        self._open_checkpoint(blueprint.get('task_id'))
+        
         try:
             # Step 1: Fetch media files (20% progress)
-            if progress_callback:
-                progress_callback('fetching', 20, 'Fetching media files from storage...')
+            self._stage_progress(progress_callback, 'fetching', 20, 50, 'Fetching media files from storage...')
             
             audio_file, video_files = self._fetch_media_files(blueprint)
             
-            # Step 2: Concatenate video clips (50% progress)
-            if progress_callback:
-                progress_callback('concatenating', 50, 'Concatenating video clips...')
-            
-            concatenated_video = self._concatenate_videos(video_files, blueprint)
-            
-            # Step 3: Add audio track (70% progress)
-            if progress_callback:
-                progress_callback('adding_audio', 70, 'Adding audio track...')
+            if self.render_mode == self.RENDER_SINGLE_PASS:
+                return self._finish_single_pass(
+                    blueprint, video_files, audio_file, progress_callback, playlist_callback
+                )
+            if self.render_mode == self.RENDER_SEGMENTED:
+                return self._finish_segmented(
+                    blueprint, video_files, audio_file, progress_callback, playlist_callback
+                )
             
-            output_config = blueprint.get('output_config', {})
-            final_video = self._add_audio_track(
-                concatenated_video,
-                audio_file,
-                output_config
+            # Step 2: Concatenate video clips (50-70% progress)
+            progress = self._stage_progress(
+                progress_callback, 'concatenating', 50, 70, 'Concatenating video clips...'
             )
             
-            # Step 4: Upload result (85% progress)
-            if progress_callback:
-                progress_callback('uploading', 85, 'Uploading result to storage...')
-            
-            result_url = self._upload_result(final_video, blueprint)
-            
-            # Step 5: Cleanup (95% progress)
-            if progress_callback:
-                progress_callback('cleanup', 95, 'Cleaning up temporary files...')
-            
-            self._cleanup_temp_files()
-            
-            # Complete (100% progress)
-            if progress_callback:
-                progress_callback('completed', 100, 'Video assembly completed')
+            concatenated_video = self._concatenate_videos(video_files, blueprint, progress)
             
-            logger.info(f"Video assembly completed for task {task_id}: {result_url}")
-            return result_url
+            return self._finish_assembly(
+                blueprint, concatenated_video, audio_file, progress_callback,
+                playlist_callback=playlist_callback
+            )
             
         except VideoAssemblyError:
             # Cleanup on error
             try:
-                self._cleanup_temp_files()
+                self._cleanup_temp_files(failed=True)
             except Exception:
                 pass
             raise
         except Exception as e:
             # Cleanup on error
             try:
-                self._cleanup_temp_files()
+                self._cleanup_temp_files(failed=True)
             except Exception:
                 pass
             raise VideoAssemblyError(f"Video assembly failed: {str(e)}") from e
+    
+    def assemble_video_stream(
+        self,
+        stream: Iterable[List[Dict]],
+        progress_callback: Optional[Callable[[str, int, str], None]] = None,
+        playlist_callback: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Assemble video while the blueprint is still being generated.
+        
+        Pipelined counterpart of assemble_video for a BlueprintStream
+        (BlueprintGenerator.stream_blueprint). The audio download starts
+        before the first section arrives, and each clip is fetched and
+        normalized on a worker thread as soon as its section is yielded,
+        so downloads, normalization and blueprint generation overlap.
+        Concatenation starts once the stream ends and every clip is ready;
+        the output is the same as assemble_video(stream.blueprint). A clip
+        used by several moves is fetched and normalized once.
+        
+        Each move path is security-checked before its clip is fetched, and
+        the complete blueprint is validated before concatenation. Errors
+        raised by the stream itself (e.g. BlueprintGenerationError)
+        propagate unchanged after temporary files are cleaned up.
+        
+        Args:
+            stream: Iterable of move lists with task_id and audio_path
+                attributes, and the complete blueprint in stream.blueprint
+                once exhausted
+            progress_callback: Optional callback(stage, progress, message)
+            playlist_callback: Optional callback(playlist URL) for HLS
+                output, called as soon as the first segment is uploaded
+        
+        Returns:
+            URL to the assembled video (the playlist for HLS output)
+            
+        Raises:
+            VideoAssemblyError: If assembly fails
+        """
+        task_id = getattr(stream, 'task_id', 'unknown')
+        audio_path = getattr(stream, 'audio_path', None)
+        
+        logger.info(f"Starting pipelined video assembly for task {task_id} ({self.pipeline_workers} workers)")
+        self._start_timer()
+        
+        error_msg = self._check_path('audio_path', audio_path)
+        if error_msg:
+            raise VideoAssemblyError(f"Invalid blueprint: {error_msg}")
+        
+        self._open_checkpoint(getattr(stream, 'task_id', None))
+        
+        clips_dir = os.path.join(self.temp_dir, 'clips')
+        normalized_dir = os.path.join(self.temp_dir, 'normalized')
+        os.makedirs(clips_dir, exist_ok=True)
+        os.makedirs(normalized_dir, exist_ok=True)
+        
+        # Single pass and segmented modes only fetch clips here; the render filters them
+        single_pass = self.render_mode in (self.RENDER_SINGLE_PASS, self.RENDER_SEGMENTED)
+        # Share the cores between the concurrent FFmpeg jobs
+        _, threads = self._normalize_concurrency(self.pipeline_workers, self.pipeline_workers)
+        executor = ThreadPoolExecutor(max_workers=self.pipeline_workers, thread_name_prefix='assembly')
+        fetch_jobs: Dict[str, Future] = {}  # one download per video_path
+        # One cut/normalize job per (video_path, segment) and one transition
+        # job per (outgoing path, incoming path, transition); None until scheduled
+        clip_jobs: Dict[Tuple, Optional[Future]] = {}
+        first_move: Dict[Tuple, int] = {}
+        clip_keys: List[Tuple] = []  # in playback order
+        move_count = 0
+        previous_move: Optional[Dict] = None
+        raw_clips = False  # a non-mezzanine clip rules out mezzanine output
+        stream_error = False
+        
+        try:
+            self._stage_progress(
+                progress_callback, 'fetching', 20, 50, 'Generating blueprint and fetching media files...'
+            )
+            
+            audio_future = executor.submit(self._fetch_audio, audio_path)
+            
+            sections = iter(stream)
+            while True:
+                try:
+                    section_moves = next(sections)
+                except StopIteration:
+                    break
+                except Exception:
+                    stream_error = True
+                    raise
+                
+                for move in section_moves:
+                    idx = move_count
+                    if not isinstance(move, dict) or 'video_path' not in move:
+                        raise VideoAssemblyError(f"Invalid blueprint: Move {idx} missing required field: video_path")
+                    error_msg = self._check_path(f'moves[{idx}].video_path', move['video_path'])
+                    if error_msg:
+                        raise VideoAssemblyError(f"Invalid blueprint: {error_msg}")
+                    video_path = move['video_path']
+                    if video_path not in fetch_jobs:
+                        fetch_jobs[video_path] = executor.submit(self._fetch_clip, idx, video_path, clips_dir)
+                    raw_clips = raw_clips or not self.ffmpeg_builder.is_mezzanine_path(video_path)
+                    if single_pass:
+                        segment, transition = self._move_segment(move), None
+                    else:
+                        segment, transition = self._plan_move(move, previous_move)
+                    if transition:
+                        transition_key = (previous_move['video_path'], video_path, transition)
+                        if transition_key not in clip_jobs:
+                            first_move[transition_key] = idx
+                            # Format known once a normalized clip is in the mix
+                            clip_jobs[transition_key] = executor.submit(
+                                self._prepare_transition, idx, fetch_jobs[transition_key[0]],
+                                fetch_jobs[video_path], normalized_dir, threads, transition
+                            ) if raw_clips else None
+                        clip_keys.append(transition_key)
+                    key = (video_path, segment)
+                    if key not in clip_jobs:
+                        first_move[key] = idx
+                        if single_pass:
+                            # The render cuts and filters the clips itself
+                            clip_jobs[key] = fetch_jobs[video_path]
+                        elif self.ffmpeg_builder.is_mezzanine_path(video_path):
+                            # Cut or normalized once the whole blueprint is known
+                            clip_jobs[key] = None
+                        else:
+                            clip_jobs[key] = executor.submit(
+                                self._prepare_clip, idx, fetch_jobs[video_path], normalized_dir, threads, key[1]
+                            )
+                    clip_keys.append(key)
+                    previous_move = move
+                    move_count += 1
+                logger.debug(f"Queued {len(section_moves)} moves ({len(fetch_jobs)} unique clips so far)")
+            
+            blueprint = getattr(stream, 'blueprint', None)
+            if blueprint is None:
+                raise VideoAssemblyError("Invalid blueprint: stream ended without a blueprint")
+            try:
+                blueprint = expand_blueprint(blueprint)
+            except BlueprintFormatError as e:
+                raise VideoAssemblyError(f"Invalid blueprint: {e}")
+            is_valid, error_msg = self.validate_blueprint(blueprint)
+            if not is_valid:
+                raise VideoAssemblyError(f"Invalid blueprint: {error_msg}")
+            if len(blueprint['moves']) != move_count:
+                raise VideoAssemblyError(
+                    f"Invalid blueprint: stream yielded {move_count} moves, blueprint has {len(blueprint['moves'])}"
+                )
+            
+            # Known only now: the clip work done so far is dropped on a hit
+            reused_url = self._reuse_output(blueprint, progress_callback)
+            if reused_url:
+                executor.shutdown(wait=True, cancel_futures=True)
+                self._cleanup_temp_files()
+                return reused_url
+            
+            progress = self._stage_progress(
+                progress_callback, 'concatenating', 50, 70, 'Concatenating video clips...'
+            )
+            
+            # Mezzanine clips were only fetched: keep them in the mezzanine
+            # format if every clip is one, otherwise normalize them too so
+            # all clips match
+            all_mezzanine = self._all_mezzanine(blueprint['moves'])
+            for key, future in clip_jobs.items():
+                if future is not None:
+                    continue
+                if len(key) == 3:
+                    clip_jobs[key] = executor.submit(
+                        self._prepare_transition, first_move[key], fetch_jobs[key[0]], fetch_jobs[key[1]],
+                        normalized_dir, threads, key[2], all_mezzanine
+                    )
+                else:
+                    clip_jobs[key] = executor.submit(
+                        self._prepare_clip, first_move[key], fetch_jobs[key[0]], normalized_dir,
+                        threads, key[1], all_mezzanine
+                    )
+            
+            # Results in playback order; the first failure aborts the rest
+            normalized_files = []
+            for key in clip_keys:
+                normalized_files.append(clip_jobs[key].result())
+                progress.update(len(normalized_files) / len(clip_keys))
+            audio_file = audio_future.result()
+            executor.shutdown(wait=True)
+            
+            if self.render_mode == self.RENDER_SINGLE_PASS:
+                return self._finish_single_pass(
+                    blueprint, normalized_files, audio_file, progress_callback, playlist_callback
+                )
+            if self.render_mode == self.RENDER_SEGMENTED:
+                return self._finish_segmented(
+                    blueprint, normalized_files, audio_file, progress_callback, playlist_callback
+                )
+            
+            concatenated_video = self._concat_clips(normalized_files)
+            
+            return self._finish_assembly(
+                blueprint, concatenated_video, audio_file, progress_callback,
+                playlist_callback=playlist_callback
+            )
+            
+        except Exception as e:
+            # Stop queued clip jobs and wait for running ones before cleanup
+            executor.shutdown(wait=True, cancel_futures=True)
+            try:
+                self._cleanup_temp_files(failed=True)
+            except Exception:
+                pass
+            if isinstance(e, VideoAssemblyError) or stream_error:
+                raise
+            raise VideoAssemblyError(f"Video assembly failed: {str(e)}") from e
+    
+    def _prepare_clip(
+        self,
+        idx: int,
+        fetch_future: Future,
+        normalized_dir: str,
+        threads: Optional[int] = None,
+        segment: Optional[ClipSegment] = None,
+        mezzanine: bool = False
+    ) -> str:
+        """
+        Make one fetched clip ready for concatenation (a pipelined assembly job).
+        
+        Waits for the clip's fetch job (always submitted earlier, so a
+        worker never waits on a job queued behind it), then normalizes the
+        clip, or only cuts it when mezzanine is True.
+        """
+        local_path = fetch_future.result()
+        if mezzanine:
+            return self._cut_mezzanine_clip(idx, local_path, normalized_dir, threads, segment)
+        return self._normalize_clip(idx, local_path, normalized_dir, threads, segment)
+    
+    def _prepare_transition(
+        self,
+        idx: int,
+        outgoing_future: Future,
+        incoming_future: Future,
+        normalized_dir: str,
+        threads: Optional[int] = None,
+        transition: Optional[ClipTransition] = None,
+        mezzanine: bool = False
+    ) -> str:
+        """
+        Render one transition once both of its clips are fetched (a pipelined assembly job).
+        
+        Both fetch jobs were submitted earlier, as for _prepare_clip.
+        """
+        outgoing_file = outgoing_future.result()
+        incoming_file = incoming_future.result()
+        return self._render_transition(
+            idx, outgoing_file, incoming_file, normalized_dir, threads, transition, mezzanine
+        )
+    
+    def _all_mezzanine(self, moves: List[Dict]) -> bool:
+        """Whether every move uses a clip in the current mezzanine format (never for a preview)."""
+        return self.profile != self.PROFILE_PREVIEW and bool(moves) and all(
+            self.ffmpeg_builder.is_mezzanine_path(move.get('video_path')) for move in moves
+        )
+    
+    def _mark_clip_ready(self, idx: int) -> None:
+        """Record time-to-first-frame when the first clip is ready for concat."""
+        if idx == 0 and self._assembly_started is not None:
+            self.last_timings.setdefault('first_clip_ready', time.perf_counter() - self._assembly_started)
+    
+    def _open_checkpoint(self, task_id: Optional[str]) -> None:
+        """Start (or resume) the task's checkpoint if a checkpoint store is configured."""
+        self._checkpoint = None
+        self.last_checkpoint_restores = {}
+        if self.checkpoints is None or not task_id or task_id == 'unknown':
+            return
+        try:
+            self._checkpoint = self.checkpoints.open(task_id)
+        except OSError as e:
+            logger.warning(f"Checkpointing disabled for task {task_id}: {e}")
+    
+    def _restore_checkpoint(self, stage: str, name: str, file_path: str) -> bool:
+        """Place a checkpointed stage output at file_path; False if there is none."""
+        if self._checkpoint is None:
+            return False
+        try:
+            return self._checkpoint.restore(stage, name, file_path)
+        except Exception as e:
+            logger.warning(f"Checkpoint restore of {stage} '{name}' failed: {e}")
+            return False
+    
+    def _record_checkpoint(self, stage: str, name: str, file_path: str) -> None:
+        """Record a completed stage output in the checkpoint, if any."""
+        if self._checkpoint is None:
+            return
+        try:
+            self._checkpoint.record(stage, name, file_path)
+        except Exception as e:
+            logger.warning(f"Checkpoint record of {stage} '{name}' failed: {e}")
+    
+    def output_path(self, blueprint: Dict) -> Optional[str]:
+        """
+        Storage path the assembled video is uploaded to.
+        
+        The blueprint's output_path, with PREVIEW_SUFFIX added to the file
+        name for the preview profile (output/video.mp4 becomes
+        output/video_preview.mp4), so a draft never replaces the full video.
+        """
+        output_path = blueprint.get('output_config', {}).get('output_path')
+        if not output_path or self.profile != self.PROFILE_PREVIEW:
+            return output_path
+        stem, ext = os.path.splitext(output_path)
+        return f'{stem}{self.PREVIEW_SUFFIX}{ext}'
+    
+    def _render_settings(self) -> Dict[str, Any]:
+        """Service settings that affect the assembled video (part of the render fingerprint)."""
+        settings = {
+            'render_mode': self.render_mode,
+            'transitions': self.transitions,
+            'output_format': self.output_format,
+            'builder_version': self.ffmpeg_builder.BUILDER_VERSION,
+            'mezzanine_version': self.ffmpeg_builder.MEZZANINE_VERSION,
+        }
+        # Only set for previews, so fingerprints of earlier full renders stay valid
+        if self.profile != self.PROFILE_FULL:
+            settings['profile'] = self.profile
+        return settings
+    
+    def _reuse_output(
+        self,
+        blueprint: Dict,
+        progress_callback: Optional[Callable[[str, int, str], None]] = None
+    ) -> Optional[str]:
+        """
+        Copy a finished render of an identical blueprint to this blueprint's output_path.
+        
+        Only for MP4 output with deduplication on. Remembers the render
+        fingerprint so the new render can be registered after upload.
+        
+        Returns:
+            URL of the output, or None if the video has to be assembled
+        """
+        self._render_fingerprint = None
+        if self.output_dedupe is None or self.output_format != self.OUTPUT_MP4:
+            return None
+        output_path = self.output_path(blueprint)
+        if not output_path:
+            return None
+        
+        self._render_fingerprint = render_fingerprint(blueprint, self._render_settings())
+        result_url = self.output_dedupe.reuse(self._render_fingerprint, output_path)
+        if result_url is None:
+            return None
+        
+        self.last_output_reused = True
+        if self._assembly_started is not None:
+            self.last_timings['total'] = time.perf_counter() - self._assembly_started
+        if progress_callback:
+            progress_callback('completed', 100, 'Reused an identical video')
+        logger.info(
+            f"Video assembly skipped for task {blueprint.get('task_id', 'unknown')}: "
+            f"identical render reused ({result_url})"
+        )
+        return result_url
+    
+    def _register_output(self, blueprint: Dict) -> None:
+        """Keep the uploaded output under its render fingerprint for later identical blueprints."""
+        if self.output_dedupe is None or not self._render_fingerprint:
+            return
+        self.output_dedupe.register(self._render_fingerprint, self.output_path(blueprint))
+    
+    def _start_timer(self) -> None:
+        """Reset last_timings and cache counters at the start of an assembly."""
+        self.last_timings = {}
+        self.last_clip_timings = {}
+        self.last_output_reused = False
+        self._current_progress = None
+        self._assembly_started = time.perf_counter()
+        self.last_clip_cache_stats = {}
+        if self.clip_cache is not None:
+            self._clip_cache_baseline = self.clip_cache.get_stats()
+    
+    def _record_clip_cache_stats(self) -> None:
+        """Compute and log normalized clip cache usage for this assembly."""
+        if self.clip_cache is None:
+            return
+        stats = self.clip_cache.get_stats()
+        baseline = self._clip_cache_baseline
+        hits = stats['hits'] - baseline.get('hits', 0)
+        misses = stats['misses'] - baseline.get('misses', 0)
+        self.last_clip_cache_stats = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': (hits / (hits + misses)) if hits + misses else 0.0,
+            'bytes_saved': stats['bytes_saved'] - baseline.get('bytes_saved', 0),
+        }
+        logger.info(
+            f"Normalized clip cache: {hits}/{hits + misses} hits "
+            f"({self.last_clip_cache_stats['hit_ratio']:.0%}), "
+            f"{self.last_clip_cache_stats['bytes_saved']} bytes saved; "
+            f"lifetime hit ratio {stats['hit_ratio']:.0%}, {stats['bytes_saved']} bytes saved"
+        )
+    
+    def _finish_assembly(
+        self,
+        blueprint: Dict,
+        concatenated_video: str,
+        audio_file: str,
+        progress_callback: Optional[Callable[[str, int, str], None]],
+        copy_video: Optional[bool] = None,
+        playlist_callback: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Add audio, upload and clean up (shared tail of the staged and segmented assembly paths).
+        
+        A preview's video is muxed as-is, with PREVIEW_AUDIO_BITRATE audio.
+        
+        Args:
+            blueprint: Expanded, validated blueprint
+            concatenated_video: Path to concatenated video (no audio)
+            audio_file: Path to local audio file
+            progress_callback: Optional callback(stage, progress, message)
+            copy_video: Whether to copy the video stream (see _add_audio_track)
+            playlist_callback: Optional callback(playlist URL) for HLS output
+        
+        Returns:
+            URL to the assembled video
+        """
+        # Step 3: Add audio track (70-85% progress)
+        progress = self._stage_progress(progress_callback, 'adding_audio', 70, 85, 'Adding audio track...')
+        publisher = self._hls_publisher(blueprint, playlist_callback)
+        
+        output_config = blueprint.get('output_config', {})
+        if self.profile == self.PROFILE_PREVIEW:
+            copy_video = True
+            output_config = {**output_config, 'audio_bitrate': self.ffmpeg_builder.PREVIEW_AUDIO_BITRATE}
+        final_video = self._add_audio_track(
+            concatenated_video,
+            audio_file,
+            output_config,
+            progress,
+            self._expected_duration(blueprint),
+            copy_video,
+            publisher
+        )
+        
+        return self._upload_and_finish(blueprint, final_video, progress_callback, publisher)
+    
+    def _finish_segmented(
+        self,
+        blueprint: Dict,
+        video_files: List[str],
+        audio_file: str,
+        progress_callback: Optional[Callable[[str, int, str], None]],
+        playlist_callback: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Render the timeline in parallel parts, join them, add audio, upload and clean up.
+        
+        The parts are encoded with the output codec and bitrate, so the
+        audio is muxed in without re-encoding the joined video.
+        
+        Args:
+            blueprint: Expanded, validated blueprint
+            video_files: Local clip paths in playback order (not normalized)
+            audio_file: Path to local audio file
+            progress_callback: Optional callback(stage, progress, message)
+            playlist_callback: Optional callback(playlist URL) for HLS output
+        
+        Returns:
+            URL to the assembled video
+        """
+        moves = blueprint.get('moves', [])
+        parts = self._split_timeline(moves, self.segment_workers)
+        progress = self._stage_progress(
+            progress_callback, 'rendering', 50, 70, f'Rendering video in {len(parts)} parallel parts...'
+        )
+        
+        part_files = self._render_parts(
+            video_files, moves, parts, blueprint.get('output_config', {}), progress
+        )
+        concatenated_video = self._concat_clips(part_files)
+        
+        return self._finish_assembly(
+            blueprint, concatenated_video, audio_file, progress_callback,
+            copy_video=True, playlist_callback=playlist_callback
+        )
+    
+    def _split_timeline(self, moves: List[Dict], parts: int) -> List[Tuple[int, int]]:
+        """
+        Split the moves into at most parts consecutive runs of similar duration.
+        
+        Cuts fall on move boundaries, nearest to equal shares of the total
+        duration (moves count equally if any has no duration).
+        
+        Returns:
+            (first move, end move) index pairs covering every move in order
+        """
+        weights = []
+        for move in moves:
+            try:
+                weights.append(float(move.get('duration') or 0))
+            except (TypeError, ValueError):
+                weights.append(0.0)
+        if not all(weight > 0 for weight in weights):
+            weights = [1.0] * len(moves)
+        parts = max(1, min(parts, len(moves)))
+        total = sum(weights)
+        
+        bounds = [0]
+        elapsed = 0.0
+        for idx, weight in enumerate(weights[:-1]):
+            elapsed += weight
+            # Cut after this move when its end is the closest to the next share
+            if len(bounds) < parts and elapsed >= total * len(bounds) / parts - weights[idx + 1] / 2:
+                bounds.append(idx + 1)
+        bounds.append(len(moves))
+        return list(zip(bounds, bounds[1:]))
+    
+    def _render_parts(
+        self,
+        video_files: List[str],
+        moves: List[Dict],
+        parts: List[Tuple[int, int]],
+        output_config: Dict,
+        progress: Optional[StageProgress] = None
+    ) -> List[str]:
+        """
+        Encode every part of the timeline in parallel FFmpeg processes.
+        
+        The cores are shared between the parts (see _normalize_concurrency).
+        The first failure cancels parts that have not started yet.
+        
+        Args:
+            video_files: Local clip paths, one per move
+            moves: Blueprint moves
+            parts: Move index ranges from _split_timeline
+            output_config: Output configuration from blueprint
+            progress: Optional stage progress, updated as parts complete
+            
+        Returns:
+            Part file paths in playback order
+            
+        Raises:
+            VideoAssemblyError: If a part fails
+        """
+        for idx, video_file in enumerate(video_files):
+            if not os.path.exists(video_file):
+                raise VideoAssemblyError(f"Video file {idx} does not exist: {video_file}")
+        
+        output_dir = os.path.join(self.temp_dir, 'parts')
+        os.makedirs(output_dir, exist_ok=True)
+        segments = [self._move_segment(move) for move in moves]
+        workers, threads = self._normalize_concurrency(len(parts), self.segment_workers)
+        logger.info(f"Rendering {len(moves)} clips in {len(parts)} parts with {workers} workers x {threads} threads")
+        started = time.perf_counter()
+        
+        results: Dict[int, str] = {}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='segment')
+        try:
+            futures = {
+                executor.submit(
+                    self._render_part, part, video_files[start:end], segments[start:end],
+                    output_dir, output_config, threads
+                ): part
+                for part, (start, end) in enumerate(parts)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress:
+                    progress.update(len(results) / len(parts))
+        finally:
+            # On failure, drop queued parts and wait for running FFmpeg processes
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        logger.info(f"All {len(parts)} parts rendered in {time.perf_counter() - started:.2f}s")
+        return [results[part] for part in range(len(parts))]
+    
+    def _render_part(
+        self,
+        part: int,
+        video_files: List[str],
+        segments: List[Optional[ClipSegment]],
+        output_dir: str,
+        output_config: Dict,
+        threads: Optional[int] = None
+    ) -> str:
+        """
+        Filter, join and encode the clips of one part of the timeline (no audio).
+        
+        Raises:
+            VideoAssemblyError: If FFmpeg fails or produces no output
+        """
+        output_file = os.path.join(output_dir, f'part_{part:04d}.mp4')
+        started = time.perf_counter()
+        
+        ffmpeg_cmd = self.ffmpeg_builder.build_segment_command(
+            video_files=video_files,
+            output_file=output_file,
+            segments=[segment.as_tuple() if segment else None for segment in segments],
+            frame_rate=self.DEFAULT_FRAME_RATE,
+            video_codec=output_config.get('video_codec', 'libx264'),
+            video_bitrate=output_config.get('video_bitrate', '2M'),
+            threads=threads
+        )
+        
+        try:
+            with self._ffmpeg_slot():
+                subprocess.run(
+                    ffmpeg_cmd,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=self.FFMPEG_TIMEOUT_SEGMENT
+                )
+        except subprocess.TimeoutExpired:
+            raise VideoAssemblyError(f"Rendering timed out for part {part}")
+        except subprocess.CalledProcessError as e:
+            error_detail = e.stderr[-500:] if e.stderr else 'No error output'
+            raise VideoAssemblyError(f"FFmpeg render failed for part {part}: {error_detail}")
+        
+        if not os.path.exists(output_file):
+            raise VideoAssemblyError(f"Part {part} not created")
+        
+        logger.debug(f"Part {part} ({len(video_files)} clips) rendered in {time.perf_counter() - started:.2f}s")
+        return output_file
+    
+    def _finish_single_pass(
+        self,
+        blueprint: Dict,
+        video_files: List[str],
+        audio_file: str,
+        progress_callback: Optional[Callable[[str, int, str], None]],
+        playlist_callback: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Render in one FFmpeg pass, upload and clean up (single pass render mode).
+        
+        With HLS output, segments are uploaded while the render runs, so
+        playback can start after the first segment is encoded.
+        
+        Args:
+            blueprint: Expanded, validated blueprint
+            video_files: Local clip paths in playback order (not normalized)
+            audio_file: Path to local audio file
+            progress_callback: Optional callback(stage, progress, message)
+            playlist_callback: Optional callback(playlist URL) for HLS output
+        
+        Returns:
+            URL to the assembled video
+        """
+        progress = self._stage_progress(
+            progress_callback, 'rendering', 50, 85, 'Rendering video in a single pass...'
+        )
+        publisher = self._hls_publisher(blueprint, playlist_callback)
+        
+        segments = [self._move_segment(move) for move in blueprint.get('moves', [])]
+        final_video = self._render_single_pass(
+            video_files, audio_file, blueprint.get('output_config', {}), segments,
+            progress, self._expected_duration(blueprint), publisher
+        )
+        
+        return self._upload_and_finish(blueprint, final_video, progress_callback, publisher)
+    
+    def _render_single_pass(
+        self,
+        video_files: List[str],
+        audio_file: str,
+        output_config: Dict,
+        segments: Optional[List[Optional[ClipSegment]]] = None,
+        progress: Optional[StageProgress] = None,
+        duration: Optional[float] = None,
+        publisher: Optional[HLSPublisher] = None
+    ) -> str:
+        """
+        Filter, concatenate and encode the clips with the audio in one FFmpeg command.
+        
+        Args:
+            video_files: Local clip paths in playback order
+            audio_file: Path to local audio file
+            output_config: Output configuration from blueprint
+            segments: Optional segment per clip (None plays the whole clip)
+            progress: Optional stage progress, updated from FFmpeg's
+                -progress output
+            duration: Expected output length in seconds (needed for progress)
+            publisher: Optional HLS publisher; FFmpeg then writes its
+                playlist, uploaded as segments are finished
+            
+        Returns:
+            Path to final video file with audio (the playlist for HLS output)
+            
+        Raises:
+            VideoAssemblyError: If rendering fails
+        """
+        logger.info(f"Rendering {len(video_files)} clips in a single pass")
+        
+        for idx, video_file in enumerate(video_files):
+            if not os.path.exists(video_file):
+                raise VideoAssemblyError(f"Video file {idx} does not exist: {video_file}")
+        if not os.path.exists(audio_file):
+            raise VideoAssemblyError(f"Audio file does not exist: {audio_file}")
+        
+        output_file = publisher.playlist_file if publisher else os.path.join(self.temp_dir, 'final_output.mp4')
+        
+        ffmpeg_cmd = self.ffmpeg_builder.build_single_pass_command(
+            video_files=video_files,
+            audio_file=audio_file,
+            output_file=output_file,
+            segments=[segment.as_tuple() if segment else None for segment in segments] if segments else None,
+            frame_rate=self.DEFAULT_FRAME_RATE,
+            video_codec=output_config.get('video_codec', 'libx264'),
+            audio_codec=output_config.get('audio_codec', 'aac'),
+            video_bitrate=output_config.get('video_bitrate', '2M'),
+            audio_bitrate=output_config.get('audio_bitrate', '128k')
+        )
+        if publisher:
+            ffmpeg_cmd = self.ffmpeg_builder.with_hls_output(
+                ffmpeg_cmd, output_file, self.hls_segment_seconds, self.DEFAULT_FRAME_RATE
+            )
+        
+        try:
+            self._run_ffmpeg(
+                ffmpeg_cmd, self.FFMPEG_TIMEOUT_SINGLE_PASS, progress, duration,
+                publisher.sync if publisher else None
+            )
+            
+            if not os.path.exists(output_file):
+                raise VideoAssemblyError("Final video file not created by FFmpeg")
+            
+            file_size = os.path.getsize(output_file)
+            if file_size == 0:
+                raise VideoAssemblyError("Final video file is empty")
+            
+            logger.info(f"Single pass render complete: {output_file} ({file_size} bytes)")
+            return output_file
+            
+        except subprocess.TimeoutExpired:
+            raise VideoAssemblyError(f"FFmpeg single pass render timed out after {self.FFMPEG_TIMEOUT_SINGLE_PASS} seconds")
+        except subprocess.CalledProcessError as e:
+            error_detail = e.stderr[-500:] if e.stderr else 'No error output'
+            raise VideoAssemblyError(f"FFmpeg single pass render failed: {error_detail}")
+        except HLSPublishError as e:
+            raise VideoAssemblyError(str(e)) from e
+        except FileNotFoundError:
+            raise VideoAssemblyError("FFmpeg executable not found")
+    
+    def _stage_progress(
+        self,
+        progress_callback: Optional[Callable[[str, int, str], None]],
+        stage: str,
+        start: int,
+        end: int,
+        message: str
+    ) -> StageProgress:
+        """Start reporting a stage that spans start-end of the overall progress."""
+        progress = StageProgress(progress_callback, stage, start, end, message, self.progress_interval)
+        progress.start()
+        self._current_progress = progress
+        return progress
+    
+    def _expected_duration(self, blueprint: Dict) -> Optional[float]:
+        """
+        Expected length of the assembled video in seconds, or None if unknown.
+        
+        The sum of the move durations when every move has one, otherwise the
+        blueprint's total_duration.
+        """
+        try:
+            durations = [float(move['duration']) for move in blueprint.get('moves', [])]
+        except (KeyError, TypeError, ValueError):
+            durations = []
+        if durations and all(duration > 0 for duration in durations):
+            return sum(durations)
+        try:
+            return float(blueprint['total_duration']) or None
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def _hls_publisher(
+        self,
+        blueprint: Dict,
+        playlist_callback: Optional[Callable[[str], None]] = None
+    ) -> Optional[HLSPublisher]:
+        """
+        Publisher for the final FFmpeg command's output, or None for MP4 output.
+        
+        The playlist and segments are uploaded next to the blueprint's
+        output_path: output/video.mp4 becomes output/video/index.m3u8.
+        """
+        if self.output_format != self.OUTPUT_HLS:
+            return None
+        output_path = blueprint.get('output_config', {}).get('output_path')
+        if not output_path:
+            raise VideoAssemblyError("No output_path specified in blueprint output_config")
+        hls_dir = os.path.join(self.temp_dir, 'hls')
+        # Segments of a failed earlier attempt (kept in a checkpoint work directory)
+        shutil.rmtree(hls_dir, ignore_errors=True)
+        return HLSPublisher(
+            self.storage,
+            hls_dir,
+            os.path.dirname(playlist_storage_path(output_path)),
+            playlist_callback
+        )
+    
+    def _run_ffmpeg(
+        self,
+        ffmpeg_cmd: List[str],
+        timeout: float,
+        progress: Optional[StageProgress] = None,
+        duration: Optional[float] = None,
+        on_update: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Run an FFmpeg command, reporting its progress when possible.
+        
+        With a stage progress that has a callback and a known output
+        duration, or with on_update, FFmpeg writes -progress blocks to
+        stdout, which are parsed as they arrive (stderr is drained on a
+        separate thread); on_update is called after each block, on the
+        calling thread. Otherwise the command runs with subprocess.run.
+        An exception raised by on_update kills FFmpeg and propagates.
+        
+        Raises:
+            subprocess.TimeoutExpired: If FFmpeg runs longer than timeout
+            subprocess.CalledProcessError: If FFmpeg fails (stderr attached)
+        """
+        report = progress is not None and progress.callback is not None and bool(duration)
+        if not report and on_update is None:
+            with self._ffmpeg_slot(progress):
+                subprocess.run(ffmpeg_cmd, capture_output=True, text=True, check=True, timeout=timeout)
+            return
+        
+        ffmpeg_cmd = self.ffmpeg_builder.with_progress_output(ffmpeg_cmd)
+        handle = progress.ffmpeg_handler(duration) if report else None
+        timed_out = threading.Event()
+        stderr_chunks: List[str] = []
+        
+        with self._ffmpeg_slot(progress), subprocess.Popen(
+            ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        ) as process:
+            stderr_reader = threading.Thread(
+                target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+            )
+            stderr_reader.start()
+            
+            def kill():
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                for block in parse_progress(process.stdout):
+                    if handle:
+                        handle(block)
+                    if on_update:
+                        on_update()
+                returncode = process.wait()
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                timer.cancel()
+            stderr_reader.join()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(ffmpeg_cmd, timeout, stderr=''.join(stderr_chunks))
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, ffmpeg_cmd, stderr=''.join(stderr_chunks))
+    
+    @contextmanager
+    def _ffmpeg_slot(self, progress: Optional[StageProgress] = None) -> Iterator[None]:
+        """
+        Hold an FFmpeg admission slot while an FFmpeg process runs.
+        
+        Waiting is reported to progress (default: the current stage) and
+        the wait is added to last_timings['ffmpeg_queue_wait']. A no-op
+        without admission control.
+        """
+        if self.admission is None:
+            yield
+            return
+        progress = progress or self._current_progress
+        on_wait = progress.queued if progress is not None else None
+        with self.admission.admit(on_wait) as waited:
+            with self._queue_wait_lock:
+                self.last_timings['ffmpeg_queue_wait'] = self.last_timings.get('ffmpeg_queue_wait', 0.0) + waited
+            yield
+    
+    def _upload_and_finish(
+        self,
+        blueprint: Dict,
+        final_video: str,
+        progress_callback: Optional[Callable[[str, int, str], None]],
+        publisher: Optional[HLSPublisher] = None
+    ) -> str:
+        """
+        Upload the final video, clean up and record timings (tail of every render mode).
+        
+        For HLS output, most segments are already uploaded; the publisher
+        uploads the rest and the complete playlist.
+        """
+        task_id = blueprint.get('task_id', 'unknown')
+        
+        # Step 4: Upload result (85% progress)
+        if progress_callback:
+            progress_callback('uploading', 85, 'Uploading result to storage...')
+        
+        if publisher:
+            try:
+                result_url = publisher.finish()
+            except HLSPublishError as e:
+                raise VideoAssemblyError(str(e)) from e
+        else:
+            result_url = self._upload_result(final_video, blueprint)
+            self._register_output(blueprint)
+        
+        # Step 5: Cleanup (95% progress)
+        if progress_callback:
+            progress_callback('cleanup', 95, 'Cleaning up temporary files...')
+        
+        self._cleanup_temp_files()
+        
+        # Complete (100% progress)
+        if progress_callback:
+            progress_callback('completed', 100, 'Video assembly completed')
+        
+        if self._assembly_started is not None:
+            self.last_timings['total'] = time.perf_counter() - self._assembly_started
+        self._record_clip_cache_stats()
+        
+        logger.info(f"Video assembly completed for task {task_id}: {result_url}")
+        return result_url
@@ -0,0 +1,149 @@
+"""
+Startup warm-up for expensive service singletons.
+
+The first choreography request in a fresh worker otherwise pays for loading
+the vector index from the database, numba-compiling librosa's feature
+extractors and building the agent service. Running warm-up once per worker
+(see gunicorn.conf.py) moves that cost to process startup.
+
+Warm-up is opt-in via SERVICE_WARMUP=true. Every component is timed and
+failures are logged without preventing the worker from starting.
+"""
+
+import os
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Components in the order they are warmed up
+WARMUP_COMPONENTS = ['vector_index', 'librosa_jit', 'text_model', 'agent_service']
+
+# Synthetic signal used to trigger numba compilation
+WARMUP_SIGNAL_SECONDS = 3.0
+WARMUP_SAMPLE_RATE = 22050
+
+
+def is_warmup_enabled() -> bool:
+    """Check whether startup warm-up is enabled via SERVICE_WARMUP."""
+    return os.environ.get('SERVICE_WARMUP', 'False').lower() in ('true', '1', 'yes')
+
+
+def get_warmup_components() -> List[str]:
+    """
+    Get the components to warm up.
+
+    SERVICE_WARMUP_COMPONENTS may restrict warm-up to a comma-separated
+    subset of WARMUP_COMPONENTS (default: all).
+    """
+    configured = os.environ.get('SERVICE_WARMUP_COMPONENTS', '')
+    if not configured.strip():
+        return list(WARMUP_COMPONENTS)
+
+    requested = [name.strip() for name in configured.split(',') if name.strip()]
+    unknown = [name for name in requested if name not in WARMUP_COMPONENTS]
+    if unknown:
+        logger.warning(f"Ignoring unknown warm-up components: {', '.join(unknown)}")
+    return [name for name in WARMUP_COMPONENTS if name in requested]
+
+
+def make_warmup_signal(
+    duration: float = WARMUP_SIGNAL_SECONDS,
+    sample_rate: int = WARMUP_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Create a short synthetic signal with a steady pulse at 120 BPM.
+
+    A pure tone gives librosa's onset and beat trackers nothing to do, so
+    clicks are added on every beat to exercise the same code paths as music.
+    """
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    y = 0.2 * np.sin(2 * np.pi * 220.0 * t)
+
+    click_length = int(0.01 * sample_rate)
+    click = np.hanning(click_length) * 0.8
+    for start in range(0, len(y) - click_length, sample_rate // 2):
+        y[start:start + click_length] += click
+
+    return y.astype(np.float32)
+
+
+def _warm_vector_index() -> None:
+    """Load move embeddings and build the vector/keyword indices."""
+    from services.vector_search_service import get_vector_search_service
+
+    get_vector_search_service().load_embeddings_from_db()
+
+
+def _warm_librosa_jit() -> None:
+    """Run the music analyzer once so numba compiles librosa's kernels."""
+    from music_analyzer import MusicAnalyzer
+
+    analyzer = MusicAnalyzer()
+    analyzer.analyze_signal(make_warmup_signal(sample_rate=analyzer.sample_rate), analyzer.sample_rate)
+
+
+def _warm_text_model() -> None:
+    """Load the query-side text embedding model."""
+    from services.text_embedding_service import get_text_embedding_service
+
+    if not get_text_embedding_service().preload():
+        raise RuntimeError("text embedding model is not available")
+
+
+def _warm_agent_service() -> None:
+    """Initialize the agent service singleton (requires OPENAI_API_KEY)."""
+    from services import get_agent_service
+
+    get_agent_service()
+
+
+_WARMUP_FUNCTIONS: Dict[str, Callable[[], None]] = {
+    'vector_index': _warm_vector_index,
+    'librosa_jit': _warm_librosa_jit,
+    'text_model': _warm_text_model,
+    'agent_service': _warm_agent_service,
+}
+
+
+def warm_up_services(components: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+    """
+    Warm up service singletons and report per-component timings.
+
+    Args:
+        components: Components to warm up (default: get_warmup_components())
+
+    Returns:
+        Dictionary mapping component name to elapsed seconds, or None if
+        that component failed or was skipped
+    """
+    if components is None:
+        components = get_warmup_components()
+
+    timings: Dict[str, Optional[float]] = {}
+    total_start = time.perf_counter()
+
+    for name in components:
+        if name == 'agent_service' and not os.getenv('OPENAI_API_KEY'):
+            logger.info("Warm-up agent_service: skipped (OPENAI_API_KEY not set)")
+            timings[name] = None
+            continue
+
+        start = time.perf_counter()
+        try:
+            _WARMUP_FUNCTIONS[name]()
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            logger.warning(f"Warm-up {name}: failed after {elapsed:.2f}s: {e}")
+            timings[name] = None
+            continue
+
+        timings[name] = time.perf_counter() - start
+        logger.info(f"Warm-up {name}: {timings[name]:.2f}s")
+
+    logger.info(f"Warm-up complete in {time.perf_counter() - total_start:.2f}s")
+    return timings